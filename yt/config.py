@@ -8,6 +8,7 @@ ytcfg_defaults["yt"] = dict(
     serialize=False,
     only_deserialize=False,
     time_functions=False,
+    instrument_spans=False,
     colored_logs=False,
     suppress_stream_logging=False,
     stdout_stream_logging=False,
@@ -44,6 +45,16 @@ ytcfg_defaults["yt"] = dict(
     supp_data_dir="/does/not/exist",
     default_colormap="cmyt.arbre",
     ray_tracing_engine="embree",
+    hsml_cache_dir="",
+    spatial_index_max_memory=2**30,
+    cosmology_tabulated=False,
+    plot_view_cache_max_memory=2**28,
+    io_threads=4,
+    selection_cache_max_memory=2**28,
+    field_cache_max_memory=0,
+    field_cache_derived=False,
+    particle_index_per_type=False,
+    particle_block_size=0,
     internals=dict(
         within_testing=False,
         within_pytest=False,
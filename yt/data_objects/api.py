@@ -3,6 +3,8 @@ from .analyzer_objects import AnalysisTask, analysis_task
 from .image_array import ImageArray
 from .index_subobjects import AMRGridPatch, OctreeSubset
 from .particle_filters import add_particle_filter, particle_filter
+from .particle_pair_counts import ParticlePairCounts
 from .profiles import ParticleProfile, Profile1D, Profile2D, Profile3D, create_profile
+from .ray_bundle import RayBundle
 from .static_output import Dataset
 from .time_series import DatasetSeries, DatasetSeriesObject
@@ -3,6 +3,8 @@ import io
 import os
 import warnings
 import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 from re import finditer
 from tempfile import NamedTemporaryFile, TemporaryFile
@@ -21,9 +23,18 @@ from yt.data_objects.selection_objects.data_selection_objects import (
 )
 from yt.fields.field_exceptions import NeedsGridType, NeedsOriginalGrid
 from yt.frontends.sph.data_structures import ParticleDataset
-from yt.funcs import get_memory_usage, is_sequence, iter_fields, mylog, only_on_root
+from yt.frontends.ytdata.utilities import save_as_dataset
+from yt.funcs import (
+    get_memory_usage,
+    get_output_filename,
+    is_sequence,
+    iter_fields,
+    mylog,
+    only_on_root,
+)
 from yt.geometry import particle_deposit as particle_deposit
 from yt.geometry.coordinates.cartesian_coordinates import all_data
+from yt.geometry.spatial_index import selection_key
 from yt.loaders import load_uniform_grid
 from yt.units.unit_object import Unit  # type: ignore
 from yt.units.yt_array import YTArray, uconcatenate  # type: ignore
@@ -33,7 +44,10 @@ from yt.utilities.exceptions import (
     YTParticleDepositionNotImplemented,
     YTTooManyVertices,
 )
-from yt.utilities.grid_data_format.writer import write_to_gdf
+from yt.utilities.grid_data_format.writer import (
+    _create_gdf_fields,
+    _create_new_gdf,
+)
 from yt.utilities.lib.cyoctree import CyOctree
 from yt.utilities.lib.interpolators import ghost_zone_interpolate
 from yt.utilities.lib.marching_cubes import march_cubes_grid, march_cubes_grid_flux
@@ -47,6 +61,7 @@ from yt.utilities.lib.pixelization_routines import (
 )
 from yt.utilities.lib.quad_tree import QuadTree
 from yt.utilities.minimal_representation import MinimalProjectionData
+from yt.utilities.on_demand_imports import _h5py as h5py
 from yt.utilities.parallel_tools.parallel_analysis_interface import (
     communication_system,
     parallel_objects,
@@ -645,6 +660,7 @@ class YTCoveringGrid(YTSelectionContainer3D):
         ("index", "z"),
     )
     _base_grid = None
+    _slabbable = True
 
     def __init__(
         self,
@@ -1104,10 +1120,138 @@ class YTCoveringGrid(YTSelectionContainer3D):
         # squeeze dummy dimension we appended above
         return np.squeeze(vals, axis=0)
 
-    def write_to_gdf(self, gdf_path, fields, nprocs=1, field_units=None, **kwargs):
+    def _slab(self, start, stop):
+        # A covering grid over the cells start:stop along the first axis
+        left_edge = self.left_edge.copy()
+        left_edge[0] += start * self.dds[0]
+        dims = self.ActiveDimensions.copy()
+        dims[0] = stop - start
+        return type(self)(
+            self.level,
+            left_edge,
+            dims,
+            ds=self.ds,
+            num_ghost_zones=self._num_ghost_zones,
+            use_pbar=False,
+            field_parameters=self.field_parameters,
+        )
+
+    def _iter_slabs(self, fields, max_slab_size=2**24):
+        r"""
+        Iterates over slabs of this grid along its first axis, yielding the
+        range of cells of every slab along that axis along with a dict of the
+        values of the fields in that slab.
+
+        Fields that have not been read yet are read from the io chunks of each
+        slab in turn, so that at most ``max_slab_size`` cells (or a single
+        plane of cells, if larger) of each field are held in memory at once.
+        """
+        fields = list(iter_fields(fields))
+        dims = self.ActiveDimensions
+        keys = [self._determine_fields(field)[0] for field in fields]
+        if (
+            not self._slabbable
+            or all(key in self.field_data for key in keys)
+            or any(
+                getattr(self.ds.field_info.get(key), "is_sph_field", False)
+                for key in keys
+            )
+        ):
+            # already in memory, or filled over the whole grid at once
+            nx = dims[0]
+        else:
+            nx = max(1, int(max_slab_size // np.prod(dims[1:])))
+        for start in range(0, dims[0], nx):
+            stop = min(start + nx, dims[0])
+            if nx == dims[0]:
+                slab = self
+            else:
+                slab = self._slab(start, stop)
+            yield start, stop, {field: slab[key] for field, key in zip(fields, keys)}
+
+    def save_as_dataset(
+        self, filename=None, fields=None, max_slab_size=2**24, compression=None
+    ):
+        r"""Export the covering grid to a reloadable yt dataset.
+
+        Like :meth:`write_to_gdf`, the fields are read and written slab by
+        slab along the first axis, so that the memory used is bounded by the
+        size of a slab rather than by the size of the grid.  Particle fields
+        are saved as for other data containers.
+
+        Parameters
+        ----------
+        filename : str, optional
+            The name of the file to be written.  If None, the name
+            will be a combination of the original dataset and the type
+            of data container.
+        fields : list of string or tuple field names, optional
+            If this is supplied, it is the list of fields to be saved to
+            disk.  If not supplied, all the fields that have been queried
+            will be saved.
+        max_slab_size : integer, optional
+            The maximum number of cells of each field held in memory at once.
+            Slabs are at least one plane of cells thick, and smoothed covering
+            grids are filled at once. Default: 2**24
+        compression : string, optional
+            The compression filter of the (chunked) HDF5 datasets, such as
+            "gzip" or "lzf". Default: None
+
+        Returns
+        -------
+        filename : str
+            The name of the file that has been created.
+        """
+        if fields is None:
+            fields = [f for f in self.field_data if f not in self._container_fields]
+        fields = list(self._determine_fields(fields))
+        if any(self.ds.field_info[f].sampling_type == "particle" for f in fields):
+            return super().save_as_dataset(filename=filename, fields=fields)
+        keyword = f"{str(self.ds)}_{self._type_name}"
+        filename = get_output_filename(filename, keyword, ".h5")
+        tds_fields = tuple(("index", t) for t in self._tds_fields)
+        fields += [f for f in self._container_fields + tds_fields if f not in fields]
+
+        # the attributes of the file, with no fields yet
+        save_as_dataset(
+            self.ds, filename, {}, extra_attrs=self._save_as_dataset_attrs()
+        )
+        shape = tuple(self.ActiveDimensions)
+        with h5py.File(filename, mode="r+") as fh:
+            group = fh.create_group("grid")
+            group.attrs["num_elements"] = int(np.prod(shape))
+            for start, stop, slab in self._iter_slabs(fields, max_slab_size):
+                for field in fields:
+                    values = slab[field]
+                    if field[1] not in group:
+                        dataset = group.create_dataset(
+                            field[1],
+                            shape=shape,
+                            dtype=values.dtype,
+                            chunks=True if compression else None,
+                            compression=compression,
+                        )
+                        dataset.attrs["units"] = str(values.units)
+                    group[field[1]][start:stop] = values.d
+        return filename
+
+    def write_to_gdf(
+        self,
+        gdf_path,
+        fields,
+        nprocs=1,
+        field_units=None,
+        max_slab_size=2**24,
+        compression=None,
+        **kwargs,
+    ):
         r"""
         Write the covering grid data to a GDF file.
 
+        The fields are read and written slab by slab along the first axis, so
+        that the memory used is bounded by the size of a slab rather than by
+        the size of the grid.
+
         Parameters
         ----------
         gdf_path : string
@@ -1120,7 +1264,14 @@ class YTCoveringGrid(YTSelectionContainer3D):
         field_units : dictionary, optional
             Dictionary of units to convert fields to. If not set, fields are
             in their default units.
-        All remaining keyword arguments are passed to
+        max_slab_size : integer, optional
+            The maximum number of cells of each field held in memory at once.
+            Slabs are at least one plane of cells thick, and smoothed covering
+            grids are filled at once. Default: 2**24
+        compression : string, optional
+            The compression filter of the (chunked) HDF5 datasets, such as
+            "gzip" or "lzf". Default: None
+        All remaining keyword arguments (such as *overwrite*) are those of
         yt.utilities.grid_data_format.writer.write_to_gdf.
 
         Examples
@@ -1132,18 +1283,22 @@ class YTCoveringGrid(YTSelectionContainer3D):
         ...     overwrite=True,
         ... )
         """
-        data = {}
+        if field_units is None:
+            field_units = {}
+        fields = list(iter_fields(fields))
+        slabs = self._iter_slabs(fields, max_slab_size)
+        start, stop, slab = next(slabs)
+        units = {}
         for field in fields:
-            if field in field_units:
-                units = field_units[field]
-            else:
-                units = str(self[field].units)
-            data[field] = (self[field].in_units(units).v, units)
+            units[field] = field_units.get(field, str(slab[field].units))
         le = self.left_edge.v
         re = self.right_edge.v
         bbox = np.array([[l, r] for l, r in zip(le, re)])
+        # The decomposition into grids and the metadata of the file are taken
+        # from a stream dataset whose (placeholder) field values are never read
+        placeholder = np.broadcast_to(np.float64(0), tuple(self.ActiveDimensions))
         ds = load_uniform_grid(
-            data,
+            {field: (placeholder, units[field]) for field in fields},
             self.ActiveDimensions,
             bbox=bbox,
             length_unit=self.ds.length_unit,
@@ -1152,7 +1307,34 @@ class YTCoveringGrid(YTSelectionContainer3D):
             nprocs=nprocs,
             sim_time=self.ds.current_time.v,
         )
-        write_to_gdf(ds, gdf_path, **kwargs)
+        with _create_new_gdf(ds, gdf_path, **kwargs) as f:
+            particle_type_name = kwargs.get("particle_type_name", "dark_matter")
+            _create_gdf_fields(
+                ds, f, fields, particle_type_name, compression=compression
+            )
+            names = [ds._get_field_info(field).name[1] for field in fields]
+            grids = [
+                (
+                    f["data"]["grid_%010i" % (grid.id - grid._id_offset)],
+                    grid.get_global_startindex(),
+                    grid.ActiveDimensions,
+                )
+                for grid in ds.index.grids
+            ]
+            while slab is not None:
+                values = {field: slab[field].to_value(units[field]) for field in fields}
+                for group, gsi, gdims in grids:
+                    lo = max(start, gsi[0])
+                    hi = min(stop, gsi[0] + gdims[0])
+                    if lo >= hi:
+                        continue
+                    for field, name in zip(fields, names):
+                        group[name][lo - gsi[0] : hi - gsi[0]] = values[field][
+                            lo - start : hi - start,
+                            gsi[1] : gsi[1] + gdims[1],
+                            gsi[2] : gsi[2] + gdims[2],
+                        ]
+                start, stop, slab = next(slabs, (None, None, None))
 
     def _get_grid_bounds_size(self):
         dd = self.ds.domain_width / 2**self.level
@@ -1245,6 +1427,21 @@ class YTArbitraryGrid(YTCoveringGrid):
         self.level = 99
         self._setup_data_source()
 
+    def _slab(self, start, stop):
+        left_edge = self.left_edge.copy()
+        left_edge[0] += start * self.dds[0]
+        right_edge = self.right_edge.copy()
+        right_edge[0] = self.left_edge[0] + stop * self.dds[0]
+        dims = self.ActiveDimensions.copy()
+        dims[0] = stop - start
+        return type(self)(
+            left_edge,
+            right_edge,
+            dims,
+            ds=self.ds,
+            field_parameters=self.field_parameters,
+        )
+
     def _fill_fields(self, fields):
         fields = [f for f in fields if f not in self.field_data]
         if len(fields) == 0:
@@ -1331,6 +1528,9 @@ class YTSmoothedCoveringGrid(YTCoveringGrid):
     _type_name = "smoothed_covering_grid"
     filename = None
     _min_level = None
+    # the interpolation from the coarser levels depends on where the whole
+    # grid lies, so a slab of it does not match the same cells of the grid
+    _slabbable = False
 
     @wraps(YTCoveringGrid.__init__)
     def __init__(self, *args, **kwargs):
@@ -1530,6 +1730,26 @@ class YTSmoothedCoveringGrid(YTCoveringGrid):
         self._setup_data_source(ls)
 
 
+def _ply_header(nv, size=None):
+    # The header of a PLY file of uncolored triangles, padded with a comment
+    # to a given size if needed
+    lines = [
+        b"ply",
+        b"format binary_little_endian 1.0",
+        b"element vertex %i" % nv,
+        b"property float x",
+        b"property float y",
+        b"property float z",
+        b"element face %i" % (nv // 3),
+        b"property list uchar int vertex_indices",
+    ]
+    header = b"\n".join(lines) + b"\n"
+    end = b"end_header\n"
+    if size is not None:
+        header += b"comment" + b" " * (size - len(header) - len(end) - 8) + b"\n"
+    return header + end
+
+
 class YTSurface(YTSelectionContainer3D):
     r"""This surface object identifies isocontours on a cell-by-cell basis,
     with no consideration of global connectedness, and returns the vertices
@@ -1554,6 +1774,11 @@ class YTSurface(YTSelectionContainer3D):
         which will be isocontoured.
     field_value : float, YTQuantity, or unit tuple
         The value at which the isocontour should be calculated.
+    num_threads : int, optional
+        The number of threads extracting the triangles of the blocks of the
+        data source, while the next blocks are read.  The blocks are also
+        distributed over the MPI processes when yt runs in parallel.
+        Default: 1.
 
     Examples
     --------
@@ -1581,8 +1806,9 @@ class YTSurface(YTSelectionContainer3D):
         ("index", "z"),
     )
 
-    def __init__(self, data_source, surface_field, field_value, ds=None):
+    def __init__(self, data_source, surface_field, field_value, ds=None, num_threads=1):
         self.data_source = data_source
+        self.num_threads = num_threads
         self.surface_field = data_source._determine_fields(surface_field)[0]
         finfo = data_source.ds.field_info[self.surface_field]
         try:
@@ -1613,26 +1839,11 @@ class YTSurface(YTSelectionContainer3D):
             mylog.info("Extracting (sampling: %s)", fields)
         verts = []
         samples = []
-        for _io_chunk in parallel_objects(self.data_source.chunks([], "io")):
-            for block, mask in self.data_source.blocks:
-                my_verts = self._extract_isocontours_from_grid(
-                    block,
-                    self.surface_field,
-                    self.field_value,
-                    mask,
-                    fields,
-                    sample_type,
-                    no_ghost=no_ghost,
-                )
-                if fields is not None:
-                    my_verts, svals = my_verts
-                    samples.append(svals)
-                verts.append(my_verts)
-        verts = np.concatenate(verts).transpose()
-        verts = self.comm.par_combine_object(verts, op="cat", datatype="array")
-        # verts is an ndarray here and will always be in code units, so we
-        # expose it in the public API as a YTArray
-        self._vertices = self.ds.arr(verts, "code_length")
+        for my_verts, svals, _ in self._march_blocks(fields, sample_type, no_ghost):
+            verts.append(my_verts)
+            if fields is not None:
+                samples.append(svals)
+        self._set_vertices(verts)
         if fields is not None:
             samples = uconcatenate(samples)
             samples = self.comm.par_combine_object(samples, op="cat", datatype="array")
@@ -1641,29 +1852,98 @@ class YTSurface(YTSelectionContainer3D):
             elif sample_type == "vertex":
                 self.vertex_samples[fields] = samples
 
-    def _extract_isocontours_from_grid(
+    def _set_vertices(self, verts):
+        verts = np.concatenate(verts).transpose()
+        verts = self.comm.par_combine_object(verts, op="cat", datatype="array")
+        # verts is an ndarray here and will always be in code units, so we
+        # expose it in the public API as a YTArray
+        self._vertices = self.ds.arr(verts, "code_length")
+
+    def _march_blocks(
         self,
-        grid,
-        field,
-        value,
-        mask,
-        sample_values=None,
+        sample_field=None,
         sample_type="face",
         no_ghost=False,
+        flux_fields=None,
+        vertices=True,
     ):
-        # TODO: check if multiple fields can be passed here
-        vals = grid.get_vertex_centered_data([field], no_ghost=no_ghost)[field]
-        if sample_values is not None:
+        # Yields the vertices of the triangles of each block (None if vertices
+        # is False), with the samples of a field and the flux of some fields
+        # over them if requested.  The blocks are read one after the other,
+        # while the triangles of the previous ones are extracted by the
+        # threads, so that only a few blocks are held in memory at once.
+        pending = deque()
+        with ThreadPoolExecutor(self.num_threads) as executor:
+            for _io_chunk in parallel_objects(self.data_source.chunks([], "io")):
+                for block, mask in self.data_source.blocks:
+                    args = self._read_block(
+                        block, mask, sample_field, no_ghost, flux_fields
+                    )
+                    pending.append(
+                        executor.submit(self._march_block, sample_type, vertices, *args)
+                    )
+                    while len(pending) > self.num_threads:
+                        yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _read_block(self, block, mask, sample_field, no_ghost, flux_fields):
+        fields = [self.surface_field]
+        if flux_fields is not None:
+            fields += [f for f in flux_fields if f is not None and f not in fields]
+        vc_data = block.get_vertex_centered_data(fields, no_ghost=no_ghost)
+        if sample_field is not None:
             # TODO: is no_ghost=False correct here?
-            svals = grid.get_vertex_centered_data([sample_values])[sample_values]
+            svals = block.get_vertex_centered_data([sample_field])[sample_field]
         else:
             svals = None
-
-        sample_type = {"face": 1, "vertex": 2}[sample_type]
-        my_verts = march_cubes_grid(
-            value, vals, mask, grid.LeftEdge, grid.dds, svals, sample_type
+        if flux_fields is None:
+            flux_data = None
+        else:
+            field_x, field_y, field_z, fluxing_field = flux_fields
+            if fluxing_field is None:
+                ff = self.ds.arr(
+                    np.ones_like(vc_data[self.surface_field].d, dtype="float64"),
+                    "dimensionless",
+                )
+            else:
+                ff = vc_data[fluxing_field]
+            flux_data = (vc_data[field_x], vc_data[field_y], vc_data[field_z], ff)
+        return vc_data[self.surface_field], svals, mask, block, flux_data
+
+    def _march_block(self, sample_type, vertices, vals, svals, mask, grid, flux_data):
+        my_verts = None
+        if vertices:
+            my_verts = march_cubes_grid(
+                self.field_value,
+                vals,
+                mask,
+                grid.LeftEdge,
+                grid.dds,
+                svals,
+                {"face": 1, "vertex": 2}[sample_type],
+            )
+            if svals is not None:
+                my_verts, svals = my_verts
+        if flux_data is None:
+            return my_verts, svals, None
+        field_x_vals, field_y_vals, field_z_vals, ff = flux_data
+        flux = march_cubes_grid_flux(
+            self.field_value,
+            vals,
+            field_x_vals,
+            field_y_vals,
+            field_z_vals,
+            ff,
+            mask,
+            grid.LeftEdge,
+            grid.dds,
         )
-        return my_verts
+        # assumes all the fluxing fields have the same units
+        flux_units = field_x_vals.units * ff.units * grid.dds.units**2
+        flux = self.ds.arr(flux, flux_units)
+        flux.convert_to_units(self.ds.unit_system[flux_units.dimensions])
+        return my_verts, svals, flux
 
     def calculate_flux(self, field_x, field_y, field_z, fluxing_field=None):
         r"""This calculates the flux over the surface.
@@ -1686,6 +1966,9 @@ class YTSurface(YTSelectionContainer3D):
         Additionally, the returned flux is defined as flux *into* the surface,
         not flux *out of* the surface.
 
+        If the surface has not been extracted yet, its vertices are computed
+        in the same pass over the data.
+
         Parameters
         ----------
         field_x : string
@@ -1725,52 +2008,21 @@ class YTSurface(YTSelectionContainer3D):
         ... )
         """
         flux = 0.0
+        verts = []
         mylog.info("Fluxing %s", fluxing_field)
-        for _io_chunk in parallel_objects(self.data_source.chunks([], "io")):
-            for block, mask in self.data_source.blocks:
-                flux += self._calculate_flux_in_grid(
-                    block, mask, field_x, field_y, field_z, fluxing_field
-                )
+        flux_fields = (field_x, field_y, field_z, fluxing_field)
+        vertices = self._vertices is None
+        for my_verts, _, my_flux in self._march_blocks(
+            flux_fields=flux_fields, vertices=vertices
+        ):
+            flux += my_flux
+            if vertices:
+                verts.append(my_verts)
+        if vertices:
+            self._set_vertices(verts)
         flux = self.comm.mpi_allreduce(flux, op="sum")
         return flux
 
-    def _calculate_flux_in_grid(
-        self, grid, mask, field_x, field_y, field_z, fluxing_field=None
-    ):
-
-        vc_fields = [self.surface_field, field_x, field_y, field_z]
-        if fluxing_field is not None:
-            vc_fields.append(fluxing_field)
-
-        vc_data = grid.get_vertex_centered_data(vc_fields)
-        if fluxing_field is None:
-            ff = self.ds.arr(
-                np.ones_like(vc_data[self.surface_field].d, dtype="float64"),
-                "dimensionless",
-            )
-        else:
-            ff = vc_data[fluxing_field]
-        surf_vals = vc_data[self.surface_field]
-        field_x_vals = vc_data[field_x]
-        field_y_vals = vc_data[field_y]
-        field_z_vals = vc_data[field_z]
-        ret = march_cubes_grid_flux(
-            self.field_value,
-            surf_vals,
-            field_x_vals,
-            field_y_vals,
-            field_z_vals,
-            ff,
-            mask,
-            grid.LeftEdge,
-            grid.dds,
-        )
-        # assumes all the fluxing fields have the same units
-        ret_units = field_x_vals.units * ff.units * grid.dds.units**2
-        ret = self.ds.arr(ret, ret_units)
-        ret.convert_to_units(self.ds.unit_system[ret_units.dimensions])
-        return ret
-
     _vertices = None
 
     @property
@@ -2357,6 +2609,7 @@ class YTSurface(YTSelectionContainer3D):
         color_log=True,
         sample_type="face",
         no_ghost=False,
+        stream=False,
     ):
         r"""This exports the surface to the PLY format, suitable for visualization
         in many different programs (e.g., MeshLab).
@@ -2375,6 +2628,13 @@ class YTSurface(YTSelectionContainer3D):
             Which color map should be applied?
         color_log : bool
             Should the color field be logged before being mapped?
+        stream : bool
+            If True, the triangles of each block of the data source are
+            written as soon as they are extracted, instead of being gathered
+            in memory first, which allows for exporting surfaces too large to
+            fit in memory.  The vertices are then not kept, and the surface
+            cannot be colored.  In parallel, the surface is gathered on the
+            root process regardless.  Default: False.
 
         Examples
         --------
@@ -2391,6 +2651,14 @@ class YTSurface(YTSelectionContainer3D):
         """
         if color_map is None:
             color_map = ytcfg.get("yt", "default_colormap")
+        if stream and color_field is not None:
+            raise ValueError(
+                "Streamed surfaces cannot be colored, as their colors depend on "
+                "the range of the color field over the whole surface."
+            )
+        if stream and self.comm.size == 1:
+            self._stream_ply(filename, bounds, no_ghost)
+            return
         if self.vertices is None:
             self.get_data(color_field, sample_type, no_ghost=no_ghost)
         elif color_field is not None:
@@ -2430,18 +2698,7 @@ class YTSurface(YTSelectionContainer3D):
             f = filename
         else:
             f = open(filename, "wb")
-        if bounds is None:
-            DLE = self.ds.domain_left_edge
-            DRE = self.ds.domain_right_edge
-            bounds = [(DLE[i], DRE[i]) for i in range(3)]
-        elif any([not all([isinstance(be, YTArray) for be in b]) for b in bounds]):
-            bounds = [
-                tuple(
-                    be if isinstance(be, YTArray) else self.ds.quan(be, "code_length")
-                    for be in b
-                )
-                for b in bounds
-            ]
+        bounds = self._sanitize_ply_bounds(bounds)
         nv = self.vertices.shape[1]
         vs = [
             ("x", "<f"),
@@ -2509,6 +2766,60 @@ class YTSurface(YTSelectionContainer3D):
         if filename is not f:
             f.close()
 
+    def _sanitize_ply_bounds(self, bounds):
+        if bounds is None:
+            DLE = self.ds.domain_left_edge
+            DRE = self.ds.domain_right_edge
+            bounds = [(DLE[i], DRE[i]) for i in range(3)]
+        elif any([not all([isinstance(be, YTArray) for be in b]) for b in bounds]):
+            bounds = [
+                tuple(
+                    be if isinstance(be, YTArray) else self.ds.quan(be, "code_length")
+                    for be in b
+                )
+                for b in bounds
+            ]
+        return bounds
+
+    def _stream_ply(self, filename, bounds=None, no_ghost=False, chunk_size=2**20):
+        bounds = self._sanitize_ply_bounds(bounds)
+        left = np.array([b[0].to("code_length").d for b in bounds])
+        width = np.array([b[1].to("code_length").d for b in bounds]) - left
+        if hasattr(filename, "read"):
+            f = filename
+        else:
+            f = open(filename, "wb")
+        # the numbers of vertices and faces are only known at the end, the
+        # header is rewritten then
+        header_start = f.tell()
+        header_size = len(_ply_header(2**63)) + 32
+        f.write(_ply_header(0, header_size))
+        nv = 0
+        for my_verts, _, _ in self._march_blocks(no_ghost=no_ghost):
+            v = np.empty(
+                my_verts.shape[0], dtype=[("x", "<f"), ("y", "<f"), ("z", "<f")]
+            )
+            for i, ax in enumerate("xyz"):
+                # Center at origin.
+                v[ax] = (my_verts[:, i] - left[i]) / width[i] - 0.5
+            v.tofile(f)
+            nv += my_verts.shape[0]
+        fs = [("ni", "uint8"), ("v1", "<i4"), ("v2", "<i4"), ("v3", "<i4")]
+        for start in range(0, nv // 3, chunk_size):
+            vi = np.arange(3 * start, min(3 * (start + chunk_size), nv), dtype="<i4")
+            arr = np.empty(vi.size // 3, dtype=fs)
+            arr["ni"] = 3
+            arr["v1"] = vi[0::3]
+            arr["v2"] = vi[1::3]
+            arr["v3"] = vi[2::3]
+            arr.tofile(f)
+        end = f.tell()
+        f.seek(header_start)
+        f.write(_ply_header(nv, header_size))
+        f.seek(end)
+        if filename is not f:
+            f.close()
+
     def export_sketchfab(
         self,
         title,
@@ -2726,7 +3037,7 @@ class YTOctree(YTSelectionContainer3D):
         self._setup_data_source()
         self.tree
 
-    def _generate_tree(self):
+    def _build_octree(self):
         positions = []
         for ptype in self.ptypes:
             positions.append(
@@ -2740,18 +3051,30 @@ class YTOctree(YTSelectionContainer3D):
         )
         if not positions.size:
             mylog.info("No particles found!")
-            self._octree = None
-            return
+            return None
 
         mylog.info("Allocating Octree for %s particles", positions.shape[0])
-        self._octree = CyOctree(
+        octree = CyOctree(
             positions,
             left_edge=self.left_edge.to("code_length").d,
             right_edge=self.right_edge.to("code_length").d,
             n_ref=self.n_ref,
         )
-        mylog.info("Allocated %s nodes in octree", self._octree.num_nodes)
-        mylog.info("Octree bound %s particles", self._octree.bound_particles)
+        mylog.info("Allocated %s nodes in octree", octree.num_nodes)
+        mylog.info("Octree bound %s particles", octree.bound_particles)
+        return octree
+
+    def _generate_tree(self):
+        # Octrees over the same particles are shared through the index
+        key = (
+            "octree",
+            tuple(self.ptypes),
+            selection_key(self._data_source),
+            self.n_ref,
+        )
+        self._octree = self.ds.index.spatial_indexes.get(key, self._build_octree)
+        if self._octree is None:
+            return
 
         # Now we store the index data about the octree in the python container
         ds = self.ds
@@ -96,16 +96,7 @@ class YTDataContainer(abc.ABC):
         self.ds.objects.append(weakref.proxy(self))
         mylog.debug("Appending object to %s (type: %s)", self.ds, type(self))
         self.field_data = YTFieldData()
-        if self.ds.unit_system.has_current_mks:
-            mag_unit = "T"
-        else:
-            mag_unit = "G"
-        self._default_field_parameters = {
-            "center": self.ds.arr(np.zeros(3, dtype="float64"), "cm"),
-            "bulk_velocity": self.ds.arr(np.zeros(3, dtype="float64"), "cm/s"),
-            "bulk_magnetic_field": self.ds.arr(np.zeros(3, dtype="float64"), mag_unit),
-            "normal": self.ds.arr([0.0, 0.0, 1.0], ""),
-        }
+        self._default_field_parameters = self._get_default_field_parameters()
         if field_parameters is None:
             field_parameters = {}
         self._set_default_field_parameters()
@@ -139,6 +130,18 @@ class YTDataContainer(abc.ABC):
 
         pdb.set_trace()
 
+    def _get_default_field_parameters(self):
+        if self.ds.unit_system.has_current_mks:
+            mag_unit = "T"
+        else:
+            mag_unit = "G"
+        return {
+            "center": self.ds.arr(np.zeros(3, dtype="float64"), "cm"),
+            "bulk_velocity": self.ds.arr(np.zeros(3, dtype="float64"), "cm/s"),
+            "bulk_magnetic_field": self.ds.arr(np.zeros(3, dtype="float64"), mag_unit),
+            "normal": self.ds.arr([0.0, 0.0, 1.0], ""),
+        }
+
     def _set_default_field_parameters(self):
         self.field_parameters = {}
         for k, v in self._default_field_parameters.items():
@@ -655,6 +658,18 @@ class YTDataContainer(abc.ABC):
                     ftypes[g_field] = "grid"
                     data[g_field] = self[g_field]
 
+        save_as_dataset(
+            self.ds,
+            filename,
+            data,
+            field_types=ftypes,
+            extra_attrs=self._save_as_dataset_attrs(),
+        )
+
+        return filename
+
+    def _save_as_dataset_attrs(self):
+        # The attributes needed to reconstruct the container once reloaded
         extra_attrs = {
             arg: getattr(self, arg, None) for arg in self._con_args + self._tds_attrs
         }
@@ -662,11 +677,7 @@ class YTDataContainer(abc.ABC):
         extra_attrs["data_type"] = "yt_data_container"
         extra_attrs["container_type"] = self._type_name
         extra_attrs["dimensionality"] = self._dimensionality
-        save_as_dataset(
-            self.ds, filename, data, field_types=ftypes, extra_attrs=extra_attrs
-        )
-
-        return filename
+        return extra_attrs
 
     def to_glue(self, fields, label="yt", data_collection=None):
         """
@@ -704,7 +715,7 @@ class YTDataContainer(abc.ABC):
     def create_firefly_object(
         self,
         datadir,
-        ptypes='all',
+        ptypes="all",
         fields_to_include=None,
         fields_units=None,
         field_names=None,
@@ -801,7 +812,7 @@ class YTDataContainer(abc.ABC):
         )
 
         # Allow for default value
-        if ptypes == 'all':
+        if ptypes == "all":
             ptypes = sorted(self.ds.particle_types_raw)
 
         ## create a ParticleGroup object that contains *every* field
@@ -829,13 +840,13 @@ class YTDataContainer(abc.ABC):
             if field_names is None:
                 field_names = []
             unavailable_fields = []
-            for i, ( field, units ) in enumerate( zip(fields_to_include, fields_units) ):
+            for i, (field, units) in enumerate(zip(fields_to_include, fields_units)):
                 ## determine if you want to take the log of the field for Firefly
                 log_flag = "log(" in units
 
                 # Prepare the field for calling, allowing good user flexibility.
-                if not isinstance( field, tuple ):
-                    field_call = ( ptype, field )
+                if not isinstance(field, tuple):
+                    field_call = (ptype, field)
                 else:
                     field_call = field
 
@@ -843,7 +854,7 @@ class YTDataContainer(abc.ABC):
                 try:
                     this_field_array = self[field_call]
                 except YTFieldNotFound:
-                    unavailable_fields.append( field )
+                    unavailable_fields.append(field)
                     continue
 
                 ## fix the units string and prepend 'log' to the field for
@@ -859,30 +870,29 @@ class YTDataContainer(abc.ABC):
                     this_field_array = np.log10(this_field_array)
 
                 ## add this array to the tracked arrays
-                field_arrays.append( this_field_array )
+                field_arrays.append(this_field_array)
                 if field_names is None:
-                    generated_field_names.append( field )
+                    generated_field_names.append(field)
                 else:
-                    generated_field_names.append( field_names[i] )
+                    generated_field_names.append(field_names[i])
 
             if field_names is None:
                 field_names = generated_field_names
 
             # Print fields skipped because they were unavailable
-            if len( unavailable_fields ) > 0:
+            if len(unavailable_fields) > 0:
                 print(
-                    'For ptype {} unable to retrieve these fields: {}'.format(
-                        ptype,
-                        unavailable_fields
+                    "For ptype {} unable to retrieve these fields: {}".format(
+                        ptype, unavailable_fields
                     )
                 )
 
             ## create a firefly ParticleGroup for this particle type
             # Include fields if available
-            if len( field_arrays ) != 0:
+            if len(field_arrays) != 0:
                 ParticleGroup_kwargs = {
-                    'field_arrays': field_arrays,
-                    'field_names': field_names,
+                    "field_arrays": field_arrays,
+                    "field_names": field_names,
                 }
             else:
                 ParticleGroup_kwargs = {}
@@ -891,11 +901,11 @@ class YTDataContainer(abc.ABC):
                 coordinates=self[ptype, "relative_particle_position"].in_units(
                     coordinate_units
                 ),
-                velocities = self[ptype, "relative_particle_velocity"].in_units(
+                velocities=self[ptype, "relative_particle_velocity"].in_units(
                     velocity_units
                 ),
                 decimation_factor=default_decimation_factor,
-                **ParticleGroup_kwargs
+                **ParticleGroup_kwargs,
             )
 
             ## bind this particle group to the firefly reader object
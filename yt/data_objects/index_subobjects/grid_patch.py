@@ -53,6 +53,17 @@ class AMRGridPatch(YTSelectionContainer):
         self._last_count = -1
         self._last_selector_id = None
 
+    def _get_default_field_parameters(self):
+        # A dataset may have millions of grids, so they share their (read-only)
+        # default field parameters rather than each building their own
+        defaults = getattr(self.ds, "_grid_default_field_parameters", None)
+        if defaults is None:
+            defaults = super()._get_default_field_parameters()
+            for value in defaults.values():
+                value.flags.writeable = False
+            self.ds._grid_default_field_parameters = defaults
+        return defaults
+
     def get_global_startindex(self):
         """
         Return the integer starting index for each dimension at the current
@@ -397,18 +408,25 @@ class AMRGridPatch(YTSelectionContainer):
         mask = self._get_selector_mask(selector)
         yield self, mask
 
+    def _fill_selector_mask(self, selector):
+        mask = selector.fill_mask_regular_grid(self)
+        return mask, 0 if mask is None else mask.sum()
+
     def _get_selector_mask(self, selector):
         if self._cache_mask and hash(selector) == self._last_selector_id:
-            mask = self._last_mask
+            return self._last_mask
+        if self._cache_mask:
+            # the masks are shared with the other grids selected by this
+            # selector, which may belong to other data objects
+            mask, count = self.index.selection_cache.get(
+                (hash(selector), "grid_mask", self.id),
+                lambda: self._fill_selector_mask(selector),
+            )
+            self._last_mask = mask
         else:
-            mask = selector.fill_mask_regular_grid(self)
-            if self._cache_mask:
-                self._last_mask = mask
-            self._last_selector_id = hash(selector)
-            if mask is None:
-                self._last_count = 0
-            else:
-                self._last_count = mask.sum()
+            mask, count = self._fill_selector_mask(selector)
+        self._last_selector_id = hash(selector)
+        self._last_count = count
         return mask
 
     def select(self, selector, source, dest, offset):
@@ -30,7 +30,7 @@ else:
 def cell_count_cache(func):
     def cc_cache_func(self, dobj):
         if hash(dobj.selector) != self._last_selector_id:
-            self._cell_count = -1
+            self._cell_count = self._count_oct_cells(dobj.selector)
         rv = func(self, dobj)
         self._cell_count = rv.shape[0]
         self._last_selector_id = hash(dobj.selector)
@@ -48,6 +48,10 @@ class OctreeSubset(YTSelectionContainer):
     _domain_offset = 0
     _cell_count = -1
     _block_order = "C"
+    # whether the masks and cell counts of the octs are kept in the selection
+    # cache of the index, which requires the oct handler to live as long as
+    # the index does
+    _cache_selection = True
 
     def __init__(self, base_region, domain, ds, num_zones=2, num_ghost_zones=0):
         super().__init__(ds, None)
@@ -103,12 +107,31 @@ class OctreeSubset(YTSelectionContainer):
         arr = arr.reshape(new_shape, order="F")
         return arr
 
+    def _cached_selection(self, selector, kind, builder):
+        if not self._cache_selection:
+            return builder()
+        key = (hash(selector), kind, id(self.oct_handler), self.domain_id)
+        return self.index.selection_cache.get(key, builder)
+
+    def _count_oct_cells(self, selector):
+        """The number of cells of this subset's octs selected by a selector."""
+        if not self._cache_selection:
+            return -1
+        return self._cached_selection(
+            selector,
+            "oct_cells",
+            lambda: selector.count_oct_cells(self.oct_handler, self.domain_id),
+        )
+
     def mask_refinement(self, selector):
-        mask = self.oct_handler.mask(selector, domain_id=self.domain_id)
-        return mask
+        return self._cached_selection(
+            selector,
+            "oct_mask",
+            lambda: self.oct_handler.mask(selector, domain_id=self.domain_id),
+        )
 
     def select_blocks(self, selector):
-        mask = self.oct_handler.mask(selector, domain_id=self.domain_id)
+        mask = self.mask_refinement(selector)
         slicer = OctreeSubsetBlockSlice(self, self.ds)
         for i, sl in slicer:
             yield sl, np.atleast_3d(mask[i, ...])
@@ -16,19 +16,9 @@ class StretchedGrid(AMRGridPatch):
         ]
         assert (computed_right_edge == self.RightEdge).all()
 
-    def _get_selector_mask(self, selector):
-        if self._cache_mask and hash(selector) == self._last_selector_id:
-            mask = self._last_mask
-        else:
-            mask = selector.fill_mask(self)
-            if self._cache_mask:
-                self._last_mask = mask
-            self._last_selector_id = hash(selector)
-            if mask is None:
-                self._last_count = 0
-            else:
-                self._last_count = mask.sum()
-        return mask
+    def _fill_selector_mask(self, selector):
+        mask = selector.fill_mask(self)
+        return mask, 0 if mask is None else mask.sum()
 
     def select_fwidth(self, dobj):
         mask = self._get_selector_mask(dobj.selector)
@@ -0,0 +1,257 @@
+import os
+from collections import OrderedDict
+
+import numpy as np
+
+from yt.funcs import get_num_threads, mylog
+from yt.units.yt_array import YTArray
+from yt.utilities.lib.cykdtree import PyKDTree
+from yt.utilities.lib.particle_kdtree_tools import count_pairs
+from yt.utilities.parallel_tools.parallel_analysis_interface import (
+    ParallelAnalysisInterface,
+    parallel_objects,
+)
+
+
+class ParticlePairCounts(ParallelAnalysisInterface):
+    r"""Pair counts of particles binned by their separation.
+
+    The particles of the data source are streamed chunk by chunk (one data
+    file at a time for particle datasets), so that only the particles of the
+    chunks currently being paired need to be held in memory.  Pairs are
+    counted with a k-d tree built on each chunk, are distributed across
+    threads within a chunk and across MPI ranks by chunk, and account for
+    periodic boundaries.
+
+    Parameters
+    ----------
+    data_source : YTSelectionContainer
+        The data object containing the particles to pair.
+    bins : array_like
+        The edges of the separation bins.  If these are not a YTArray or a
+        (values, units) tuple, they are assumed to be in code_length.
+    ptype : str, optional
+        The particle type to pair.  Default: "all".
+    weight_field : field tuple, optional
+        If supplied, every pair is weighted by the product of the values of
+        this field for both particles.  Default: None.
+    num_threads : int, optional
+        The number of threads used to count pairs.  If zero, uses the
+        ``num_threads`` configuration option, or all available CPUs.
+        Default: 0.
+    max_cached_chunks : int, optional
+        The maximum number of chunks whose particles are kept in memory
+        between uses.  Default: 8.
+
+    Attributes
+    ----------
+    bins : YTArray
+        The edges of the separation bins.
+    counts : YTArray
+        The (weighted) number of distinct pairs in each bin.
+    total_weight : YTQuantity
+        The number of particles, or the sum of their weights.
+
+    Examples
+    --------
+    >>> ds = yt.load("snapshot_033/snap_033.0.hdf5")
+    >>> ad = ds.all_data()
+    >>> pc = ParticlePairCounts(ad, (np.logspace(-2, 1, 16), "Mpc"), "PartType1")
+    >>> xi = pc.correlation_function()
+    """
+
+    _leafsize = 32
+
+    def __init__(
+        self,
+        data_source,
+        bins,
+        ptype="all",
+        weight_field=None,
+        num_threads=0,
+        max_cached_chunks=8,
+    ):
+        ParallelAnalysisInterface.__init__(self)
+        self.data_source = data_source
+        self.ds = data_source.ds
+        self.ptype = ptype
+        if weight_field is not None:
+            weight_field = data_source._determine_fields(weight_field)[0]
+        self.weight_field = weight_field
+        if isinstance(bins, tuple):
+            bins = self.ds.arr(*bins)
+        elif not isinstance(bins, YTArray):
+            bins = self.ds.arr(bins, "code_length")
+        self.bins = bins
+        if num_threads == 0:
+            num_threads = int(get_num_threads()) or os.cpu_count() or 1
+        self.num_threads = num_threads
+        self.max_cached_chunks = max_cached_chunks
+        self._cache = OrderedDict()
+        self._edges = bins.to_value("code_length").astype("float64")
+        if np.any(np.diff(self._edges) <= 0) or self._edges[0] < 0:
+            raise ValueError("Bins must be positive and monotonically increasing.")
+        self._left_edge = self.ds.domain_left_edge.to_value("code_length")
+        self._right_edge = self.ds.domain_right_edge.to_value("code_length")
+        self._width = self._right_edge - self._left_edge
+        self._periodic = np.array(self.ds.periodicity, dtype="bool")
+        if np.any(self._edges[-1] > self._width[self._periodic] / 2):
+            raise ValueError(
+                "The largest separation must not exceed half of the width of "
+                "the periodic domain."
+            )
+        self._count_pairs()
+
+    def _read_chunk(self, ci):
+        data_source = self.data_source
+        with data_source._chunked_read(self._chunks[ci]):
+            pos = data_source[self.ptype, "particle_position"]
+            pos = pos.to_value("code_length")
+            if self.weight_field is None:
+                weight = np.ones(pos.shape[0], dtype="float64")
+            else:
+                weight = data_source[self.weight_field]
+                self._weight_units = str(weight.units)
+                weight = weight.d.astype("float64")
+        return np.ascontiguousarray(pos, dtype="float64"), weight
+
+    def _get_chunk(self, ci):
+        # Returns the particles of a chunk along with a k-d tree on them, keeping
+        # the most recently used chunks around
+        if ci in self._cache:
+            self._cache.move_to_end(ci)
+            return self._cache[ci]
+        self._cache[ci] = self._build_tree(*self._read_chunk(ci))
+        while len(self._cache) > self.max_cached_chunks:
+            self._cache.popitem(last=False)
+        return self._cache[ci]
+
+    def _build_tree(self, pos, weight):
+        if pos.shape[0] == 0:
+            return pos, weight, None
+        kdtree = PyKDTree(
+            pos,
+            left_edge=pos.min(axis=0),
+            right_edge=pos.max(axis=0),
+            periodic=False,
+            leafsize=self._leafsize,
+        )
+        idx = kdtree.idx.astype("int64")
+        return pos, weight, (np.ascontiguousarray(pos[idx]), weight[idx], kdtree)
+
+    def _chunk_neighbors(self, bounds):
+        # Returns, for every chunk, the later chunks whose bounding boxes are
+        # within the largest separation, accounting for periodicity
+        rmax2 = self._edges[-1] ** 2
+        neighbors = []
+        for i, (lo_i, hi_i) in enumerate(bounds):
+            my_neighbors = []
+            for j in range(i + 1, len(bounds)):
+                lo_j, hi_j = bounds[j]
+                gap = np.maximum(0, np.maximum(lo_j - hi_i, lo_i - hi_j))
+                for shift in (-self._width, self._width):
+                    shift = np.where(self._periodic, shift, 0)
+                    sgap = np.maximum(
+                        0, np.maximum(lo_j + shift - hi_i, lo_i - hi_j - shift)
+                    )
+                    gap = np.minimum(gap, sgap)
+                if (gap**2).sum() <= rmax2:
+                    my_neighbors.append(j)
+            neighbors.append(my_neighbors)
+        return neighbors
+
+    def _count_pairs(self):
+        data_source = self.data_source
+        data_source.get_data()
+        self._chunks = list(data_source.index._chunk(data_source, "io"))
+        # First pass: find the extent of every chunk, each rank reading its own
+        # chunks, which it then counts the pairs of
+        self._weight_units = "dimensionless"
+        storage = {}
+        for sto, ci in parallel_objects(range(len(self._chunks)), storage=storage):
+            pos, weight = self._read_chunk(ci)
+            if pos.shape[0] == 0:
+                lo, hi = np.full(3, np.inf), np.full(3, -np.inf)
+            else:
+                lo, hi = pos.min(axis=0), pos.max(axis=0)
+            sto.result = lo, hi, weight.sum(), (weight**2).sum(), self._weight_units
+            if pos.shape[0] > 0 and len(self._cache) < self.max_cached_chunks:
+                self._cache[ci] = self._build_tree(pos, weight)
+        results = [storage[ci] for ci in range(len(self._chunks))]
+        bounds = [(lo, hi) for lo, hi, _, _, _ in results]
+        total_weight = sum(r[2] for r in results)
+        total_weight2 = sum(r[3] for r in results)
+        if results:
+            self._weight_units = results[0][4]
+        neighbors = self._chunk_neighbors(bounds)
+        mylog.info(
+            "Counting pairs in %s chunks with %s neighbor chunk pairs",
+            len(bounds),
+            sum(len(n) for n in neighbors),
+        )
+
+        counts = np.zeros(self._edges.size - 1, dtype="float64")
+        for ci in parallel_objects(range(len(bounds))):
+            pos, weight, tree = self._get_chunk(ci)
+            if tree is None:
+                continue
+            counts += count_pairs(
+                pos,
+                weight,
+                *tree,
+                self._edges,
+                self._periodic,
+                self._left_edge,
+                self._right_edge,
+                auto=True,
+                num_threads=self.num_threads,
+            )
+            for cj in neighbors[ci]:
+                opos, oweight, otree = self._get_chunk(cj)
+                if otree is None:
+                    continue
+                counts += count_pairs(
+                    opos,
+                    oweight,
+                    *tree,
+                    self._edges,
+                    self._periodic,
+                    self._left_edge,
+                    self._right_edge,
+                    num_threads=self.num_threads,
+                )
+        self._cache.clear()
+        self._chunks = None
+        counts = self.comm.mpi_allreduce(counts, op="sum")
+
+        units = self.ds.quan(1, self._weight_units).units
+        self.counts = self.ds.arr(counts, units**2)
+        self.total_weight = self.ds.quan(total_weight, units)
+        self._total_weight2 = total_weight2
+
+    def correlation_function(self):
+        r"""
+        The two-point correlation function in the separation bins.
+
+        This uses the natural estimator, DD / RR - 1, with the random pair
+        counts computed analytically.  It assumes that the data source covers
+        the whole domain and is only meaningful for periodic domains.
+
+        Returns
+        -------
+        xi : YTArray
+            The dimensionless correlation function in every bin.
+        """
+        volume = np.prod(self._width)
+        shell_volume = 4.0 / 3.0 * np.pi * np.diff(self._edges**3)
+        npairs = (float(self.total_weight) ** 2 - self._total_weight2) / 2
+        random_counts = npairs * shell_volume / volume
+        xi = self.counts.d / random_counts - 1
+        return self.ds.arr(xi, "dimensionless")
+
+    @property
+    def bin_centers(self):
+        return 0.5 * (self.bins[1:] + self.bins[:-1])
+
+    def __repr__(self):
+        return "ParticlePairCounts (%s, %s bins)" % (self.ptype, self.counts.size)
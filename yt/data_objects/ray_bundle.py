@@ -0,0 +1,259 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from yt.funcs import is_sequence
+from yt.units.yt_array import YTArray
+from yt.utilities.lib.ray_segments import grid_ray_segments
+from yt.utilities.parallel_tools.parallel_analysis_interface import (
+    ParallelAnalysisInterface,
+    parallel_objects,
+)
+
+
+class RayBundle(ParallelAnalysisInterface):
+    r"""A set of rays cast through a dataset at once.
+
+    For grid datasets, each grid is walked once for all of the rays crossing
+    it, and its fields are read once for all of them, which is much faster
+    than creating a :class:`~yt.data_objects.selection_objects.ray.YTRay` for
+    each ray when there are many of them.  Other datasets fall back to one
+    ray object per ray.
+
+    The data of each ray are sorted along it, and are returned as lists with
+    one array per ray; :meth:`get_flat` returns them concatenated instead.
+    The grids are distributed over the MPI processes when yt runs in
+    parallel.
+
+    Parameters
+    ----------
+    ds : ~yt.data_objects.static_output.Dataset
+        The dataset to cast the rays through.
+    rays : array_like
+        The (N, 2, 3) start and end points of the rays, in code units unless
+        they have units.
+    num_threads : int, optional
+        The number of threads used to walk the rays through the grids.
+        Default: 1.
+
+    Examples
+    --------
+    >>> starts = np.random.random((1000, 3))
+    >>> rays = np.stack([starts, starts + [0.0, 0.0, 0.1]], axis=1)
+    >>> bundle = RayBundle(ds, rays)
+    >>> column_densities = [
+    ...     (rho * dts).sum()
+    ...     for rho, dts in zip(bundle["gas", "density"], bundle["dts"])
+    ... ]
+    """
+
+    def __init__(self, ds, rays, num_threads=1):
+        super().__init__()
+        self.ds = ds
+        if isinstance(rays, YTArray):
+            rays = ds.arr(rays).to("code_length")
+        else:
+            rays = ds.arr(rays, "code_length", dtype="float64")
+        if rays.ndim != 3 or rays.shape[1:] != (2, 3):
+            raise ValueError(
+                f"The rays must be an array of shape (N, 2, 3), not {rays.shape}."
+            )
+        self.start_points = rays[:, 0]
+        self.end_points = rays[:, 1]
+        self.vec = self.end_points - self.start_points
+        self.num_threads = num_threads
+        self.field_data = {}
+        self._segments = None
+
+    def __len__(self):
+        return self.start_points.shape[0]
+
+    def __getitem__(self, field):
+        values, offsets = self.get_flat(field)
+        return np.split(values, offsets[1:-1])
+
+    @property
+    def offsets(self):
+        """The (N + 1) offsets of the data of each ray in the flat arrays."""
+        return self._get_segments()["offsets"]
+
+    def get_flat(self, field):
+        r"""Returns the values of a field along all of the rays, concatenated,
+        and the offsets of the values of each ray.
+
+        Parameters
+        ----------
+        field : str or tuple of str
+            The field, or ``"t"`` for the parametric position (between 0 and
+            1) along the rays where they enter the cells, or ``"dts"`` for
+            the parametric length of the rays in the cells.
+        """
+        key = self._field_key(field)
+        if key not in self.field_data:
+            self.get_data(field)
+        return self.field_data[key], self.offsets
+
+    def get_data(self, fields):
+        r"""Reads fields along all of the rays, in a single pass over the
+        dataset.
+
+        Parameters
+        ----------
+        fields : str, tuple of str, or list of them
+            The fields to read.
+        """
+        if isinstance(fields, (str, tuple)):
+            fields = [fields]
+        segments = self._get_segments()
+        keys = [self._field_key(f) for f in fields]
+        missing = [k for k in keys if k not in self.field_data]
+        for key in missing:
+            if key in ("t", "dts"):
+                values = segments[key]
+                self.field_data[key] = self.ds.arr(values, "dimensionless")
+        missing = [k for k in missing if k not in ("t", "dts")]
+        if not missing:
+            return
+        if "grids" in segments:
+            self._read_grid_fields(missing, segments)
+        else:
+            self._read_ray_fields(missing)
+
+    def _field_key(self, field):
+        if field in ("t", "dts"):
+            return field
+        return self.ds._get_field_info(field).name
+
+    def _get_segments(self):
+        if self._segments is not None:
+            return self._segments
+        if hasattr(self.ds.index, "grids"):
+            self._segments = self._walk_grids()
+        else:
+            self._segments = self._walk_rays()
+        return self._segments
+
+    def _walk_grids(self):
+        starts = np.ascontiguousarray(self.start_points.d)
+        vecs = np.ascontiguousarray(self.vec.d)
+        grids = self.ds.index.grids
+
+        def walk(gi, rays):
+            grid = grids[gi]
+            segments = grid_ray_segments(
+                np.ascontiguousarray(starts[rays]),
+                np.ascontiguousarray(vecs[rays]),
+                np.ascontiguousarray(grid.LeftEdge.to("code_length").d),
+                np.ascontiguousarray(grid.RightEdge.to("code_length").d),
+                np.ascontiguousarray(grid.dds.to("code_length").d),
+                np.ascontiguousarray(grid.child_mask, dtype="uint8"),
+            )
+            return (rays[segments[0]],) + segments[1:]
+
+        my_grids = list(parallel_objects(range(len(grids))))
+        crossing = {}
+        my_rays = [self._grid_rays(grids[gi], crossing) for gi in my_grids]
+        store = {}
+        if self.num_threads > 1:
+            with ThreadPoolExecutor(self.num_threads) as executor:
+                walked = executor.map(walk, my_grids, my_rays)
+                store.update(zip(my_grids, walked))
+        else:
+            store.update((gi, walk(gi, r)) for gi, r in zip(my_grids, my_rays))
+        store = {gi: s for gi, s in store.items() if s[0].size > 0}
+        store = self.comm.par_combine_object(store, "join", datatype="dict")
+
+        gis = sorted(store)
+        nsegs = [store[gi][0].size for gi in gis]
+        grid_ids = np.repeat(np.array(gis, dtype="int64"), nsegs)
+        rays, cells, t, dts = (
+            np.concatenate([store[gi][i] for gi in gis] or [np.empty(0)])
+            for i in range(4)
+        )
+        order = np.lexsort((t, rays.astype("int64")))
+        rays = rays[order].astype("int64")
+        return {
+            "grids": grid_ids[order],
+            "cells": cells[order].astype("int64"),
+            "t": t[order],
+            "dts": dts[order],
+            "offsets": np.searchsorted(rays, np.arange(len(self) + 1)),
+        }
+
+    def _grid_rays(self, grid, crossing):
+        # The indices of the rays crossing the bounding box of a grid.  A grid
+        # lies within its parents, so only the rays crossing them are tested.
+        if grid.id in crossing:
+            return crossing[grid.id]
+        parents = grid.Parent
+        if parents is None or (is_sequence(parents) and len(parents) == 0):
+            rays = np.arange(len(self), dtype="int64")
+        elif is_sequence(parents):
+            rays = np.unique(
+                np.concatenate([self._grid_rays(p, crossing) for p in parents])
+            )
+        else:
+            rays = self._grid_rays(parents, crossing)
+        left_edge = grid.LeftEdge.to("code_length").d
+        right_edge = grid.RightEdge.to("code_length").d
+        p = self.start_points.d[rays]
+        v = self.vec.d[rays]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            t0 = (left_edge - p) / v
+            t1 = (right_edge - p) / v
+        parallel = v == 0.0
+        tmin = np.where(parallel, 0.0, np.fmin(t0, t1)).max(axis=1, initial=0.0)
+        tmax = np.where(parallel, 1.0, np.fmax(t0, t1)).min(axis=1, initial=1.0)
+        outside = parallel & ((p < left_edge) | (p > right_edge))
+        crossing[grid.id] = rays[(tmin <= tmax) & ~outside.any(axis=1)]
+        return crossing[grid.id]
+
+    def _read_grid_fields(self, fields, segments):
+        grid_ids = segments["grids"]
+        order = np.argsort(grid_ids, kind="stable")
+        gis, starts = np.unique(grid_ids[order], return_index=True)
+        ends = np.r_[starts[1:], order.size]
+        store = {}
+        for i in parallel_objects(range(gis.size)):
+            grid = self.ds.index.grids[gis[i]]
+            cells = segments["cells"][order[starts[i] : ends[i]]]
+            store[i] = {}
+            # only release the fields read here, not those read before
+            cached = set(grid.field_data)
+            for field in fields:
+                values = grid[field]
+                store[i][field] = values.d.ravel()[cells], str(values.units)
+            for field in set(grid.field_data) - cached:
+                grid.field_data.pop(field)
+        store = self.comm.par_combine_object(store, "join", datatype="dict")
+        for field in fields:
+            values = np.empty(order.size, dtype="float64")
+            units = self.ds._get_field_info(field).units
+            for i in range(gis.size):
+                values[order[starts[i] : ends[i]]], units = store[i][field]
+            self.field_data[field] = self.ds.arr(values, units)
+
+    def _walk_rays(self):
+        data = {"t": [], "dts": []}
+        for start, end in zip(self.start_points, self.end_points):
+            ray = self.ds.ray(start, end)
+            order = np.argsort(ray["t"])
+            for key in data:
+                data[key].append(ray[key].d[order])
+        offsets = np.zeros(len(self) + 1, dtype="int64")
+        offsets[1:] = np.cumsum([t.size for t in data["t"]])
+        return {
+            "t": np.concatenate(data["t"] or [np.empty(0)]),
+            "dts": np.concatenate(data["dts"] or [np.empty(0)]),
+            "offsets": offsets,
+        }
+
+    def _read_ray_fields(self, fields):
+        values = {field: [] for field in fields}
+        for start, end in zip(self.start_points, self.end_points):
+            ray = self.ds.ray(start, end)
+            order = np.argsort(ray["t"])
+            for field in fields:
+                values[field].append(ray[field][order])
+        for field in fields:
+            self.field_data[field] = self.ds.arr(np.concatenate(values[field]))
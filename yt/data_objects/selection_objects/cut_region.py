@@ -10,6 +10,7 @@ from yt.data_objects.selection_objects.data_selection_objects import (
 from yt.data_objects.static_output import Dataset
 from yt.funcs import iter_fields, validate_object, validate_sequence
 from yt.geometry.selection_routines import points_in_cells
+from yt.geometry.spatial_index import selection_key
 from yt.utilities.exceptions import YTIllDefinedCutRegion
 from yt.utilities.on_demand_imports import _scipy
 
@@ -189,6 +190,9 @@ class YTCutRegion(YTSelectionContainer3D):
 
         levelmin = levels.min()
         levelmax = levels.max()
+        # The cell trees only depend on the selection, so they are shared by
+        # all particle types (and all identical cut regions)
+        key = selection_key(self)
 
         for lvl in range(levelmax, levelmin - 1, -1):
             # Filter out cells not in the current level
@@ -196,7 +200,14 @@ class YTCutRegion(YTSelectionContainer3D):
             dx_loc = dx[lvl_mask]
             pos_loc = pos[lvl_mask]
 
-            grid_tree = _scipy.spatial.cKDTree(pos_loc, boxsize=1)
+            tree_key = ("cell_kdtree", None, key, lvl)
+            grid_tree = self.ds.index.spatial_indexes.get(
+                tree_key, lambda: _scipy.spatial.cKDTree(pos_loc, boxsize=1)
+            )
+            if not np.array_equal(grid_tree.data, pos_loc):
+                # the conditionals depend on field parameters
+                grid_tree = _scipy.spatial.cKDTree(pos_loc, boxsize=1)
+                self.ds.index.spatial_indexes.add(tree_key, grid_tree)
 
             # Compute closest cell for all remaining particles
             dist, icell = grid_tree.query(
@@ -14,7 +14,9 @@ from yt.data_objects.derived_quantities import DerivedQuantityCollection
 from yt.data_objects.field_data import YTFieldData
 from yt.fields.field_exceptions import NeedsGridType
 from yt.funcs import fix_axis, is_sequence, iter_fields, validate_width_tuple
+from yt.geometry.field_cache import field_parameters_key
 from yt.geometry.selection_routines import compose_selector
+from yt.geometry.spatial_index import selection_key
 from yt.units import YTArray
 from yt.utilities.exceptions import (
     GenerationInProgress,
@@ -30,6 +32,7 @@ from yt.utilities.logger import ytLogger as mylog
 from yt.utilities.parallel_tools.parallel_analysis_interface import (
     ParallelAnalysisInterface,
 )
+from yt.utilities.performance_counters import yt_spans
 
 
 class YTSelectionContainer(YTDataContainer, ParallelAnalysisInterface, abc.ABC):
@@ -62,7 +65,14 @@ class YTSelectionContainer(YTDataContainer, ParallelAnalysisInterface, abc.ABC):
                     % (data_source._dimensionality, self._dimensionality)
                 )
             self.field_parameters.update(data_source.field_parameters)
-        self.quantities = DerivedQuantityCollection(self)
+        self._quantities = None
+
+    @property
+    def quantities(self):
+        # built on first use, as most grids and chunks never need it
+        if self._quantities is None:
+            self._quantities = DerivedQuantityCollection(self)
+        return self._quantities
 
     @property
     def selector(self):
@@ -214,9 +224,29 @@ class YTSelectionContainer(YTDataContainer, ParallelAnalysisInterface, abc.ABC):
             if field not in ofields:
                 self.field_data.pop(field)
 
+    def _derived_cache_key(self, field):
+        # Derived fields are shared by the data objects with the same selection
+        # and field parameters, but not by the chunks of a data object
+        if not self.index.field_cache.derived:
+            return None
+        if getattr(self._current_chunk, "chunk_type", None) != "all":
+            return None
+        params = field_parameters_key(self.field_parameters)
+        return ("derived", (selection_key(self), params), field)
+
+    def _lookup_derived(self, cache_key):
+        if cache_key is None:
+            return None
+        try:
+            return self.index.field_cache.lookup(cache_key).copy()
+        except KeyError:
+            return None
+
     def _generate_fields(self, fields_to_generate):
         index = 0
-        with self._field_lock():
+        with self._field_lock(), yt_spans(
+            "fields.generate_fields", fields=len(fields_to_generate)
+        ):
             # At this point, we assume that any fields that are necessary to
             # *generate* a field are in fact already available to us.  Note
             # that we do not make any assumption about whether or not the
@@ -229,8 +259,13 @@ class YTSelectionContainer(YTDataContainer, ParallelAnalysisInterface, abc.ABC):
                 if field in self.field_data:
                     continue
                 fi = self.ds._get_field_info(*field)
+                cache_key = self._derived_cache_key(field)
                 try:
-                    fd = self._generate_field(field)
+                    fd = self._lookup_derived(cache_key)
+                    if fd is None:
+                        fd = self._generate_field(field)
+                    else:
+                        cache_key = None
                     if hasattr(fd, "units"):
                         fd.units.registry = self.ds.unit_registry
                     if fd is None:
@@ -279,6 +314,8 @@ class YTSelectionContainer(YTDataContainer, ParallelAnalysisInterface, abc.ABC):
                     except UnitParseError as e:
                         raise YTFieldUnitParseError(fi) from e
                     self.field_data[field] = fd
+                    if cache_key is not None:
+                        self.index.field_cache.add(cache_key, fd.copy())
                 except GenerationInProgress as gip:
                     for f in gip.fields:
                         if f not in fields_to_generate:
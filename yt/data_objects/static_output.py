@@ -1693,6 +1693,9 @@ class Dataset(abc.ABC):
         self.field_info._show_field_errors.append(name)
         deps, _ = self.field_info.check_derived_fields([name])
         self.field_dependencies.update(deps)
+        if force_override:
+            # the fields derived from this one may have changed
+            self.index.field_cache.invalidate(kind="derived")
 
     def add_mesh_sampling_particle_field(self, sample_field, ptype="all"):
         """Add a new mesh sampling particle field
@@ -310,3 +310,84 @@ def test_arbitrary_grid_edge():
         assert ag.left_edge.units.registry == ds.unit_registry
         assert ag.right_edge.units.registry == ds.unit_registry
         ag[("gas", "density")]
+
+
+@requires_module("h5py")
+def test_covering_grid_write_to_gdf(tmp_path):
+    from yt.testing import fake_amr_ds
+
+    ds = fake_amr_ds(fields=["density", "velocity_x"], units=["g/cm**3", "cm/s"])
+    fields = [("gas", "density"), ("gas", "velocity_x")]
+    le, dims = [0.1, 0.2, 0.0], [30, 20, 16]
+    cg = ds.covering_grid(1, le, dims)
+    fn = str(tmp_path / "cg.h5")
+    # write in slabs of two planes of cells, into grids across the slabs
+    cg.write_to_gdf(
+        fn,
+        fields,
+        nprocs=4,
+        field_units={("gas", "velocity_x"): "km/s"},
+        max_slab_size=2 * 20 * 16,
+        compression="gzip",
+    )
+    assert len(cg.field_data) == 0
+    gdf = load(fn)
+    gdf_cg = gdf.covering_grid(0, gdf.domain_left_edge, dims)
+    assert_equal(gdf_cg["gas", "density"].d, cg["gas", "density"].d)
+    assert_almost_equal(
+        gdf_cg["gas", "velocity_x"].to("km/s").d, cg["gas", "velocity_x"].to("km/s").d
+    )
+    ag = ds.arbitrary_grid([0.1, 0.1, 0.1], [0.9, 0.7, 0.5], [24, 16, 8])
+    slabs = list(ag._iter_slabs(fields, max_slab_size=5 * 16 * 8))
+    assert_equal(
+        [(start, stop) for start, stop, _ in slabs],
+        [(0, 5), (5, 10), (10, 15), (15, 20), (20, 24)],
+    )
+    for field in fields:
+        data = np.concatenate([slab[field].d for _, _, slab in slabs])
+        assert_almost_equal(data, ag[field].d)
+
+
+def test_smoothed_covering_grid_slabs():
+    from yt.testing import fake_amr_ds
+
+    ds = fake_amr_ds(fields=["density"], units=["g/cm**3"])
+    field = ("gas", "density")
+    le, dims = [0.1, 0.2, 0.0], [40, 24, 16]
+    scg = ds.smoothed_covering_grid(2, le, dims)
+    slabs = list(scg._iter_slabs([field], max_slab_size=24 * 16))
+    ref = ds.smoothed_covering_grid(2, le, dims)[field]
+    data = np.concatenate([slab[field].d for _, _, slab in slabs])
+    assert_equal(data, ref.d)
+
+
+@requires_module("h5py")
+def test_covering_grid_save_as_dataset(tmp_path):
+    from yt.data_objects.selection_objects.data_selection_objects import (
+        YTSelectionContainer,
+    )
+    from yt.testing import fake_amr_ds
+    from yt.utilities.on_demand_imports import _h5py as h5py
+
+    ds = fake_amr_ds(fields=["density"], units=["g/cm**3"])
+    field = ("gas", "density")
+    cg = ds.covering_grid(1, [0.0, 0.25, 0.0], [30, 20, 16])
+    fn = cg.save_as_dataset(
+        str(tmp_path / "cg.h5"),
+        [field],
+        max_slab_size=2 * 20 * 16,
+        compression="gzip",
+    )
+    assert len(cg.field_data) == 0
+    cg_ds = load(fn)
+    assert_equal(cg_ds.data[field], cg[field])
+    assert_equal(cg_ds.data["index", "x"], cg["index", "x"])
+    # the file is the same as the one written at once
+    ref = YTSelectionContainer.save_as_dataset(cg, str(tmp_path / "ref.h5"), [field])
+    with h5py.File(fn, mode="r") as f, h5py.File(ref, mode="r") as f_ref:
+        assert_equal(sorted(f.attrs), sorted(f_ref.attrs))
+        assert_equal(sorted(f["grid"]), sorted(f_ref["grid"]))
+        assert_equal(dict(f["grid"].attrs), dict(f_ref["grid"].attrs))
+        for name in f["grid"]:
+            assert_equal(f["grid"][name][()], f_ref["grid"][name][()])
+            assert_equal(dict(f["grid"][name].attrs), dict(f_ref["grid"][name].attrs))
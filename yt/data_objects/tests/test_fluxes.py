@@ -1,7 +1,7 @@
 import os
 import shutil
 import tempfile
-from unittest import TestCase
+from unittest import TestCase, mock
 
 import numpy as np
 
@@ -31,6 +31,24 @@ def test_flux_calculation():
     assert_equal(str(flux2.units), "cm**2")
 
 
+def test_flux_with_vertices():
+    ds = fake_random_ds(32, nprocs=8)
+    dd = ds.all_data()
+    ref = ds.surface(dd, ("gas", "density"), 0.5)
+    surf = ds.surface(dd, ("gas", "density"), 0.5, num_threads=4)
+    fields = [("gas", f"velocity_{ax}") for ax in "xyz"]
+    flux = surf.calculate_flux(*fields, ("gas", "density"))
+    # the vertices are extracted in the same pass as the flux
+    assert surf._vertices is not None
+    assert_equal(surf.vertices, ref.vertices)
+    # and not extracted again once they are known
+    march = "yt.data_objects.construction_data_containers.march_cubes_grid"
+    with mock.patch(march) as march_cubes_grid:
+        assert_equal(flux, ref.calculate_flux(*fields, ("gas", "density")))
+    march_cubes_grid.assert_not_called()
+    assert_equal(surf["gas", "velocity_x"], ref["gas", "velocity_x"])
+
+
 def test_sampling():
     ds = fake_random_ds(64, nprocs=4)
     dd = ds.all_data()
@@ -69,6 +87,23 @@ class ExporterTests(TestCase):
         )
         assert os.path.exists("my_ply2.ply")
 
+    def test_export_ply_stream(self):
+        ds = fake_random_ds(32, nprocs=8)
+        dd = ds.all_data()
+        bounds = [(0, 1), (0, 1), (0, 1)]
+        surf = ds.surface(dd, ("gas", "density"), 0.5, num_threads=2)
+        surf.export_ply("stream.ply", bounds=bounds, stream=True)
+        assert surf._vertices is None
+        surf = ds.surface(dd, ("gas", "density"), 0.5)
+        surf.export_ply("memory.ply", bounds=bounds)
+        data = []
+        for fn in ["stream.ply", "memory.ply"]:
+            with open(fn, "rb") as f:
+                header, body = f.read().split(b"end_header\n")
+            header = [line for line in header.split(b"\n") if b"comment" not in line]
+            data.append((header, body))
+        assert_equal(data[0], data[1])
+
     def test_export_obj(self):
         ds = fake_random_ds(
             16,
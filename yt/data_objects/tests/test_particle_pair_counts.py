@@ -0,0 +1,57 @@
+import numpy as np
+from numpy.testing import assert_raises
+
+from yt.data_objects.particle_pair_counts import ParticlePairCounts
+from yt.testing import assert_allclose_units, assert_equal, fake_random_ds
+
+
+def _brute_force_counts(pos, weight, bins, periodic):
+    sep = pos[:, None, :] - pos[None, :, :]
+    if periodic:
+        sep -= np.round(sep)
+    r = np.sqrt((sep**2).sum(axis=-1))
+    w = weight[:, None] * weight[None, :]
+    iu = np.triu_indices(pos.shape[0], k=1)
+    return np.histogram(r[iu], bins=bins, weights=w[iu])[0]
+
+
+def test_pair_counts():
+    bins = np.linspace(0.02, 0.3, 8)
+    for periodicity in [(True, True, True), (False, False, False)]:
+        ds = fake_random_ds(16, nprocs=8, particles=1000)
+        ds._periodicity = periodicity
+        ad = ds.all_data()
+        pos = ad["all", "particle_position"].to_value("code_length")
+        mass = ad["all", "particle_mass"].to_value("g")
+        # force one chunk per grid to exercise pairing across chunks
+        for grid_chunksize in (1000, 1):
+            ds.index._grid_chunksize = grid_chunksize
+            pc = ParticlePairCounts(ad, bins, num_threads=2)
+            assert_equal(pc.counts.units, ds.quan(1, "dimensionless").units)
+            assert_equal(pc.total_weight, 1000)
+            expected = _brute_force_counts(pos, np.ones(1000), bins, periodicity[0])
+            assert_allclose_units(pc.counts.d, expected)
+            pc = ParticlePairCounts(
+                ad, (bins, "cm"), weight_field=("all", "particle_mass")
+            )
+            assert_equal(str(pc.counts.units), "g**2")
+            assert_allclose_units(
+                pc.counts.d, _brute_force_counts(pos, mass, bins, periodicity[0])
+            )
+
+
+def test_correlation_function():
+    ds = fake_random_ds(16, nprocs=4, particles=2000)
+    bins = np.linspace(0.05, 0.4, 8)
+    pc = ParticlePairCounts(ds.all_data(), bins, max_cached_chunks=1)
+    xi = pc.correlation_function()
+    assert_equal(xi.shape, (7,))
+    # randomly placed particles are uncorrelated
+    assert np.all(np.abs(xi) < 0.1)
+
+
+def test_pair_counts_invalid_bins():
+    ds = fake_random_ds(16, particles=100)
+    ad = ds.all_data()
+    assert_raises(ValueError, ParticlePairCounts, ad, [0.2, 0.1])
+    assert_raises(ValueError, ParticlePairCounts, ad, [0.1, 0.6])
@@ -1,7 +1,14 @@
 import numpy as np
 
 from yt import load
-from yt.testing import assert_equal, assert_rel_equal, fake_random_ds, requires_file
+from yt.data_objects.ray_bundle import RayBundle
+from yt.testing import (
+    assert_equal,
+    assert_rel_equal,
+    fake_amr_ds,
+    fake_random_ds,
+    requires_file,
+)
 from yt.units.yt_array import uconcatenate
 
 
@@ -64,3 +71,31 @@ def test_ray_particle():
     ray = ds.ray(ds.domain_left_edge, ds.domain_right_edge)
     assert_equal(ray["t"].shape, (1451,))
     assert ray["dts"].sum(dtype="f8") > 0
+
+
+def test_ray_bundle():
+    ds = fake_amr_ds(fields=["density"], units=["g/cm**3"])
+    prng = np.random.RandomState(0x4D3D3D3)
+    rays = prng.random_sample((20, 2, 3))
+    # an axis-aligned ray, and one outside of the domain
+    rays[0] = [[0.1, 0.2, 0.3], [0.9, 0.2, 0.3]]
+    rays[1] = [[1.5, 1.5, 1.5], [2.0, 2.0, 2.0]]
+    # the data already read from the grids are kept
+    grid = ds.index.grids[-1]
+    grid["gas", "density"]
+    for num_threads in (1, 2):
+        bundle = RayBundle(ds, rays, num_threads=num_threads)
+        density = bundle["gas", "density"]
+        t, dts = bundle["t"], bundle["dts"]
+        assert_equal(len(density), len(rays))
+        assert_equal(t[1].size, 0)
+        for i in (0, 2, 3, 19):
+            my_ray = ds.ray(rays[i, 0], rays[i, 1])
+            order = np.argsort(my_ray["t"])
+            assert_equal(t[i], my_ray["t"][order])
+            assert_equal(dts[i], my_ray["dts"][order])
+            assert_equal(density[i], my_ray["gas", "density"][order])
+            assert_rel_equal(dts[i].sum(), ds.arr(1.0, ""), 10)
+        values, offsets = bundle.get_flat(("gas", "density"))
+        assert_equal(values[offsets[3] : offsets[4]], density[3])
+    assert_equal(list(grid.field_data), [("gas", "density")])
@@ -1,6 +1,7 @@
 import numpy as np
 
 from yt.frontends.gadget.api import IOHandlerGadgetHDF5
+from yt.utilities.file_handler import read_hdf5_ranges
 from yt.utilities.on_demand_imports import _h5py as h5py
 
 
@@ -11,10 +12,13 @@ class IOHandlerArepoHDF5(IOHandlerGadgetHDF5):
         # This is handled below in _get_smoothing_length
         return
 
-    def _get_smoothing_length(self, data_file, position_dtype, position_shape):
+    def _get_smoothing_length(
+        self, data_file, position_dtype, position_shape, ranges=None
+    ):
         ptype = self.ds._sph_ptypes[0]
         ind = int(ptype[-1])
         si, ei = data_file.start, data_file.end
+        ranges = ranges or [(si, ei)]
         with h5py.File(data_file.filename, mode="r") as f:
             pcount = f["/Header"].attrs["NumPart_ThisFile"][ind].astype("int")
             pcount = np.clip(pcount - si, 0, ei - si)
@@ -22,7 +26,9 @@ class IOHandlerArepoHDF5(IOHandlerGadgetHDF5):
             # we compute one here by finding the radius of the sphere
             # corresponding to the volume of the Voroni cell and multiplying
             # by a user-configurable smoothing factor.
-            hsml = f[ptype]["Masses"][si:ei, ...] / f[ptype]["Density"][si:ei, ...]
+            hsml = read_hdf5_ranges(f[ptype]["Masses"], ranges) / read_hdf5_ranges(
+                f[ptype]["Density"], ranges
+            )
             hsml *= 3.0 / (4.0 * np.pi)
             hsml **= 1.0 / 3.0
             hsml *= self.ds.smoothing_factor
@@ -741,7 +741,7 @@ class ARTDomainSubset(OctreeSubset):
         fields = [f for ft, f in ftfields]
         field_idxs = [all_fields.index(f) for f in fields]
         source, tr = {}, {}
-        cell_count = selector.count_oct_cells(self.oct_handler, self.domain_id)
+        cell_count = self._count_oct_cells(selector)
         levels, cell_inds, file_inds = self.oct_handler.file_index_octs(
             selector, self.domain_id, cell_count
         )
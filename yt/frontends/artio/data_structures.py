@@ -28,6 +28,8 @@ class ARTIOOctreeSubset(OctreeSubset):
     _con_args = ("base_region", "sfc_start", "sfc_end", "oct_handler", "ds")
     _type_name = "octree_subset"
     _num_zones = 2
+    # the oct handlers are built for every chunk and cache their own mask
+    _cache_selection = False
 
     def __init__(self, base_region, sfc_start, sfc_end, oct_handler, ds):
         self.field_data = YTFieldData()
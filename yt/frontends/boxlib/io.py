@@ -8,6 +8,70 @@ from yt.funcs import mylog
 from yt.geometry.selection_routines import GridSelector
 from yt.utilities.io_handler import BaseIOHandler
 
+# The largest number of unrequested bytes read to merge the reads of two FABs
+_MAX_GAP = 2**20
+# An upper bound on the length of the header line of a FAB
+_HEADER_SIZE = 1024
+
+
+def _read_fabs(filename, requests, max_gap=_MAX_GAP):
+    """
+    Read ranges of bytes from the FABs of a file, merging the ranges which are
+    close to each other into large sequential reads.
+
+    Parameters
+    ----------
+    filename : str
+        The file holding the FABs.
+    requests : list of (key, offset, skip_header, nbytes)
+        The ranges to read: ``nbytes`` bytes starting at ``offset``, or right
+        after the end of the header line starting at ``offset`` if
+        ``skip_header`` is True.
+    max_gap : int, optional
+        The largest number of unrequested bytes read to merge two ranges.
+
+    Returns
+    -------
+    A dictionary mapping the key of each request to the offset in the file of
+    the bytes read and to the array of these bytes.
+    """
+    requests = sorted(requests, key=lambda r: r[1])
+    ends = [
+        offset + nbytes + (_HEADER_SIZE if skip_header else 0)
+        for _, offset, skip_header, nbytes in requests
+    ]
+    rv = {}
+    with open(filename, "rb") as f:
+        i = 0
+        while i < len(requests):
+            # Find the run of requests close enough to be read at once
+            j, end = i + 1, ends[i]
+            while j < len(requests) and requests[j][1] <= end + max_gap:
+                end = max(end, ends[j])
+                j += 1
+            start = requests[i][1]
+            buff = np.empty(end - start, dtype="uint8")
+            f.seek(start)
+            nread = f.readinto(buff)
+            for key, offset, skip_header, nbytes in requests[i:j]:
+                pos = offset - start
+                if skip_header:
+                    newlines = np.flatnonzero(buff[pos : pos + _HEADER_SIZE] == 10)
+                    if newlines.size == 0:
+                        # an unusually long header, read this one on its own
+                        f.seek(offset)
+                        f.readline()
+                        pos = f.tell() - start
+                    else:
+                        pos += newlines[0] + 1
+                if pos + nbytes <= nread:
+                    rv[key] = start + pos, buff[pos : pos + nbytes]
+                else:
+                    f.seek(start + pos)
+                    rv[key] = start + pos, np.fromfile(f, "uint8", nbytes)
+            i = j
+    return rv
+
 
 def _remove_raw(all_fields, raw_fields):
     centered_fields = set(all_fields)
@@ -48,45 +112,63 @@ class IOHandlerBoxlib(BaseIOHandler):
         ind = 0
         for chunk in chunks:
             data = self._read_chunk_data(chunk, centered_fields)
+            raw_data = self._read_raw_fields(chunk.objs, raw_fields)
             for g in chunk.objs:
                 for field in fields:
                     if field in centered_fields:
                         ds = data[g.id].pop(field)
                     else:
-                        ds = self._read_raw_field(g, field)
+                        ds = raw_data.pop((g.id, field))
                     nd = g.select(selector, ds, rv[field], ind)
                 ind += nd
                 data.pop(g.id)
         return rv
 
     def _read_raw_field(self, grid, field):
-        field_name = field[1]
+        return self._read_raw_fields([grid], [field])[grid.id, field]
+
+    def _read_raw_fields(self, grids, fields):
+        # The FABs of the raw fields are read file by file, with the reads of
+        # the FABs of each file merged
         base_dir = self.ds.index.raw_file
+        requests = defaultdict(list)
+        shapes = {}
+        for field in fields:
+            field_name = field[1]
+            nghost = self.ds.index.raw_field_nghost[field_name]
+            box_list, fn_list, offset_list = self.ds.index.raw_field_map[field_name]
+            for grid in grids:
+                filename = os.path.join(
+                    base_dir, f"Level_{grid.Level}", fn_list[grid.id]
+                )
+                box = box_list[grid.id]
+                shape = box[1] - box[0] + 2 * nghost + 1
+                shapes[grid.id, field] = shape, nghost
+                nbytes = np.product(shape) * 8
+                requests[filename].append(
+                    ((grid.id, field), offset_list[grid.id], True, nbytes)
+                )
+
+        def read(filename):
+            return _read_fabs(filename, requests[filename])
 
-        nghost = self.ds.index.raw_field_nghost[field_name]
-        box_list = self.ds.index.raw_field_map[field_name][0]
-        fn_list = self.ds.index.raw_field_map[field_name][1]
-        offset_list = self.ds.index.raw_field_map[field_name][2]
-
-        lev = grid.Level
-        filename = os.path.join(base_dir, f"Level_{lev}", fn_list[grid.id])
-        offset = offset_list[grid.id]
-        box = box_list[grid.id]
-
-        lo = box[0] - nghost
-        hi = box[1] + nghost
-        shape = hi - lo + 1
-        with open(filename, "rb") as f:
-            f.seek(offset)
-            f.readline()  # always skip the first line
-            arr = np.fromfile(f, "float64", np.product(shape))
-            arr = arr.reshape(shape, order="F")
-        return arr[
-            tuple(
-                slice(None) if (nghost[dim] == 0) else slice(nghost[dim], -nghost[dim])
-                for dim in range(self.ds.dimensionality)
-            )
-        ]
+        rv = {}
+        for _filename, fabs in self._prefetch(sorted(requests), read):
+            for key, (_, buff) in fabs.items():
+                shape, nghost = shapes[key]
+                arr = buff.view("float64")
+                if not arr.flags.aligned:
+                    arr = arr.copy()
+                arr = arr.reshape(shape, order="F")
+                rv[key] = arr[
+                    tuple(
+                        slice(None)
+                        if (nghost[dim] == 0)
+                        else slice(nghost[dim], -nghost[dim])
+                        for dim in range(self.ds.dimensionality)
+                    )
+                ]
+        return rv
 
     def _read_chunk_data(self, chunk, fields):
         data = {}
@@ -97,28 +179,52 @@ class IOHandlerBoxlib(BaseIOHandler):
             if g.filename is None:
                 continue
             grids_by_file[g.filename].append(g)
+            data[g.id] = {}
+        # All of the requested components of a FAB are read at once, from the
+        # first one to the last one, and the reads of the FABs of each file
+        # are merged
+        components = [
+            (i, field)
+            for i, field in enumerate(self.ds.index.field_order)
+            if field in fields
+        ]
+        if len(components) == 0:
+            return data
+        first, last = components[0][0], components[-1][0]
         dtype = self.ds.index._dtype
         bpr = dtype.itemsize
-        for filename in grids_by_file:
-            grids = grids_by_file[filename]
-            grids.sort(key=lambda a: a._offset)
-            f = open(filename, "rb")
-            for grid in grids:
-                data[grid.id] = {}
-                local_offset = grid._get_offset(f) - f.tell()
+
+        def read(filename):
+            requests = []
+            for grid in grids_by_file[filename]:
+                size = grid.ActiveDimensions.prod() * bpr
+                nbytes = (last - first + 1) * size
+                if grid._offset == -1:
+                    # the length of the header of the FAB is not known yet
+                    requests.append(
+                        (grid.id, grid._base_offset, True, first * size + nbytes)
+                    )
+                else:
+                    requests.append(
+                        (grid.id, grid._offset + first * size, False, nbytes)
+                    )
+            return _read_fabs(filename, requests)
+
+        grids = {g.id: g for g in chunk.objs}
+        for _filename, fabs in self._prefetch(sorted(grids_by_file), read):
+            for grid_id, (offset, buff) in fabs.items():
+                grid = grids[grid_id]
                 count = grid.ActiveDimensions.prod()
-                size = count * bpr
-                for field in self.ds.index.field_order:
-                    if field in fields:
-                        # We read it ...
-                        f.seek(local_offset, os.SEEK_CUR)
-                        v = np.fromfile(f, dtype=dtype, count=count)
-                        v = v.reshape(grid.ActiveDimensions, order="F")
-                        data[grid.id][field] = v
-                        local_offset = 0
-                    else:
-                        local_offset += size
-            f.close()
+                if grid._offset == -1:
+                    grid._offset = offset
+                    buff = buff[first * count * bpr :]
+                values = buff.view(dtype)
+                if not values.flags.aligned:
+                    values = values.copy()
+                values = values.reshape(last - first + 1, count)
+                for i, field in components:
+                    v = values[i - first].reshape(grid.ActiveDimensions, order="F")
+                    data[grid.id][field] = v
         return data
 
     def _read_particle_coords(self, chunks, ptf):
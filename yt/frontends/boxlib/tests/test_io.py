@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from yt.frontends.boxlib.io import IOHandlerBoxlib, _read_fabs
+from yt.testing import assert_equal
+
+
+def _write_fabs(fname, values):
+    offsets = []
+    with open(fname, "wb") as f:
+        for i, data in enumerate(values):
+            offsets.append(f.tell())
+            f.write(f"FAB ((8, (64 11 52 0 1 12 0 1023)),{i})\n".encode())
+            f.write(data.tobytes())
+    return offsets
+
+
+def test_read_fabs(tmp_path):
+    fname = str(tmp_path / "Cell_D_00000")
+    prng = np.random.RandomState(0x4D3D3D3)
+    values = [prng.random_sample(n) for n in (10, 20, 1000)]
+    offsets = _write_fabs(fname, values)
+    requests = [(i, offset, True, values[i].nbytes) for i, offset in enumerate(offsets)]
+    for max_gap in (0, 2**20):
+        read = _read_fabs(fname, requests[::-1], max_gap=max_gap)
+        assert_equal(sorted(read), [0, 1, 2])
+        for i, data in enumerate(values):
+            offset, buff = read[i]
+            assert_equal(buff.view("float64"), data)
+            # the offset of the data, after the header
+            read_again = _read_fabs(fname, [(i, offset + 8, False, 16)])
+            assert_equal(read_again[i][1].view("float64"), data[1:3])
+
+
+def test_read_chunk_data(tmp_path):
+    fname = str(tmp_path / "Cell_D_00000")
+    fields = ["density", "xmom", "ymom", "zmom", "eden"]
+    dims = [np.array([2, 3, 4]), np.array([4, 4, 4]), np.array([1, 2, 1])]
+    prng = np.random.RandomState(0x4D3D3D3)
+    values = [prng.random_sample((len(fields),) + tuple(d[::-1])) for d in dims]
+    offsets = _write_fabs(fname, values)
+    grids = [
+        SimpleNamespace(
+            id=i, filename=fname, ActiveDimensions=d, _base_offset=o, _offset=-1
+        )
+        for i, (d, o) in enumerate(zip(dims, offsets))
+    ]
+    handler = IOHandlerBoxlib.__new__(IOHandlerBoxlib)
+    index = SimpleNamespace(field_order=fields, _dtype=np.dtype("float64"))
+    handler.ds = SimpleNamespace(index=index)
+    # the offsets of the data are found on the first read, and reused
+    for subset in (["xmom", "eden"], fields, ["ymom"]):
+        data = handler._read_chunk_data(SimpleNamespace(objs=grids), subset)
+        for grid, v in zip(grids, values):
+            assert_equal(sorted(data[grid.id]), sorted(subset))
+            for field in subset:
+                assert_equal(data[grid.id][field], v[fields.index(field)].T)
@@ -5,11 +5,14 @@ from typing import Tuple
 
 import numpy as np
 
+from yt.config import ytcfg
 from yt.frontends.sph.io import IOHandlerSPH
-from yt.units.yt_array import uconcatenate  # type: ignore
-from yt.utilities.lib.particle_kdtree_tools import generate_smoothing_length
+from yt.utilities.file_handler import read_hdf5_ranges
 from yt.utilities.logger import ytLogger as mylog
 from yt.utilities.on_demand_imports import _h5py as h5py
+from yt.utilities.parallel_tools.parallel_analysis_interface import (
+    communication_system,
+)
 
 from .definitions import SNAP_FORMAT_2_OFFSET, gadget_hdf5_ptypes
 
@@ -92,68 +95,60 @@ class IOHandlerGadgetHDF5(IOHandlerSPH):
             yield key, pos
         f.close()
 
+    def _hsml_sidecar(self, filename):
+        return self._hsml_filename(filename.replace(".hdf5", ".hsml.hdf5"))
+
     def _generate_smoothing_length(self, index):
         data_files = index.data_files
         if not self.ds.gen_hsmls:
             return
-        hsml_fn = data_files[0].filename.replace(".hdf5", ".hsml.hdf5")
+        hsml_fn = self._hsml_sidecar(data_files[0].filename)
         if os.path.exists(hsml_fn):
             with h5py.File(hsml_fn, mode="r") as f:
                 file_hash = f.attrs["q"]
             if file_hash != self.ds._file_hash:
                 mylog.warning("Replacing hsml files.")
                 for data_file in data_files:
-                    hfn = data_file.filename.replace(".hdf5", ".hsml.hdf5")
-                    os.remove(hfn)
+                    hfn = self._hsml_sidecar(data_file.filename)
+                    if os.path.exists(hfn):
+                        os.remove(hfn)
             else:
                 return
-        positions = []
-        counts = defaultdict(int)
-        for data_file in data_files:
-            for _, ppos in self._yield_coordinates(
-                data_file, needed_ptype=self.ds._sph_ptypes[0]
-            ):
-                counts[data_file.filename] += ppos.shape[0]
-                positions.append(ppos)
-        if not positions:
+        hsml = self._compute_smoothing_length(index)
+        if hsml is None:
             return
-        offsets = {}
-        offset = 0
-        for fn, count in counts.items():
-            offsets[fn] = offset
-            offset += count
-        kdtree = index.kdtree
-        positions = uconcatenate(positions)[kdtree.idx]
-        hsml = generate_smoothing_length(
-            positions.astype("float64"), kdtree, self.ds._num_neighbors
-        )
-        dtype = positions.dtype
-        hsml = hsml[np.argsort(kdtree.idx)].astype(dtype)
-        mylog.warning("Writing smoothing lengths to hsml files.")
-        for i, data_file in enumerate(data_files):
-            si, ei = data_file.start, data_file.end
-            fn = data_file.filename
-            hsml_fn = data_file.filename.replace(".hdf5", ".hsml.hdf5")
-            with h5py.File(hsml_fn, mode="a") as f:
-                if i == 0:
-                    f.attrs["q"] = self.ds._file_hash
-                g = f.require_group(self.ds._sph_ptypes[0])
-                d = g.require_dataset(
-                    "SmoothingLength", dtype=dtype, shape=(counts[fn],)
-                )
-                begin = si + offsets[fn]
-                end = min(ei, d.size) + offsets[fn]
-                d[si:ei] = hsml[begin:end]
-
-    def _get_smoothing_length(self, data_file, position_dtype, position_shape):
+        dtype = next(h.dtype for h in hsml if h.size > 0)
+        counts = defaultdict(int)
+        for data_file, data_file_hsml in zip(data_files, hsml):
+            counts[data_file.filename] += data_file_hsml.size
+        if ytcfg.get("yt", "internals", "topcomm_parallel_rank") == 0:
+            mylog.warning("Writing smoothing lengths to hsml files.")
+            for i, data_file in enumerate(data_files):
+                si = data_file.start
+                fn = data_file.filename
+                hsml_fn = self._hsml_sidecar(fn)
+                os.makedirs(os.path.dirname(hsml_fn), exist_ok=True)
+                with h5py.File(hsml_fn, mode="a") as f:
+                    if i == 0:
+                        f.attrs["q"] = self.ds._file_hash
+                    g = f.require_group(self.ds._sph_ptypes[0])
+                    d = g.require_dataset(
+                        "SmoothingLength", dtype=dtype, shape=(counts[fn],)
+                    )
+                    d[si : si + hsml[i].size] = hsml[i]
+        communication_system.communicators[-1].barrier()
+
+    def _get_smoothing_length(
+        self, data_file, position_dtype, position_shape, ranges=None
+    ):
         ptype = self.ds._sph_ptypes[0]
         si, ei = data_file.start, data_file.end
         if self.ds.gen_hsmls:
-            fn = data_file.filename.replace(".hdf5", ".hsml.hdf5")
+            fn = self._hsml_sidecar(data_file.filename)
         else:
             fn = data_file.filename
         with h5py.File(fn, mode="r") as f:
-            ds = f[ptype]["SmoothingLength"][si:ei, ...]
+            ds = read_hdf5_ranges(f[ptype]["SmoothingLength"], ranges or [(si, ei)])
             dt = ds.dtype.newbyteorder("N")  # Native
             if position_dtype is not None and dt < position_dtype:
                 # Sometimes positions are stored in double precision
@@ -176,14 +171,22 @@ class IOHandlerGadgetHDF5(IOHandlerSPH):
                 continue
             g = f[f"/{ptype}"]
             if selector is None or getattr(selector, "is_all_data", False):
+                ranges = [(si, ei)]
                 mask = slice(None, None, None)
                 mask_sum = data_file.total_particles[ptype]
                 hsmls = None
             else:
-                coords = g["Coordinates"][si:ei].astype("float64")
+                # only the blocks of particles the selector may touch are read
+                ranges = self.ds.index._particle_ranges(data_file, ptype, selector)
+                if not ranges:
+                    continue
+                coords = read_hdf5_ranges(g["Coordinates"], ranges).astype("float64")
                 if ptype == "PartType0":
                     hsmls = self._get_smoothing_length(
-                        data_file, g["Coordinates"].dtype, g["Coordinates"].shape
+                        data_file,
+                        g["Coordinates"].dtype,
+                        g["Coordinates"].shape,
+                        ranges=ranges,
                     ).astype("float64")
                 else:
                     hsmls = 0.0
@@ -203,19 +206,19 @@ class IOHandlerGadgetHDF5(IOHandlerSPH):
                     data[:] = self.ds["Massarr"][ind]
                 elif field in self._element_names:
                     rfield = "ElementAbundance/" + field
-                    data = g[rfield][si:ei][mask, ...]
+                    data = read_hdf5_ranges(g[rfield], ranges)[mask, ...]
                 elif field.startswith("Metallicity_"):
                     col = int(field.rsplit("_", 1)[-1])
-                    data = g["Metallicity"][si:ei, col][mask]
+                    data = read_hdf5_ranges(g["Metallicity"], ranges, col)[mask]
                 elif field.startswith("GFM_Metals_"):
                     col = int(field.rsplit("_", 1)[-1])
-                    data = g["GFM_Metals"][si:ei, col][mask]
+                    data = read_hdf5_ranges(g["GFM_Metals"], ranges, col)[mask]
                 elif field.startswith("Chemistry_"):
                     col = int(field.rsplit("_", 1)[-1])
-                    data = g["ChemistryAbundances"][si:ei, col][mask]
+                    data = read_hdf5_ranges(g["ChemistryAbundances"], ranges, col)[mask]
                 elif field.startswith("PassiveScalars_"):
                     col = int(field.rsplit("_", 1)[-1])
-                    data = g["PassiveScalars"][si:ei, col][mask]
+                    data = read_hdf5_ranges(g["PassiveScalars"], ranges, col)[mask]
                 elif field == "smoothing_length":
                     # This is for frontends which do not store
                     # the smoothing length on-disk, so we do not
@@ -226,10 +229,11 @@ class IOHandlerGadgetHDF5(IOHandlerSPH):
                             data_file,
                             g["Coordinates"].dtype,
                             g["Coordinates"].shape,
+                            ranges=ranges,
                         ).astype("float64")
                     data = hsmls[mask]
                 else:
-                    data = g[field][si:ei][mask, ...]
+                    data = read_hdf5_ranges(g[field], ranges)[mask, ...]
 
                 data_return[(ptype, field)] = data
 
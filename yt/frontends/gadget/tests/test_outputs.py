@@ -4,11 +4,20 @@ import tempfile
 from collections import OrderedDict
 from itertools import product
 
+import numpy as np
+
 import yt
+from yt.config import ytcfg
 from yt.frontends.gadget.api import GadgetDataset, GadgetHDF5Dataset
 from yt.frontends.gadget.testing import fake_gadget_binary
-from yt.testing import ParticleSelectionComparison, requires_file
+from yt.testing import (
+    ParticleSelectionComparison,
+    assert_equal,
+    requires_file,
+    requires_module,
+)
 from yt.utilities.answer_testing.framework import data_dir_load, requires_ds, sph_answer
+from yt.utilities.on_demand_imports import _h5py as h5py
 
 isothermal_h5 = "IsothermalCollapse/snap_505.hdf5"
 isothermal_bin = "IsothermalCollapse/snap_505"
@@ -55,6 +64,123 @@ def test_gadget_binary():
     shutil.rmtree(tmpdir)
 
 
+def fake_gadget_hdf5(prefix, positions):
+    """Write a Gadget HDF5 snapshot, one file per dict of positions by ptype."""
+    prng = np.random.RandomState(0x4D3D3D3)
+    npart = np.zeros((len(positions), 6), "int32")
+    for i, pos in enumerate(positions):
+        for ptype, p in pos.items():
+            npart[i, int(ptype[-1])] = len(p)
+    for i, pos in enumerate(positions):
+        with h5py.File(f"{prefix}.{i}.hdf5", mode="w") as f:
+            header = f.create_group("Header")
+            header.attrs.update(
+                {
+                    "NumFilesPerSnapshot": len(positions),
+                    "NumPart_ThisFile": npart[i],
+                    "NumPart_Total": npart.sum(axis=0),
+                    "NumPart_Total_HighWord": np.zeros(6, "int32"),
+                    "MassTable": np.zeros(6),
+                    "Time": 1.0,
+                    "Redshift": 0.0,
+                    "BoxSize": 1.0,
+                    "Omega0": 0.3,
+                    "OmegaLambda": 0.7,
+                    "HubbleParam": 0.7,
+                }
+            )
+            for ptype, p in pos.items():
+                g = f.create_group(ptype)
+                g["Coordinates"] = p
+                g["Masses"] = prng.random_sample(len(p))
+                if ptype == "PartType0":
+                    g["SmoothingLength"] = np.full(len(p), 1e-3)
+                    g["Density"] = prng.random_sample(len(p))
+    return f"{prefix}.0.hdf5"
+
+
+@requires_module("h5py")
+def test_particle_index_per_type(tmp_path):
+    prng = np.random.RandomState(0x4D3D3D3)
+
+    def box(left_edge, right_edge):
+        return left_edge + (right_edge - left_edge) * prng.random_sample((1000, 3))
+
+    # the gas and the stars of each file are in different regions
+    fn = fake_gadget_hdf5(
+        str(tmp_path / "snap"),
+        [
+            {"PartType0": box(0.1, 0.2), "PartType4": box(0.6, 0.9)},
+            {"PartType0": box(0.6, 0.8), "PartType4": box(0.0, 0.05)},
+        ],
+    )
+    fields = [
+        ("PartType0", "Masses"),
+        ("PartType4", "Masses"),
+        ("all", "Masses"),
+        ("gas", "density"),
+    ]
+    values = {}
+    for per_type in (False, True):
+        ytcfg["yt", "particle_index_per_type"] = per_type
+        try:
+            ds = yt.load(fn, index_order=(4, 2))
+            reg = ds.region([0.15] * 3, [0.08] * 3, [0.22] * 3)
+            values[per_type] = [np.sort(reg[field]) for field in fields]
+        finally:
+            ytcfg["yt", "particle_index_per_type"] = False
+    for v1, v2 in zip(values[False], values[True]):
+        assert_equal(v1, v2)
+    assert_equal(values[True][0].size, 1000)
+
+    # only the index of the gas is refined to its smoothing lengths
+    regions = ds.index._ptype_regions
+    assert_equal(ds.index_order, (4, 2))
+    assert_equal(regions["PartType0"].index_order2, 4)
+    assert_equal(regions["PartType4"].index_order2, 2)
+    # and reading the gas or the stars only touches the files holding them
+    assert_equal(ds.index._identify_ptype_files(reg.selector, ("PartType0",)), {0})
+    assert_equal(ds.index._identify_ptype_files(reg.selector, ("PartType4",)), set())
+
+
+@requires_module("h5py")
+def test_particle_blocks(tmp_path):
+    prng = np.random.RandomState(0x4D3D3D3)
+    positions = []
+    for i in range(2):
+        # particles sorted along x within each file
+        pos = {
+            ptype: prng.random_sample((1000, 3)) for ptype in ("PartType0", "PartType1")
+        }
+        for p in pos.values():
+            p[:] = p[np.argsort(p[:, 0])]
+        positions.append(pos)
+    fn = fake_gadget_hdf5(str(tmp_path / "snap"), positions)
+    fields = [("PartType0", "Masses"), ("PartType1", "Masses"), ("gas", "density")]
+    values = {}
+    for block_size in (0, 100):
+        ytcfg["yt", "particle_block_size"] = block_size
+        try:
+            ds = yt.load(fn, index_order=(4, 2))
+            sp = ds.sphere([0.3, 0.5, 0.5], 0.1)
+            values[block_size] = [np.sort(sp[field]) for field in fields]
+            # the bounds of the blocks are stored next to the bitmap index
+            ds = yt.load(fn, index_order=(4, 2))
+            if block_size > 0:
+                assert_equal(len(ds.index._particle_blocks), 4)
+            sp = ds.sphere([0.3, 0.5, 0.5], 0.1)
+            ranges = ds.index._particle_ranges(
+                ds.index.data_files[0], "PartType1", sp.selector
+            )
+        finally:
+            ytcfg["yt", "particle_block_size"] = 0
+    for v1, v2 in zip(values[0], values[100]):
+        assert_equal(v1, v2)
+    assert values[0][1].size > 0
+    # only the blocks around x = 0.3 are read
+    assert 0 < sum(end - start for start, end in ranges) <= 300
+
+
 @requires_file(isothermal_h5)
 def test_gadget_hdf5():
     assert isinstance(
@@ -12,10 +12,15 @@ from yt.data_objects.selection_objects.data_selection_objects import (
 from yt.data_objects.static_output import ParticleDataset
 from yt.frontends.gadget.data_structures import _fix_unit_ordering
 from yt.frontends.gadget_fof.fields import GadgetFOFFieldInfo, GadgetFOFHaloFieldInfo
-from yt.frontends.halo_catalog.data_structures import HaloCatalogFile, HaloDataset
+from yt.frontends.halo_catalog.data_structures import (
+    HaloCatalogFile,
+    HaloDataset,
+    HaloIndexMixin,
+)
 from yt.funcs import only_on_root, setdefaultattr
 from yt.geometry.particle_geometry_handler import ParticleIndex
 from yt.utilities.cosmology import Cosmology
+from yt.utilities.file_handler import read_hdf5_rows
 from yt.utilities.logger import ytLogger as mylog
 from yt.utilities.on_demand_imports import _h5py as h5py
 
@@ -313,7 +318,7 @@ class GadgetFOFDataset(ParticleDataset):
         return valid
 
 
-class GadgetFOFHaloParticleIndex(GadgetFOFParticleIndex):
+class GadgetFOFHaloParticleIndex(HaloIndexMixin, GadgetFOFParticleIndex):
     def __init__(self, ds, dataset_type):
         self.real_ds = weakref.proxy(ds.real_ds)
         super().__init__(ds, dataset_type)
@@ -336,6 +341,8 @@ class GadgetFOFHaloParticleIndex(GadgetFOFParticleIndex):
         self._group_length_sum = np.array(
             [data_file.group_length_sum for data_file in self.data_files]
         )
+        # file index -> cumulative sum of the lengths of its groups
+        self._group_length_offsets = {}
 
     def _detect_output_fields(self):
         field_list = []
@@ -377,50 +384,21 @@ class GadgetFOFHaloParticleIndex(GadgetFOFParticleIndex):
         fields_to_return = self.io._read_particle_selection(dobj, fields_to_read)
         return fields_to_return, fields_to_generate
 
-    def _get_halo_file_indices(self, ptype, identifiers):
-        return np.digitize(identifiers, self._halo_index_start[ptype], right=False) - 1
-
-    def _get_halo_scalar_index(self, ptype, identifier):
-        i_scalar = self._get_halo_file_indices(ptype, [identifier])[0]
-        scalar_index = identifier - self._halo_index_start[ptype][i_scalar]
-        return scalar_index
+    def _read_halo_particle_field(self, fh, ptype, field, indices):
+        return read_hdf5_rows(fh[ptype][field], indices)
 
-    def _get_halo_values(self, ptype, identifiers, fields, f=None):
+    def _get_group_length_offset(self, i_file, group_index):
         """
-        Get field values for halos.  IDs are likely to be
-        sequential (or at least monotonic), but not necessarily
-        all within the same file.
-
-        This does not do much to minimize file i/o, but with
-        halos randomly distributed across files, there's not
-        much more we can do.
+        The number of member particles of the groups of a file that come
+        before a given group.
         """
-
-        # if a file is already open, don't open it again
-        filename = None if f is None else f.filename
-
-        data = defaultdict(lambda: np.empty(identifiers.size))
-        i_scalars = self._get_halo_file_indices(ptype, identifiers)
-        for i_scalar in np.unique(i_scalars):
-            target = i_scalars == i_scalar
-            scalar_indices = identifiers - self._halo_index_start[ptype][i_scalar]
-
-            # only open file if it's not already open
-            my_f = (
-                f
-                if self.data_files[i_scalar].filename == filename
-                else h5py.File(self.data_files[i_scalar].filename, mode="r")
-            )
-
-            for field in fields:
-                data[field][target] = my_f[os.path.join(ptype, field)][()][
-                    scalar_indices[target]
-                ]
-
-            if self.data_files[i_scalar].filename != filename:
-                my_f.close()
-
-        return data
+        offsets = self._group_length_offsets.get(i_file)
+        if offsets is None:
+            f = self._halo_files.get(self.data_files[i_file].filename)
+            offsets = np.zeros(f["Group"]["GroupLen"].size + 1, dtype=np.int64)
+            np.cumsum(f["Group"]["GroupLen"][()], out=offsets[1:])
+            self._group_length_offsets[i_file] = offsets
+        return offsets[group_index]
 
     def _setup_data_io(self):
         super()._setup_data_io()
@@ -622,8 +600,7 @@ class GadgetFOFHaloContainer(YTSelectionContainer):
         all_id_start = self.index._group_length_sum[:g_scalar].sum(dtype=np.int64)
 
         # Now add the halos in this file that come before.
-        with h5py.File(self.index.data_files[g_scalar].filename, mode="r") as f:
-            all_id_start += f["Group"]["GroupLen"][:group_index].sum(dtype=np.int64)
+        all_id_start += self.index._get_group_length_offset(g_scalar, group_index)
 
         # Add the subhalo offset.
         all_id_start += id_offset
@@ -206,26 +206,21 @@ class IOHandlerGadgetFOFHaloHDF5(IOHandlerGadgetFOFHDF5):
         all_data = {}
         if not scalar_fields:
             return all_data
-        pcount = 1
-        with h5py.File(dobj.scalar_data_file.filename, mode="r") as f:
-            for ptype, field_list in sorted(scalar_fields.items()):
-                for field in field_list:
-                    if field == "particle_identifier":
-                        field_data = (
-                            np.arange(dobj.scalar_data_file.total_particles[ptype])
-                            + dobj.scalar_data_file.index_start[ptype]
-                        )
-                    elif field in f[ptype]:
-                        field_data = f[ptype][field][()].astype("float64")
-                    else:
-                        fname = field[: field.rfind("_")]
-                        field_data = f[ptype][fname][()].astype("float64")
-                        my_div = field_data.size / pcount
-                        if my_div > 1:
-                            findex = int(field[field.rfind("_") + 1 :])
-                            field_data = field_data[:, findex]
-                    data = np.array([field_data[dobj.scalar_index]])
-                    all_data[(ptype, field)] = data
+        # only the row of this halo is read
+        f = self.ds.index._halo_files.get(dobj.scalar_data_file.filename)
+        for ptype, field_list in sorted(scalar_fields.items()):
+            for field in field_list:
+                if field == "particle_identifier":
+                    value = dobj.scalar_index + dobj.scalar_data_file.index_start[ptype]
+                elif field in f[ptype]:
+                    value = f[ptype][field][dobj.scalar_index]
+                else:
+                    fname = field[: field.rfind("_")]
+                    value = f[ptype][fname][dobj.scalar_index]
+                    if value.size > 1:
+                        findex = int(field[field.rfind("_") + 1 :])
+                        value = value[findex]
+                all_data[(ptype, field)] = np.array([value], dtype="float64")
         return all_data
 
     def _read_member_fields(self, dobj, member_fields):
@@ -240,24 +235,24 @@ class IOHandlerGadgetFOFHaloHDF5(IOHandlerGadgetFOFHDF5):
             if pcount == 0:
                 continue
             field_end = field_start + end_index - start_index
-            with h5py.File(data_file.filename, mode="r") as f:
-                for ptype, field_list in sorted(member_fields.items()):
-                    for field in field_list:
-                        field_data = all_data[(ptype, field)]
-                        if field in f["IDs"]:
-                            my_data = f["IDs"][field][start_index:end_index].astype(
-                                "float64"
-                            )
-                        else:
-                            fname = field[: field.rfind("_")]
-                            my_data = f["IDs"][fname][start_index:end_index].astype(
-                                "float64"
-                            )
-                            my_div = my_data.size / pcount
-                            if my_div > 1:
-                                findex = int(field[field.rfind("_") + 1 :])
-                                my_data = my_data[:, findex]
-                        field_data[field_start:field_end] = my_data
+            f = self.ds.index._halo_files.get(data_file.filename)
+            for ptype, field_list in sorted(member_fields.items()):
+                for field in field_list:
+                    field_data = all_data[(ptype, field)]
+                    if field in f["IDs"]:
+                        my_data = f["IDs"][field][start_index:end_index].astype(
+                            "float64"
+                        )
+                    else:
+                        fname = field[: field.rfind("_")]
+                        my_data = f["IDs"][fname][start_index:end_index].astype(
+                            "float64"
+                        )
+                        my_div = my_data.size / pcount
+                        if my_div > 1:
+                            findex = int(field[field.rfind("_") + 1 :])
+                            my_data = my_data[:, findex]
+                    field_data[field_start:field_end] = my_data
             field_start = field_end
         return all_data
 
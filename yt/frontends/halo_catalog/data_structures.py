@@ -17,6 +17,7 @@ from yt.data_objects.static_output import (
 from yt.frontends.ytdata.data_structures import SavedDataset
 from yt.funcs import parse_h5_attr
 from yt.geometry.particle_geometry_handler import ParticleIndex
+from yt.utilities.file_handler import HDF5FilePool, read_hdf5_rows
 from yt.utilities.on_demand_imports import _h5py as h5py
 
 from .fields import YTHaloCatalogFieldInfo, YTHaloCatalogHaloFieldInfo
@@ -181,7 +182,71 @@ class YTHaloCatalogDataset(SavedDataset):
         return False
 
 
-class YTHaloParticleIndex(ParticleIndex):
+class HaloIndexMixin:
+    """
+    Lookups of the values of halos from the files of a halo catalog, shared by
+    the indexes of the halo datasets.
+
+    The files are kept open in a pool, and only the rows of the requested
+    halos are read from them.
+    """
+
+    _max_open_files = 32
+    _halo_file_pool = None
+
+    @property
+    def _halo_files(self):
+        if self._halo_file_pool is None:
+            self._halo_file_pool = HDF5FilePool(self._max_open_files)
+        return self._halo_file_pool
+
+    def _get_halo_file_indices(self, ptype, identifiers):
+        """
+        Get the index of the data file list where this halo lives.
+
+        Digitize returns i such that bins[i-1] <= x < bins[i], so we subtract
+        one because we will open data file i.
+        """
+        return np.digitize(identifiers, self._halo_index_start[ptype], right=False) - 1
+
+    def _get_halo_scalar_index(self, ptype, identifier):
+        i_scalar = self._get_halo_file_indices(ptype, [identifier])[0]
+        scalar_index = identifier - self._halo_index_start[ptype][i_scalar]
+        return scalar_index
+
+    def _get_halo_values(self, ptype, identifiers, fields, f=None):
+        """
+        Get field values for halos.
+
+        The identifiers, in any order, are grouped by the file holding their
+        values, from which only the rows of these halos are read.  An already
+        open file may be supplied as ``f``.
+        """
+        identifiers = np.asarray(identifiers, dtype="int64")
+        data = {field: np.empty(identifiers.size) for field in fields}
+        i_scalars = self._get_halo_file_indices(ptype, identifiers)
+        order = np.argsort(i_scalars, kind="stable")
+        files, starts = np.unique(i_scalars[order], return_index=True)
+        for i_scalar, target in zip(files, np.split(order, starts[1:])):
+            filename = self.data_files[i_scalar].filename
+            if f is not None and f.filename == filename:
+                fh = f
+            else:
+                fh = self._halo_files.get(filename)
+            scalar_indices = (
+                identifiers[target] - self._halo_index_start[ptype][i_scalar]
+            )
+            for field in fields:
+                data[field][target] = self._read_halo_particle_field(
+                    fh, ptype, field, scalar_indices
+                )
+        return data
+
+    def _read_halo_particle_field(self, fh, ptype, field, indices):
+        return read_hdf5_rows(fh[field], indices)
+
+
+class YTHaloParticleIndex(HaloIndexMixin, ParticleIndex):
     """
     Particle index for getting halo particles from YTHaloCatalogDatasets.
     """
@@ -241,58 +306,9 @@ class YTHaloParticleIndex(ParticleIndex):
         ds.field_units.update(units)
         ds.particle_types_raw = ds.particle_types
 
-    def _get_halo_file_indices(self, ptype, identifiers):
-        """
-        Get the index of the data file list where this halo lives.
-
-        Digitize returns i such that bins[i-1] <= x < bins[i], so we subtract
-        one because we will open data file i.
-        """
-        return np.digitize(identifiers, self._halo_index_start[ptype], right=False) - 1
-
-    def _get_halo_scalar_index(self, ptype, identifier):
-        i_scalar = self._get_halo_file_indices(ptype, [identifier])[0]
-        scalar_index = identifier - self._halo_index_start[ptype][i_scalar]
-        return scalar_index
-
-    def _get_halo_values(self, ptype, identifiers, fields, f=None):
-        """
-        Get field values for halo data containers.
-        """
-
-        # if a file is already open, don't open it again
-        filename = None if f is None else f.filename
-
-        data = defaultdict(lambda: np.empty(identifiers.size))
-        i_scalars = self._get_halo_file_indices(ptype, identifiers)
-        for i_scalar in np.unique(i_scalars):
-            # mask array to get field data for this halo
-            target = i_scalars == i_scalar
-            scalar_indices = identifiers - self._halo_index_start[ptype][i_scalar]
-
-            # only open file if it's not already open
-            my_f = (
-                f
-                if self.data_files[i_scalar].filename == filename
-                else h5py.File(self.data_files[i_scalar].filename, mode="r")
-            )
-
-            for field in fields:
-                data[field][target] = self._read_halo_particle_field(
-                    my_f, ptype, field, scalar_indices[target]
-                )
-
-            if self.data_files[i_scalar].filename != filename:
-                my_f.close()
-
-        return data
-
     def _identify_base_chunk(self, dobj):
         pass
 
-    def _read_halo_particle_field(self, fh, ptype, field, indices):
-        return fh[field][indices]
-
     def _read_particle_fields(self, fields, dobj, chunk=None):
         if not fields:
             return {}, []
@@ -149,14 +149,14 @@ class IOHandlerYTHalo(HaloDatasetIOHandler, IOHandlerYTHaloCatalog):  # type: ig
             if pcount == 0:
                 continue
             field_end = field_start + end_index - start_index
-            with h5py.File(data_file.filename, mode="r") as f:
-                for ptype, field_list in sorted(member_fields.items()):
-                    for field in field_list:
-                        field_data = all_data[(ptype, field)]
-                        my_data = f["particles"][field][start_index:end_index].astype(
-                            "float64"
-                        )
-                        field_data[field_start:field_end] = my_data
+            f = self.ds.index._halo_files.get(data_file.filename)
+            for ptype, field_list in sorted(member_fields.items()):
+                for field in field_list:
+                    field_data = all_data[(ptype, field)]
+                    my_data = f["particles"][field][start_index:end_index].astype(
+                        "float64"
+                    )
+                    field_data[field_start:field_end] = my_data
             field_start = field_end
         return all_data
 
@@ -164,9 +164,9 @@ class IOHandlerYTHalo(HaloDatasetIOHandler, IOHandlerYTHaloCatalog):  # type: ig
         all_data = {}
         if not scalar_fields:
             return all_data
-        with h5py.File(dobj.scalar_data_file.filename, mode="r") as f:
-            for ptype, field_list in sorted(scalar_fields.items()):
-                for field in field_list:
-                    data = np.array([f[field][dobj.scalar_index]]).astype("float64")
-                    all_data[(ptype, field)] = data
+        f = self.ds.index._halo_files.get(dobj.scalar_data_file.filename)
+        for ptype, field_list in sorted(scalar_fields.items()):
+            for field in field_list:
+                data = np.array([f[field][dobj.scalar_index]]).astype("float64")
+                all_data[(ptype, field)] = data
         return all_data
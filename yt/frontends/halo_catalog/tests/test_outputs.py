@@ -12,6 +12,7 @@ from yt.testing import (
 )
 from yt.units.yt_array import YTArray, YTQuantity
 from yt.utilities.answer_testing.framework import data_dir_load
+from yt.utilities.on_demand_imports import _h5py as h5py
 
 
 def fake_halo_catalog(data):
@@ -88,6 +89,44 @@ class HaloCatalogTest(TempDirTest):
             f2.sort()
             assert_array_equal(f1, f2)
 
+    @requires_module("h5py")
+    def test_halo_members(self):
+        rs = np.random.RandomState(3670474)
+        n_halos = 100
+        fields = ["particle_mass"] + [f"particle_position_{ax}" for ax in "xyz"]
+        units = ["g"] + ["cm"] * 3
+        data = {
+            field: YTArray(rs.random_sample(n_halos), unit)
+            for field, unit in zip(fields, units)
+        }
+        number = rs.randint(1, 10, size=n_halos)
+        start = np.cumsum(number) - number
+        data["particle_number"] = YTArray(number, "")
+        data["particle_index_start"] = YTArray(start, "")
+
+        fn = fake_halo_catalog(data)
+        member_ids = np.arange(number.sum()) + 1000
+        with h5py.File(fn, mode="r+") as f:
+            f.create_group("particles").create_dataset("ids", data=member_ids)
+        ds = yt_load(fn)
+
+        # halos queried in any order, possibly repeatedly
+        ids = np.array([99, 3, 50, 3, 0])
+        values = ds._halos_ds.index._get_halo_values(
+            "halos", ids, ["particle_mass", "particle_number"]
+        )
+        assert_equal(values["particle_mass"], data["particle_mass"].d[ids])
+        assert_equal(values["particle_number"], number[ids])
+
+        for hid in ids:
+            halo = ds.halo("halos", hid)
+            assert_equal(halo.mass, data["particle_mass"][hid])
+            assert_equal(halo["halos", "particle_mass"], data["particle_mass"][[hid]])
+            assert_equal(
+                halo["halos", "ids"].d,
+                member_ids[start[hid] : start[hid] + number[hid]],
+            )
+
 
 t46 = "tiny_fof_halos/DD0046/DD0046.0.h5"
 
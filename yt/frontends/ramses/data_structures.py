@@ -32,7 +32,7 @@ from .definitions import (
 from .field_handlers import get_field_handlers
 from .fields import _X, RAMSESFieldInfo
 from .hilbert import get_cpu_list
-from .io_utils import fill_hydro, read_amr
+from .io_utils import read_amr
 from .particle_handlers import get_particle_handlers
 
 
@@ -368,91 +368,80 @@ class RAMSESDomainSubset(OctreeSubset):
                 "of ghost zones, was called with num_ghost_zones=%s" % num_ghost_zones
             )
 
-    def _fill_no_ghostzones(self, fd, fields, selector, file_handler):
-        ndim = self.ds.dimensionality
-        # Here we get a copy of the file, which we skip through and read the
-        # bits we want.
-        oct_handler = self.oct_handler
-        all_fields = [f for ft, f in file_handler.field_list]
-        fields = [f for ft, f in fields]
-        data = {}
-        cell_count = selector.count_oct_cells(self.oct_handler, self.domain_id)
-
-        levels, cell_inds, file_inds = self.oct_handler.file_index_octs(
-            selector, self.domain_id, cell_count
-        )
-
-        # Initializing data container
-        for field in fields:
-            data[field] = np.zeros(cell_count, "float64")
-
-        cpu_list = [self.domain_id - 1]
-        fill_hydro(
-            fd,
-            file_handler.offset,
-            file_handler.level_count,
-            cpu_list,
-            levels,
-            cell_inds,
-            file_inds,
-            ndim,
-            all_fields,
-            fields,
-            data,
-            oct_handler,
-        )
-        return data
-
-    def _fill_with_ghostzones(
-        self, fd, fields, selector, file_handler, num_ghost_zones
-    ):
-        ndim = self.ds.dimensionality
-        ncpu = self.ds.parameters["ncpu"]
-        # Here we get a copy of the file, which we skip through and read the
-        # bits we want.
+    def _file_indices(self, selector):
+        """
+        Return the level, index within its oct, index in the file and (with
+        ghost zones, if there are several domains) domain of the selected cells.
+        """
         oct_handler = self.oct_handler
-        all_fields = [f for ft, f in file_handler.field_list]
-        fields = [f for ft, f in fields]
-        tr = {}
-
-        cell_count = (
-            selector.count_octs(self.oct_handler, self.domain_id) * self.nz**ndim
-        )
+        if self._num_ghost_zones == 0:
+            cell_count = self._count_oct_cells(selector)
+            levels, cell_inds, file_inds = oct_handler.file_index_octs(
+                selector, self.domain_id, cell_count
+            )
+            return levels, cell_inds, file_inds, None
 
         gz_cache = getattr(self, "_ghost_zone_cache", None)
         if gz_cache:
             levels, cell_inds, file_inds, domains = gz_cache
         else:
+            cell_count = (
+                selector.count_octs(oct_handler, self.domain_id)
+                * self.nz**self.ds.dimensionality
+            )
             gz_cache = (
                 levels,
                 cell_inds,
                 file_inds,
                 domains,
-            ) = self.oct_handler.file_index_octs_with_ghost_zones(
+            ) = oct_handler.file_index_octs_with_ghost_zones(
                 selector, self.domain_id, cell_count, self._num_ghost_zones
             )
             self._ghost_zone_cache = gz_cache
+        if self.ds.parameters["ncpu"] == 1:
+            domains = None
+        return levels, cell_inds, file_inds, domains
 
-        # Initializing data container
-        for field in fields:
-            tr[field] = np.zeros(cell_count, "float64")
-        cpu_list = list(range(ncpu))
-        fill_hydro(
-            fd,
-            file_handler.offset,
-            file_handler.level_count,
-            cpu_list,
-            levels,
-            cell_inds,
-            file_inds,
-            ndim,
-            all_fields,
-            fields,
-            tr,
-            oct_handler,
-            domains=domains,
-        )
-        return tr
+    def _file_blocks(self, file_indices):
+        """
+        Return the (cpu, level) blocks of the files holding the given cells.
+        """
+        levels, cell_inds, file_inds, domains = file_indices
+        if domains is None:
+            return [(self.domain_id - 1, int(ilevel)) for ilevel in np.unique(levels)]
+        keys = np.unique((domains.astype("int64") - 1) * 256 + levels)
+        ncpu = self.ds.parameters["ncpu"]
+        return [
+            (int(icpu), int(ilevel))
+            for icpu, ilevel in zip(keys // 256, keys % 256)
+            if 0 <= icpu < ncpu
+        ]
+
+    def _fill_blocks(self, fields, file_indices, blocks):
+        """
+        Fill the given cells with the values of the fields read from the
+        blocks of a file (see `FieldFileHandler.read_blocks`).
+        """
+        levels, cell_inds, file_inds, domains = file_indices
+        oct_handler = self.oct_handler
+        data = {field: np.zeros(levels.size, "float64") for field in fields}
+        for (icpu, ilevel), block in blocks.items():
+            if domains is None:
+                oct_handler.fill_level(
+                    ilevel, levels, cell_inds, file_inds, data, block
+                )
+            else:
+                oct_handler.fill_level_with_domain(
+                    ilevel,
+                    levels,
+                    cell_inds,
+                    file_inds,
+                    domains,
+                    data,
+                    block,
+                    domain=icpu + 1,
+                )
+        return data
 
     @property
     def fwidth(self):
@@ -492,12 +481,10 @@ class RAMSESDomainSubset(OctreeSubset):
         return fcoords
 
     def fill(self, fd, fields, selector, file_handler):
-        if self._num_ghost_zones == 0:
-            return self._fill_no_ghostzones(fd, fields, selector, file_handler)
-        else:
-            return self._fill_with_ghostzones(
-                fd, fields, selector, file_handler, self._num_ghost_zones
-            )
+        fields = [f for ft, f in fields]
+        file_indices = self._file_indices(selector)
+        blocks = file_handler.read_blocks(fd, fields, self._file_blocks(file_indices))
+        return self._fill_blocks(fields, file_indices, blocks)
 
     def retrieve_ghost_zones(self, ngz, fields, smoothed=False):
         if smoothed:
@@ -3,6 +3,8 @@ import glob
 import os
 from typing import List, Optional, Set, Tuple, Type
 
+import numpy as np
+
 from yt.config import ytcfg
 from yt.funcs import mylog
 from yt.utilities.cython_fortran_utils import FortranFile
@@ -279,6 +281,81 @@ class FieldFileHandler(abc.ABC, HandlerMixin):
         self._level_count = level_count
         return self._offset
 
+    def read_blocks(self, fd, fields, blocks):
+        """
+        Read the values of some fields in some (cpu, level) blocks of the file.
+
+        The record offsets of the file are indexed once (see `offset`), and the
+        records of the fields are then read with a single read for each run of
+        adjacent records, rather than record by record.
+
+        Parameters
+        ----------
+        fd : file object
+            The file, opened in binary mode.
+        fields : list of str
+            The names of the fields to read.
+        blocks : iterable of (int, int)
+            The (cpu, level) blocks to read, with levels counted from the
+            minimum level of the dataset. Missing blocks are skipped.
+
+        Returns
+        -------
+        A dictionary mapping each block read to a dictionary mapping each field
+        to the array, of shape (number of octs, number of cells per oct), of
+        its values.
+        """
+        twotondim = 2**self.ds.dimensionality
+        all_fields = [f for ft, f in self.field_list]
+        nvar = len(all_fields)
+        ivars = np.array(sorted(all_fields.index(f) for f in fields), dtype="int64")
+        nsel = len(ivars)
+        if nsel == 0:
+            return {}
+        offsets = self.offset
+        level_count = self.level_count
+
+        # The records are ordered by cell, then by variable
+        irec = (np.arange(twotondim)[:, None] * nvar + ivars).ravel()
+        breaks = np.flatnonzero(np.diff(irec) != 1) + 1
+        run_starts = irec[np.r_[0, breaks]]
+        run_stops = irec[np.r_[breaks - 1, irec.size - 1]] + 1
+
+        tr = {}
+        for icpu, ilevel in blocks:
+            if icpu >= offsets.shape[0] or ilevel >= offsets.shape[1]:
+                continue
+            nc = level_count[icpu, ilevel]
+            offset = offsets[icpu, ilevel]
+            if nc == 0 or offset == -1:
+                continue
+            # Each record is the data framed by two 4-byte markers.  The buffer
+            # starts with 4 bytes of padding so that the data are aligned.
+            rec = 8 * nc + 8
+            buff = np.empty(4 + twotondim * nsel * rec, dtype="uint8")
+            pos = 4
+            for start, stop in zip(run_starts, run_stops):
+                fd.seek(offset + start * rec)
+                size = (stop - start) * rec
+                if fd.readinto(buff[pos : pos + size]) != size:
+                    raise OSError(f"Unexpected end of file {self.fname}")
+                pos += size
+            markers = np.ndarray(
+                (twotondim * nsel, 2), "i4", buff, 4, (rec, 4 + 8 * nc)
+            )
+            if np.any(markers != 8 * nc):
+                raise OSError(
+                    f"Record sizes in {self.fname} do not match the expected "
+                    f"size ({8 * nc}) at level {ilevel} of cpu {icpu + 1}"
+                )
+            data = np.ndarray(
+                (twotondim, nsel, nc), "f8", buff, 8, (nsel * rec, rec, 8)
+            )
+            tr[icpu, ilevel] = {
+                all_fields[ivar]: data[:, i, :].T for i, ivar in enumerate(ivars)
+            }
+        return tr
+
     @classmethod
     def load_fields_from_yt_config(cls) -> List[str]:
         if cls.config_field and ytcfg.has_section(cls.config_field):
@@ -1,12 +1,12 @@
 import os
 from collections import defaultdict
+from functools import partial
 from typing import Union
 
 import numpy as np
 
 from yt._maintenance.deprecation import issue_deprecation_warning
 from yt.frontends.ramses.definitions import VAR_DESC_RE, VERSION_RE
-from yt.utilities.cython_fortran_utils import FortranFile
 from yt.utilities.exceptions import (
     YTFieldTypeNotFound,
     YTFileNotParseable,
@@ -72,6 +72,70 @@ def convert_ramses_conformal_time_to_physical_age(
     return (tsim - t) * t_scale
 
 
+def _read_records(fd, records, count):
+    """
+    Read Fortran records of ``count`` values each.
+
+    Parameters
+    ----------
+    fd : file object
+        The file, opened in binary mode.
+    records : dict
+        Maps the offset in the file of each record to the type of its values.
+    count : integer
+        The number of values in each record.
+
+    Returns
+    -------
+    A dictionary mapping the offset of each record to the array of its values.
+
+    Notes
+    -----
+    Adjacent records are read at once.  Records whose size turns out to differ
+    from the expected one are then read one by one.
+    """
+    offsets = sorted(records)
+    sizes = [count * np.dtype(records[offset]).itemsize for offset in offsets]
+    tr = {}
+    i = 0
+    while i < len(offsets):
+        # Find the run of adjacent records starting at this one
+        j = i + 1
+        while j < len(offsets) and offsets[j] == offsets[j - 1] + sizes[j - 1] + 8:
+            j += 1
+        buff = np.empty(offsets[j - 1] + sizes[j - 1] + 8 - offsets[i], "uint8")
+        fd.seek(offsets[i])
+        nread = fd.readinto(buff)
+        for offset, size in zip(offsets[i:j], sizes[i:j]):
+            pos = offset - offsets[i]
+            markers = buff[pos : pos + 4], buff[pos + 4 + size : pos + 8 + size]
+            if pos + 8 + size <= nread and all(
+                m.view("i4")[0] == size for m in markers
+            ):
+                data = buff[pos + 4 : pos + 4 + size].view(records[offset])
+                if not data.flags.aligned:
+                    data = data.copy()
+            else:
+                data = _read_record(fd, offset, records[offset])
+            tr[offset] = data
+        i = j
+    return tr
+
+
+def _read_record(fd, offset, dtype):
+    """Read the Fortran record at the given offset of the file."""
+    fd.seek(offset)
+    (size,) = np.frombuffer(fd.read(4), "i4")
+    data = np.frombuffer(bytearray(fd.read(size)), dtype)
+    (size2,) = np.frombuffer(fd.read(4), "i4")
+    if size != size2:
+        raise OSError(
+            "Sizes do not agree in the header and footer for this record - "
+            "check header dtype"
+        )
+    return data
+
+
 def _ramses_particle_file_handler(fname, foffsets, data_types, subset, fields, count):
     """General file handler, called by _read_particle_subset
 
@@ -93,28 +157,37 @@ def _ramses_particle_file_handler(fname, foffsets, data_types, subset, fields, c
     tr = {}
     ds = subset.domain.ds
     current_time = ds.current_time.in_units("code_time").v
-    with FortranFile(fname) as fd:
-        # We do *all* conversion into boxlen here.
-        # This means that no other conversions need to be applied to convert
-        # positions into the same domain as the octs themselves.
-        for field in sorted(fields, key=lambda a: foffsets[a]):
-            if count == 0:
-                tr[field] = np.empty(0, dtype=data_types[field])
-                continue
-            fd.seek(foffsets[field])
-            dt = data_types[field]
-            tr[field] = fd.read_vector(dt)
-            if field[1].startswith("particle_position"):
-                np.divide(tr[field], ds["boxlen"], tr[field])
-            if ds.cosmological_simulation and field[1] == "particle_birth_time":
-                conformal_time = tr[field]
-                physical_age = convert_ramses_conformal_time_to_physical_age(
-                    ds, conformal_time
-                )
-                tr[field] = current_time - physical_age
-                # arbitrarily set particles with zero conformal_age to zero
-                # particle_age. This corresponds to DM particles.
-                tr[field][conformal_time == 0] = 0
+    fields = list(fields)
+    if count == 0:
+        return {field: np.empty(0, dtype=data_types[field]) for field in fields}
+    with open(fname, "rb") as fd:
+        records = _read_records(
+            fd, {foffsets[field]: data_types[field] for field in fields}, count
+        )
+    # We do *all* conversion into boxlen here.
+    # This means that no other conversions need to be applied to convert
+    # positions into the same domain as the octs themselves.
+    first_field = {}
+    for field in fields:
+        offset = foffsets[field]
+        if offset in first_field:
+            # Some fields (e.g. the conformal birth time) alias another one
+            tr[field] = tr[first_field[offset]].copy()
+        else:
+            tr[field] = records[offset]
+            first_field[offset] = field
+    for field in fields:
+        if field[1].startswith("particle_position"):
+            np.divide(tr[field], ds["boxlen"], tr[field])
+        if ds.cosmological_simulation and field[1] == "particle_birth_time":
+            conformal_time = tr[field]
+            physical_age = convert_ramses_conformal_time_to_physical_age(
+                ds, conformal_time
+            )
+            tr[field] = current_time - physical_age
+            # arbitrarily set particles with zero conformal_age to zero
+            # particle_age. This corresponds to DM particles.
+            tr[field][conformal_time == 0] = 0
     return tr
 
 
@@ -124,48 +197,112 @@ class IOHandlerRAMSES(BaseIOHandler):
     def _read_fluid_selection(self, chunks, selector, fields, size):
         tr = defaultdict(list)
 
-        # Set of field types
-        ftypes = {f[0] for f in fields}
-        for chunk in chunks:
-            # Gather fields by type to minimize i/o operations
-            for ft in ftypes:
-                # Get all the fields of the same type
-                field_subs = list(filter(lambda f, ft=ft: f[0] == ft, fields))
+        # Gather fields by type, so that each file is read in a single pass
+        field_subs = defaultdict(list)
+        for ft, f in fields:
+            field_subs[ft].append(f)
 
-                # Loop over subsets
+        def _plan_reads():
+            # Find the cells to fill and the blocks of the files holding them.
+            for chunk in chunks:
                 for subset in chunk.objs:
-                    fname = None
-                    for fh in subset.domain.field_handlers:
-                        if fh.ftype == ft:
-                            file_handler = fh
-                            fname = fh.fname
-                            break
-
-                    if fname is None:
-                        raise YTFieldTypeNotFound(ft)
-
-                    # Now we read the entire thing
-                    with FortranFile(fname) as fd:
-                        # This contains the boundary information, so we skim through
-                        # and pick off the right vectors
-                        rv = subset.fill(fd, field_subs, selector, file_handler)
-                    for ft, f in field_subs:
-                        d = rv.pop(f)
-                        mylog.debug(
-                            "Filling %s with %s (%0.3e %0.3e) (%s zones)",
-                            f,
-                            d.size,
-                            d.min(),
-                            d.max(),
-                            d.size,
+                    file_handlers = {}
+                    for ft in field_subs:
+                        for fh in subset.domain.field_handlers:
+                            if fh.ftype == ft:
+                                file_handlers[ft] = fh
+                                # Index the records of the file, if not done yet
+                                fh.offset
+                                break
+                        else:
+                            raise YTFieldTypeNotFound(ft)
+                    file_indices = subset._file_indices(selector)
+                    blocks = subset._file_blocks(file_indices)
+                    # Only read the blocks missing from the field cache
+                    cached, to_read = {}, {}
+                    for ft, fh in file_handlers.items():
+                        cached[ft], to_read[ft] = self._cached_blocks(
+                            fh, ft, field_subs[ft], blocks
                         )
-                        tr[(ft, f)].append(d)
+                    yield subset, file_handlers, file_indices, cached, to_read
+
+        def _read_blocks(plan):
+            # Run on the I/O threads
+            subset, file_handlers, file_indices, cached, to_read = plan
+            rv = {}
+            for ft, fh in file_handlers.items():
+                if not to_read[ft]:
+                    rv[ft] = {}
+                    continue
+                with open(fh.fname, "rb") as fd:
+                    rv[ft] = fh.read_blocks(fd, field_subs[ft], to_read[ft])
+            return rv
+
+        for plan, rv in self._prefetch(_plan_reads(), _read_blocks):
+            subset, file_handlers, file_indices, cached, to_read = plan
+            for ft, field_list in field_subs.items():
+                blocks = cached[ft]
+                blocks.update(
+                    self._cache_blocks(
+                        file_handlers[ft], ft, field_list, to_read[ft], rv.pop(ft)
+                    )
+                )
+                data = subset._fill_blocks(field_list, file_indices, blocks)
+                for f in field_list:
+                    d = data.pop(f)
+                    mylog.debug(
+                        "Filling %s with %s (%0.3e %0.3e) (%s zones)",
+                        f,
+                        d.size,
+                        d.min(),
+                        d.max(),
+                        d.size,
+                    )
+                    tr[(ft, f)].append(d)
         d = {}
         for field in fields:
             d[field] = np.concatenate(tr.pop(field))
 
         return d
 
+    def _cached_blocks(self, fh, ft, fields, blocks):
+        """
+        Return the blocks of a file whose fields are all in the field cache,
+        and the list of the other blocks.
+        """
+        cache = self.ds.index.field_cache
+        if not cache.enabled:
+            return {}, blocks
+        cached, missing = {}, []
+        for block in blocks:
+            try:
+                data = {
+                    f: cache.lookup(("ramses", (fh.fname, block), (ft, f)))
+                    for f in fields
+                }
+            except KeyError:
+                missing.append(block)
+                continue
+            # None marks the blocks without any oct
+            if all(v is not None for v in data.values()):
+                cached[block] = data
+        return cached, missing
+
+    def _cache_blocks(self, fh, ft, fields, blocks, read):
+        """Store the blocks read from a file in the field cache."""
+        cache = self.ds.index.field_cache
+        if not cache.enabled:
+            return read
+        for block in blocks:
+            data = read.get(block)
+            for f in fields:
+                values = None
+                if data is not None:
+                    # a copy, so as not to keep the rest of the read buffer
+                    values = data[f] = np.ascontiguousarray(data[f])
+                cache.add(("ramses", (fh.fname, block), (ft, f)), values)
+        return read
+
     def _read_particle_coords(self, chunks, ptf):
         pn = "particle_position_%s"
         fields = [
@@ -173,15 +310,15 @@ class IOHandlerRAMSES(BaseIOHandler):
             for ptype, field_list in ptf.items()
             for ax in "xyz"
         ]
-        for chunk in chunks:
-            for subset in chunk.objs:
-                rv = self._read_particle_subset(subset, fields)
-                for ptype in sorted(ptf):
-                    yield ptype, (
-                        rv[ptype, pn % "x"],
-                        rv[ptype, pn % "y"],
-                        rv[ptype, pn % "z"],
-                    ), 0.0
+        subsets = (subset for chunk in chunks for subset in chunk.objs)
+        read = partial(self._read_particle_subset, fields=fields)
+        for _subset, rv in self._prefetch(subsets, read):
+            for ptype in sorted(ptf):
+                yield ptype, (
+                    rv[ptype, pn % "x"],
+                    rv[ptype, pn % "y"],
+                    rv[ptype, pn % "z"],
+                ), 0.0
 
     def _read_particle_fields(self, chunks, ptf, selector):
         pn = "particle_position_%s"
@@ -193,17 +330,17 @@ class IOHandlerRAMSES(BaseIOHandler):
             for ax in "xyz":
                 if pn % ax not in field_list:
                     fields.append((ptype, pn % ax))
-        for chunk in chunks:
-            for subset in chunk.objs:
-                rv = self._read_particle_subset(subset, fields)
-                for ptype, field_list in sorted(ptf.items()):
-                    x, y, z = (np.asarray(rv[ptype, pn % ax], "=f8") for ax in "xyz")
-                    mask = selector.select_points(x, y, z, 0.0)
-                    if mask is None:
-                        mask = []
-                    for field in field_list:
-                        data = np.asarray(rv.pop((ptype, field))[mask], "=f8")
-                        yield (ptype, field), data
+        subsets = (subset for chunk in chunks for subset in chunk.objs)
+        read = partial(self._read_particle_subset, fields=fields)
+        for _subset, rv in self._prefetch(subsets, read):
+            for ptype, field_list in sorted(ptf.items()):
+                x, y, z = (np.asarray(rv[ptype, pn % ax], "=f8") for ax in "xyz")
+                mask = selector.select_points(x, y, z, 0.0)
+                if mask is None:
+                    mask = []
+                for field in field_list:
+                    data = np.asarray(rv.pop((ptype, field))[mask], "=f8")
+                    yield (ptype, field), data
 
     def _read_particle_subset(self, subset, fields):
         """Read the particle files."""
@@ -132,64 +132,3 @@ cpdef read_offset(FortranFile f, INT64_t min_level, INT64_t domain_id, INT64_t n
             f.skip(skip_len)
 
     return offset, level_count
-
-@cython.boundscheck(False)
-@cython.wraparound(False)
-@cython.cdivision(True)
-@cython.nonecheck(False)
-def fill_hydro(FortranFile f,
-               np.ndarray[np.int64_t, ndim=2] offsets,
-               np.ndarray[np.int64_t, ndim=2] level_count,
-               list cpu_enumerator,
-               np.ndarray[np.uint8_t, ndim=1] levels,
-               np.ndarray[np.uint8_t, ndim=1] cell_inds,
-               np.ndarray[np.int64_t, ndim=1] file_inds,
-               INT64_t ndim, list all_fields, list fields,
-               dict tr,
-               RAMSESOctreeContainer oct_handler,
-               np.ndarray[np.int32_t, ndim=1] domains=np.array([], dtype='int32')):
-    cdef INT64_t offset
-    cdef dict tmp
-    cdef str field
-    cdef INT64_t twotondim
-    cdef int ilevel, icpu, ifield, nfields, nlevels, nc, ncpu_selected
-    cdef np.ndarray[np.uint8_t, ndim=1] mask
-
-    twotondim = 2**ndim
-    nfields = len(all_fields)
-    ncpu = offsets.shape[0]
-    nlevels = offsets.shape[1]
-    ncpu_selected = len(cpu_enumerator)
-
-    mask = np.array([(field in fields) for field in all_fields], dtype=np.uint8)
-
-    # Loop over levels
-    for ilevel in range(nlevels):
-        # Loop over cpu domains
-        for icpu in cpu_enumerator:
-            nc = level_count[icpu, ilevel]
-            if nc == 0:
-                continue
-            offset = offsets[icpu, ilevel]
-            if offset == -1:
-                continue
-            f.seek(offset)
-            tmp = {}
-            # Initialize temporary data container for io
-            # note: we use Fortran ordering to reflect the in-file ordering
-            for field in all_fields:
-                tmp[field] = np.empty((nc, twotondim), dtype="float64", order='F')
-
-            for i in range(twotondim):
-                # Read the selected fields
-                for ifield in range(nfields):
-                    if not mask[ifield]:
-                        f.skip()
-                    else:
-                        tmp[all_fields[ifield]][:, i] = f.read_vector('d') # i-th cell
-            if ncpu_selected > 1:
-                oct_handler.fill_level_with_domain(
-                    ilevel, levels, cell_inds, file_inds, domains, tr, tmp, domain=icpu+1)
-            else:
-                oct_handler.fill_level(
-                    ilevel, levels, cell_inds, file_inds, tr, tmp)
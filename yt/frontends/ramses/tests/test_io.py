@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from yt.frontends.ramses.field_handlers import HydroFieldFileHandler
+from yt.frontends.ramses.io import _read_records
+from yt.testing import assert_equal
+from yt.utilities.cython_fortran_utils import FortranFile
+
+
+def _write_record(f, data):
+    data = np.asarray(data)
+    marker = np.int32(data.nbytes).tobytes()
+    f.write(marker + data.tobytes() + marker)
+
+
+def test_read_records(tmp_path):
+    fname = str(tmp_path / "part.out00001")
+    prng = np.random.RandomState(0x4D3D3D3)
+    records = [
+        prng.random_sample(7),
+        np.arange(7, dtype="int32"),
+        prng.random_sample(7),
+        prng.random_sample(3),
+        prng.random_sample(7),
+    ]
+    with open(fname, "wb") as f:
+        offsets = []
+        for data in records:
+            offsets.append(f.tell())
+            _write_record(f, data)
+    with open(fname, "rb") as fd:
+        # the fourth record is shorter than expected and is read on its own
+        read = _read_records(fd, {o: r.dtype.char for o, r in zip(offsets, records)}, 7)
+    for offset, data in zip(offsets, records):
+        assert_equal(read[offset], data)
+        assert read[offset].flags.aligned and read[offset].flags.writeable
+
+
+def test_read_blocks(tmp_path):
+    fname = str(tmp_path / "hydro.out00001")
+    fields = ["Density", "x-velocity", "y-velocity", "z-velocity", "Pressure"]
+    prng = np.random.RandomState(0x4D3D3D3)
+    # (cpu, level) -> (number of octs, 8 cells, number of fields)
+    values = {
+        (0, 0): prng.random_sample((1, 8, 5)),
+        (0, 1): prng.random_sample((4, 8, 5)),
+        (1, 1): prng.random_sample((3, 8, 5)),
+    }
+    offsets = np.full((2, 2), -1, dtype="int64")
+    level_count = np.zeros((2, 2), dtype="int64")
+    with open(fname, "wb") as f:
+        _write_record(f, np.zeros(1, dtype="int32"))
+        for block, data in values.items():
+            offsets[block] = f.tell()
+            level_count[block] = data.shape[0]
+            for i in range(8):
+                for ifield in range(5):
+                    _write_record(f, data[:, i, ifield])
+
+    handler = HydroFieldFileHandler.__new__(HydroFieldFileHandler)
+    handler.ds = SimpleNamespace(dimensionality=3)
+    handler.fname = fname
+    handler.field_list = [("ramses", f) for f in fields]
+    handler._offset, handler._level_count = offsets, level_count
+    for subset in (fields, ["Pressure", "x-velocity"], ["y-velocity"]):
+        with open(fname, "rb") as fd:
+            blocks = handler.read_blocks(fd, subset, [(0, 1), (1, 0), (1, 1)])
+        assert_equal(sorted(blocks), [(0, 1), (1, 1)])
+        for block, data in blocks.items():
+            assert_equal(sorted(data), sorted(subset))
+            for f in subset:
+                assert_equal(data[f], values[block][:, :, fields.index(f)])
+
+    # the blocks match what is read record by record
+    with open(fname, "rb") as fd:
+        blocks = handler.read_blocks(fd, ["Density"], [(0, 1)])
+    with FortranFile(fname) as fd:
+        fd.seek(offsets[0, 1])
+        records = [fd.read_vector("d") for _ in range(8 * 5)]
+    assert_equal(blocks[0, 1]["Density"], np.array(records[::5]).T)
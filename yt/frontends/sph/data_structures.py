@@ -90,18 +90,9 @@ class SPHParticleIndex(ParticleIndex):
 
         super()._initialize_index()
 
-    def _generate_kdtree(self, fname):
+    def _generate_kdtree(self):
         from yt.utilities.lib.cykdtree import PyKDTree
 
-        if fname is not None:
-            if os.path.exists(fname):
-                mylog.info("Loading KDTree from %s", os.path.basename(fname))
-                kdtree = PyKDTree.from_file(fname)
-                if kdtree.data_version != self.ds._file_hash:
-                    mylog.info("Detected hash mismatch, regenerating KDTree")
-                else:
-                    self._kdtree = kdtree
-                    return
         positions = []
         for data_file in self.data_files:
             for _, ppos in self.io._yield_coordinates(
@@ -109,12 +100,11 @@ class SPHParticleIndex(ParticleIndex):
             ):
                 positions.append(ppos)
         if positions == []:
-            self._kdtree = None
-            return
+            return None
         positions = np.concatenate(positions)
         mylog.info("Allocating KDTree for %s particles", positions.shape[0])
         num_neighbors = getattr(self.ds, "num_neighbors", 32)
-        self._kdtree = PyKDTree(
+        return PyKDTree(
             positions.astype("float64"),
             left_edge=self.ds.domain_left_edge,
             right_edge=self.ds.domain_right_edge,
@@ -122,14 +112,9 @@ class SPHParticleIndex(ParticleIndex):
             leafsize=2 * int(num_neighbors),
             data_version=self.ds._file_hash,
         )
-        if fname is not None:
-            self._kdtree.save(fname)
 
     @property
     def kdtree(self):
-        if hasattr(self, "_kdtree"):
-            return self._kdtree
-
         ds = self.ds
 
         if getattr(ds, "kdtree_filename", None) is None:
@@ -141,6 +126,9 @@ class SPHParticleIndex(ParticleIndex):
         else:
             fname = ds.kdtree_filename
 
-        self._generate_kdtree(fname)
-
-        return self._kdtree
+        num_neighbors = getattr(ds, "num_neighbors", 32)
+        periodic = tuple(bool(p) for p in ds.periodicity)
+        key = ("kdtree", ds._sph_ptypes[0], None, 2 * int(num_neighbors), periodic)
+        return self.spatial_indexes.get(
+            key, self._generate_kdtree, filename=fname, data_version=ds._file_hash
+        )
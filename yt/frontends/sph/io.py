@@ -5,7 +5,20 @@ Generic file-handing functions for SPH data
 
 
 """
+import hashlib
+import os
+
+import numpy as np
+
+from yt.config import ytcfg
+from yt.funcs import get_num_threads
+from yt.utilities.configure import config_dir
 from yt.utilities.io_handler import BaseParticleIOHandler
+from yt.utilities.lib.cykdtree import PyKDTree
+from yt.utilities.lib.particle_kdtree_tools import generate_smoothing_length
+from yt.utilities.parallel_tools.parallel_analysis_interface import (
+    communication_system,
+)
 
 
 class IOHandlerSPH(BaseParticleIOHandler):
@@ -13,9 +26,138 @@ class IOHandlerSPH(BaseParticleIOHandler):
 
     This exists to handle particles with smoothing lengths, which require us
     to read in smoothing lengths along with the the particle coordinates to
-    determine particle extents.
-
-    At present this is non-functional.
+    determine particle extents.  When the data files do not provide them,
+    the smoothing lengths are generated from the distances to the nearest
+    neighbors of the particles and are cached in sidecar files.
     """
 
-    pass
+    def _hsml_filename(self, filename):
+        """
+        Return where the smoothing lengths generated for a data file are
+        cached, given the default sidecar file name *filename* next to it.
+
+        The sidecar is relocated to the ``hsml_cache_dir`` configuration
+        option when it is set, or to yt's configuration directory when the
+        data directory is not writable.
+        """
+        cache_dir = ytcfg.get("yt", "hsml_cache_dir")
+        dirname, basename = os.path.split(os.path.abspath(filename))
+        if not cache_dir:
+            if os.path.exists(filename) or os.access(dirname, os.W_OK):
+                return filename
+            cache_dir = os.path.join(config_dir(), "hsml_cache")
+        # Sidecars of data files in different directories may share a name
+        subdir = hashlib.md5(dirname.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(os.path.expanduser(cache_dir), subdir, basename)
+
+    def _sph_positions(self, data_file):
+        # The positions of the SPH particles of a data file
+        positions = [
+            pos
+            for _, pos in self._yield_coordinates(
+                data_file, needed_ptype=self.ds._sph_ptypes[0]
+            )
+        ]
+        if not positions:
+            return np.empty((0, 3), dtype="float64")
+        return np.concatenate(positions)
+
+    def _tree_smoothing_length(self, positions, count):
+        # The smoothing lengths of the first count particles at positions,
+        # among all of them
+        ds = self.ds
+        kdtree = PyKDTree(
+            positions,
+            left_edge=ds.domain_left_edge.to_value("code_length"),
+            right_edge=ds.domain_right_edge.to_value("code_length"),
+            periodic=np.array(ds.periodicity),
+            leafsize=2 * int(getattr(ds, "num_neighbors", 32)),
+        )
+        tree_positions = np.ascontiguousarray(positions[kdtree.idx])
+        num_threads = int(get_num_threads()) or os.cpu_count() or 1
+        hsml = generate_smoothing_length(
+            tree_positions, kdtree, ds._num_neighbors, num_threads=num_threads
+        )
+        return hsml[np.argsort(kdtree.idx)][:count]
+
+    def _local_smoothing_length(self, index, file_ids):
+        """
+        Compute the smoothing lengths of the SPH particles of the data files
+        *file_ids* of *index*, as a list of arrays, from a kdtree of these
+        particles and of the particles of the other data files around them.
+        """
+        ds = self.ds
+        data_files = [index.data_files[i] for i in file_ids]
+        positions = [self._sph_positions(data_file) for data_file in data_files]
+        counts = [pos.shape[0] for pos in positions]
+        own = np.concatenate(positions).astype("float64")
+        if own.shape[0] == 0:
+            return [np.empty(0, dtype=pos.dtype) for pos in positions]
+        # The distances to the neighbors among these particles only are upper
+        # bounds, so that all of the actual neighbors are in the bounding box
+        # of the spheres they span
+        if own.shape[0] > ds._num_neighbors:
+            hsml = self._tree_smoothing_length(own, own.shape[0])
+            lo = (own - hsml[:, None]).min(axis=0)
+            hi = (own + hsml[:, None]).max(axis=0)
+        else:
+            lo = np.full(3, -np.inf)
+            hi = np.full(3, np.inf)
+        width = (ds.domain_right_edge - ds.domain_left_edge).to_value("code_length")
+        halo = []
+        for i, data_file in enumerate(index.data_files):
+            if i in file_ids:
+                continue
+            pos = self._sph_positions(data_file).astype("float64")
+            inside = np.ones(pos.shape[0], dtype="bool")
+            for ax in range(3):
+                x = pos[:, ax]
+                in_box = (x >= lo[ax]) & (x <= hi[ax])
+                if ds.periodicity[ax]:
+                    in_box |= (x + width[ax] <= hi[ax]) | (x - width[ax] >= lo[ax])
+                inside &= in_box
+            halo.append(pos[inside])
+        hsml = self._tree_smoothing_length(np.concatenate([own] + halo), own.shape[0])
+        hsml = np.split(hsml, np.cumsum(counts)[:-1])
+        return [h.astype(pos.dtype) for h, pos in zip(hsml, positions)]
+
+    def _compute_smoothing_length(self, index):
+        """
+        Compute the smoothing lengths of the SPH particles of every data file
+        of *index*, as a list of arrays in the precision of their positions,
+        or None if there are no SPH particles.  The neighbor searches run on
+        ``num_threads`` threads.  In parallel, the data files are split
+        between MPI ranks, which only build kdtrees of the particles of their
+        own data files and of those around them.
+        """
+        data_files = index.data_files
+        size = ytcfg.get("yt", "internals", "topcomm_parallel_size")
+        if size > 1:
+            rank = ytcfg.get("yt", "internals", "topcomm_parallel_rank")
+            file_ids = np.array_split(np.arange(len(data_files)), size)[rank]
+            hsml = self._local_smoothing_length(index, list(file_ids))
+            comm = communication_system.communicators[-1]
+            hsml = comm.par_combine_object(
+                dict(zip(file_ids, hsml)), "join", datatype="dict"
+            )
+            hsml = [hsml[i] for i in range(len(data_files))]
+            if sum(h.size for h in hsml) == 0:
+                return None
+            return hsml
+        positions = [self._sph_positions(data_file) for data_file in data_files]
+        counts = [pos.shape[0] for pos in positions]
+        if sum(counts) == 0:
+            return None
+        # The kdtree of the index is shared with the SPH routines
+        kdtree = index.kdtree
+        tree_positions = np.concatenate(positions)[kdtree.idx]
+        tree_positions = np.ascontiguousarray(tree_positions, dtype="float64")
+        num_threads = int(get_num_threads()) or os.cpu_count() or 1
+        hsml = generate_smoothing_length(
+            tree_positions,
+            kdtree,
+            self.ds._num_neighbors,
+            num_threads=num_threads,
+        )
+        hsml = np.split(hsml[np.argsort(kdtree.idx)], np.cumsum(counts)[:-1])
+        return [h.astype(pos.dtype) for h, pos in zip(hsml, positions)]
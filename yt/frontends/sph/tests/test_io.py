@@ -0,0 +1,85 @@
+import os
+from types import SimpleNamespace
+
+import numpy as np
+
+from yt.config import ytcfg
+from yt.frontends.sph.io import IOHandlerSPH
+from yt.loaders import load_particles
+from yt.testing import assert_equal
+from yt.utilities.lib.cykdtree import PyKDTree
+from yt.utilities.lib.particle_kdtree_tools import generate_smoothing_length
+
+
+class _InMemorySPHIO(IOHandlerSPH):
+    # data files are the indices of arrays of positions
+    def __init__(self, ds, positions):
+        super().__init__(ds)
+        self.positions = positions
+
+    def _yield_coordinates(self, data_file, needed_ptype=None):
+        if self.positions[data_file].shape[0] > 0:
+            yield "io", self.positions[data_file]
+
+
+def test_local_smoothing_length():
+    prng = np.random.RandomState(0x4D3D3D3)
+    # clustered data files, across the periodic boundaries, and a few
+    # scattered ones
+    centers = [[0.05, 0.5, 0.5], [0.5, 0.95, 0.02], [0.5, 0.5, 0.5]]
+    positions = [
+        np.mod(prng.normal(center, 0.1, size=(300, 3)), 1.0) for center in centers
+    ]
+    positions += [prng.random_sample((100, 3)), prng.random_sample((20, 3))]
+    positions.append(np.empty((0, 3)))
+    all_positions = np.concatenate(positions)
+    for periodic in (True, False):
+        ds = load_particles(
+            {"particle_position": all_positions}, periodicity=(periodic,) * 3
+        )
+        ds._num_neighbors = 32
+        ds._sph_ptypes = ("io",)
+        kdtree = PyKDTree(
+            all_positions,
+            left_edge=ds.domain_left_edge.d,
+            right_edge=ds.domain_right_edge.d,
+            periodic=np.array(ds.periodicity),
+            leafsize=64,
+        )
+        expected = generate_smoothing_length(
+            np.ascontiguousarray(all_positions[kdtree.idx]), kdtree, 32
+        )[np.argsort(kdtree.idx)]
+        expected = np.split(expected, np.cumsum([p.shape[0] for p in positions]))
+        io = _InMemorySPHIO(ds, positions)
+        index = SimpleNamespace(data_files=list(range(len(positions))))
+        for file_ids in ([0], [1, 2], [3], [4], [5], list(range(6))):
+            hsml = io._local_smoothing_length(index, file_ids)
+            for i, data_file_hsml in zip(file_ids, hsml):
+                assert_equal(data_file_hsml, expected[i])
+        # in serial, with the kdtree of the index
+        index.kdtree = kdtree
+        hsml = io._compute_smoothing_length(index)
+        for i, data_file_hsml in enumerate(hsml):
+            assert_equal(data_file_hsml, expected[i])
+
+
+def test_hsml_filename(tmp_path):
+    ds = load_particles({"particle_position": np.zeros((1, 3))})
+    io = IOHandlerSPH(ds)
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    filename = str(data_dir / "snapshot_000.hsml.hdf5")
+    cache_dir = ytcfg.get("yt", "hsml_cache_dir")
+    try:
+        # next to the data file by default
+        ytcfg["yt", "hsml_cache_dir"] = ""
+        assert_equal(io._hsml_filename(filename), filename)
+        # in the cache directory, per directory of the data files
+        ytcfg["yt", "hsml_cache_dir"] = str(tmp_path / "cache")
+        cached = io._hsml_filename(filename)
+        assert_equal(os.path.basename(cached), os.path.basename(filename))
+        assert os.path.dirname(os.path.dirname(cached)) == str(tmp_path / "cache")
+        other = io._hsml_filename(str(tmp_path / "other" / "snapshot_000.hsml.hdf5"))
+        assert other != cached
+    finally:
+        ytcfg["yt", "hsml_cache_dir"] = cache_dir
@@ -290,28 +290,40 @@ class StreamHierarchy(GridIndex):
         for i, grid in enumerate(self.grids):
             grid.NumberOfParticles = self.grid_particle_count[i, 0]
 
-    def update_data(self, data):
+    def update_data(self, data, copy=True):
         """
         Update the stream data with a new data dict. If fields already exist,
         they will be replaced, but if they do not, they will be added. Fields
         already in the stream but not part of the data dict will be left
         alone.
+
+        Updating fields which already exist, for instance at every step of a
+        simulation, only discards the data cached for them.  If ``copy`` is
+        False, the new arrays are used rather than copies of them.
         """
         particle_types = set_particle_types(data[0])
 
         self.stream_handler.particle_types.update(particle_types)
         self.ds._find_particle_types()
 
+        known_fields = set(self.field_list)
+        updated = set()
         for i, grid in enumerate(self.grids):
-            field_units, gdata, number_of_particles = process_data(data[i])
+            field_units, gdata, number_of_particles = process_data(data[i], copy=copy)
             self.stream_handler.particle_count[i] = number_of_particles
             self.stream_handler.field_units.update(field_units)
             for field in gdata:
                 if field in grid.field_data:
                     grid.field_data.pop(field, None)
                 self.stream_handler.fields[grid.id][field] = gdata[field]
+            updated.update(gdata)
 
         self._reset_particle_count()
+        for field in updated:
+            self.field_cache.invalidate(field)
+        self.field_cache.invalidate(kind="derived")
+        if updated.issubset(known_fields):
+            return
         # We only want to create a superset of fields here.
         for field in self.ds.field_list:
             if field[0] == "all":
@@ -464,19 +476,24 @@ class StreamParticleIndex(SPHParticleIndex):
         else:
             self.io = io_registry[self.dataset_type](self.ds)
 
-    def update_data(self, data):
+    def update_data(self, data, copy=True):
         """
         Update the stream data with a new data dict. If fields already exist,
         they will be replaced, but if they do not, they will be added. Fields
         already in the stream but not part of the data dict will be left
         alone.
+
+        Updating fields which already exist only discards the data cached for
+        them, and the particle index and spatial indexes (such as the k-d tree)
+        are only rebuilt if the positions of the particles are updated.  If
+        ``copy`` is False, the new arrays are used rather than copies of them.
         """
         # Alias
         ds = self.ds
         handler = ds.stream_handler
 
         # Preprocess
-        field_units, data, _ = process_data(data)
+        field_units, data, _ = process_data(data, copy=copy)
         pdata = {}
         for key in data.keys():
             if not isinstance(key, tuple):
@@ -487,6 +504,7 @@ class StreamParticleIndex(SPHParticleIndex):
             pdata[field] = data[key]
         data = pdata  # Drop reference count
         particle_types = set_particle_types(data)
+        new_fields = not set(data).issubset(self.field_list)
 
         # Update particle types
         handler.particle_types.update(particle_types)
@@ -500,6 +518,21 @@ class StreamParticleIndex(SPHParticleIndex):
                 fields._additional_fields += (field,)
         fields["stream_file"].update(data)
 
+        # Discard the cached data, and the index if the particles moved
+        for field in data:
+            self.field_cache.invalidate(field)
+        self.field_cache.invalidate(kind="derived")
+        if any(field[1].startswith("particle_position") for field in data):
+            self.field_cache.invalidate(kind="particles")
+            self.selection_cache.clear()
+            self.spatial_indexes.clear()
+            self._data_files = self._total_particles = None
+            self._file_extents = None
+            ds._particle_type_counts = None
+            self._initialize_index()
+
+        if not new_fields:
+            return
         # Update field list
         for field in self.ds.field_list:
             if field[0] in ["all", "nbody"]:
@@ -574,14 +607,19 @@ class StreamParticlesDataset(StreamDataset):
         pos = ad[sph_ptype, "particle_position"].to(l_unit).d
         mass = ad[sph_ptype, "particle_mass"].to(m_unit).d
 
-        # Construct k-d tree
-        kdtree = PyKDTree(
-            pos.astype("float64"),
-            left_edge=self.domain_left_edge.to_value(l_unit),
-            right_edge=self.domain_right_edge.to_value(l_unit),
-            periodic=self.periodicity,
-            leafsize=2 * int(n_neighbors),
-        )
+        # Construct k-d tree, which is shared with the SPH gather routines
+        def _build_kdtree():
+            return PyKDTree(
+                pos.astype("float64"),
+                left_edge=self.domain_left_edge.to_value(l_unit),
+                right_edge=self.domain_right_edge.to_value(l_unit),
+                periodic=self.periodicity,
+                leafsize=2 * int(n_neighbors),
+            )
+
+        periodic = tuple(bool(p) for p in self.periodicity)
+        key = ("kdtree", sph_ptype, None, 2 * int(n_neighbors), periodic)
+        kdtree = self.index.spatial_indexes.get(key, _build_kdtree)
         order = np.argsort(kdtree.idx)
 
         def exists(fname):
@@ -777,7 +815,7 @@ class StreamOctreeSubset(OctreeSubset):
         # Here we get a copy of the file, which we skip through and read the
         # bits we want.
         oct_handler = self.oct_handler
-        cell_count = selector.count_oct_cells(self.oct_handler, self.domain_id)
+        cell_count = self._count_oct_cells(selector)
         levels, cell_inds, file_inds = self.oct_handler.file_index_octs(
             selector, self.domain_id, cell_count
         )
@@ -1,4 +1,5 @@
 from collections import defaultdict
+from itertools import product
 
 import numpy as np
 
@@ -49,12 +50,9 @@ def assign_particle_data(ds, pdata, bbox):
         pdata.pop("number_of_particles", None)
         num_grids = len(ds.stream_handler.fields)
         parent_ids = ds.stream_handler.parent_ids
-        num_children = np.zeros(num_grids, dtype="int64")
-        # We're going to do this the slow way
-        mask = np.empty(num_grids, dtype="bool")
-        for i in range(num_grids):
-            np.equal(parent_ids, i, mask)
-            num_children[i] = mask.sum()
+        num_children = np.bincount(
+            parent_ids[parent_ids >= 0], minlength=num_grids
+        ).astype("int64")
         levels = ds.stream_handler.levels.astype("int64").ravel()
         grid_tree = GridTree(
             num_grids,
@@ -143,7 +141,70 @@ def assign_particle_data(ds, pdata, bbox):
         ds.stream_handler.particle_count[gi] = npart
 
 
-def process_data(data, grid_dims=None):
+def find_parent_ids(left_edges, right_edges, levels):
+    r"""
+    Finds the parent of each grid of a grid hierarchy.
+
+    The parent of a grid is the grid of the next coarser level which overlaps
+    it, the one with the largest index if there are several.  The grids of
+    each level are binned on a regular mesh, so that each grid is only
+    compared to the few coarser grids sharing its bins, rather than to all of
+    them.
+
+    Parameters
+    ----------
+    left_edges, right_edges : array_like
+        The (N, 3) left and right edges of the grids.
+    levels : array_like
+        The levels of the grids.
+
+    Returns
+    -------
+    An array of the N indices of the parent grids, -1 for the grids without a
+    parent.
+    """
+    left_edges = np.asarray(left_edges, dtype="float64")
+    right_edges = np.asarray(right_edges, dtype="float64")
+    levels = np.asarray(levels).ravel()
+    parent_ids = np.full(levels.size, -1, dtype="int64")
+    eps = np.finfo(np.float64).eps
+    for level in np.unique(levels):
+        (parents,) = (levels == level - 1).nonzero()
+        if parents.size == 0:
+            continue
+        (children,) = (levels == level).nonzero()
+        origin = left_edges[parents].min(axis=0)
+        nbins = int(np.ceil(parents.size ** (1.0 / 3.0)))
+        dx = (right_edges[parents].max(axis=0) - origin) / nbins
+        dx[dx <= 0] = 1.0
+
+        def _bins(ids):
+            lo = np.floor((left_edges[ids] - origin) / dx).astype("int64")
+            hi = np.floor((right_edges[ids] - origin) / dx).astype("int64")
+            return np.clip(lo, 0, nbins - 1), np.clip(hi, 0, nbins - 1)
+
+        bins = defaultdict(list)
+        for pi, lo, hi in zip(parents, *_bins(parents)):
+            for key in product(*(range(l, h + 1) for l, h in zip(lo, hi))):
+                bins[key].append(pi)
+        for ci, lo, hi in zip(children, *_bins(children)):
+            candidates = set()
+            for key in product(*(range(l, h + 1) for l, h in zip(lo, hi))):
+                candidates.update(bins.get(key, ()))
+            if not candidates:
+                continue
+            candidates = np.fromiter(candidates, dtype="int64")
+            overlap = np.all(
+                (right_edges[candidates] - left_edges[ci] > eps)
+                & (right_edges[ci] - left_edges[candidates] > eps),
+                axis=1,
+            )
+            if overlap.any():
+                parent_ids[ci] = candidates[overlap].max()
+    return parent_ids
+
+
+def process_data(data, grid_dims=None, copy=True):
     new_data, field_units = {}, {}
     for field, val in data.items():
         # val is a data array
@@ -151,11 +212,11 @@ def process_data(data, grid_dims=None):
             # val is a YTArray
             if hasattr(val, "units"):
                 field_units[field] = val.units
-                new_data[field] = val.copy().d
+                new_data[field] = val.copy().d if copy else val.d
             # val is a numpy array
             else:
                 field_units[field] = ""
-                new_data[field] = val.copy()
+                new_data[field] = val.copy() if copy else val
 
         # val is a tuple of (data, units)
         elif isinstance(val, tuple) and len(val) == 2:
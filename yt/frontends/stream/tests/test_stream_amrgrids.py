@@ -1,7 +1,8 @@
 import numpy as np
 
 from yt import ProjectionPlot, load_amr_grids
-from yt.testing import assert_raises
+from yt.frontends.stream.definitions import find_parent_ids
+from yt.testing import assert_equal, assert_raises, fake_amr_ds
 from yt.utilities.exceptions import YTIllDefinedAMR, YTIntDomainOverflow
 
 
@@ -82,3 +83,24 @@ def test_validation():
         )
 
     assert_raises(YTIllDefinedAMR, load_grids)
+
+
+def test_parent_ids():
+    ds = fake_amr_ds()
+    index = ds.index
+    left_edges, right_edges = index.grid_left_edge.d, index.grid_right_edge.d
+    parent_ids = find_parent_ids(left_edges, right_edges, index.grid_levels)
+    # compare to all of the pairs of grids
+    eps = np.finfo(np.float64).eps
+    levels = index.grid_levels.ravel()
+    for i in range(index.num_grids):
+        overlap = np.all(
+            (right_edges - left_edges[i] > eps) & (right_edges[i] - left_edges > eps),
+            axis=1,
+        )
+        (parents,) = np.nonzero(overlap & (levels == levels[i] - 1))
+        assert_equal(parent_ids[i], parents.max() if parents.size else -1)
+    assert (parent_ids[levels > 0] >= 0).all()
+    for grid, parent_id in zip(index.grids, parent_ids):
+        parent = grid.Parent.id if grid.Parent is not None else -1
+        assert_equal(parent_id, parent)
@@ -1,7 +1,8 @@
 import numpy as np
 
 from yt.data_objects.profiles import create_profile
-from yt.testing import fake_particle_ds, fake_random_ds
+from yt.loaders import load_particles, load_uniform_grid
+from yt.testing import assert_equal, fake_particle_ds, fake_random_ds
 
 
 def test_update_data_grid():
@@ -27,3 +28,57 @@ def test_update_data_particle():
     assert ("io", "temperature") in ds.field_list
     dd = ds.all_data()
     dd[("io", "temperature")]
+
+
+def test_update_data_zero_copy():
+    dens = np.random.uniform(size=(16, 16, 16))
+    ds = load_uniform_grid({"density": (dens, "g/cm**3")}, dens.shape, copy=False)
+    ds.index.field_cache.max_memory = 2**20
+    ad = ds.all_data()
+    assert_equal(ad["gas", "density"].sum(), dens.sum())
+    fields = list(ds.field_list)
+    # the arrays are shared with the caller, and updated in place
+    dens *= 2
+    ds.index.update_data([{"density": dens}], copy=False)
+    assert ds.index.grids[0].field_data == {}
+    assert_equal(ds.all_data()["gas", "density"].sum(), dens.sum())
+    assert_equal(ds.field_list, fields)
+
+
+def test_update_data_particle_positions():
+    npart = 1000
+    prng = np.random.RandomState(0x4D3D3D3)
+    pos = prng.random_sample((npart, 3))
+    data = {"particle_position": pos, "particle_mass": np.ones(npart)}
+    ds = load_particles(data, copy=False)
+    sp = ds.sphere([0.5] * 3, 0.25)
+    r2 = ((pos - 0.5) ** 2).sum(axis=1)
+    assert_equal(sp["io", "particle_mass"].size, (r2 <= 0.25**2).sum())
+    # moving the particles rebuilds the index
+    pos = np.mod(pos + 0.3, 1.0)
+    ds.index.update_data({"particle_position": pos}, copy=False)
+    sp = ds.sphere([0.5] * 3, 0.25)
+    r2 = ((pos - 0.5) ** 2).sum(axis=1)
+    assert_equal(sp["io", "particle_mass"].size, (r2 <= 0.25**2).sum())
+
+
+def test_update_data_particle_positions_kdtree():
+    npart = 1000
+    prng = np.random.RandomState(0x4D3D3D3)
+    pos = prng.random_sample((npart, 3))
+    data = {
+        "particle_position": pos,
+        "particle_mass": np.ones(npart),
+        "smoothing_length": np.full(npart, 0.05),
+        "density": np.ones(npart),
+    }
+    ds = load_particles(data, copy=False)
+    ds.index.kdtree
+    # moving the particles rebuilds the k-d tree
+    pos = np.mod(pos + 0.3, 1.0)
+    ds.index.update_data({"particle_position": pos}, copy=False)
+    kdtree = ds.index.kdtree
+    for leaf in kdtree.leaves:
+        leaf_pos = pos[kdtree.idx[leaf.start_idx : leaf.stop_idx]]
+        assert np.all(leaf_pos >= leaf.left_edge)
+        assert np.all(leaf_pos <= leaf.right_edge)
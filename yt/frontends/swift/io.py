@@ -1,6 +1,7 @@
 import numpy as np
 
 from yt.frontends.sph.io import IOHandlerSPH
+from yt.utilities.file_handler import read_hdf5_ranges
 from yt.utilities.on_demand_imports import _h5py as h5py
 
 
@@ -56,7 +57,7 @@ class IOHandlerSwift(IOHandlerSPH):
             yield key, pos
         f.close()
 
-    def _get_smoothing_length(self, sub_file, pdtype=None, pshape=None):
+    def _get_smoothing_length(self, sub_file, pdtype=None, pshape=None, ranges=None):
         # We do not need the pdtype and the pshape, but some frontends do so we
         # accept them and then just ignore them
         ptype = self.ds._sph_ptypes[0]
@@ -66,7 +67,7 @@ class IOHandlerSwift(IOHandlerSPH):
             pcount = f["/Header"].attrs["NumPart_ThisFile"][ind].astype("int")
             pcount = np.clip(pcount - si, 0, ei - si)
             # we upscale to float64
-            hsml = f[ptype]["SmoothingLength"][si:ei, ...]
+            hsml = read_hdf5_ranges(f[ptype]["SmoothingLength"], ranges or [(si, ei)])
             hsml = hsml.astype("float64", copy=False)
             return hsml
 
@@ -83,10 +84,15 @@ class IOHandlerSwift(IOHandlerSPH):
             if sub_file.total_particles[ptype] == 0:
                 continue
             g = f[f"/{ptype}"]
+            if selector:
+                # only the blocks of particles the selector may touch are read
+                ranges = self.ds.index._particle_ranges(sub_file, ptype, selector)
+            else:
+                ranges = [(si, ei)]
             # this should load as float64
-            coords = g["Coordinates"][si:ei]
+            coords = read_hdf5_ranges(g["Coordinates"], ranges)
             if ptype == "PartType0":
-                hsmls = self._get_smoothing_length(sub_file)
+                hsmls = self._get_smoothing_length(sub_file, ranges=ranges)
             else:
                 hsmls = 0.0
 
@@ -99,9 +105,9 @@ class IOHandlerSwift(IOHandlerSPH):
                 continue
             for field in field_list:
                 if field in ("Mass", "Masses"):
-                    data = g[self.ds._particle_mass_name][si:ei]
+                    data = read_hdf5_ranges(g[self.ds._particle_mass_name], ranges)
                 else:
-                    data = g[field][si:ei]
+                    data = read_hdf5_ranges(g[field], ranges)
 
                 if selector:
                     data = data[mask, ...]
@@ -5,10 +5,13 @@ import struct
 import numpy as np
 from numpy.lib.recfunctions import append_fields
 
+from yt.config import ytcfg
 from yt.frontends.sph.io import IOHandlerSPH
 from yt.frontends.tipsy.definitions import npart_mapping
-from yt.utilities.lib.particle_kdtree_tools import generate_smoothing_length
 from yt.utilities.logger import ytLogger as mylog
+from yt.utilities.parallel_tools.parallel_analysis_interface import (
+    communication_system,
+)
 
 
 class IOHandlerTipsyBinary(IOHandlerSPH):
@@ -114,7 +117,7 @@ class IOHandlerTipsyBinary(IOHandlerSPH):
 
     @property
     def hsml_filename(self):
-        return f"{self.ds.parameter_filename}-{'hsml'}"
+        return self._hsml_filename(f"{self.ds.parameter_filename}-{'hsml'}")
 
     def _generate_smoothing_length(self, index):
         if os.path.exists(self.hsml_filename):
@@ -124,22 +127,17 @@ class IOHandlerTipsyBinary(IOHandlerSPH):
                 os.remove(self.hsml_filename)
             else:
                 return
-        positions = []
-        for data_file in index.data_files:
-            for _, ppos in self._yield_coordinates(
-                data_file, needed_ptype=self.ds._sph_ptypes[0]
-            ):
-                positions.append(ppos)
-        if positions == []:
+        hsml = self._compute_smoothing_length(index)
+        if hsml is None:
             return
-        kdtree = index.kdtree
-        positions = np.concatenate(positions)[kdtree.idx]
-        hsml = generate_smoothing_length(positions, kdtree, self.ds._num_neighbors)
-        hsml = hsml[np.argsort(kdtree.idx)]
+        hsml = np.concatenate(hsml)
         dtype = self._pdtypes["Gas"]["Coordinates"][0]
-        with open(self.hsml_filename, "wb") as f:
-            f.write(struct.pack("q", self.ds._file_hash))
-            f.write(hsml.astype(dtype).tobytes())
+        if ytcfg.get("yt", "internals", "topcomm_parallel_rank") == 0:
+            os.makedirs(os.path.dirname(self.hsml_filename), exist_ok=True)
+            with open(self.hsml_filename, "wb") as f:
+                f.write(struct.pack("q", self.ds._file_hash))
+                f.write(hsml.astype(dtype).tobytes())
+        communication_system.communicators[-1].barrier()
 
     def _read_smoothing_length(self, data_file, count):
         dtype = self._pdtypes["Gas"]["Coordinates"][0]
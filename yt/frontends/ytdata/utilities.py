@@ -69,6 +69,36 @@ def save_as_dataset(ds, filename, data, field_types=None, extra_attrs=None):
 
     mylog.info("Saving field data to yt dataset: %s.", filename)
 
+    fh = h5py.File(filename, mode="w")
+    _save_dataset_attrs(fh, ds, extra_attrs)
+
+    for field in data:
+        if field_types is None:
+            field_type = "data"
+        else:
+            field_type = field_types[field]
+        if field_type not in fh:
+            fh.create_group(field_type)
+
+        if isinstance(field, tuple):
+            field_name = field[1]
+        else:
+            field_name = field
+
+        # for python3
+        if data[field].dtype.kind == "U":
+            data[field] = data[field].astype("|S")
+
+        _yt_array_hdf5(fh[field_type], field_name, data[field])
+        if "num_elements" not in fh[field_type].attrs:
+            fh[field_type].attrs["num_elements"] = data[field].size
+    fh.close()
+    return filename
+
+
+def _save_dataset_attrs(fh, ds, extra_attrs=None):
+    # Writes the attributes of the dataset associated with the saved fields,
+    # and any extra attributes, to an open hdf5 file
     if extra_attrs is None:
         extra_attrs = {}
     base_attrs = [
@@ -91,7 +121,6 @@ def save_as_dataset(ds, filename, data, field_types=None, extra_attrs=None):
         "magnetic_unit",
     ]
 
-    fh = h5py.File(filename, mode="w")
     if ds is None:
         ds = {}
 
@@ -120,29 +149,6 @@ def save_as_dataset(ds, filename, data, field_types=None, extra_attrs=None):
     if "data_type" not in extra_attrs:
         fh.attrs["data_type"] = "yt_array_data"
 
-    for field in data:
-        if field_types is None:
-            field_type = "data"
-        else:
-            field_type = field_types[field]
-        if field_type not in fh:
-            fh.create_group(field_type)
-
-        if isinstance(field, tuple):
-            field_name = field[1]
-        else:
-            field_name = field
-
-        # for python3
-        if data[field].dtype.kind == "U":
-            data[field] = data[field].astype("|S")
-
-        _yt_array_hdf5(fh[field_type], field_name, data[field])
-        if "num_elements" not in fh[field_type].attrs:
-            fh[field_type].attrs["num_elements"] = data[field].size
-    fh.close()
-    return filename
-
 
 def _hdf5_yt_array(fh, field, ds=None):
     r"""Load an hdf5 dataset as a YTArray.
@@ -1,12 +1,16 @@
+import os
+
 import numpy as np
 
 from yt.data_objects.index_subobjects.unstructured_mesh import SemiStructuredMesh
-from yt.funcs import mylog
+from yt.funcs import get_num_threads, mylog
 from yt.units.yt_array import YTArray, uconcatenate, uvstack  # type: ignore
+from yt.utilities.lib.mesh_utilities import ElementBVH
 from yt.utilities.lib.pixelization_routines import (
     interpolate_sph_grid_gather,
     normalization_2d_utility,
     pixelize_cartesian,
+    pixelize_cartesian_multiple,
     pixelize_cartesian_nodal,
     pixelize_element_mesh,
     pixelize_element_mesh_line,
@@ -184,6 +188,7 @@ class CartesianCoordinateHandler(CoordinateHandler):
 
             coords = index.meshes[mesh_id].connectivity_coords
             offset = index.meshes[mesh_id]._index_offset
+            bvh = self._element_bvh(ftype, coords, indices, offset)
             ad = data_source.ds.all_data()
             field_data = ad[field]
             buff_size = size[0:dimension] + (1,) + size[dimension:]
@@ -212,7 +217,14 @@ class CartesianCoordinateHandler(CoordinateHandler):
                 indices = indices[:, 0:8]
 
             img = pixelize_element_mesh(
-                coords, indices, buff_size, field_data, extents, index_offset=offset
+                coords,
+                indices,
+                buff_size,
+                field_data,
+                extents,
+                index_offset=offset,
+                bvh=bvh,
+                num_threads=int(get_num_threads()) or os.cpu_count() or 1,
             )
 
             # re-order the array and squeeze out the dummy dim
@@ -225,6 +237,92 @@ class CartesianCoordinateHandler(CoordinateHandler):
         else:
             return self._oblique_pixelize(data_source, field, bounds, size, antialias)
 
+    def pixelize_multiple(
+        self,
+        dimension,
+        data_source,
+        fields,
+        bounds,
+        size,
+        antialias=True,
+        periodic=True,
+    ):
+        """
+        Method for pixelizing several fields at once.  The fields that are
+        deposited with pixelize_cartesian share a single pass over the cells,
+        distributed across threads over the image rows, while the others are
+        pixelized one at a time.
+        """
+        index = data_source.ds.index
+        if (
+            hasattr(index, "meshes")
+            and not isinstance(index.meshes[0], SemiStructuredMesh)
+        ) or self.axis_id.get(dimension, dimension) >= 3:
+            return [
+                self.pixelize(
+                    dimension, data_source, field, bounds, size, antialias, periodic
+                )
+                for field in fields
+            ]
+
+        buffs = [None] * len(fields)
+        batched = []
+        for i, field in enumerate(fields):
+            if self._is_cartesian_pixelized(data_source, field):
+                batched.append(i)
+            else:
+                buffs[i] = self.pixelize(
+                    dimension, data_source, field, bounds, size, antialias, periodic
+                )
+        if len(batched) == 0:
+            return buffs
+
+        period = self.period[:2].copy()  # dummy here
+        period[0] = self.period[self.x_axis[dimension]]
+        period[1] = self.period[self.y_axis[dimension]]
+        if hasattr(period, "in_units"):
+            period = period.in_units("code_length").d
+
+        pfields = ["px", "py", "pdx", "pdy"]
+        px, py, pdx, pdy = (
+            np.asarray(data_source[f], dtype="float64") for f in pfields
+        )
+        data = np.empty((len(batched), px.size), dtype="float64")
+        for i, fi in enumerate(batched):
+            data[i] = data_source[fields[fi]]
+        multi_buff = np.full((len(batched), size[1], size[0]), np.nan, dtype="float64")
+        num_threads = int(get_num_threads()) or os.cpu_count() or 1
+        pixelize_cartesian_multiple(
+            multi_buff,
+            px,
+            py,
+            pdx,
+            pdy,
+            data,
+            bounds,
+            int(antialias),
+            period,
+            int(periodic),
+            num_threads=num_threads,
+        )
+        for i, fi in enumerate(batched):
+            buffs[fi] = multi_buff[i]
+        return buffs
+
+    def _is_cartesian_pixelized(self, data_source, field):
+        # Whether _ortho_pixelize deposits this field with pixelize_cartesian
+        from yt.frontends.sph.data_structures import ParticleDataset
+        from yt.frontends.stream.data_structures import StreamParticlesDataset
+
+        field = data_source._determine_fields(field)[0]
+        finfo = data_source.ds._get_field_info(field)
+        if np.any(finfo.nodal_flag):
+            return False
+        particle_datasets = (ParticleDataset, StreamParticlesDataset)
+        return not (
+            isinstance(data_source.ds, particle_datasets) and finfo.is_sph_field
+        )
+
     def pixelize_line(self, field, start_point, end_point, npoints):
         """
         Method for sampling datasets along a line in preparation for
@@ -257,6 +355,7 @@ class CartesianCoordinateHandler(CoordinateHandler):
                 )
 
             offset = index.meshes[mesh_id]._index_offset
+            bvh = self._element_bvh(ftype, coords, indices, offset)
             ad = self.ds.all_data()
             field_data = ad[field]
 
@@ -281,6 +380,8 @@ class CartesianCoordinateHandler(CoordinateHandler):
                 npoints,
                 field_data,
                 index_offset=offset,
+                bvh=bvh,
+                num_threads=int(get_num_threads()) or os.cpu_count() or 1,
             )
             arc_length = YTArray(arc_length, start_point.units)
             plot_values = YTArray(plot_values, field_data.units)
@@ -289,6 +390,14 @@ class CartesianCoordinateHandler(CoordinateHandler):
             arc_length, plot_values = _sample_ray(ray, npoints, field)
         return arc_length, plot_values
 
+    def _element_bvh(self, ftype, coords, indices, offset):
+        # The bounding volume hierarchy of the elements of a mesh is built once
+        # and shared by all of the slices and line plots of the mesh
+        return self.ds.index.spatial_indexes.get(
+            ("element_bvh", ftype, None),
+            lambda: ElementBVH(coords, indices, offset),
+        )
+
     def _ortho_pixelize(
         self, data_source, field, bounds, size, antialias, dim, periodic
     ):
@@ -148,6 +148,27 @@ class CoordinateHandler(abc.ABC):
         # pixelizer
         pass
 
+    def pixelize_multiple(
+        self,
+        dimension,
+        data_source,
+        fields,
+        bounds,
+        size,
+        antialias=True,
+        periodic=True,
+    ):
+        """
+        Pixelizes several fields at once, returning a list of buffers.
+        Coordinate handlers that can share work between fields override this.
+        """
+        return [
+            self.pixelize(
+                dimension, data_source, field, bounds, size, antialias, periodic
+            )
+            for field in fields
+        ]
+
     @abc.abstractmethod
     def pixelize_line(self, field, start_point, end_point, npoints):
         pass
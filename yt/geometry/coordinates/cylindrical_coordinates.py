@@ -114,6 +114,21 @@ class CylindricalCoordinateHandler(CoordinateHandler):
             # Pixelizing along a cylindrical surface is a bit tricky
             raise NotImplementedError
 
+    def pixelize_multiple(
+        self,
+        dimension,
+        data_source,
+        fields,
+        bounds,
+        size,
+        antialias=True,
+        periodic=False,
+    ):
+        # Not periodic by default, as for pixelize
+        return super().pixelize_multiple(
+            dimension, data_source, fields, bounds, size, antialias, periodic
+        )
+
     def pixelize_line(self, field, start_point, end_point, npoints):
         raise NotImplementedError
 
@@ -0,0 +1,85 @@
+"""
+A cache of the field data read from disk for the grids, oct domains and
+particle data files of a dataset, shared by all of its data objects.
+"""
+from yt.config import ytcfg
+from yt.geometry.selection_cache import SelectionCache
+
+
+def field_parameters_key(field_parameters):
+    """A hashable key describing the values of a set of field parameters."""
+    key = []
+    for name, value in sorted(field_parameters.items()):
+        units = str(getattr(value, "units", ""))
+        if hasattr(value, "tobytes"):
+            value = (value.dtype.str, value.shape, value.tobytes())
+        key.append((name, repr(value), units))
+    return tuple(key)
+
+
+class FieldDataCache(SelectionCache):
+    r"""
+    A memory-bounded cache of the field data of a dataset.
+
+    The raw, on-disk values of the fields are cached for every object they
+    are read from: grids, (cpu, level) blocks of the files of oct domains and
+    the particle data files, so that reading the same fields again, for the
+    same or for another data object, does not hit the disk.  Keys are tuples
+    ``(kind, object_key, field)``.  The derived fields generated by data
+    objects are cached too if the ``field_cache_derived`` configuration option
+    is set.  The least recently used data are released once their size
+    exceeds ``max_memory`` bytes.
+
+    Cached arrays are read-only: data objects select from them, or copy them.
+
+    Parameters
+    ----------
+    max_memory : int, optional
+        The maximum size of the cached data, in bytes.  Defaults to the
+        ``field_cache_max_memory`` configuration option.  A non-positive value
+        disables the cache.
+    """
+
+    _max_memory_option = "field_cache_max_memory"
+
+    @property
+    def enabled(self):
+        return self.max_memory > 0
+
+    @property
+    def derived(self):
+        """Whether derived fields are cached."""
+        return self.enabled and ytcfg.get("yt", "field_cache_derived")
+
+    def lookup(self, key):
+        """
+        Returns the data stored under ``key``, raising a KeyError if there are
+        none.
+        """
+        if key not in self._results:
+            self.misses += 1
+            raise KeyError(key)
+        self.hits += 1
+        self._results.move_to_end(key)
+        return self._results[key][0]
+
+    def invalidate(self, field=None, kind=None):
+        r"""
+        Removes the cached data of a field, of a kind of object, or both.
+
+        Parameters
+        ----------
+        field : tuple of str or str, optional
+            The field to forget, either a ``(field type, field name)`` tuple
+            or a field name of any type.  Defaults to all of the fields.
+        kind : str, optional
+            The kind of object to forget the data of, for instance ``"grid"``
+            or ``"derived"``.  Defaults to all kinds.
+        """
+        for key in self.keys():
+            key_kind, _, key_field = key
+            if kind is not None and key_kind != kind:
+                continue
+            if field is not None and field not in (key_field, key_field[1]):
+                continue
+            self.discard(key)
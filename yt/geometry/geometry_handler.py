@@ -6,6 +6,9 @@ from typing import Optional, Tuple
 import numpy as np
 
 from yt.config import ytcfg
+from yt.geometry.field_cache import FieldDataCache
+from yt.geometry.selection_cache import SelectionCache
+from yt.geometry.spatial_index import SpatialIndexRegistry
 from yt.units.yt_array import YTArray, uconcatenate  # type: ignore
 from yt.utilities.exceptions import YTFieldNotFound
 from yt.utilities.io_handler import io_registry
@@ -15,6 +18,7 @@ from yt.utilities.parallel_tools.parallel_analysis_interface import (
     ParallelAnalysisInterface,
     parallel_root_only,
 )
+from yt.utilities.performance_counters import yt_spans
 
 
 class Index(ParallelAnalysisInterface, abc.ABC):
@@ -48,6 +52,27 @@ class Index(ParallelAnalysisInterface, abc.ABC):
     def _detect_output_fields(self):
         pass
 
+    @property
+    def spatial_indexes(self):
+        """The registry of the k-d trees and octrees built on this dataset."""
+        if getattr(self, "_spatial_indexes", None) is None:
+            self._spatial_indexes = SpatialIndexRegistry()
+        return self._spatial_indexes
+
+    @property
+    def selection_cache(self):
+        """The cache of the selection masks and counts of this dataset."""
+        if getattr(self, "_selection_cache", None) is None:
+            self._selection_cache = SelectionCache()
+        return self._selection_cache
+
+    @property
+    def field_cache(self):
+        """The cache of the field data read from this dataset."""
+        if getattr(self, "_field_cache", None) is None:
+            self._field_cache = FieldDataCache()
+        return self._field_cache
+
     def _icoords_to_fcoords(
         self,
         icoords: np.ndarray,
@@ -218,12 +243,23 @@ class Index(ParallelAnalysisInterface, abc.ABC):
         selector = dobj.selector
         if chunk is None:
             self._identify_base_chunk(dobj)
-        chunks = self._chunk_io(dobj, cache=False)
-        fields_to_return = self.io._read_particle_selection(
-            chunks, selector, fields_to_read
+        chunks = yt_spans.iterate(
+            "index.chunk_io", self._chunk_io_fields(dobj, fields_to_read)
         )
+        with yt_spans("io.read_particle_selection", fields=len(fields_to_read)) as span:
+            fields_to_return = self.io._read_particle_selection(
+                chunks, selector, fields_to_read
+            )
+            span.add(
+                bytes=sum(v.nbytes for v in fields_to_return.values()),
+                particles=sum(v.shape[0] for v in fields_to_return.values()),
+            )
         return fields_to_return, fields_to_generate
 
+    def _chunk_io_fields(self, dobj, fields):
+        # The io chunks of a data object needed to read the given fields
+        return self._chunk_io(dobj, cache=False)
+
     def _read_fluid_fields(self, fields, dobj, chunk=None):
         if len(fields) == 0:
             return {}, []
@@ -236,9 +272,14 @@ class Index(ParallelAnalysisInterface, abc.ABC):
             chunk_size = dobj.size
         else:
             chunk_size = chunk.data_size
-        fields_to_return = self.io._read_fluid_selection(
-            self._chunk_io(dobj), selector, fields_to_read, chunk_size
-        )
+        chunks = yt_spans.iterate("index.chunk_io", self._chunk_io(dobj))
+        with yt_spans(
+            "io.read_fluid_selection", fields=len(fields_to_read), cells=chunk_size
+        ) as span:
+            fields_to_return = self.io._read_fluid_selection(
+                chunks, selector, fields_to_read, chunk_size
+            )
+            span.add(bytes=sum(v.nbytes for v in fields_to_return.values()))
         return fields_to_return, fields_to_generate
 
     def _chunk(self, dobj, chunking_style, ngz=0, **kwargs):
@@ -252,7 +293,7 @@ class Index(ParallelAnalysisInterface, abc.ABC):
         elif chunking_style == "spatial":
             return self._chunk_spatial(dobj, ngz, **kwargs)
         elif chunking_style == "io":
-            return self._chunk_io(dobj, **kwargs)
+            return yt_spans.iterate("index.chunk_io", self._chunk_io(dobj, **kwargs))
         else:
             raise NotImplementedError
 
@@ -13,6 +13,7 @@ from yt.funcs import ensure_numpy_array, iter_fields
 from yt.geometry.geometry_handler import ChunkDataCache, Index, YTDataChunk
 from yt.utilities.definitions import MAXLEVEL
 from yt.utilities.logger import ytLogger as mylog
+from yt.utilities.performance_counters import yt_spans
 
 from .grid_container import GridTree, MatchPointsToGrids
 
@@ -293,35 +294,62 @@ class GridIndex(Index, abc.ABC):
         ind = pts.find_points_in_tree()
         return self.grids[ind], ind
 
-    def _get_grid_tree(self):
+    _grid_parent_index = None
 
-        left_edge = self.ds.arr(np.zeros((self.num_grids, 3)), "code_length")
-        right_edge = self.ds.arr(np.zeros((self.num_grids, 3)), "code_length")
-        level = np.zeros((self.num_grids), dtype="int64")
-        parent_ind = np.zeros((self.num_grids), dtype="int64")
-        num_children = np.zeros((self.num_grids), dtype="int64")
-        dimensions = np.zeros((self.num_grids, 3), dtype="int32")
+    @property
+    def grid_parent_index(self):
+        """
+        The index of the parent of every grid, or -1 for grids without one.
 
-        for i, grid in enumerate(self.grids):
+        The parent of a grid is the grid of the next coarser level containing
+        the center of its first cell.
+        """
+        if self._grid_parent_index is None:
+            parents = np.full(self.num_grids, -1, dtype="int64")
+            left_edges = self.grid_left_edge.d
+            right_edges = self.grid_right_edge.d
+            levels = self.grid_levels[:, 0]
+            points = left_edges + 0.5 * (right_edges - left_edges) / (
+                self.grid_dimensions
+            )
+            for level in np.unique(levels[levels > 0]):
+                children = np.flatnonzero(levels == level)
+                candidates = np.flatnonzero(levels == level - 1)
+                if candidates.size == 0:
+                    continue
+                # in chunks of children, to bound the size of the masks
+                chunk_size = max(1, 2**22 // candidates.size)
+                for start in range(0, children.size, chunk_size):
+                    chunk = children[start : start + chunk_size]
+                    inside = np.all(
+                        (left_edges[candidates] <= points[chunk, None])
+                        & (right_edges[candidates] > points[chunk, None]),
+                        axis=2,
+                    )
+                    found = inside.any(axis=1)
+                    parents[chunk[found]] = candidates[inside.argmax(axis=1)[found]]
+            self._grid_parent_index = parents
+        return self._grid_parent_index
 
-            left_edge[i, :] = grid.LeftEdge
-            right_edge[i, :] = grid.RightEdge
-            level[i] = grid.Level
-            if grid.Parent is None:
-                parent_ind[i] = -1
-            else:
-                parent_ind[i] = grid.Parent.id - grid.Parent._id_offset
-            num_children[i] = np.int64(len(grid.Children))
-            dimensions[i, :] = grid.ActiveDimensions
+    def _get_grid_tree(self):
+        # The tree is built from the index arrays once and then shared
+        return self.spatial_indexes.get(
+            ("grid_tree", None, None), self._build_grid_tree
+        )
 
+    def _build_grid_tree(self):
+        parent_ind = self.grid_parent_index
+        num_children = np.bincount(
+            parent_ind[parent_ind >= 0], minlength=self.num_grids
+        )
         return GridTree(
             self.num_grids,
-            left_edge,
-            right_edge,
-            dimensions,
+            np.ascontiguousarray(self.grid_left_edge.d, dtype="float64"),
+            np.ascontiguousarray(self.grid_right_edge.d, dtype="float64"),
+            np.ascontiguousarray(self.grid_dimensions, dtype="int32"),
             parent_ind,
-            level,
-            num_children,
+            self.grid_levels[:, 0].astype("int64"),
+            num_children.astype("int64"),
         )
 
     def convert(self, unit):
@@ -333,28 +361,100 @@ class GridIndex(Index, abc.ABC):
             dobj._chunk_info = np.empty(1, dtype="object")
             dobj._chunk_info[0] = weakref.proxy(dobj)
         elif getattr(dobj, "_grids", None) is None:
-            gi = dobj.selector.select_grids(
-                self.grid_left_edge, self.grid_right_edge, self.grid_levels
+            selected = self.selection_cache.get(
+                (hash(dobj.selector), "grids"),
+                lambda: self._select_grids(dobj.selector),
             )
-            if any([g.filename is not None for g in self.grids[gi]]):
-                _gsort = _grid_sort_mixed
-            else:
-                _gsort = _grid_sort_id
-            grids = sorted(self.grids[gi], key=_gsort)
-            dobj._chunk_info = np.empty(len(grids), dtype="object")
-            for i, g in enumerate(grids):
-                dobj._chunk_info[i] = g
+            dobj._chunk_info = self.grids[selected]
         # These next two lines, when uncommented, turn "on" the fast index.
         # if dobj._type_name != "grid":
         #    fast_index = self._get_grid_tree()
         if getattr(dobj, "size", None) is None:
-            dobj.size = self._count_selection(dobj, fast_index=fast_index)
+            with yt_spans("selector.count") as span:
+                dobj.size = self._count_selection(dobj, fast_index=fast_index)
+                span.add(cells=dobj.size)
         if getattr(dobj, "shape", None) is None:
             dobj.shape = (dobj.size,)
         dobj._current_chunk = list(
             self._chunk_all(dobj, cache=False, fast_index=fast_index)
         )[0]
 
+    def _select_grids(self, selector):
+        # The indices of the grids selected by a selector, in chunking order
+        with yt_spans("selector.select_grids", grids=self.num_grids) as span:
+            gi = selector.select_grids(
+                self.grid_left_edge, self.grid_right_edge, self.grid_levels
+            )
+            span.add(selected=int(gi.sum()))
+        selected = np.flatnonzero(gi)
+        return selected[np.argsort(self._grid_chunk_rank[selected])]
+
+    def _read_fluid_fields(self, fields, dobj, chunk=None):
+        # With the field cache, whole grids are read and kept, and the cells
+        # selected by data objects are then copied out of them
+        if not self.field_cache.enabled or len(fields) == 0:
+            return super()._read_fluid_fields(fields, dobj, chunk)
+        fields_to_read, fields_to_generate = self._split_fields(fields)
+        if len(fields_to_read) == 0:
+            return {}, fields_to_generate
+        if chunk is None:
+            self._identify_base_chunk(dobj)
+            size = dobj.size
+        else:
+            size = chunk.data_size
+        if dobj._type_name == "grid":
+            data = self._read_cached_grid(dobj, fields_to_read)
+            return {f: v.copy() for f, v in data.items()}, fields_to_generate
+        grids = getattr(dobj._current_chunk, "objs", dobj._chunk_info)
+        if any(g._type_name != "grid" for g in grids) or any(
+            np.any(self.ds.field_info[f].nodal_flag) for f in fields_to_read
+        ):
+            # ghost zones and nodal fields are read as usual
+            return super()._read_fluid_fields(fields, dobj, chunk)
+        rv = {field: np.empty(size, dtype="=f8") for field in fields_to_read}
+        ind = {field: 0 for field in fields_to_read}
+        for g in grids:
+            data = self._read_cached_grid(g, fields_to_read)
+            for field in fields_to_read:
+                # some frontends read grids as flattened arrays
+                source = data[field].reshape(g.ActiveDimensions)
+                ind[field] += g.select(dobj.selector, source, rv[field], ind[field])
+        return rv, fields_to_generate
+
+    def _read_cached_grid(self, grid, fields):
+        data, missing = {}, []
+        for field in fields:
+            try:
+                data[field] = self.field_cache.lookup(("grid", grid.id, field))
+            except KeyError:
+                missing.append(field)
+        if missing:
+            read, _ = super()._read_fluid_fields(missing, grid)
+            for field, values in read.items():
+                self.field_cache.add(("grid", grid.id, field), values)
+                data[field] = values
+        return data
+
+    _grid_chunk_rank_cache = None
+
+    @property
+    def _grid_chunk_rank(self):
+        # The rank of every grid in the order grids are chunked in: by id or,
+        # if any grid has a file name, by file name (or id, as a string)
+        if self._grid_chunk_rank_cache is None:
+            ids = [g.id for g in self.grids]
+            filenames = [g.filename for g in self.grids]
+            if all(fn is None for fn in filenames):
+                keys = np.array(ids, dtype="int64")
+            else:
+                keys = np.array(
+                    [str(i) if fn is None else fn for i, fn in zip(ids, filenames)]
+                )
+            rank = np.empty(self.num_grids, dtype="int64")
+            rank[np.argsort(keys, kind="stable")] = np.arange(self.num_grids)
+            self._grid_chunk_rank_cache = rank
+        return self._grid_chunk_rank_cache
+
     def _count_selection(self, dobj, grids=None, fast_index=None):
         if fast_index is not None:
             return fast_index.count(dobj.selector)
@@ -507,13 +607,3 @@ class GridIndex(Index, abc.ABC):
             take_log=take_log,
             validators=[ValidateSpatial()],
         )
-
-
-def _grid_sort_id(g):
-    return g.id
-
-
-def _grid_sort_mixed(g):
-    if g.filename is None:
-        return str(g.id)
-    return g.filename
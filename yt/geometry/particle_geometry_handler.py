@@ -6,14 +6,66 @@ import weakref
 
 import numpy as np
 
+from yt.config import ytcfg
 from yt.data_objects.index_subobjects.particle_container import ParticleContainer
 from yt.funcs import get_pbar, only_on_root
 from yt.geometry.geometry_handler import Index, YTDataChunk
 from yt.geometry.particle_oct_container import ParticleBitmap
+from yt.geometry.selection_routines import (
+    CuttingPlaneSelector,
+    DiskSelector,
+    EllipsoidSelector,
+    OrthoRaySelector,
+    RaySelector,
+    RegionSelector,
+    SliceSelector,
+    SphereSelector,
+)
 from yt.utilities.lib.ewah_bool_wrap import BoolArrayCollection
 from yt.utilities.lib.fnv_hash import fnv_hash
 from yt.utilities.logger import ytLogger as mylog
 from yt.utilities.parallel_tools.parallel_analysis_interface import parallel_objects
+from yt.utilities.performance_counters import yt_spans
+
+# The selectors whose bounding box tests are exact enough to skip the blocks of
+# particles outside of them
+_block_selectors = (
+    CuttingPlaneSelector,
+    DiskSelector,
+    EllipsoidSelector,
+    OrthoRaySelector,
+    RaySelector,
+    RegionSelector,
+    SliceSelector,
+    SphereSelector,
+)
+
+
+def _particle_block_bounds(pos, hsml, block_size, left_edge, right_edge, periodicity):
+    """
+    Returns the bounding boxes, smoothing lengths included, of the consecutive
+    blocks of block_size particles as an array of shape (nblocks, 2, 3), or
+    None if there are no particles.
+    """
+    if pos.shape[0] == 0:
+        return None
+    starts = np.arange(0, pos.shape[0], block_size)
+    if hsml is None:
+        lo = hi = pos
+    else:
+        hsml = np.asarray(hsml, dtype="float64").reshape(-1, 1)
+        lo, hi = pos - hsml, pos + hsml
+    bounds = np.empty((starts.size, 2, 3), dtype="float64")
+    bounds[:, 0] = np.minimum.reduceat(lo, starts, axis=0)
+    bounds[:, 1] = np.maximum.reduceat(hi, starts, axis=0)
+    # blocks smoothed across a periodic boundary span the whole domain
+    for i in range(3):
+        if not periodicity[i]:
+            continue
+        wraps = (bounds[:, 0, i] < left_edge[i]) | (bounds[:, 1, i] > right_edge[i])
+        bounds[wraps, 0, i] = left_edge[i]
+        bounds[wraps, 1, i] = right_edge[i]
+    return bounds
 
 
 class ParticleIndex(Index):
@@ -171,19 +223,41 @@ class ParticleIndex(Index):
             index_order2=order2,
         )
 
+        # Optionally, an index for each particle type, so that reading the
+        # fields of some particle types only touches the files holding them
+        self._ptype_regions = {}
+        if ytcfg.get("yt", "particle_index_per_type") and len(self.data_files) > 1:
+            for ptype in sorted(ds.particle_types_raw):
+                self._ptype_regions[ptype] = ParticleBitmap(
+                    ds.domain_left_edge,
+                    ds.domain_right_edge,
+                    ds.periodicity,
+                    self.ds._file_hash,
+                    len(self.data_files),
+                    index_order1=order1,
+                    index_order2=order2,
+                )
+
         # Load Morton index from file if provided
-        def _current_fname():
+        def _current_fname(regions=self.regions, ptype=None):
             if getattr(ds, "index_filename", None) is None:
-                fname = ds.parameter_filename + ".index{}_{}.ewah".format(
-                    self.regions.index_order1, self.regions.index_order2
+                fname = ds.parameter_filename + ".index{}_{}".format(
+                    regions.index_order1, regions.index_order2
                 )
+                if ptype is not None:
+                    fname += f".{ptype}"
+                fname += ".ewah"
             else:
                 fname = ds.index_filename
+                if ptype is not None:
+                    fname += f".{ptype}"
             return fname
 
         fname = _current_fname()
 
         dont_load = dont_cache and not hasattr(ds, "index_filename")
+        # the indexes which could not be loaded, with their particle type
+        to_build = []
         try:
             if dont_load:
                 raise OSError
@@ -192,24 +266,51 @@ class ParticleIndex(Index):
             self._initialize_frontend_specific()
             if rflag == 0:
                 raise OSError
+            self._load_particle_blocks(fname)
         except (OSError, struct.error):
             self.regions.reset_bitmasks()
-            self._initialize_coarse_index()
-            self._initialize_refined_index()
+            to_build.append((self.regions, None))
+        for ptype, regions in sorted(self._ptype_regions.items()):
+            try:
+                if dont_load:
+                    raise OSError
+                regions.load_bitmasks(_current_fname(regions, ptype))
+                if regions.check_bitmasks() == 0:
+                    raise OSError
+            except (OSError, struct.error):
+                regions.reset_bitmasks()
+                to_build.append((regions, ptype))
+        if not to_build:
+            return
+
+        # all of the indexes are built in the same passes over the particles
+        self._initialize_coarse_index(to_build)
+        self._initialize_refined_index(to_build)
+        for regions, ptype in to_build:
             # We now update fname since index_order2 may have changed
-            fname = _current_fname()
+            fname = _current_fname(regions, ptype)
             wdir = os.path.dirname(fname)
             if not dont_cache and os.access(wdir, os.W_OK):
                 # Sometimes os mis-reports whether a directory is writable,
                 # So pass if writing the bitmask file fails.
                 try:
-                    self.regions.save_bitmasks(fname)
+                    regions.save_bitmasks(fname)
+                    if ptype is None:
+                        self._save_particle_blocks(fname)
                 except OSError:
                     pass
-            rflag = self.regions.check_bitmasks()
-
-    def _initialize_coarse_index(self):
-        max_hsml = 0.0
+            rflag = regions.check_bitmasks()
+
+    def _initialize_coarse_index(self, to_build=None):
+        # to_build is a list of (bitmap index, particle type indexed by it or
+        # None for all of them)
+        if to_build is None:
+            to_build = [(self.regions, None)]
+        max_hsml = [0.0] * len(to_build)
+        # the bounds of the blocks of particles are found in the same pass
+        block_size = ytcfg.get("yt", "particle_block_size")
+        if block_size > 0 and self._particle_blocks is None:
+            self._particle_blocks = {}
         pb = get_pbar("Initializing coarse index ", len(self.data_files))
         for i, data_file in parallel_objects(enumerate(self.data_files)):
             pb.update(i + 1)
@@ -219,36 +320,58 @@ class ParticleIndex(Index):
                     hsml = self.io._get_smoothing_length(
                         data_file, pos.dtype, pos.shape
                     )
-                    if hsml is not None and hsml.size > 0.0:
-                        max_hsml = max(max_hsml, hsml.max())
                 else:
                     hsml = None
-                self.regions._coarse_index_data_file(pos, hsml, data_file.file_id)
+                if block_size > 0:
+                    self._particle_blocks[
+                        data_file.file_id, ptype
+                    ] = self._compute_particle_blocks(pos, hsml)
+                for j, (regions, index_ptype) in enumerate(to_build):
+                    if index_ptype not in (None, ptype):
+                        continue
+                    if hsml is not None and hsml.size > 0.0:
+                        max_hsml[j] = max(max_hsml[j], hsml.max())
+                    regions._coarse_index_data_file(pos, hsml, data_file.file_id)
         pb.finish()
-        self.regions.masks = self.comm.mpi_allreduce(self.regions.masks, op="sum")
-        self.regions.particle_counts = self.comm.mpi_allreduce(
-            self.regions.particle_counts, op="sum"
-        )
-        for data_file in self.data_files:
-            self.regions._set_coarse_index_data_file(data_file.file_id)
-        self.regions.find_collisions_coarse()
-        if max_hsml > 0.0 and len(self.data_files) > 1:
-            # By passing this in, we only allow index_order2 to be increased by
-            # two at most, never increased.  One place this becomes particularly
-            # useful is in the case of an extremely small section of gas
-            # particles embedded in a much much larger domain.  The max
-            # smoothing length will be quite small, so based on the larger
-            # domain, it will correspond to a very very high index order, which
-            # is a large amount of memory!  Having multiple indexes, one for
-            # each particle type, would fix this.
-            new_order2 = self.regions.update_mi2(max_hsml, ds.index_order[1] + 2)
-            mylog.info(
-                "Updating index_order2 from %s to %s", ds.index_order[1], new_order2
+        for j, (regions, index_ptype) in enumerate(to_build):
+            regions.masks = self.comm.mpi_allreduce(regions.masks, op="sum")
+            regions.particle_counts = self.comm.mpi_allreduce(
+                regions.particle_counts, op="sum"
             )
-            self.ds.index_order = (self.ds.index_order[0], new_order2)
+            for data_file in self.data_files:
+                regions._set_coarse_index_data_file(data_file.file_id)
+            regions.find_collisions_coarse()
+            if max_hsml[j] == 0.0 or len(self.data_files) == 1:
+                continue
+            if index_ptype is not None:
+                new_order2 = regions.update_mi2(max_hsml[j], ds.index_order[1] + 2)
+                mylog.info(
+                    "Updating index_order2 of the %s index from %s to %s",
+                    index_ptype,
+                    ds.index_order[1],
+                    new_order2,
+                )
+            elif not self._ptype_regions:
+                # By passing this in, we only allow index_order2 to be
+                # increased by two at most, never increased.  One place this
+                # becomes particularly useful is in the case of an extremely
+                # small section of gas particles embedded in a much much larger
+                # domain.  The max smoothing length will be quite small, so
+                # based on the larger domain, it will correspond to a very very
+                # high index order, which is a large amount of memory!  The
+                # particle_index_per_type option builds an index for each
+                # particle type instead, only the index of the smoothed
+                # particles being refined.
+                new_order2 = regions.update_mi2(max_hsml[j], ds.index_order[1] + 2)
+                mylog.info(
+                    "Updating index_order2 from %s to %s", ds.index_order[1], new_order2
+                )
+                self.ds.index_order = (self.ds.index_order[0], new_order2)
 
-    def _initialize_refined_index(self):
-        mask = self.regions.masks.sum(axis=1).astype("uint8")
+    def _initialize_refined_index(self, to_build=None):
+        if to_build is None:
+            to_build = [(self.regions, None)]
+        masks = [regions.masks.sum(axis=1).astype("uint8") for regions, _ in to_build]
         max_npart = max(sum(d.total_particles.values()) for d in self.data_files) * 28
         sub_mi1 = np.zeros(max_npart, "uint64")
         sub_mi2 = np.zeros(max_npart, "uint64")
@@ -261,19 +384,20 @@ class ParticleIndex(Index):
             count_threshold,
         )
         total_refined = 0
-        total_coarse_refined = (
-            (mask >= 2) & (self.regions.particle_counts > count_threshold)
-        ).sum()
-        mylog.debug(
-            "This should produce roughly %s zones, for %s of the domain",
-            total_coarse_refined,
-            100 * total_coarse_refined / mask.size,
-        )
+        for (regions, _), mask in zip(to_build, masks):
+            total_coarse_refined = (
+                (mask >= 2) & (regions.particle_counts > count_threshold)
+            ).sum()
+            mylog.debug(
+                "This should produce roughly %s zones, for %s of the domain",
+                total_coarse_refined,
+                100 * total_coarse_refined / mask.size,
+            )
         storage = {}
         for sto, (i, data_file) in parallel_objects(
             enumerate(self.data_files), storage=storage
         ):
-            coll = None
+            colls = [None] * len(to_build)
             pb.update(i + 1)
             nsub_mi = 0
             for ptype, pos in self.io._yield_coordinates(data_file):
@@ -285,32 +409,34 @@ class ParticleIndex(Index):
                     )
                 else:
                     hsml = None
-                nsub_mi, coll = self.regions._refined_index_data_file(
-                    coll,
-                    pos,
-                    hsml,
-                    mask,
-                    sub_mi1,
-                    sub_mi2,
-                    data_file.file_id,
-                    nsub_mi,
-                    count_threshold=count_threshold,
-                    mask_threshold=mask_threshold,
-                )
-                total_refined += nsub_mi
+                for j, (regions, index_ptype) in enumerate(to_build):
+                    if index_ptype not in (None, ptype):
+                        continue
+                    nsub_mi, colls[j] = regions._refined_index_data_file(
+                        colls[j],
+                        pos,
+                        hsml,
+                        masks[j],
+                        sub_mi1,
+                        sub_mi2,
+                        data_file.file_id,
+                        nsub_mi,
+                        count_threshold=count_threshold,
+                        mask_threshold=mask_threshold,
+                    )
+                    total_refined += nsub_mi
             sto.result_id = i
-            if coll is None:
-                coll_str = b""
-            else:
-                coll_str = coll.dumps()
-            sto.result = (data_file.file_id, coll_str)
+            coll_strs = [b"" if coll is None else coll.dumps() for coll in colls]
+            sto.result = (data_file.file_id, coll_strs)
         pb.finish()
         for i in sorted(storage):
-            file_id, coll_str = storage[i]
-            coll = BoolArrayCollection()
-            coll.loads(coll_str)
-            self.regions.bitmasks.append(file_id, coll)
-        self.regions.find_collisions_refined()
+            file_id, coll_strs = storage[i]
+            for (regions, _), coll_str in zip(to_build, coll_strs):
+                coll = BoolArrayCollection()
+                coll.loads(coll_str)
+                regions.bitmasks.append(file_id, coll)
+        for regions, _ in to_build:
+            regions.find_collisions_refined()
 
     def _detect_output_fields(self):
         # TODO: Add additional fields
@@ -337,6 +463,163 @@ class ParticleIndex(Index):
         ds.field_units.update(units)
         ds.particle_types_raw = ds.particle_types
 
+    def _identify_file_masks(self, selector):
+        with yt_spans(
+            "selector.identify_file_masks", files=self.regions.nfiles
+        ) as span:
+            rv = self.regions.identify_file_masks(selector)
+            span.add(selected=len(rv[1]))
+        return rv
+
+    _particle_blocks = None
+
+    def _compute_particle_blocks(self, pos, hsml):
+        return _particle_block_bounds(
+            pos,
+            hsml,
+            ytcfg.get("yt", "particle_block_size"),
+            self.ds.domain_left_edge.d,
+            self.ds.domain_right_edge.d,
+            self.ds.periodicity,
+        )
+
+    def _particle_blocks_fname(self, fname):
+        block_size = ytcfg.get("yt", "particle_block_size")
+        return f"{fname}.blocks{block_size}.npz"
+
+    def _save_particle_blocks(self, fname):
+        if not self._particle_blocks:
+            return
+        arrays = {
+            f"{file_id}_{ptype}": bounds
+            for (file_id, ptype), bounds in self._particle_blocks.items()
+            if bounds is not None
+        }
+        np.savez(
+            self._particle_blocks_fname(fname),
+            file_hash=np.int64(self.ds._file_hash),
+            **arrays,
+        )
+
+    def _load_particle_blocks(self, fname):
+        if ytcfg.get("yt", "particle_block_size") <= 0:
+            return
+        self._particle_blocks = {}
+        try:
+            f = np.load(self._particle_blocks_fname(fname))
+        except OSError:
+            # the blocks are found when they are first needed
+            return
+        with f:
+            if int(f["file_hash"]) != self.ds._file_hash:
+                return
+            for key in f.files:
+                if key == "file_hash":
+                    continue
+                file_id, ptype = key.split("_", 1)
+                self._particle_blocks[int(file_id), ptype] = f[key]
+
+    def _particle_block_bounds(self, data_file, ptype):
+        """
+        Returns the bounding boxes of the consecutive blocks of particles of a
+        type in a data file, finding them if needed.
+        """
+        if self._particle_blocks is None:
+            self._particle_blocks = {}
+        key = (data_file.file_id, ptype)
+        if key not in self._particle_blocks:
+            bounds = None
+            for yptype, pos in self.io._yield_coordinates(
+                data_file, needed_ptype=ptype
+            ):
+                if yptype != ptype:
+                    continue
+                hsml = None
+                if ptype == getattr(self.ds, "_sph_ptypes", (None,))[0]:
+                    hsml = self.io._get_smoothing_length(
+                        data_file, pos.dtype, pos.shape
+                    )
+                bounds = self._compute_particle_blocks(pos, hsml)
+            self._particle_blocks[key] = bounds
+        return self._particle_blocks[key]
+
+    def _particle_ranges(self, data_file, ptype, selector):
+        """
+        Returns the (start, end) ranges of the particles of a type in a data
+        file which may be selected by ``selector``.
+
+        With the particle_block_size option, the particles of the data files
+        are split into blocks of consecutive particles whose bounding boxes
+        are kept, so that only the blocks touched by the selector are read.
+        Otherwise, this is the range of all of the particles of the data file.
+        """
+        start = data_file.start
+        count = data_file.total_particles[ptype]
+        block_size = ytcfg.get("yt", "particle_block_size")
+        if (
+            block_size <= 0
+            or count <= block_size
+            or not isinstance(selector, _block_selectors)
+        ):
+            return [(start, start + count)]
+
+        def _build():
+            bounds = self._particle_block_bounds(data_file, ptype)
+            if bounds is None:
+                return [(start, start + count)]
+            levels = np.zeros((bounds.shape[0], 1), dtype="int32")
+            selected = selector.select_grids(bounds[:, 0], bounds[:, 1], levels)
+            # runs of selected blocks are read at once
+            edges = np.diff(np.concatenate([[0], selected.astype("int8"), [0]]))
+            return [
+                (start + b * block_size, start + min(e * block_size, count))
+                for b, e in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1))
+            ]
+
+        return self.selection_cache.get(
+            (hash(selector), "particle_ranges", data_file.file_id, ptype), _build
+        )
+
+    def _identify_ptype_files(self, selector, ptypes):
+        """
+        Returns the ids of the data files which may hold particles of the
+        given types selected by ``selector``, from the indexes of these types,
+        or None if the files cannot be restricted to them.
+        """
+        if not ptypes or not set(ptypes) <= set(self.ds.particle_types_raw):
+            return None
+
+        def _build():
+            file_ids = set()
+            for ptype in ptypes:
+                regions = self._ptype_regions.get(ptype)
+                if regions is None or getattr(selector, "is_all_data", False):
+                    file_ids.update(
+                        data_file.file_id
+                        for data_file in self.data_files
+                        if data_file.total_particles.get(ptype, 1) > 0
+                    )
+                else:
+                    dfi = regions.identify_file_masks(selector)[0]
+                    file_ids.update(int(i) for i in dfi)
+            return frozenset(file_ids)
+
+        return self.selection_cache.get((hash(selector), "ptype_files", ptypes), _build)
+
+    def _chunk_io_fields(self, dobj, fields):
+        ptypes = set()
+        for ftype, _ in fields:
+            ptypes.update(self.ds.particle_unions.get(ftype, (ftype,)))
+        file_ids = self._identify_ptype_files(dobj.selector, tuple(sorted(ptypes)))
+        for chunk in self._chunk_io(dobj, cache=False):
+            # skip the files without any selected particle of these types
+            if file_ids is None or any(
+                data_file.file_id in file_ids
+                for obj in chunk.objs
+                for data_file in obj.data_files
+            ):
+                yield chunk
+
     def _identify_base_chunk(self, dobj):
         # Must check that chunk_info contains the right number of ghost zones
         if getattr(dobj, "_chunk_info", None) is None:
@@ -348,8 +631,9 @@ class ParticleIndex(Index):
                     nfiles = self.regions.nfiles
                     dfi = np.arange(nfiles)
                 else:
-                    dfi, file_masks, addfi = self.regions.identify_file_masks(
-                        dobj.selector
+                    dfi, file_masks, addfi = self.selection_cache.get(
+                        (hash(dobj.selector), "file_masks"),
+                        lambda: self._identify_file_masks(dobj.selector),
                     )
                     nfiles = len(file_masks)
                 dobj._chunk_info = [None for _ in range(nfiles)]
@@ -382,6 +666,57 @@ class ParticleIndex(Index):
                 # like.
         (dobj._current_chunk,) = self._chunk_all(dobj)
 
+    _file_extents = None
+
+    def _data_file_extents(self):
+        """
+        Returns the bounding boxes, in code_length, of the particles of every
+        data file (including their smoothing lengths), as an array of shape
+        (nfiles, 2, 3).  Data files without particles have an empty bounding
+        box.  The bounds of the blocks of particles are used if they are known.
+        """
+        if self._file_extents is not None:
+            return self._file_extents
+        extents = np.empty((len(self.data_files), 2, 3), dtype="float64")
+        extents[:, 0] = np.inf
+        extents[:, 1] = -np.inf
+        sph_ptype = getattr(self.ds, "_sph_ptypes", (None,))[0]
+        blocks = self._particle_blocks or {}
+        for i, data_file in enumerate(self.data_files):
+            keys = [
+                (data_file.file_id, ptype)
+                for ptype, count in data_file.total_particles.items()
+                if count > 0
+            ]
+            if all(key in blocks for key in keys):
+                bounds = [blocks[key] for key in keys]
+            else:
+                bounds = []
+                for ptype, pos in self.io._yield_coordinates(data_file):
+                    hsml = None
+                    if ptype == sph_ptype:
+                        hsml = self.io._get_smoothing_length(
+                            data_file, pos.dtype, pos.shape
+                        )
+                    # a single block of all of the particles
+                    bounds.append(
+                        _particle_block_bounds(
+                            pos,
+                            hsml,
+                            max(pos.shape[0], 1),
+                            self.ds.domain_left_edge.d,
+                            self.ds.domain_right_edge.d,
+                            self.ds.periodicity,
+                        )
+                    )
+            for ptype_bounds in bounds:
+                if ptype_bounds is None:
+                    continue
+                extents[i, 0] = np.minimum(extents[i, 0], ptype_bounds[:, 0].min(0))
+                extents[i, 1] = np.maximum(extents[i, 1], ptype_bounds[:, 1].max(0))
+        self._file_extents = extents
+        return extents
+
     def _chunk_all(self, dobj):
         oobjs = getattr(dobj._current_chunk, "objs", dobj._chunk_info)
         yield YTDataChunk(dobj, "all", oobjs, None)
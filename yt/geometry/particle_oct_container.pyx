@@ -67,6 +67,7 @@ from particle_deposit cimport gind
 #from yt.utilities.lib.ewah_bool_wrap cimport \
 from ..utilities.lib.ewah_bool_wrap cimport BoolArrayCollection
 
+import mmap
 import os
 import struct
 
@@ -76,7 +77,10 @@ import struct
 # index for the ghost cell is refined in the selector.
 DEF RefinedExternalGhosts = 1
 
-_bitmask_version = np.uint64(5)
+_bitmask_version = np.uint64(6)
+# The last version of the index files without an offset table, which are read
+# at once and then rewritten
+_bitmask_version_sequential = np.uint64(5)
 
 from ..utilities.lib.ewah_bool_wrap cimport (
     BoolArrayCollectionUncompressed as BoolArrayColl,
@@ -461,6 +465,10 @@ cdef class ParticleBitmap:
     cdef public FileBitmasks bitmasks
     cdef public BoolArrayCollection collisions
     cdef public int _used_mi2
+    cdef public object _index_map
+    cdef public object _bitmask_offsets
+    cdef public object _file_bounds
+    cdef public object _decoded
 
     def __init__(self, left_edge, right_edge, periodicity, file_hash, nfiles,
                  index_order1, index_order2):
@@ -494,11 +502,18 @@ cdef class ParticleBitmap:
         self.particle_counts = np.zeros(1 << (index_order1 * 3), dtype="uint64")
         self.bitmasks = FileBitmasks(self.nfiles)
         self.collisions = BoolArrayCollection()
+        # The bitmasks loaded from an index file are only decoded when needed
+        self._index_map = None
+        self._bitmask_offsets = None
+        self._file_bounds = None
+        self._decoded = np.ones(self.nfiles, dtype="uint8")
 
     def _bitmask_logicaland(self, ifile, bcoll, out):
+        self._decode_bitmasks([ifile])
         self.bitmasks._logicaland(ifile, bcoll, out)
 
     def _bitmask_intersects(self, ifile, bcoll):
+        self._decode_bitmasks([ifile])
         return self.bitmasks._intersects(ifile, bcoll)
 
     def update_mi2(self, np.float64_t characteristic_size,
@@ -952,6 +967,7 @@ cdef class ParticleBitmap:
     @cython.initializedcheck(False)
     def find_collisions(self, verbose=False):
         cdef tuple cc, rc
+        self._decode_bitmasks()
         cc, rc = self.bitmasks._find_collisions(self.collisions,verbose)
         return cc, rc
 
@@ -961,6 +977,7 @@ cdef class ParticleBitmap:
     @cython.initializedcheck(False)
     def find_collisions_coarse(self, verbose=False, file_list = None):
         cdef int nc, nm
+        self._decode_bitmasks()
         nc, nm = self.bitmasks._find_collisions_coarse(self.collisions, verbose, file_list)
         return nc, nm
 
@@ -972,6 +989,7 @@ cdef class ParticleBitmap:
                             BoolArrayCollection mask2 = None):
         cdef np.ndarray[np.uint8_t, ndim=1] arr = np.zeros((1 << (self.index_order1 * 3)),'uint8')
         cdef np.uint8_t[:] arr_view = arr
+        self._decode_bitmasks()
         self.bitmasks._select_uncontaminated(ifile, mask, arr_view, mask2)
         return arr
 
@@ -985,6 +1003,7 @@ cdef class ParticleBitmap:
         cdef np.uint8_t[:] arr_view = arr
         cdef np.ndarray[np.uint8_t, ndim=1] sfiles = np.zeros(self.nfiles,'uint8')
         cdef np.uint8_t[:] sfiles_view = sfiles
+        self._decode_bitmasks()
         self.bitmasks._select_contaminated(ifile, mask, arr_view, sfiles_view, mask2)
         return arr, np.where(sfiles)[0].astype('uint32')
 
@@ -994,6 +1013,7 @@ cdef class ParticleBitmap:
     @cython.initializedcheck(False)
     def find_collisions_refined(self, verbose=False):
         cdef np.int32_t nc, nm
+        self._decode_bitmasks()
         nc, nm = self.bitmasks._find_collisions_refined(self.collisions,verbose)
         return nc, nm
 
@@ -1003,6 +1023,7 @@ cdef class ParticleBitmap:
         cdef np.uint64_t ifile
         cdef int out = 0
         out += struct.calcsize('Q')
+        self._decode_bitmasks()
         # Bitmaps for each file
         for ifile in range(self.nfiles):
             serial_BAC = self.bitmasks._dumps(ifile)
@@ -1015,37 +1036,60 @@ cdef class ParticleBitmap:
         return out
 
     def get_bitmasks(self):
+        self._decode_bitmasks()
         return self.bitmasks
 
     def iseq_bitmask(self, solf):
+        self._decode_bitmasks()
         return self.bitmasks._iseq(solf.get_bitmasks())
 
     def save_bitmasks(self, fname):
         cdef bytes serial_BAC
         cdef np.uint64_t ifile
+        self._decode_bitmasks()
+        # The offset and size of the serialized bitmask of each file and of
+        # the collisions, followed by the bounds of the coarse cells of each
+        # file, so that the bitmasks can be decoded when needed
+        offsets = np.zeros((self.nfiles + 1, 2), dtype="uint64")
+        bounds = self._compute_file_bounds()
         f = open(fname,'wb')
         # Header
         f.write(struct.pack('Q', _bitmask_version))
         f.write(struct.pack('q', self.file_hash))
         f.write(struct.pack('Q', self.nfiles))
+        table_offset = f.tell()
+        f.write(offsets.tobytes())
+        f.write(bounds.tobytes())
         # Bitmap for each file
         for ifile in range(self.nfiles):
             serial_BAC = self.bitmasks._dumps(ifile)
-            f.write(struct.pack('Q', len(serial_BAC)))
+            offsets[ifile] = f.tell(), len(serial_BAC)
             f.write(serial_BAC)
         # Collisions
         serial_BAC = self.collisions._dumps()
-        f.write(struct.pack('Q', len(serial_BAC)))
+        offsets[self.nfiles] = f.tell(), len(serial_BAC)
         f.write(serial_BAC)
+        f.seek(table_offset)
+        f.write(offsets.tobytes())
         f.close()
 
     def check_bitmasks(self):
+        # Only the decoded bitmasks are checked, the others were checked when
+        # the index was built
         return self.bitmasks._check()
 
     def reset_bitmasks(self):
         self.bitmasks._reset()
+        self._index_map = None
+        self._decoded[:] = 1
 
     def load_bitmasks(self, fname):
+        r"""Loads the bitmasks saved in an index file.
+
+        Only the header of the file and the collisions are read: the bitmasks
+        of the data files are memory-mapped, and decoded the first time they
+        are needed.
+        """
         cdef bint read_flag = 1
         cdef bint irflag
         cdef np.uint64_t ver
@@ -1062,7 +1106,9 @@ cdef class ParticleBitmap:
             overwrite = 1
             nfiles = ver
             ver = 0 # Original bitmaps had number of files first
-        if ver != _bitmask_version:
+        if ver == _bitmask_version_sequential:
+            overwrite = 1
+        elif ver != _bitmask_version and ver != 0:
             raise OSError("The file format of the index has changed since "
                           "this file was created. It will be replaced with an "
                           "updated version.")
@@ -1077,6 +1123,19 @@ cdef class ParticleBitmap:
                 raise OSError(
                     "Number of bitmasks ({}) conflicts with number of files "
                     "({})".format(nfiles, self.nfiles))
+        if ver == _bitmask_version:
+            offsets = np.frombuffer(f.read(16 * (nfiles + 1)), dtype="uint64")
+            bounds = np.frombuffer(f.read(48 * nfiles), dtype="int64")
+            self._bitmask_offsets = offsets.reshape(nfiles + 1, 2)
+            self._file_bounds = bounds.reshape(nfiles, 2, 3)
+            # Collisions
+            f.seek(self._bitmask_offsets[nfiles, 0])
+            size_serial = self._bitmask_offsets[nfiles, 1]
+            irflag = self.collisions._loads(f.read(size_serial))
+            self._index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._decoded[:] = 0
+            f.close()
+            return read_flag
         # Read bitmap for each file
         pb = get_pbar("Loading particle index", nfiles)
         for ifile in range(nfiles):
@@ -1095,21 +1154,86 @@ cdef class ParticleBitmap:
             self.save_bitmasks(fname)
         return read_flag
 
+    def _decode_bitmasks(self, file_ids=None):
+        r"""Decodes the memory-mapped bitmasks of some files (by default, all
+        of them) which have not been decoded yet."""
+        cdef np.uint64_t ifile
+        if self._index_map is None:
+            return
+        if file_ids is None:
+            file_ids = np.flatnonzero(self._decoded == 0)
+        for ifile in file_ids:
+            if self._decoded[ifile]:
+                continue
+            offset, size = self._bitmask_offsets[ifile]
+            self.bitmasks._loads(ifile, self._index_map[offset:offset + size])
+            self._decoded[ifile] = 1
+        if self._decoded.all():
+            self._index_map.close()
+            self._index_map = None
+
+    cdef void _coarse_bounds(self, BoolArrayCollection mask,
+                             np.int64_t[:] lo, np.int64_t[:] hi):
+        # Extends the bounds, in coarse cells, to those of the coarse cells
+        # set in the mask
+        cdef int i
+        cdef np.uint64_t ind[3]
+        cdef ewah_bool_array *keys = <ewah_bool_array *> mask.ewah_keys
+        cdef ewah_bool_iterator *iter_set = new ewah_bool_iterator(keys[0].begin())
+        cdef ewah_bool_iterator *iter_end = new ewah_bool_iterator(keys[0].end())
+        while iter_set[0] != iter_end[0]:
+            decode_morton_64bit(dereference(iter_set[0]), ind)
+            for i in range(3):
+                lo[i] = min(lo[i], <np.int64_t> ind[i])
+                hi[i] = max(hi[i], <np.int64_t> ind[i])
+            preincrement(iter_set[0])
+        del iter_set
+        del iter_end
+
+    def _compute_file_bounds(self):
+        cdef np.uint64_t ifile
+        bounds = np.empty((self.nfiles, 2, 3), dtype="int64")
+        bounds[:, 0] = np.iinfo("int64").max
+        bounds[:, 1] = -1
+        for ifile in range(self.nfiles):
+            self._coarse_bounds(self.bitmasks._get_bitmask(ifile),
+                                bounds[ifile, 0], bounds[ifile, 1])
+        return bounds
+
+    def _candidate_files(self, *masks):
+        r"""Returns the files whose coarse cells may intersect some masks,
+        having decoded their bitmasks."""
+        if self._index_map is None:
+            return np.arange(self.nfiles, dtype="uint32")
+        lo = np.full(3, np.iinfo("int64").max, dtype="int64")
+        hi = np.full(3, -1, dtype="int64")
+        for mask in masks:
+            self._coarse_bounds(mask, lo, hi)
+        bounds = self._file_bounds
+        candidates = np.all((bounds[:, 0] <= hi) & (bounds[:, 1] >= lo), axis=1)
+        file_ids = np.flatnonzero(candidates).astype("uint32")
+        self._decode_bitmasks(file_ids)
+        return file_ids
+
     def print_info(self):
         cdef np.uint64_t ifile
+        self._decode_bitmasks()
         for ifile in range(self.nfiles):
             self.bitmasks.print_info(ifile, "File: %03d" % ifile)
 
     def count_coarse(self, ifile):
         r"""Get the number of coarse cells set for a file."""
+        self._decode_bitmasks([ifile])
         return self.bitmasks.count_coarse(ifile)
 
     def count_refined(self, ifile):
         r"""Get the number of cells refined for a file."""
+        self._decode_bitmasks([ifile])
         return self.bitmasks.count_refined(ifile)
 
     def count_total(self, ifile):
         r"""Get the total number of cells set for a file."""
+        self._decode_bitmasks([ifile])
         return self.bitmasks.count_total(ifile)
 
     def check(self):
@@ -1120,6 +1244,7 @@ cdef class ParticleBitmap:
         cdef vector[size_t].iterator it_mi1
         cdef int nm = 0, nc = 0
         cdef np.uint64_t ifile, nbitmasks
+        self._decode_bitmasks()
         nbitmasks = len(self.bitmasks)
         # Locate all indices with second level refinement
         for ifile in range(self.nfiles):
@@ -1152,6 +1277,7 @@ cdef class ParticleBitmap:
 
     def file_ownership_mask(self, fid):
         cdef BoolArrayCollection out
+        self._decode_bitmasks([fid])
         out = self.bitmasks._get_bitmask(<np.uint32_t> fid)
         return out
 
@@ -1237,6 +1363,7 @@ cdef class ParticleBitmap:
         # Get bitmasks for parts of files touching the selector
         file_masks = np.array([BoolArrayCollection() for i in range(len(file_idx))],
                               dtype="object")
+        self._decode_bitmasks(file_idx)
         for i, (fid, fmask) in enumerate(zip(file_idx,file_masks)):
             self.bitmasks._logicaland(<np.uint32_t> fid, cmask, fmask)
         return file_masks
@@ -1293,7 +1420,7 @@ cdef class ParticleBitmap:
         cdef np.ndarray[np.uint8_t, ndim=1] file_mask_p
         file_mask_p = np.zeros(self.nfiles, dtype="uint8")
         # Compare with mask of particles
-        for ifile in range(self.nfiles):
+        for ifile in self._candidate_files(mm_s):
             # Only continue if the file is not already selected
             if file_mask_p[ifile] == 0:
                 if mm_d._intersects(ifile, mm_s):
@@ -1310,7 +1437,7 @@ cdef class ParticleBitmap:
         file_mask_p = np.zeros(self.nfiles, dtype="uint8")
         file_mask_g = np.zeros(self.nfiles, dtype="uint8")
         # Compare with mask of particles
-        for ifile in range(self.nfiles):
+        for ifile in self._candidate_files(mm_s, mm_g):
             # Only continue if the file is not already selected
             if file_mask_p[ifile] == 0:
                 if mm_d._intersects(ifile, mm_s):
@@ -1564,6 +1691,7 @@ cdef class ParticleBitmapSelector:
         for i in range(3):
             pos[i] = self.DLE[i]
             dds[i] = self.DRE[i] - self.DLE[i]
+        self.bitmap._decode_bitmasks()
         # Fill with input
         for i in range(self.nfiles):
             self.file_mask_p[i] = file_mask_p[i]
@@ -0,0 +1,112 @@
+"""
+A cache of the results of selections (masks, cell counts, grid and data file
+masks), shared by all of the data objects of a dataset with the same selector.
+"""
+from collections import OrderedDict
+
+import numpy as np
+
+from yt.config import ytcfg
+
+
+def selection_nbytes(value):
+    """An estimate of the memory used by a cached selection, in bytes."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(selection_nbytes(v) for v in value)
+    if isinstance(value, dict):
+        return sum(selection_nbytes(v) for v in value.values())
+    # scalars, None and the compressed bitmaps of the particle indexes
+    return 64
+
+
+class SelectionCache:
+    r"""
+    A memory-bounded cache of the selection results of a dataset.
+
+    Selecting the cells of a grid or of the octs of a domain, or the data files
+    touched by a region, only depends on the selector and on the object being
+    selected.  The results are therefore shared by every data object with the
+    same selector, and by every repeated query on a data object.  Keys are
+    tuples which are conventionally ``(hash(selector), kind, *object_key)``.
+    Once the estimated size of the cached results exceeds ``max_memory`` bytes,
+    the least recently used results are released; the most recently used one
+    is always kept.
+
+    Parameters
+    ----------
+    max_memory : int, optional
+        The maximum estimated size of the cached results, in bytes.  Defaults
+        to the ``selection_cache_max_memory`` configuration option.  A
+        non-positive value disables the cache.
+    """
+
+    _max_memory_option = "selection_cache_max_memory"
+
+    def __init__(self, max_memory=None):
+        if max_memory is None:
+            max_memory = ytcfg.get("yt", self._max_memory_option)
+        self.max_memory = max_memory
+        self._results = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key):
+        return key in self._results
+
+    def __len__(self):
+        return len(self._results)
+
+    def keys(self):
+        return list(self._results.keys())
+
+    def get(self, key, builder):
+        r"""
+        Returns the selection result stored under ``key``, computing it if
+        needed.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the result.
+        builder : callable
+            Called without arguments to compute the result when it is not
+            cached.
+        """
+        if key in self._results:
+            self.hits += 1
+            self._results.move_to_end(key)
+            return self._results[key][0]
+        self.misses += 1
+        value = builder()
+        self.add(key, value)
+        return value
+
+    def add(self, key, value):
+        """Stores a result under ``key``, evicting older results if needed."""
+        if self.max_memory <= 0:
+            return
+        # the masks are shared by all of the data objects, make sure that none
+        # of them modifies them in place
+        for v in value if isinstance(value, tuple) else (value,):
+            if isinstance(v, np.ndarray):
+                v.flags.writeable = False
+        self.discard(key)
+        nbytes = selection_nbytes(value)
+        self._results[key] = (value, nbytes)
+        self.nbytes += nbytes
+        while len(self._results) > 1 and self.nbytes > self.max_memory:
+            _, (_, nbytes) = self._results.popitem(last=False)
+            self.nbytes -= nbytes
+
+    def discard(self, key):
+        """Removes the result stored under ``key``, if any."""
+        if key in self._results:
+            self.nbytes -= self._results.pop(key)[1]
+
+    def clear(self):
+        """Removes all of the cached results."""
+        self._results.clear()
+        self.nbytes = 0
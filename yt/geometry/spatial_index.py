@@ -0,0 +1,147 @@
+"""
+A registry of the spatial indexes (k-d trees, octrees and bounding volume
+hierarchies) built over the particles, cells or elements of a dataset.
+"""
+import os
+from collections import OrderedDict
+
+from yt.config import ytcfg
+from yt.funcs import mylog
+from yt.utilities.lib.cykdtree import PyKDTree
+from yt.utilities.lib.mesh_utilities import ElementBVH
+
+
+def selection_key(dobj):
+    """
+    A hashable key describing the selection of a data object, such that two
+    data objects selecting the same data share the same key.
+    """
+    if dobj is None:
+        return None
+    key = (dobj._type_name, hash(dobj.selector))
+    conditionals = getattr(dobj, "conditionals", None)
+    if conditionals:
+        key += (tuple(conditionals),)
+    return key
+
+
+def tree_nbytes(tree):
+    """An estimate of the memory used by a spatial index, in bytes."""
+    if tree is None:
+        return 0
+    if isinstance(tree, PyKDTree):
+        # the particle ordering plus, for every leaf, its edges and neighbors
+        return 8 * tree.npts + 256 * tree.num_leaves
+    if isinstance(tree, ElementBVH):
+        return tree.nbytes
+    if hasattr(tree, "num_nodes"):
+        # CyOctree: its copy of the positions plus the node arrays
+        return 24 * tree.bound_particles + 80 * tree.num_nodes
+    # scipy's cKDTree keeps a copy of the data plus the ordering
+    data = getattr(tree, "data", None)
+    if data is not None:
+        return 2 * data.nbytes
+    return 0
+
+
+class SpatialIndexRegistry:
+    r"""
+    A lazily populated, memory-bounded cache of the spatial indexes of a
+    dataset.
+
+    Trees are built on first request by the supplied builder and are shared by
+    all subsequent requests with the same key.  Keys are tuples which are
+    conventionally ``(kind, ptype, selection_key(dobj), *parameters)``.  Once
+    the estimated size of the cached trees exceeds ``max_memory`` bytes, the
+    least recently used trees are released; the most recently used tree is
+    always kept.  k-d trees may additionally be persisted to disk.
+
+    Parameters
+    ----------
+    max_memory : int, optional
+        The maximum estimated size of the cached trees, in bytes.  Defaults to
+        the ``spatial_index_max_memory`` configuration option.  A non-positive
+        value disables the limit.
+    """
+
+    def __init__(self, max_memory=None):
+        if max_memory is None:
+            max_memory = ytcfg.get("yt", "spatial_index_max_memory")
+        self.max_memory = max_memory
+        self._trees = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key):
+        return key in self._trees
+
+    def __len__(self):
+        return len(self._trees)
+
+    def keys(self):
+        return list(self._trees.keys())
+
+    @property
+    def nbytes(self):
+        return sum(nbytes for _, nbytes in self._trees.values())
+
+    def get(self, key, builder, filename=None, data_version=None):
+        r"""
+        Returns the tree stored under ``key``, building it if needed.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the tree.
+        builder : callable
+            Called without arguments to build the tree when it is neither
+            cached nor stored on disk.  It may return None if there is nothing
+            to index.
+        filename : str, optional
+            If supplied, the k-d tree is loaded from this file if it exists and
+            matches ``data_version``, and is saved to it after being built.
+        data_version : int, optional
+            The version of the data the tree stored on disk must match.
+        """
+        if key in self._trees:
+            self.hits += 1
+            self._trees.move_to_end(key)
+            return self._trees[key][0]
+        self.misses += 1
+        tree = None
+        if filename is not None:
+            tree = self._load(filename, data_version)
+        if tree is None:
+            tree = builder()
+            if filename is not None and tree is not None:
+                tree.save(filename)
+        self.add(key, tree)
+        return tree
+
+    def _load(self, filename, data_version):
+        if not os.path.exists(filename):
+            return None
+        mylog.info("Loading KDTree from %s", os.path.basename(filename))
+        tree = PyKDTree.from_file(filename)
+        if data_version is not None and tree.data_version != data_version:
+            mylog.info("Detected hash mismatch, regenerating KDTree")
+            return None
+        return tree
+
+    def add(self, key, tree):
+        """Stores a tree under ``key``, evicting older trees if needed."""
+        self._trees[key] = (tree, tree_nbytes(tree))
+        self._trees.move_to_end(key)
+        if self.max_memory <= 0:
+            return
+        while len(self._trees) > 1 and self.nbytes > self.max_memory:
+            old_key, _ = self._trees.popitem(last=False)
+            mylog.debug("Releasing spatial index %s", old_key)
+
+    def discard(self, key):
+        """Removes the tree stored under ``key``, if any."""
+        self._trees.pop(key, None)
+
+    def clear(self):
+        """Removes all of the cached trees."""
+        self._trees.clear()
@@ -0,0 +1,100 @@
+import numpy as np
+
+from yt.config import ytcfg
+from yt.geometry.field_cache import FieldDataCache
+from yt.testing import assert_equal, fake_amr_ds, fake_particle_ds
+
+
+def _enable_cache(ds, max_memory=2**26):
+    ds.index.field_cache.max_memory = max_memory
+    return ds.index.field_cache
+
+
+def test_invalidate():
+    cache = FieldDataCache(max_memory=2**20)
+    assert cache.enabled
+    for i in range(3):
+        cache.add(("grid", i, ("gas", "density")), np.ones(8))
+        cache.add(("grid", i, ("gas", "temperature")), np.ones(8))
+    cache.add(("derived", None, ("gas", "density")), np.ones(8))
+    assert_equal(cache.nbytes, 7 * 64)
+    cache.invalidate(("gas", "temperature"))
+    assert_equal(len(cache), 4)
+    cache.invalidate(kind="derived")
+    assert_equal(len(cache), 3)
+    cache.invalidate("density")
+    assert_equal((len(cache), cache.nbytes), (0, 0))
+    assert not FieldDataCache(max_memory=0).enabled
+
+
+def test_grid_data_cached():
+    fields, units = ["density", "temperature"], ["g/cm**3", "K"]
+    ds = fake_amr_ds(fields=fields, units=units)
+    ref = fake_amr_ds(fields=fields, units=units)
+    cache = _enable_cache(ds)
+    sp = ds.sphere([0.4, 0.5, 0.6], 0.3)
+    sp_ref = ref.sphere([0.4, 0.5, 0.6], 0.3)
+    assert_equal(sp["gas", "density"], sp_ref["gas", "density"])
+    misses = cache.misses
+    assert_equal(misses, ds.index.num_grids)
+    # another data object selecting (partly) the same grids reads no data
+    reg = ds.region([0.5] * 3, [0.2] * 3, [0.7] * 3)
+    reg_ref = ref.region([0.5] * 3, [0.2] * 3, [0.7] * 3)
+    assert_equal(reg["gas", "density"], reg_ref["gas", "density"])
+    assert_equal(cache.misses, misses)
+    assert cache.hits > 0
+    # nor do the grids themselves
+    grid = ds.index.grids[-1]
+    assert_equal(grid["gas", "density"], ref.index.grids[-1]["gas", "density"])
+    assert_equal(cache.misses, misses)
+    # the cached data cannot be modified through the data objects
+    grid["gas", "density"][:] = 0
+    assert_equal(reg["gas", "density"], reg_ref["gas", "density"])
+    # other fields are read
+    assert_equal(sp["gas", "temperature"], sp_ref["gas", "temperature"])
+    assert_equal(cache.misses, 2 * misses)
+
+
+def test_particle_data_cached():
+    ds = fake_particle_ds(npart=1000)
+    cache = _enable_cache(ds)
+    field = ("io", "particle_mass")
+    values = ds.all_data()[field]
+    misses = cache.misses
+    assert_equal(ds.all_data()[field], values)
+    assert_equal(cache.misses, misses)
+    sp = ds.sphere([0.5] * 3, 0.25)
+    mask = np.sum((ds.all_data()["io", "particle_position"].d - 0.5) ** 2, axis=1)
+    assert_equal(np.sort(sp[field]), np.sort(values[mask <= 0.25**2]))
+    misses = cache.misses
+    assert_equal(ds.sphere([0.5] * 3, 0.25)[field], sp[field])
+    assert_equal(cache.misses, misses)
+
+
+def test_derived_fields_cached():
+    ds = fake_amr_ds(fields=["density"], units=["g/cm**3"])
+    cache = _enable_cache(ds)
+    ytcfg["yt", "field_cache_derived"] = True
+    try:
+        field = ("index", "radius")
+        sp = ds.sphere([0.4, 0.5, 0.6], 0.3)
+        radius = sp[field]
+        assert ("derived", field) in [(k[0], k[2]) for k in cache.keys()]
+        hits = cache.hits
+        assert_equal(ds.sphere([0.4, 0.5, 0.6], 0.3)[field], radius)
+        assert_equal(cache.hits, hits + 1)
+        # the derived fields depend on the field parameters
+        sp = ds.sphere([0.4, 0.5, 0.6], 0.3)
+        sp.set_field_parameter("center", ds.arr([0.5] * 3, "code_length"))
+        assert np.any(sp[field] != radius)
+        # and are forgotten when the fields they derive from change
+        ds.add_field(
+            ("gas", "density"),
+            lambda field, data: data["index", "ones"],
+            sampling_type="cell",
+            units="",
+            force_override=True,
+        )
+        assert all(k[0] != "derived" for k in cache.keys())
+    finally:
+        ytcfg["yt", "field_cache_derived"] = False
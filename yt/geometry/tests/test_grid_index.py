@@ -1,4 +1,6 @@
-from yt.testing import assert_allclose_units, fake_amr_ds
+import numpy as np
+
+from yt.testing import assert_allclose_units, assert_equal, fake_amr_ds
 
 
 def test_icoords_to_ires():
@@ -19,3 +21,35 @@ def test_icoords_to_ires():
         assert_allclose_units(fcoords_xz[:, 1], dd.fcoords[:, 2])
         assert_allclose_units(fwidth_xz[:, 0], dd.fwidth[:, 0])
         assert_allclose_units(fwidth_xz[:, 1], dd.fwidth[:, 2])
+
+
+def test_grid_tree_and_chunk_order():
+    ds = fake_amr_ds()
+    index = ds.index
+    parents = index.grid_parent_index
+    for i, grid in enumerate(index.grids):
+        if grid.Parent is None:
+            assert_equal(parents[i], -1)
+        else:
+            assert_equal(parents[i], grid.Parent.id - grid._id_offset)
+        assert_equal(np.sum(parents == i), len(grid.Children))
+    tree = index._get_grid_tree()
+    assert index._get_grid_tree() is tree
+    # the tree finds the finest grid containing a point
+    point = np.array([0.3, 0.4, 0.5])
+    grids, _ = index._find_points(*([x] for x in point))
+    inside = np.all(
+        (index.grid_left_edge.d <= point) & (index.grid_right_edge.d > point), axis=1
+    )
+    finest = np.flatnonzero(inside)[np.argmax(index.grid_levels[inside, 0])]
+    assert grids[0] is index.grids[finest]
+    # grids are chunked in the order of their ids
+    reg = ds.r[0.2:0.6, 0.3:0.7, :]
+    index._identify_base_chunk(reg)
+    ids = [grid.id for grid in reg._chunk_info]
+    assert len(ids) > 1
+    assert_equal(ids, sorted(ids))
+    # and share their default field parameters
+    g1, g2 = index.grids[:2]
+    assert g1._default_field_parameters is g2._default_field_parameters
+    assert not g1.get_field_parameter("center").flags.writeable
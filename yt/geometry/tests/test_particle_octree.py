@@ -305,6 +305,35 @@ def test_bitmap_save_load():
     os.remove(fname)
 
 
+def test_bitmap_lazy_load():
+    nfiles = 16
+    kwargs = dict(
+        decomp="grid",
+        left_edge=np.array([0.0, 0.0, 0.0]),
+        right_edge=np.array([nfiles, nfiles, nfiles], dtype="float64"),
+        periodicity=np.array([False, False, False]),
+    )
+    reg0 = FakeBitmap(nfiles**3, nfiles, 4, 2, **kwargs)
+    fname = "temp_bitmasks_lazy.dat"
+    reg0.save_bitmasks(fname)
+    try:
+        reg1 = FakeBitmap(nfiles**3, nfiles, 4, 2, fname=fname, **kwargs)
+        # only the bitmasks of the files near the selection are decoded
+        fr = FakeRegion(nfiles)
+        fr.set_edges(3, 0.1)
+        selector = RegionSelector(fr)
+        assert_equal(reg1._decoded.sum(), 0)
+        files1 = reg1.identify_data_files(selector, ngz=1)[0]
+        assert 0 < reg1._decoded.sum() < nfiles
+        files0 = reg0.identify_data_files(selector, ngz=1)[0]
+        for f0, f1 in zip(files0, files1):
+            assert_array_equal(f0, f1)
+        assert_true(reg0.iseq_bitmask(reg1))
+        assert_true(reg1._decoded.all())
+    finally:
+        os.remove(fname)
+
+
 def test_bitmap_select():
     np.random.seed(int(0x4D3D3D3))
     dx = 0.1
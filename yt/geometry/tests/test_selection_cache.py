@@ -0,0 +1,77 @@
+import numpy as np
+
+from yt.geometry.selection_cache import SelectionCache
+from yt.testing import (
+    assert_equal,
+    fake_amr_ds,
+    fake_octree_ds,
+    fake_particle_ds,
+    fake_stretched_ds,
+)
+
+
+def test_cache_bounded():
+    builds = []
+
+    def builder(n):
+        def _build():
+            builds.append(n)
+            return np.ones(n, dtype="bool"), n
+
+        return _build
+
+    cache = SelectionCache(max_memory=2500)
+    mask, count = cache.get((0, "grid_mask", 1), builder(1000))
+    assert cache.get((0, "grid_mask", 1), builder(1000))[0] is mask
+    assert_equal(builds, [1000])
+    assert_equal((cache.hits, cache.misses), (1, 1))
+    # the shared masks cannot be modified
+    assert not mask.flags.writeable
+    cache.get((0, "grid_mask", 2), builder(1000))
+    cache.get((0, "grid_mask", 3), builder(1000))
+    # the least recently used mask is released to stay within the budget
+    assert_equal(len(cache), 2)
+    assert (0, "grid_mask", 1) not in cache
+    assert cache.nbytes <= cache.max_memory
+    # the most recent result is always kept
+    cache.get((0, "grid_mask", 4), builder(5000))
+    assert_equal(cache.keys(), [(0, "grid_mask", 4)])
+    cache.clear()
+    assert_equal((len(cache), cache.nbytes), (0, 0))
+    # a non-positive budget disables the cache
+    cache.max_memory = 0
+    cache.get((0, "grid_mask", 1), builder(10))
+    cache.get((0, "grid_mask", 1), builder(10))
+    assert_equal(len(cache), 0)
+    assert_equal(builds, [1000, 1000, 1000, 5000, 10, 10])
+
+
+def _check_shared(ds, field, coord=("index", "x")):
+    cache = ds.index.selection_cache
+    sp = ds.region([0.4, 0.5, 0.6], [0.2, 0.25, 0.3], [0.65, 0.75, 0.9])
+    values = sp[field]
+    misses = cache.misses
+    assert misses > 0
+    # the same selection, made by another data object, is not computed again
+    sp2 = ds.region([0.4, 0.5, 0.6], [0.2, 0.25, 0.3], [0.65, 0.75, 0.9])
+    assert_equal(sp2[field], values)
+    assert_equal(sp2[coord], sp[coord])
+    assert_equal(cache.misses, misses)
+    assert cache.hits > 0
+    # whereas another selection is
+    ds.region([0.4, 0.5, 0.6], [0.2, 0.25, 0.3], [0.6, 0.75, 0.9])[field]
+    assert cache.misses > misses
+
+
+def test_grid_selection_shared():
+    _check_shared(fake_amr_ds(fields=["density"], units=["g/cm**3"]), "density")
+    _check_shared(fake_stretched_ds(), "density")
+
+
+def test_octree_selection_shared():
+    _check_shared(fake_octree_ds(), ("gas", "density"))
+
+
+def test_particle_selection_shared():
+    ds = fake_particle_ds(npart=1000)
+    _check_shared(ds, ("all", "particle_mass"), ("all", "particle_position_x"))
@@ -0,0 +1,90 @@
+import numpy as np
+
+from yt.geometry.spatial_index import SpatialIndexRegistry, tree_nbytes
+from yt.testing import assert_equal, fake_random_ds, fake_sph_grid_ds, requires_module
+from yt.utilities.lib.cykdtree import PyKDTree
+
+
+def _kdtree(npart, seed=0):
+    pos = np.random.RandomState(seed).random_sample((npart, 3))
+    return PyKDTree(pos, left_edge=np.zeros(3), right_edge=np.ones(3), leafsize=16)
+
+
+def test_registry_lazy_and_bounded():
+    builds = []
+
+    def builder(npart):
+        def _build():
+            builds.append(npart)
+            return _kdtree(npart)
+
+        return _build
+
+    size = tree_nbytes(_kdtree(1000))
+    reg = SpatialIndexRegistry(max_memory=2 * size + 1)
+    assert_equal(len(reg), 0)
+    t1 = reg.get(("kdtree", "io", None, 1), builder(1000))
+    assert reg.get(("kdtree", "io", None, 1), builder(1000)) is t1
+    assert_equal(builds, [1000])
+    assert_equal((reg.hits, reg.misses), (1, 1))
+    reg.get(("kdtree", "io", None, 2), builder(1000))
+    reg.get(("kdtree", "io", None, 3), builder(1000))
+    # the least recently used tree is released to stay within the budget
+    assert_equal(len(reg), 2)
+    assert ("kdtree", "io", None, 1) not in reg
+    assert reg.nbytes <= reg.max_memory
+    # the most recent tree is always kept
+    reg.max_memory = 1
+    reg.get(("kdtree", "io", None, 4), builder(1000))
+    assert_equal(reg.keys(), [("kdtree", "io", None, 4)])
+    reg.clear()
+    assert_equal(len(reg), 0)
+
+
+def test_registry_persistence(tmp_path):
+    fname = str(tmp_path / "tree.kdtree")
+    reg = SpatialIndexRegistry()
+    tree = reg.get("tree", lambda: _kdtree(500), filename=fname)
+    # a fresh registry loads the tree from disk instead of building it
+    reg = SpatialIndexRegistry()
+    loaded = reg.get("tree", lambda: None, filename=fname)
+    loaded.assert_equal(tree)
+
+
+def test_octree_shared():
+    ds = fake_sph_grid_ds()
+    o1 = ds.octree(n_ref=4)
+    o2 = ds.octree(n_ref=4)
+    assert o1.tree is o2.tree
+    assert ds.octree(n_ref=8).tree is not o1.tree
+    assert_equal(o2["index", "x"].shape[0], 17)
+
+
+def test_sph_kdtree_shared():
+    ds = fake_sph_grid_ds()
+    kdtree = ds.index.kdtree
+    assert ds.index.kdtree is kdtree
+    assert_equal(kdtree.npts, 27)
+    ds.add_sph_fields(n_neighbors=32)
+    assert_equal(ds.index.spatial_indexes.hits, 2)
+    # the trees of different periodicities are not shared
+    ds._periodicity = (False, False, False)
+    kdtree = ds.index.kdtree
+    assert not np.any(kdtree.periodic)
+    ds.force_periodicity()
+    assert ds.index.kdtree is not kdtree
+    assert np.all(ds.index.kdtree.periodic)
+
+
+@requires_module("scipy")
+def test_cut_region_trees_shared():
+    ds = fake_random_ds(16, particles=1000)
+    ad = ds.all_data()
+    cr = ad.cut_region(['obj["gas", "density"] > 0.5'])
+    mask = cr._part_ind("io")
+    nlevels = len(ds.index.spatial_indexes)
+    assert nlevels > 0
+    cr2 = ad.cut_region(['obj["gas", "density"] > 0.5'])
+    assert_equal(cr2._part_ind("io"), mask)
+    assert_equal(len(ds.index.spatial_indexes), nlevels)
+    assert_equal(ds.index.spatial_indexes.hits, nlevels)
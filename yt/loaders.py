@@ -30,7 +30,6 @@ from yt.utilities.exceptions import (
     YTUnidentifiedDataType,
 )
 from yt.utilities.hierarchy_inspection import find_lowest_subclasses
-from yt.utilities.lib.misc_utilities import get_box_grids_level
 from yt.utilities.logger import ytLogger as mylog
 from yt.utilities.object_registries import (
     output_type_registry,
@@ -167,6 +166,7 @@ def load_uniform_grid(
     *,
     cell_widths=None,
     parameters=None,
+    copy=True,
 ):
     r"""Load a uniform grid of data into yt as a
     :class:`~yt.frontends.stream.data_structures.StreamHandler`.
@@ -222,6 +222,12 @@ def load_uniform_grid(
     parameters: dictionary, optional
         Optional dictionary used to populate the dataset parameters, useful
         for storing dataset metadata.
+    copy: boolean, optional
+        If False, the arrays of ``data`` are wrapped rather than copied, so
+        that changing them in place, for instance in a simulation running
+        alongside yt, changes the data of the dataset.  The data cached by
+        the dataset must then be discarded with the ``update_data`` method of
+        its index.  Defaults to True.
 
     Examples
     --------
@@ -255,7 +261,7 @@ def load_uniform_grid(
     # First we fix our field names, apply units to data
     # and check for consistency of field shapes
     field_units, data, number_of_particles = process_data(
-        data, grid_dims=tuple(domain_dimensions)
+        data, grid_dims=tuple(domain_dimensions), copy=copy
     )
 
     sfh = StreamDictFieldHandler()
@@ -377,6 +383,7 @@ def load_amr_grids(
     default_species_fields=None,
     *,
     parameters=None,
+    copy=True,
 ):
     r"""Load a set of grids of data into yt as a
     :class:`~yt.frontends.stream.data_structures.StreamHandler`.
@@ -441,6 +448,12 @@ def load_amr_grids(
     parameters: dictionary, optional
         Optional dictionary used to populate the dataset parameters, useful
         for storing dataset metadata.
+    copy: boolean, optional
+        If False, the arrays of ``data`` are wrapped rather than copied, so
+        that changing them in place, for instance in a simulation running
+        alongside yt, changes the data of the dataset.  The data cached by
+        the dataset must then be discarded with the ``update_data`` method of
+        its index.  Defaults to True.
 
     Examples
     --------
@@ -475,7 +488,11 @@ def load_amr_grids(
         StreamDictFieldHandler,
         StreamHandler,
     )
-    from yt.frontends.stream.definitions import process_data, set_particle_types
+    from yt.frontends.stream.definitions import (
+        find_parent_ids,
+        process_data,
+        set_particle_types,
+    )
 
     domain_dimensions = np.array(domain_dimensions)
     ngrids = len(grid_data)
@@ -488,7 +505,6 @@ def load_amr_grids(
     grid_right_edges = np.zeros((ngrids, 3), dtype="float64")
     grid_dimensions = np.zeros((ngrids, 3), dtype="int32")
     number_of_particles = np.zeros((ngrids, 1), dtype="int64")
-    parent_ids = np.zeros(ngrids, dtype="int64") - 1
     sfh = StreamDictFieldHandler()
     for i, g in enumerate(grid_data):
         grid_left_edges[i, :] = g.pop("left_edge")
@@ -496,27 +512,14 @@ def load_amr_grids(
         grid_dimensions[i, :] = g.pop("dimensions")
         grid_levels[i, :] = g.pop("level")
         field_units, data, n_particles = process_data(
-            g, grid_dims=tuple(grid_dimensions[i, :])
+            g, grid_dims=tuple(grid_dimensions[i, :]), copy=copy
         )
         number_of_particles[i, :] = n_particles
         sfh[i] = data
 
     # We now reconstruct our parent ids, so that our particle assignment can
     # proceed.
-    mask = np.empty(ngrids, dtype="int32")
-    for gi in range(ngrids):
-        get_box_grids_level(
-            grid_left_edges[gi, :],
-            grid_right_edges[gi, :],
-            grid_levels[gi] + 1,
-            grid_left_edges,
-            grid_right_edges,
-            grid_levels,
-            mask,
-        )
-        ids = np.where(mask.astype("bool"))
-        for ci in ids:
-            parent_ids[ci] = gi
+    parent_ids = find_parent_ids(grid_left_edges, grid_right_edges, grid_levels)
 
     # Check if the grid structure is properly aligned (bug #1295)
     for lvl in range(grid_levels.min() + 1, grid_levels.max() + 1):
@@ -601,6 +604,7 @@ def load_particles(
     default_species_fields=None,
     *,
     parameters=None,
+    copy=True,
 ):
     r"""Load a set of particles into yt as a
     :class:`~yt.frontends.stream.data_structures.StreamParticleHandler`.
@@ -650,6 +654,12 @@ def load_particles(
     parameters: dictionary, optional
         Optional dictionary used to populate the dataset parameters, useful
         for storing dataset metadata.
+    copy: boolean, optional
+        If False, the arrays of ``data`` are wrapped rather than copied, so
+        that changing them in place, for instance in a simulation running
+        alongside yt, changes the data of the dataset.  The data cached by
+        the dataset must then be discarded with the ``update_data`` method of
+        its index.  Defaults to True.
 
     Examples
     --------
@@ -711,7 +721,7 @@ def load_particles(
     magnetic_unit = parse_unit(magnetic_unit, "magnetic")
 
     # Preprocess data
-    field_units, data, _ = process_data(data)
+    field_units, data, _ = process_data(data, copy=copy)
     sfh = StreamDictFieldHandler()
 
     pdata = {}
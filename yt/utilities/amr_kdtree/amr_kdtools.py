@@ -11,17 +11,29 @@ def receive_and_reduce(comm, incoming_rank, image, add_to_front):
     )
 
     if add_to_front:
-        front = arr2
-        back = image
-    else:
-        front = image
-        back = arr2
+        return composite_images(arr2, image)
+    return composite_images(image, arr2)
 
-    if image.shape[2] == 3:
-        # Assume Projection Camera, Add
-        np.add(image, front, image)
-        return image
 
+def send_to_parent(comm, outgoing_rank, image):
+    mylog.debug("Sending image to %04i", outgoing_rank)
+    comm.send_array(image, outgoing_rank, tag=comm.rank)
+
+
+def scatter_image(comm, root, image):
+    mylog.debug("Scattering from %04i", root)
+    image = comm.mpi_bcast(image, root=root)
+    return image
+
+
+def composite_images(front, back):
+    r"""Composites an image in front of another one.
+
+    Images with three channels are summed, as for projections; otherwise the
+    front image is blended over the back one according to its opacity.
+    """
+    if front.shape[2] == 3:
+        return front + back
     ta = 1.0 - front[:, :, 3]
     np.maximum(ta, 0.0, ta)
     # This now does the following calculation, but in a memory
@@ -34,12 +46,109 @@ def receive_and_reduce(comm, incoming_rank, image, add_to_front):
     return image
 
 
-def send_to_parent(comm, outgoing_rank, image):
-    mylog.debug("Sending image to %04i", outgoing_rank)
-    comm.send_array(image, outgoing_rank, tag=comm.rank)
+def image_rows(nprocs, nrows):
+    r"""The bounds of the rows of an image split between processes."""
+    return np.linspace(0, nrows, nprocs + 1).astype("int64")
 
 
-def scatter_image(comm, root, image):
-    mylog.debug("Scattering from %04i", root)
-    image = comm.mpi_bcast(image, root=root)
-    return image
+def rank_groups(nprocs):
+    r"""The processes whose leaves are below each node of the top of a kd-tree
+    partitioned over ``nprocs`` processes, the leaf of process ``i`` being the
+    node ``nprocs + i``."""
+    groups = {}
+    for node_id in range(2 * nprocs - 1, 0, -1):
+        if node_id >= nprocs:
+            groups[node_id] = [node_id - nprocs]
+        else:
+            groups[node_id] = groups[2 * node_id] + groups[2 * node_id + 1]
+    return groups
+
+
+def swap_plan(left, right, nrows):
+    r"""Plans the compositing of the images of the two children of a node.
+
+    The image of each child is distributed in rows over the processes below
+    it, ``left`` and ``right``, and the image of the node is distributed over
+    all of these processes.
+
+    Returns
+    -------
+    A dictionary giving, for each process, the first and last rows of its
+    part of the image of the node and the pieces of the images of the
+    children it receives, as (child, source process, first row, last row)
+    tuples where the child is 0 for the left one and 1 for the right one.
+    """
+    group = left + right
+    rows = image_rows(len(group), nrows)
+    plan = {}
+    for k, rank in enumerate(group):
+        start, end = rows[k], rows[k + 1]
+        pieces = []
+        for side, procs in enumerate((left, right)):
+            old_rows = image_rows(len(procs), nrows)
+            for j, source in enumerate(procs):
+                lo, hi = max(start, old_rows[j]), min(end, old_rows[j + 1])
+                if lo < hi:
+                    pieces.append((side, source, lo, hi))
+        plan[rank] = (start, end, pieces)
+    return plan
+
+
+def swap_composite(comm, image, path, nprocs):
+    r"""Composites the images rendered by the processes along a kd-tree.
+
+    At each node, the processes below it exchange pieces of the images of
+    its children so that each of them composites a part of the rows of the
+    image of the node, as in binary swap but for any number of processes.
+    Every process thus sends and receives about the size of one image in
+    total, in a few messages per level of the tree.
+
+    Parameters
+    ----------
+    comm : Communicator
+        The communicator of the processes.
+    image : array
+        The image rendered by this process.
+    path : list of tuples
+        The node ids of the ancestors of the leaf of this process, from the
+        bottom up, and whether the right child of each of them is in front of
+        the left one.
+    nprocs : int
+        The number of processes.
+
+    Returns
+    -------
+    The first row of the part of the image this process composited, and this
+    part.
+    """
+    groups = rank_groups(nprocs)
+    rank = comm.rank
+    nrows = image.shape[0]
+    start, piece = 0, np.ascontiguousarray(image)
+    for node_id, right_in_front in path:
+        plan = swap_plan(groups[2 * node_id], groups[2 * node_id + 1], nrows)
+        hooks = []
+        for dest, (_, _, pieces) in plan.items():
+            for _, source, lo, hi in pieces:
+                if source == rank and dest != rank:
+                    hooks.append(
+                        comm.mpi_nonblocking_send(
+                            piece[lo - start : hi - start], dest, tag=node_id
+                        )
+                    )
+        new_start, new_end, pieces = plan[rank]
+        shape = (new_end - new_start,) + image.shape[1:]
+        children = [np.zeros(shape, dtype=piece.dtype) for _ in range(2)]
+        for side, source, lo, hi in pieces:
+            dest = children[side][lo - new_start : hi - new_start]
+            if source == rank:
+                dest[...] = piece[lo - start : hi - start]
+            else:
+                hooks.append(comm.mpi_nonblocking_recv(dest, source, tag=node_id))
+        comm.mpi_Request_Waitall(hooks)
+        if right_in_front:
+            piece = composite_images(children[1], children[0])
+        else:
+            piece = composite_images(children[0], children[1])
+        start = new_start
+    return start, piece
@@ -1,21 +1,22 @@
 import operator
+from contextlib import contextmanager
 
 import numpy as np
 
 from yt.funcs import is_sequence, mylog
+from yt.geometry.geometry_handler import YTDataChunk
 from yt.geometry.grid_geometry_handler import GridIndex
-from yt.utilities.amr_kdtree.amr_kdtools import (
-    receive_and_reduce,
-    scatter_image,
-    send_to_parent,
-)
+from yt.utilities.amr_kdtree.amr_kdtools import swap_composite
 from yt.utilities.lib.amr_kdtools import Node
+from yt.utilities.lib.misc_utilities import get_box_grids_below_level
 from yt.utilities.lib.partitioned_grid import PartitionedGrid
 from yt.utilities.math_utils import periodic_position
 from yt.utilities.on_demand_imports import _h5py as h5py
 from yt.utilities.parallel_tools.parallel_analysis_interface import (
     ParallelAnalysisInterface,
+    parallel_objects,
 )
+from yt.utilities.performance_counters import yt_spans
 
 steps = np.array(
     [
@@ -108,15 +109,25 @@ class Tree:
         del gles, gres, gids, grids
 
     def build(self):
-        lvl_range = range(self.min_level, self.max_level + 1)
-        for lvl in lvl_range:
-            # grids = self.data_source.select_grids(lvl)
-            grids = np.array(
-                [b for b, mask in self.data_source.blocks if b.Level == lvl]
-            )
-            if len(grids) == 0:
-                continue
-            self.add_grids(grids)
+        # The blocks of the data source are listed once, with the io chunks
+        # split between the processes, and each process then only builds the
+        # nodes of its own part of the tree
+        with yt_spans("amr_kdtree.build"):
+            storage = {}
+            for sto, _chunk in parallel_objects(
+                self.data_source.chunks([], "io"), storage=storage
+            ):
+                sto.result = [(b.id, b.Level) for b, mask in self.data_source.blocks]
+            blocks = [block for i in sorted(storage) for block in storage[i]]
+            for lvl in range(self.min_level, self.max_level + 1):
+                grids = [
+                    self.ds.index.grids[gid - self._id_offset]
+                    for gid, level in blocks
+                    if level == lvl
+                ]
+                if len(grids) == 0:
+                    continue
+                self.add_grids(grids)
 
     def check_tree(self):
         for node in self.trunk.depth_traverse():
@@ -231,13 +242,85 @@ class AMRKDTree(ParallelAnalysisInterface):
         self.brick_dimensions = []
         bricks = []
 
-        for b in self.traverse():
-            list(map(_apply_log, b.my_data, flip_log, self.log_fields))
-            bricks.append(b)
+        with yt_spans("amr_kdtree.bricks"), self._preloaded_bricks(regenerate_data):
+            for b in self.traverse():
+                list(map(_apply_log, b.my_data, flip_log, self.log_fields))
+                bricks.append(b)
         self.bricks = np.array(bricks)
         self.brick_dimensions = np.array(self.brick_dimensions)
         self._initialized = True
 
+    @contextmanager
+    def _preloaded_bricks(self, regenerate_data):
+        # Reads the data of the grids of the bricks of this process, and of
+        # the grids their ghost zones are taken from, at once rather than
+        # grid by grid, and keeps them in the field cache of the index while
+        # the bricks are generated.
+        index = self.ds.index
+        cache = index.field_cache
+        fields = [
+            f for f in self.get_dependencies(self.fields) if f in self.ds.field_list
+        ]
+        gids = np.unique(
+            [node.grid - self._id_offset for node in self.tree.trunk.kd_traverse()]
+        ).astype("int64")
+        if not regenerate_data or len(fields) == 0 or gids.size == 0:
+            yield
+            return
+        if not self.no_ghost:
+            gids = self._ghost_zone_grids(gids)
+        grids = [index.grids[gi] for gi in gids]
+        max_memory = cache.max_memory
+        if not cache.enabled:
+            nbytes = (
+                8 * len(fields) * int(index.grid_dimensions[gids].prod(axis=1).sum())
+            )
+            cache.max_memory = 2 * nbytes
+        try:
+            if index._preload_implemented:
+                chunk = YTDataChunk(None, "cache", grids, cache=False)
+                data = index.io._read_chunk_data(chunk, fields) or {}
+                for g in grids:
+                    for field, values in data.get(g.id, {}).items():
+                        # some frontends read the ghost zones of the grids too
+                        if values.size == g.ActiveDimensions.prod():
+                            values = np.asarray(values, dtype="=f8").ravel()
+                            cache.add(("grid", g.id, field), values)
+            else:
+                for g in grids:
+                    index._read_cached_grid(g, fields)
+            yield
+        finally:
+            if max_memory <= 0:
+                cache.clear()
+            cache.max_memory = max_memory
+
+    def _ghost_zone_grids(self, gids):
+        # The grids of the same or a coarser level within a cell of the
+        # bounding box of the grids of every level
+        index = self.ds.index
+        left_edges = index.grid_left_edge.d
+        right_edges = index.grid_right_edge.d
+        levels = index.grid_levels.astype("int32")
+        selected = np.zeros(index.num_grids, dtype="bool")
+        mask = np.empty(index.num_grids, dtype="int32")
+        for level in np.unique(levels[gids, 0]):
+            lgids = gids[levels[gids, 0] == level]
+            dds = (right_edges[lgids[0]] - left_edges[lgids[0]]) / (
+                index.grid_dimensions[lgids[0]]
+            )
+            get_box_grids_below_level(
+                left_edges[lgids].min(axis=0) - dds,
+                right_edges[lgids].max(axis=0) + dds,
+                level,
+                left_edges,
+                right_edges,
+                levels,
+                mask,
+            )
+            selected |= mask.astype("bool")
+        return np.flatnonzero(selected)
+
     def initialize_source(self, fields, log_fields, no_ghost):
         if (
             fields == self.fields
@@ -299,26 +382,24 @@ class AMRKDTree(ParallelAnalysisInterface):
     def reduce_tree_images(self, image, viewpoint):
         if self.comm.size <= 1:
             return image
-        myrank = self.comm.rank
         nprocs = self.comm.size
-        owners = self.get_reduce_owners()
-        node = self.get_node(nprocs + myrank)
-
-        while owners[node.parent.node_id] == myrank:
-            split_dim = node.parent.get_split_dim()
-            split_pos = node.parent.get_split_pos()
-            add_to_front = viewpoint[split_dim] >= split_pos
-            image = receive_and_reduce(
-                self.comm, owners[node.parent.right.node_id], image, add_to_front
-            )
-            if node.parent.node_id == 1:
-                break
-            else:
-                node = node.parent
-        else:
-            send_to_parent(self.comm, owners[node.parent.node_id], image)
-
-        return scatter_image(self.comm, owners[1], image)
+        # the ancestors of the leaf of this process, from the bottom up, and
+        # whether their right child is in front of their left one
+        path = []
+        node = self.get_node(nprocs + self.comm.rank)
+        while node.parent is not None:
+            node = node.parent
+            right_in_front = viewpoint[node.get_split_dim()] >= node.get_split_pos()
+            path.append((node.node_id, right_in_front))
+        with yt_spans("amr_kdtree.composite", pixels=image.shape[0] * image.shape[1]):
+            start, rows = swap_composite(self.comm, image, path, nprocs)
+            # gather the rows composited by every process on all of them
+            full = np.zeros(image.shape, dtype=rows.dtype)
+            full[start : start + rows.shape[0]] = rows
+            full = self.comm.mpi_allreduce(full, op="sum")
+        image = image.copy()
+        image[...] = full
+        return image
 
     def get_brick_data(self, node):
         if node.data is not None and not node.dirty:
@@ -0,0 +1,161 @@
+"""
+A strong-scaling benchmark of the volume rendering of grid datasets.
+
+The same dataset is rendered with an increasing number of MPI processes, and
+the time spent building the AMRKDTree, generating its bricks and compositing
+the images of the processes is reported for each of them::
+
+    $ python -m yt.utilities.amr_kdtree.benchmark --nprocs 1 2 4 8
+    $ python -m yt.utilities.amr_kdtree.benchmark --nprocs 4 16 64 \\
+          --mpirun "srun -n {nprocs}" --resolution 1024 IsolatedGalaxy/galaxy0030/galaxy0030
+
+"""
+import argparse
+import json
+import shlex
+import subprocess
+import sys
+import time
+
+PHASES = ("build", "bricks", "composite")
+_RESULT_PREFIX = "amr_kdtree benchmark: "
+
+
+def run_benchmark(ds, field=("gas", "density"), resolution=256):
+    r"""Renders a dataset once and times the phases of the rendering.
+
+    This is meant to be run by all of the processes of a parallel run.
+
+    Parameters
+    ----------
+    ds : ~yt.data_objects.static_output.Dataset
+        The grid dataset to render.
+    field : tuple of str, optional
+        The field to render. Default: ``("gas", "density")``.
+    resolution : int, optional
+        The number of pixels on a side of the image. Default: 256.
+
+    Returns
+    -------
+    A dictionary of the time, in seconds, spent in each of :data:`PHASES` and
+    in the whole rendering (``"total"``), the maximum over the processes.
+    """
+    from yt.utilities.parallel_tools.parallel_analysis_interface import (
+        communication_system,
+    )
+    from yt.utilities.performance_counters import yt_spans
+    from yt.visualization.volume_rendering.volume_rendering import create_scene
+
+    enabled = yt_spans.enabled
+    yt_spans.enable(keep_events=False)
+    yt_spans.reset()
+    try:
+        start = time.perf_counter()
+        sc = create_scene(ds, field)
+        sc.camera.resolution = resolution
+        sc.render()
+        times = {"total": time.perf_counter() - start}
+        for phase in PHASES:
+            name = f"amr_kdtree.{phase}"
+            times[phase] = yt_spans.stats[name].total_time
+    finally:
+        if not enabled:
+            yt_spans.disable()
+    comm = communication_system.communicators[-1]
+    return {key: comm.mpi_allreduce(value, op="max") for key, value in times.items()}
+
+
+def _load(args):
+    import yt
+    from yt.testing import fake_random_ds
+
+    if args.dataset is None:
+        return fake_random_ds(
+            args.size, nprocs=args.grids, fields=("density",), units=("g/cm**3",)
+        )
+    return yt.load(args.dataset)
+
+
+def _worker(args):
+    import yt
+
+    yt.enable_parallelism()
+    times = run_benchmark(_load(args), tuple(args.field), args.resolution)
+    if yt.is_root():
+        print(_RESULT_PREFIX + json.dumps(times), flush=True)
+
+
+def _print_table(results):
+    header = ["nprocs", "total"] + list(PHASES) + ["speedup", "efficiency"]
+    print(" ".join(f"{h:>10s}" for h in header))
+    nprocs0 = min(results)
+    for nprocs, times in sorted(results.items()):
+        speedup = results[nprocs0]["total"] / times["total"]
+        efficiency = speedup * nprocs0 / nprocs
+        row = [times["total"]] + [times[phase] for phase in PHASES]
+        row += [speedup, efficiency]
+        print(f"{nprocs:>10d} " + " ".join(f"{v:>10.3f}" for v in row))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Strong-scaling benchmark of the volume rendering "
+        "of grid datasets."
+    )
+    parser.add_argument(
+        "dataset",
+        nargs="?",
+        default=None,
+        help="The dataset to render. Defaults to a random uniform grid dataset.",
+    )
+    parser.add_argument(
+        "--nprocs",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4],
+        help="The numbers of MPI processes to run with.",
+    )
+    parser.add_argument(
+        "--mpirun",
+        default="mpirun -np {nprocs}",
+        help="The command launching the MPI processes, where {nprocs} is "
+        "replaced with their number.",
+    )
+    parser.add_argument(
+        "--field", nargs=2, default=["gas", "density"], help="The field to render."
+    )
+    parser.add_argument(
+        "--resolution", type=int, default=256, help="The resolution of the image."
+    )
+    parser.add_argument(
+        "--size", type=int, default=128, help="The size of the random dataset."
+    )
+    parser.add_argument(
+        "--grids", type=int, default=64, help="The grids of the random dataset."
+    )
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        _worker(args)
+        return
+
+    argv = sys.argv[1:] if argv is None else list(argv)
+    results = {}
+    for nprocs in args.nprocs:
+        command = shlex.split(args.mpirun.format(nprocs=nprocs))
+        command += [sys.executable, "-m", "yt.utilities.amr_kdtree.benchmark"]
+        command += ["--worker"] + argv
+        output = subprocess.run(
+            command, check=True, stdout=subprocess.PIPE, universal_newlines=True
+        ).stdout
+        for line in output.splitlines():
+            if line.startswith(_RESULT_PREFIX):
+                results[nprocs] = json.loads(line[len(_RESULT_PREFIX) :])
+        if nprocs not in results:
+            raise RuntimeError(f"The benchmark with {nprocs} processes failed.")
+    _print_table(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,7 @@ import functools
 
 import numpy as np
 
+from yt.config import ytcfg
 from yt.units import dimensions
 from yt.units.unit_object import Unit  # type: ignore
 from yt.units.unit_registry import UnitRegistry  # type: ignore
@@ -56,6 +57,16 @@ class Cosmology:
     w_a : float, optional
         See w_0. w_a is the derivative of w(a) evaluated at a = 1. Cosmological
         constant case corresponds to w_a = 0. Default is None.
+    tabulated : bool, optional
+        If True, comoving distances, path lengths, lookback times and the
+        conversions between time and scale factor are interpolated from
+        cumulative tables, which are computed once and shared by all
+        calculators with the same cosmological parameters.  All of these
+        accept arrays.  The tabulated integrals from redshift zero are precise
+        to about one part in 1e10, which is more precise than the direct
+        calculation, though differences between nearby redshifts lose some of
+        that precision.  Defaults to the ``cosmology_tabulated``
+        configuration option.
 
     Examples
     --------
@@ -78,6 +89,7 @@ class Cosmology:
         use_dark_factor=False,
         w_0=-1.0,
         w_a=0.0,
+        tabulated=None,
     ):
         self.omega_matter = float(omega_matter)
         self.omega_radiation = float(omega_radiation)
@@ -108,6 +120,31 @@ class Cosmology:
         self.w_0 = w_0
         self.w_a = w_a
 
+        if tabulated is None:
+            tabulated = ytcfg.get("yt", "cosmology_tabulated")
+        self.tabulated = tabulated
+
+    @property
+    def tables(self):
+        """
+        The tables of the cosmological integrals for the parameters of this
+        cosmology, which are shared by all calculators with these parameters.
+        """
+        key = (
+            self.omega_matter,
+            self.omega_lambda,
+            self.omega_radiation,
+            self.omega_curvature,
+            bool(self.use_dark_factor),
+            float(self.w_0),
+            float(self.w_a),
+        )
+        if key not in _cosmology_tables:
+            _cosmology_tables[key] = CosmologyTables(
+                self.expansion_factor, self.omega_matter, self.omega_radiation
+            )
+        return _cosmology_tables[key]
+
     def hubble_distance(self):
         r"""
         The distance corresponding to c / h, where c is the speed of light
@@ -137,9 +174,12 @@ class Cosmology:
         >>> print(co.comoving_radial_distance(0.0, 1.0).in_units("Mpccm"))
 
         """
-        return (
-            self.hubble_distance() * trapzint(self.inverse_expansion_factor, z_i, z_f)
-        ).in_base(self.unit_system)
+        if self.tabulated:
+            distance = self.tables.comoving_distance(z_f)
+            distance -= self.tables.comoving_distance(z_i)
+        else:
+            distance = trapzint(self.inverse_expansion_factor, z_i, z_f)
+        return (self.hubble_distance() * distance).in_base(self.unit_system)
 
     def comoving_transverse_distance(self, z_i, z_f):
         r"""
@@ -357,9 +397,12 @@ class Cosmology:
         >>> print(co.lookback_time(0.0, 1.0).in_units("Gyr"))
 
         """
-        return (trapzint(self.age_integrand, z_i, z_f) / self.hubble_constant).in_base(
-            self.unit_system
-        )
+        if self.tabulated:
+            t = self.tables.age(-np.log10(np.add(z_i, 1)))
+            t -= self.tables.age(-np.log10(np.add(z_f, 1)))
+        else:
+            t = trapzint(self.age_integrand, z_i, z_f)
+        return (t / self.hubble_constant).in_base(self.unit_system)
 
     def critical_density(self, z):
         r"""
@@ -439,6 +482,8 @@ class Cosmology:
         return ((1 + z) ** 2) * self.inverse_expansion_factor(z)
 
     def path_length(self, z_i, z_f):
+        if self.tabulated:
+            return self.tables.path_length(z_f) - self.tables.path_length(z_i)
         return trapzint(self.path_length_function, z_i, z_f)
 
     def t_from_a(self, a):
@@ -459,6 +504,10 @@ class Cosmology:
 
         """
 
+        if self.tabulated:
+            t = self.tables.age(np.log10(a))
+            return (t / self.hubble_constant).in_base(self.unit_system)
+
         # Interpolate from a table of log(a) vs. log(t)
         la = np.log10(a)
         la_i = min(-6, np.asarray(la).min() - 3)
@@ -520,6 +569,9 @@ class Cosmology:
             t = self.arr(t, "s")
         lt = np.log10((t * self.hubble_constant).to(""))
 
+        if self.tabulated:
+            return np.power(10, self.tables.log_a_from_log_age(np.asarray(lt)))
+
         # Interpolate from a table of log(a) vs. log(t)
         # Make initial guess for bounds and widen if necessary.
         la_i = -6
@@ -626,6 +678,138 @@ class Cosmology:
         return self._quan
 
 
+_cosmology_tables = {}
+
+
+class CosmologyTables:
+    r"""
+    Cumulative tables of the dimensionless cosmological integrals as functions
+    of the base-10 logarithm of the scale factor, log(a).
+
+    The comoving distance, the path length and the age of the Universe (in
+    units of the Hubble distance and Hubble time) are integrated with
+    Simpson's rule on a uniform grid in log(a), and are evaluated by cubic
+    Hermite interpolation using the exact derivatives of the integrals.  The
+    error of both steps scales as the fourth power of the grid spacing.  The
+    grid is extended whenever values outside of it are requested.
+
+    Parameters
+    ----------
+    expansion_factor : callable
+        The ratio between the Hubble parameter at a given redshift and
+        redshift zero.
+    omega_matter : float
+        The matter density, which sets the age below the grid.
+    omega_radiation : float
+        The radiation density, which sets the age below the grid.
+    bins_per_dex : int, optional
+        The number of grid points per decade of scale factor.  Default: 200.
+    """
+
+    def __init__(
+        self, expansion_factor, omega_matter, omega_radiation, bins_per_dex=200
+    ):
+        self.expansion_factor = expansion_factor
+        self.omega_matter = omega_matter
+        self.omega_radiation = omega_radiation
+        self.bins_per_dex = bins_per_dex
+        self._build(-12, 2)
+
+    def _build(self, la_min, la_max):
+        self.la_min = la_min
+        self.la_max = la_max
+        n_bins = (la_max - la_min) * self.bins_per_dex + 1
+        la = np.linspace(la_min, la_max, n_bins)
+        la_mid = 0.5 * (la[1:] + la[:-1])
+        ln10 = np.log(10)
+
+        def _integrands(la):
+            a = np.power(10.0, la)
+            E = self.expansion_factor(1.0 / a - 1)
+            return ln10 / E, ln10 / (a * E), ln10 / (a**3 * E)
+
+        f = _integrands(la)
+        f_mid = _integrands(la_mid)
+        segments = [
+            np.diff(la) / 6 * (fi[:-1] + 4 * fi_mid + fi[1:])
+            for fi, fi_mid in zip(f, f_mid)
+        ]
+        # the distances are integrated outward from a = 1 (la = 0), so that
+        # they are not swamped by the large early contributions
+        i0 = -la_min * self.bins_per_dex
+
+        def _from_today(seg):
+            return np.concatenate(
+                [seg[:i0][::-1].cumsum()[::-1], [0], -seg[i0:].cumsum()]
+            )
+
+        self.la = la
+        self.distance = _from_today(segments[1])
+        self.distance_deriv = -f[1]
+        self.path = _from_today(segments[2])
+        self.path_deriv = -f[2]
+        # the age is integrated from a = 0, so add the part below the grid
+        age = np.concatenate([[0], segments[0].cumsum()]) + self._early_age(la_min)
+        self.log_age = np.log10(age)
+        self.log_age_deriv = f[0] / (ln10 * age)
+
+    def _early_age(self, la):
+        # The age of the Universe at a small scale factor, when only matter
+        # and radiation matter, written so as to avoid cancellation
+        a = np.power(10.0, la)
+        om, orad = self.omega_matter, self.omega_radiation
+        if orad == 0:
+            if om == 0:
+                return 0.0
+            return 2 * a**1.5 / (3 * np.sqrt(om))
+        s = np.sqrt(1 + om * a / orad)
+        return 2 * a**2 * (s + 2) / (3 * np.sqrt(orad) * (s + 1) ** 2)
+
+    def _check_range(self, la):
+        la_min = min(self.la_min, int(np.floor(np.min(la))) - 1)
+        la_max = max(self.la_max, int(np.ceil(np.max(la))) + 1)
+        if la_min < self.la_min or la_max > self.la_max:
+            self._build(la_min, la_max)
+
+    def comoving_distance(self, z):
+        """The comoving distance to redshift z, in units of the Hubble distance."""
+        la = -np.log10(np.add(z, 1))
+        self._check_range(la)
+        return _hermite(self.la, self.distance, self.distance_deriv, la)
+
+    def path_length(self, z):
+        """The path length to redshift z, in units of the Hubble distance."""
+        la = -np.log10(np.add(z, 1))
+        self._check_range(la)
+        return _hermite(self.la, self.path, self.path_deriv, la)
+
+    def age(self, la):
+        """The age of the Universe at log(a), in units of the Hubble time."""
+        self._check_range(la)
+        return np.power(10, _hermite(self.la, self.log_age, self.log_age_deriv, la))
+
+    def log_a_from_log_age(self, lt):
+        """The log(a) at which the log of the age of the Universe is lt."""
+        while np.min(lt) < self.log_age[0]:
+            self._build(self.la_min - 6, self.la_max)
+        while np.max(lt) > self.log_age[-1]:
+            self._build(self.la_min, self.la_max + 2)
+        return _hermite(self.log_age, self.la, 1 / self.log_age_deriv, lt)
+
+
+def _hermite(x, y, dydx, xq):
+    # Cubic Hermite interpolation of y(x) with derivatives dydx at xq.
+    i = np.clip(np.searchsorted(x, xq) - 1, 0, x.size - 2)
+    h = x[i + 1] - x[i]
+    s = (xq - x[i]) / h
+    return (
+        (1 + 2 * s) * (1 - s) ** 2 * y[i]
+        + s * (1 - s) ** 2 * h * dydx[i]
+        + s**2 * (3 - 2 * s) * y[i + 1]
+        + s**2 * (s - 1) * h * dydx[i + 1]
+    )
+
+
 def trapzint(f, a, b, bins=10000):
     zbins = np.logspace(np.log10(a + 1), np.log10(b + 1), bins) - 1
     return np.trapz(f(zbins[:-1]), x=zbins[:-1], dx=np.diff(zbins))
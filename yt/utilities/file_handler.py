@@ -1,5 +1,8 @@
+from collections import OrderedDict
 from contextlib import contextmanager
 
+import numpy as np
+
 from yt.utilities.on_demand_imports import NotAModule, _h5py as h5py
 
 
@@ -51,6 +54,109 @@ class HDF5FileHandler:
             self.handle.close()
 
 
+class HDF5FilePool:
+    r"""
+    A bounded pool of HDF5 files open for reading, so that files read over
+    and over are only opened once.
+
+    Parameters
+    ----------
+    max_open : int
+        The maximum number of files kept open.  The least recently used files
+        are closed beyond this number.
+    """
+
+    def __init__(self, max_open=32):
+        self.max_open = max_open
+        self._files = OrderedDict()
+
+    def __len__(self):
+        return len(self._files)
+
+    def get(self, filename):
+        """Returns the open file of the given name, opening it if needed."""
+        f = self._files.get(filename)
+        if f is None or not f:
+            f = self._files[filename] = h5py.File(filename, mode="r")
+        self._files.move_to_end(filename)
+        while len(self._files) > self.max_open:
+            _, old = self._files.popitem(last=False)
+            old.close()
+        return f
+
+    def close(self):
+        """Closes all of the files."""
+        while self._files:
+            _, f = self._files.popitem()
+            f.close()
+
+
+def read_hdf5_rows(dataset, indices, max_gap=1024):
+    r"""
+    Reads the rows of an HDF5 dataset at the given indices.
+
+    The indices are sorted and the rows read as hyperslabs, one for each run
+    of indices separated by no more than ``max_gap`` rows, so that the amount
+    of data read scales with the number of rows requested rather than with the
+    size of the dataset.
+
+    Parameters
+    ----------
+    dataset : h5py.Dataset
+        The dataset to read from.
+    indices : array_like of int
+        The indices of the rows along the first axis, in any order and
+        possibly repeated.
+    max_gap : int
+        The largest number of unrequested rows read to merge two runs.
+
+    Returns
+    -------
+    array
+        The rows, in the order of ``indices``.
+    """
+    indices = np.asarray(indices, dtype="int64")
+    rows, inverse = np.unique(indices, return_inverse=True)
+    out = np.empty((rows.size,) + dataset.shape[1:], dtype=dataset.dtype)
+    if rows.size == 0:
+        return out
+    bounds = np.concatenate(
+        [[0], np.flatnonzero(np.diff(rows) > max_gap + 1) + 1, [rows.size]]
+    )
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        lo, hi = rows[start], rows[end - 1] + 1
+        out[start:end] = dataset[lo:hi][rows[start:end] - lo]
+    return out[inverse.ravel()]
+
+
+def read_hdf5_ranges(dataset, ranges, column=None):
+    r"""
+    Reads the rows of an HDF5 dataset in the given ranges, as one hyperslab
+    each.
+
+    Parameters
+    ----------
+    dataset : h5py.Dataset
+        The dataset to read from.
+    ranges : list of (int, int)
+        The (start, end) indices of the ranges of rows along the first axis.
+    column : int, optional
+        If given, only this column of the rows is read.
+
+    Returns
+    -------
+    array
+        The rows of all of the ranges, concatenated.
+    """
+    columns = () if column is None else (column,)
+    if len(ranges) == 0:
+        ranges = [(0, 0)]
+    rows = [dataset[(slice(start, end),) + columns] for start, end in ranges]
+    if len(rows) == 1:
+        return rows[0]
+    return np.concatenate(rows)
+
+
 class FITSFileHandler(HDF5FileHandler):
     def __init__(self, filename):
         from yt.utilities.on_demand_imports import _astropy
@@ -23,6 +23,7 @@ def write_to_gdf(
     dataset_units=None,
     particle_type_name="dark_matter",
     overwrite=False,
+    compression=None,
     **kwargs,
 ):
     """
@@ -58,6 +59,9 @@ def write_to_gdf(
     overwrite : boolean, optional
         Whether or not to overwrite an already existing file. If False, attempting
         to overwrite an existing file will result in an exception.
+    compression : string, optional
+        The compression filter of the (chunked) HDF5 datasets of the fields,
+        such as "gzip" or "lzf". Default: None
 
     Examples
     --------
@@ -87,7 +91,7 @@ def write_to_gdf(
     ) as f:
 
         # now add the fields one-by-one
-        _write_fields_to_gdf(ds, f, fields, particle_type_name)
+        _write_fields_to_gdf(ds, f, fields, particle_type_name, compression=compression)
 
 
 def save_field(ds, fields, field_parameters=None):
@@ -126,9 +130,48 @@ def save_field(ds, fields, field_parameters=None):
 
 
 def _write_fields_to_gdf(
-    ds, fhandle, fields, particle_type_name, field_parameters=None
+    ds, fhandle, fields, particle_type_name, field_parameters=None, compression=None
 ):
 
+    _create_gdf_fields(ds, fhandle, fields, particle_type_name, compression=compression)
+
+    # now add the actual data, grid by grid
+    g = fhandle["data"]
+    data_source = ds.all_data()
+    citer = data_source.chunks([], "io", local_only=True)
+    for region in parallel_objects(citer):
+        # is there a better way to the get the grids on each chunk?
+        for chunk in ds.index._chunk_io(region):
+            for grid in chunk.objs:
+                for field in fields:
+
+                    # sanitize and get the field info object
+                    fi = ds._get_field_info(field)
+                    ftype, fname = fi.name
+
+                    # set field parameters, if specified
+                    if field_parameters is not None:
+                        for k, v in field_parameters.items():
+                            grid.set_field_parameter(k, v)
+
+                    grid_group = g["grid_%010i" % (grid.id - grid._id_offset)]
+                    particles_group = grid_group["particles"]
+                    pt_group = particles_group[particle_type_name]
+                    # add the field data to the grid group
+                    # Check if this is a real field or particle data.
+                    grid.get_data(field)
+                    units = fhandle["field_types"][fname].attrs["field_units"]
+                    if fi.sampling_type == "particle":  # particle data
+                        dset = pt_group[fname]
+                        dset[:] = grid[field].in_units(units)
+                    else:  # a field
+                        dset = grid_group[fname]
+                        dset[:] = grid[field].in_units(units)
+
+
+def _create_gdf_fields(ds, fhandle, fields, particle_type_name, **kwargs):
+    # Adds the field attributes and creates the (empty) field datasets of every
+    # grid.  Remaining keyword arguments are passed to h5py's create_dataset.
     for field in fields:
         # add field info to field_types group
         g = fhandle["field_types"]
@@ -171,42 +214,12 @@ def _write_fields_to_gdf(
             pt_group = particles_group[particle_type_name]
 
             if fi.sampling_type == "particle":  # particle data
-                pt_group.create_dataset(fname, grid.ActiveDimensions, dtype="float64")
+                group = pt_group
             else:  # a field
-                grid_group.create_dataset(fname, grid.ActiveDimensions, dtype="float64")
-
-    # now add the actual data, grid by grid
-    g = fhandle["data"]
-    data_source = ds.all_data()
-    citer = data_source.chunks([], "io", local_only=True)
-    for region in parallel_objects(citer):
-        # is there a better way to the get the grids on each chunk?
-        for chunk in ds.index._chunk_io(region):
-            for grid in chunk.objs:
-                for field in fields:
-
-                    # sanitize and get the field info object
-                    fi = ds._get_field_info(field)
-                    ftype, fname = fi.name
-
-                    # set field parameters, if specified
-                    if field_parameters is not None:
-                        for k, v in field_parameters.items():
-                            grid.set_field_parameter(k, v)
-
-                    grid_group = g["grid_%010i" % (grid.id - grid._id_offset)]
-                    particles_group = grid_group["particles"]
-                    pt_group = particles_group[particle_type_name]
-                    # add the field data to the grid group
-                    # Check if this is a real field or particle data.
-                    grid.get_data(field)
-                    units = fhandle["field_types"][fname].attrs["field_units"]
-                    if fi.sampling_type == "particle":  # particle data
-                        dset = pt_group[fname]
-                        dset[:] = grid[field].in_units(units)
-                    else:  # a field
-                        dset = grid_group[fname]
-                        dset[:] = grid[field].in_units(units)
+                group = grid_group
+            group.create_dataset(
+                fname, grid.ActiveDimensions, dtype="float64", **kwargs
+            )
 
 
 @contextmanager
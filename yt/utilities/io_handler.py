@@ -1,6 +1,7 @@
 import os
 import sys
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from functools import _make_key, lru_cache
 from typing import DefaultDict, Dict, List, Tuple
@@ -13,6 +14,7 @@ else:
 import numpy as np
 
 from yt._typing import ParticleCoordinateTuple
+from yt.config import ytcfg
 from yt.geometry.selection_routines import GridSelector
 from yt.utilities.on_demand_imports import _h5py as h5py
 
@@ -130,6 +132,33 @@ class BaseIOHandler:
                 ind[field] += obj.select(selector, data, rv[field], ind[field])
         return rv
 
+    def _prefetch(self, items, read):
+        """
+        Yields ``(item, read(item))`` for each of the items, in order.
+
+        Up to ``io_threads`` (see the configuration options) items are read
+        ahead on a pool of threads, so that the reads of several files overlap
+        with each other and with the processing of the data already read.
+        ``read`` must therefore be thread-safe, while the items are produced
+        and consumed in the calling thread.
+        """
+        num_threads = ytcfg.get("yt", "io_threads")
+        if num_threads <= 1:
+            for item in items:
+                yield item, read(item)
+            return
+        pending = deque()
+        with ThreadPoolExecutor(num_threads) as executor:
+            for item in items:
+                # bound the number of items held in memory
+                if len(pending) >= num_threads:
+                    done, future = pending.popleft()
+                    yield done, future.result()
+                pending.append((item, executor.submit(read, item)))
+            while pending:
+                done, future = pending.popleft()
+                yield done, future.result()
+
     def io_iter(self, chunks, fields: List[Tuple[str, str]]):
         raise NotImplementedError(
             "subclassing Dataset.io_iter this is required in order to use the default "
@@ -222,6 +251,38 @@ class BaseIOHandler:
                 rv[field_f] = np.empty(shape, dtype="float64")
         return rv
 
+    def _read_cached_data_file(self, data_file, ptf, selector):
+        # The data read from a data file are kept in the field cache, unselected
+        # for all of the data and otherwise for the selector they were read for
+        cache = self.ds.index.field_cache
+        if not cache.enabled:
+            return self._read_particle_data_file(data_file, ptf, selector)
+        selection = None
+        if selector is not None and not getattr(selector, "is_all_data", False):
+            selection = hash(selector)
+        file_key = (data_file.filename, data_file.start, selection)
+        rv = {}
+        missing = defaultdict(list)
+        for ptype, field_list in ptf.items():
+            for fname in field_list:
+                try:
+                    data = cache.lookup(("particles", file_key, (ptype, fname)))
+                except KeyError:
+                    missing[ptype].append(fname)
+                    continue
+                # None marks the fields without any selected particle
+                if data is not None:
+                    rv[ptype, fname] = data
+        if missing:
+            read = self._read_particle_data_file(data_file, missing, selector)
+            for ptype, field_list in missing.items():
+                for fname in field_list:
+                    data = read.get((ptype, fname))
+                    cache.add(("particles", file_key, (ptype, fname)), data)
+                    if data is not None:
+                        rv[ptype, fname] = data
+        return rv
+
     def _read_particle_fields(self, chunks, ptf, selector):
         # Now we have all the sizes, and we can allocate
         data_files = set()
@@ -229,7 +290,7 @@ class BaseIOHandler:
             for obj in chunk.objs:
                 data_files.update(obj.data_files)
         for data_file in sorted(data_files, key=lambda x: (x.filename, x.start)):
-            data_file_data = self._read_particle_data_file(data_file, ptf, selector)
+            data_file_data = self._read_cached_data_file(data_file, ptf, selector)
             # temporary trickery so it's still an iterator, need to adjust
             # the io_handler.BaseIOHandler.read_particle_selection() method
             # to not use an iterator.
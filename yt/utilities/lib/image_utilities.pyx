@@ -13,21 +13,27 @@ cimport numpy as np
 from yt.utilities.lib.fp_utils cimport iclip
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
 def add_points_to_greyscale_image(
-        np.ndarray[np.float64_t, ndim=2] buffer,
-        np.ndarray[np.uint8_t,   ndim=2] buffer_mask,
-        np.ndarray[np.float64_t, ndim=1] px,
-        np.ndarray[np.float64_t, ndim=1] py,
-        np.ndarray[np.float64_t, ndim=1] pv):
+        np.float64_t[:, :] buffer,
+        np.uint8_t[:, :] buffer_mask,
+        np.float64_t[:] px,
+        np.float64_t[:] py,
+        np.float64_t[:] pv):
+    # The GIL is released so that several chunks of particles can be
+    # deposited concurrently into separate buffers.
     cdef int i, j, pi
     cdef int np = px.shape[0]
     cdef int xs = buffer.shape[0]
     cdef int ys = buffer.shape[1]
-    for pi in range(np):
-        j = <int> (xs * px[pi])
-        i = <int> (ys * py[pi])
-        buffer[i, j] += pv[pi]
-        buffer_mask[i, j] = 1
+    with nogil:
+        for pi in range(np):
+            # points on the upper edges of the image go into the last pixel
+            j = iclip(<int> (xs * px[pi]), 0, buffer.shape[1] - 1)
+            i = iclip(<int> (ys * py[pi]), 0, buffer.shape[0] - 1)
+            buffer[i, j] += pv[pi]
+            buffer_mask[i, j] = 1
     return
 
 def add_points_to_image(
@@ -44,7 +44,7 @@ cdef struct TriangleCollection:
     Triangle *current
 
 cdef Triangle *AddTriangle(Triangle *self,
-                    np.float64_t p0[3], np.float64_t p1[3], np.float64_t p2[3]):
+                    np.float64_t p0[3], np.float64_t p1[3], np.float64_t p2[3]) nogil:
     cdef Triangle *nn = <Triangle *> malloc(sizeof(Triangle))
     if self != NULL:
         self.next = nn
@@ -107,7 +107,7 @@ cdef int march_cubes(
                  np.float64_t gv[8], np.float64_t isovalue,
                  np.float64_t dds[3],
                  np.float64_t x, np.float64_t y, np.float64_t z,
-                 TriangleCollection *triangles):
+                 TriangleCollection *triangles) nogil:
 
     cdef np.float64_t vertlist[12][3]
     cdef int cubeindex = 0
@@ -206,55 +206,61 @@ def march_cubes_grid(np.float64_t isovalue,
     triangles.count = 0
     cdef np.float64_t *data = <np.float64_t *> values.data
     cdef np.float64_t *dds = <np.float64_t *> dxs.data
-    pos[0] = left_edge[0]
-    for i in range(dims[0]):
-        pos[1] = left_edge[1]
-        for j in range(dims[1]):
-            pos[2] = left_edge[2]
-            for k in range(dims[2]):
-                if mask[i,j,k] == 1:
-                    offset = i * (dims[1] + 1) * (dims[2] + 1) \
-                           + j * (dims[2] + 1) + k
-                    intdata = data + offset
-                    offset_fill(dims, intdata, gv)
-                    nt = march_cubes(gv, isovalue, dds, pos[0], pos[1], pos[2],
-                                &triangles)
-                    if nt == 0 or do_sample == 0:
-                        pos[2] += dds[2]
-                        continue
-                    if last == NULL and triangles.first != NULL:
-                        current = triangles.first
-                        last = NULL
-                    elif last != NULL:
-                        current = last.next
-                    if do_sample == 1:
-                        # At each triangle's center, sample our secondary field
-                        while current != NULL:
-                            for n in range(3):
-                                point[n] = 0.0
-                            for n in range(3):
-                                for m in range(3):
-                                    point[m] += (current.p[n][m]-pos[m])*idds[m]
-                            for n in range(3):
-                                point[n] /= 3.0
-                            current.val[0] = offset_interpolate(dims, point,
-                                                             sdata + offset)
-                            last = current
-                            if current.next == NULL: break
-                            current = current.next
-                    elif do_sample == 2:
-                        while current != NULL:
-                            for n in range(3):
-                                for m in range(3):
-                                    point[m] = (current.p[n][m]-pos[m])*idds[m]
-                                current.val[n] = offset_interpolate(dims,
-                                                    point, sdata + offset)
-                            last = current
-                            if current.next == NULL: break
-                            current = current.next
-                pos[2] += dds[2]
-            pos[1] += dds[1]
-        pos[0] += dds[0]
+    cdef np.float64_t le[3]
+    for i in range(3):
+        le[i] = left_edge[i]
+    # The triangles of each grid are extracted without the GIL, so that several
+    # grids can be processed by as many threads
+    with nogil:
+        pos[0] = le[0]
+        for i in range(dims[0]):
+            pos[1] = le[1]
+            for j in range(dims[1]):
+                pos[2] = le[2]
+                for k in range(dims[2]):
+                    if mask[i,j,k] == 1:
+                        offset = i * (dims[1] + 1) * (dims[2] + 1) \
+                               + j * (dims[2] + 1) + k
+                        intdata = data + offset
+                        offset_fill(dims, intdata, gv)
+                        nt = march_cubes(gv, isovalue, dds, pos[0], pos[1], pos[2],
+                                    &triangles)
+                        if nt == 0 or do_sample == 0:
+                            pos[2] += dds[2]
+                            continue
+                        if last == NULL and triangles.first != NULL:
+                            current = triangles.first
+                            last = NULL
+                        elif last != NULL:
+                            current = last.next
+                        if do_sample == 1:
+                            # At each triangle's center, sample our secondary field
+                            while current != NULL:
+                                for n in range(3):
+                                    point[n] = 0.0
+                                for n in range(3):
+                                    for m in range(3):
+                                        point[m] += (current.p[n][m]-pos[m])*idds[m]
+                                for n in range(3):
+                                    point[n] /= 3.0
+                                current.val[0] = offset_interpolate(dims, point,
+                                                                 sdata + offset)
+                                last = current
+                                if current.next == NULL: break
+                                current = current.next
+                        elif do_sample == 2:
+                            while current != NULL:
+                                for n in range(3):
+                                    for m in range(3):
+                                        point[m] = (current.p[n][m]-pos[m])*idds[m]
+                                    current.val[n] = offset_interpolate(dims,
+                                                        point, sdata + offset)
+                                last = current
+                                if current.next == NULL: break
+                                current = current.next
+                    pos[2] += dds[2]
+                pos[1] += dds[1]
+            pos[0] += dds[0]
     # Hallo, we are all done.
     cdef np.ndarray[np.float64_t, ndim=2] vertices
     vertices = np.zeros((triangles.count*3,3), dtype='float64')
@@ -301,7 +307,7 @@ def march_cubes_grid_flux(
     cdef np.float64_t *fdata = <np.float64_t *> flux_field.data
     cdef np.float64_t *dds = <np.float64_t *> dxs.data
     cdef np.float64_t flux = 0.0
-    cdef np.float64_t temp, area, s
+    cdef np.float64_t temp, area, s, wval
     cdef np.float64_t center[3]
     cdef np.float64_t point[3]
     cdef np.float64_t cell_pos[3]
@@ -313,88 +319,92 @@ def march_cubes_grid_flux(
         idds[i] = 1.0 / dds[i]
     triangles.first = triangles.current = NULL
     triangles.count = 0
-    cell_pos[0] = left_edge[0]
-    for i in range(dims[0]):
-        cell_pos[1] = left_edge[1]
-        for j in range(dims[1]):
-            cell_pos[2] = left_edge[2]
-            for k in range(dims[2]):
-                if mask[i,j,k] == 1:
-                    offset = i * (dims[1] + 1) * (dims[2] + 1) \
-                           + j * (dims[2] + 1) + k
-                    intdata = data + offset
-                    offset_fill(dims, intdata, gv)
-                    march_cubes(gv, isovalue, dds,
-                                cell_pos[0], cell_pos[1], cell_pos[2],
-                                &triangles)
-                    # Now our triangles collection has a bunch.  We now
-                    # calculate fluxes for each.
-                    if last == NULL and triangles.first != NULL:
-                        current = triangles.first
-                        last = NULL
-                    elif last != NULL:
-                        current = last.next
-                    while current != NULL:
-                        # Calculate the center of the triangle
-                        wval = 0.0
-                        for n in range(3):
-                            center[n] = 0.0
-                        for n in range(3):
-                            for m in range(3):
-                                point[m] = (current.p[n][m]-cell_pos[m])*idds[m]
-                            # Now we calculate the value at this point
-                            temp = offset_interpolate(dims, point, intdata)
-                            #print("something", temp, point[0], point[1], point[2])
-                            wval += temp
-                            for m in range(3):
-                                center[m] += temp * point[m]
-                        # Now we divide by our normalizing factor
-                        for n in range(3):
-                            center[n] /= wval
-                        # We have our center point of the triangle, in 0..1
-                        # coordinates.  So now we interpolate our three
-                        # fields.
-                        fv[0] = offset_interpolate(dims, center, v1data + offset)
-                        fv[1] = offset_interpolate(dims, center, v2data + offset)
-                        fv[2] = offset_interpolate(dims, center, v3data + offset)
-                        # We interpolate again the actual value data
-                        wval = offset_interpolate(dims, center, fdata + offset)
-                        # Now we have our flux vector and our field value!
-                        # We just need a normal vector with which we can
-                        # dot it.  The normal should be equal to the gradient
-                        # in the center of the triangle, or thereabouts.
-                        eval_gradient(dims, center, intdata, normal)
-                        temp = 0.0
-                        for n in range(3):
-                            temp += normal[n]*normal[n]
-                        # Take the negative, to ensure it points inwardly
-                        temp = -sqrt(temp)
-                        # Dump this somewhere for now
-                        temp = wval * (fv[0] * normal[0] +
-                                       fv[1] * normal[1] +
-                                       fv[2] * normal[2])/temp
-                        # Now we need the area of the triangle.  This will take
-                        # a lot of time to calculate compared to the rest.
-                        # We use Heron's formula.
-                        for n in range(3):
-                            fv[n] = 0.0
-                        for n in range(3):
-                            fv[0] += (current.p[0][n] - current.p[2][n]) * (current.p[0][n] - current.p[2][n])
-                            fv[1] += (current.p[1][n] - current.p[0][n]) * (current.p[1][n] - current.p[0][n])
-                            fv[2] += (current.p[2][n] - current.p[1][n]) * (current.p[2][n] - current.p[1][n])
-                        s = 0.0
-                        for n in range(3):
-                            fv[n] = sqrt(fv[n])
-                            s += 0.5 * fv[n]
-                        area = (s*(s-fv[0])*(s-fv[1])*(s-fv[2]))
-                        area = sqrt(area)
-                        flux += temp*area
-                        last = current
-                        if current.next == NULL: break
-                        current = current.next
-                cell_pos[2] += dds[2]
-            cell_pos[1] += dds[1]
-        cell_pos[0] += dds[0]
+    cdef np.float64_t le[3]
+    for i in range(3):
+        le[i] = left_edge[i]
+    with nogil:
+        cell_pos[0] = le[0]
+        for i in range(dims[0]):
+            cell_pos[1] = le[1]
+            for j in range(dims[1]):
+                cell_pos[2] = le[2]
+                for k in range(dims[2]):
+                    if mask[i,j,k] == 1:
+                        offset = i * (dims[1] + 1) * (dims[2] + 1) \
+                               + j * (dims[2] + 1) + k
+                        intdata = data + offset
+                        offset_fill(dims, intdata, gv)
+                        march_cubes(gv, isovalue, dds,
+                                    cell_pos[0], cell_pos[1], cell_pos[2],
+                                    &triangles)
+                        # Now our triangles collection has a bunch.  We now
+                        # calculate fluxes for each.
+                        if last == NULL and triangles.first != NULL:
+                            current = triangles.first
+                            last = NULL
+                        elif last != NULL:
+                            current = last.next
+                        while current != NULL:
+                            # Calculate the center of the triangle
+                            wval = 0.0
+                            for n in range(3):
+                                center[n] = 0.0
+                            for n in range(3):
+                                for m in range(3):
+                                    point[m] = (current.p[n][m]-cell_pos[m])*idds[m]
+                                # Now we calculate the value at this point
+                                temp = offset_interpolate(dims, point, intdata)
+                                #print("something", temp, point[0], point[1], point[2])
+                                wval += temp
+                                for m in range(3):
+                                    center[m] += temp * point[m]
+                            # Now we divide by our normalizing factor
+                            for n in range(3):
+                                center[n] /= wval
+                            # We have our center point of the triangle, in 0..1
+                            # coordinates.  So now we interpolate our three
+                            # fields.
+                            fv[0] = offset_interpolate(dims, center, v1data + offset)
+                            fv[1] = offset_interpolate(dims, center, v2data + offset)
+                            fv[2] = offset_interpolate(dims, center, v3data + offset)
+                            # We interpolate again the actual value data
+                            wval = offset_interpolate(dims, center, fdata + offset)
+                            # Now we have our flux vector and our field value!
+                            # We just need a normal vector with which we can
+                            # dot it.  The normal should be equal to the gradient
+                            # in the center of the triangle, or thereabouts.
+                            eval_gradient(dims, center, intdata, normal)
+                            temp = 0.0
+                            for n in range(3):
+                                temp += normal[n]*normal[n]
+                            # Take the negative, to ensure it points inwardly
+                            temp = -sqrt(temp)
+                            # Dump this somewhere for now
+                            temp = wval * (fv[0] * normal[0] +
+                                           fv[1] * normal[1] +
+                                           fv[2] * normal[2])/temp
+                            # Now we need the area of the triangle.  This will take
+                            # a lot of time to calculate compared to the rest.
+                            # We use Heron's formula.
+                            for n in range(3):
+                                fv[n] = 0.0
+                            for n in range(3):
+                                fv[0] += (current.p[0][n] - current.p[2][n]) * (current.p[0][n] - current.p[2][n])
+                                fv[1] += (current.p[1][n] - current.p[0][n]) * (current.p[1][n] - current.p[0][n])
+                                fv[2] += (current.p[2][n] - current.p[1][n]) * (current.p[2][n] - current.p[1][n])
+                            s = 0.0
+                            for n in range(3):
+                                fv[n] = sqrt(fv[n])
+                                s += 0.5 * fv[n]
+                            area = (s*(s-fv[0])*(s-fv[1])*(s-fv[2]))
+                            area = sqrt(area)
+                            flux += temp*area
+                            last = current
+                            if current.next == NULL: break
+                            current = current.next
+                    cell_pos[2] += dds[2]
+                cell_pos[1] += dds[1]
+            cell_pos[0] += dds[0]
     # Hallo, we are all done.
     WipeTriangles(triangles.first)
     return flux
@@ -117,3 +117,237 @@ def clamp_edges(np.float64_t[:] edge, np.float64_t[:] pleft,
         start_index = (edge[i] - pleft[i]) / pdx[i]
         integer_index = rint(start_index)
         edge[i] = integer_index * pdx[i] + pleft[i]
+
+
+# the maximum depth of an ElementBVH; below half of it, nodes are split evenly
+DEF _MAX_DEPTH = 160
+
+
+cdef class ElementBVH:
+    """
+    A bounding volume hierarchy over the bounding boxes of the elements of an
+    unstructured mesh.
+
+    It is used to find the elements which may overlap a region, such as the
+    pixels of an image or the points of a line, without having to check every
+    element of the mesh.  The element ids returned by the queries are always
+    sorted.
+
+    Parameters
+    ----------
+    coords : array_like
+        The coordinates of the vertices, with shape (nvertices, ndim).
+    indices : array_like
+        The connectivity of the elements, with shape (nelements, nverts).
+    offset : int, optional
+        The index of the first vertex in the connectivity.  Default: 0.
+    leaf_size : int, optional
+        The maximum number of elements in a leaf.  Default: 16.
+    """
+
+    cdef readonly np.int64_t num_elem
+    cdef readonly np.int64_t num_nodes
+    cdef readonly int ndim
+    cdef np.float64_t[:, ::1] bboxes
+    cdef np.int64_t[::1] elem_ids
+    # begin, end, left child, right child (-1 for leaves)
+    cdef np.int64_t[:, ::1] nodes
+    cdef np.float64_t[:, ::1] node_bboxes
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    def __init__(self, np.float64_t[:, :] coords, np.int64_t[:, :] indices,
+                 int offset=0, int leaf_size=16):
+        cdef np.int64_t i, j, k, v
+        cdef int ndim = coords.shape[1]
+        cdef np.float64_t[:, ::1] bboxes
+        self.ndim = ndim
+        self.num_elem = indices.shape[0]
+        self.bboxes = bboxes = np.empty((self.num_elem, 2 * ndim), dtype="float64")
+        with nogil:
+            for i in range(self.num_elem):
+                for k in range(ndim):
+                    bboxes[i, k] = 1e300
+                    bboxes[i, ndim + k] = -1e300
+                for j in range(indices.shape[1]):
+                    v = indices[i, j] - offset
+                    for k in range(ndim):
+                        bboxes[i, k] = fmin(bboxes[i, k], coords[v, k])
+                        bboxes[i, ndim + k] = fmax(bboxes[i, ndim + k],
+                                                   coords[v, k])
+        self.elem_ids = np.arange(self.num_elem, dtype="int64")
+        self._build(max(leaf_size, 2))
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    @cython.cdivision(True)
+    cdef void _build(self, np.int64_t leaf_size):
+        cdef np.int64_t[:, ::1] stack = np.empty((_MAX_DEPTH + 1, 2), dtype="int64")
+        cdef np.int64_t nstack, node, depth, begin, end, mid, i, j, k, ax, tmp
+        cdef np.float64_t cmin, cmax, split, width, c
+        cdef int ndim = self.ndim
+        cdef np.float64_t[:, ::1] bboxes = self.bboxes
+        cdef np.int64_t[::1] ids = self.elem_ids
+        cdef np.int64_t[:, ::1] nodes
+        cdef np.float64_t[:, ::1] node_bboxes
+        cdef np.int64_t max_nodes = 2 * (self.num_elem // leaf_size) + 8
+        nodes = np.empty((max_nodes, 4), dtype="int64")
+        node_bboxes = np.empty((max_nodes, 2 * ndim), dtype="float64")
+        nodes[0, 0] = 0
+        nodes[0, 1] = self.num_elem
+        self.num_nodes = 1
+        stack[0, 0] = 0
+        stack[0, 1] = 0
+        nstack = 1
+        while nstack > 0:
+            nstack -= 1
+            node = stack[nstack, 0]
+            depth = stack[nstack, 1]
+            begin = nodes[node, 0]
+            end = nodes[node, 1]
+            nodes[node, 2] = nodes[node, 3] = -1
+            for k in range(ndim):
+                node_bboxes[node, k] = 1e300
+                node_bboxes[node, ndim + k] = -1e300
+            for i in range(begin, end):
+                for k in range(ndim):
+                    node_bboxes[node, k] = fmin(node_bboxes[node, k],
+                                                bboxes[ids[i], k])
+                    node_bboxes[node, ndim + k] = fmax(
+                        node_bboxes[node, ndim + k], bboxes[ids[i], ndim + k])
+            if end - begin <= leaf_size:
+                continue
+            # split at the middle of the widest extent of the centers
+            ax = 0
+            width = -1.0
+            split = 0.0
+            for k in range(ndim):
+                cmin = 1e300
+                cmax = -1e300
+                for i in range(begin, end):
+                    c = bboxes[ids[i], k] + bboxes[ids[i], ndim + k]
+                    cmin = fmin(cmin, c)
+                    cmax = fmax(cmax, c)
+                if cmax - cmin > width:
+                    width = cmax - cmin
+                    ax = k
+                    split = 0.5 * (cmin + cmax)
+            mid = begin
+            if depth < _MAX_DEPTH // 2:
+                for i in range(begin, end):
+                    if bboxes[ids[i], ax] + bboxes[ids[i], ndim + ax] < split:
+                        tmp = ids[i]
+                        ids[i] = ids[mid]
+                        ids[mid] = tmp
+                        mid += 1
+            if mid == begin or mid == end:
+                # the centers coincide, or the tree is getting too deep, so
+                # split the elements evenly
+                mid = (begin + end) // 2
+            if self.num_nodes + 2 > max_nodes:
+                max_nodes *= 2
+                nodes = np.resize(nodes, (max_nodes, 4))
+                node_bboxes = np.resize(node_bboxes, (max_nodes, 2 * ndim))
+            for j in range(2):
+                nodes[node, 2 + j] = self.num_nodes
+                nodes[self.num_nodes, 0] = begin if j == 0 else mid
+                nodes[self.num_nodes, 1] = mid if j == 0 else end
+                stack[nstack, 0] = self.num_nodes
+                stack[nstack, 1] = depth + 1
+                nstack += 1
+                self.num_nodes += 1
+        self.nodes = np.asarray(nodes[:self.num_nodes]).copy()
+        self.node_bboxes = np.asarray(node_bboxes[:self.num_nodes]).copy()
+
+    @property
+    def nbytes(self):
+        return (self.bboxes.nbytes + self.elem_ids.nbytes + self.nodes.nbytes
+                + self.node_bboxes.nbytes)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef np.int64_t _query(self, np.float64_t *LE, np.float64_t *RE,
+                           np.int64_t *out) nogil:
+        # Counts, and if out is not NULL stores, the elements whose bounding
+        # boxes overlap the closed box [LE, RE]
+        cdef np.int64_t stack[_MAX_DEPTH + 2]
+        cdef np.int64_t nstack = 1, node, i, e, count = 0
+        cdef int k, ndim = self.ndim
+        cdef bint overlap
+        stack[0] = 0
+        while nstack > 0:
+            nstack -= 1
+            node = stack[nstack]
+            overlap = True
+            for k in range(ndim):
+                if (self.node_bboxes[node, k] > RE[k]
+                        or self.node_bboxes[node, ndim + k] < LE[k]):
+                    overlap = False
+                    break
+            if not overlap:
+                continue
+            if self.nodes[node, 2] >= 0:
+                stack[nstack] = self.nodes[node, 2]
+                stack[nstack + 1] = self.nodes[node, 3]
+                nstack += 2
+                continue
+            for i in range(self.nodes[node, 0], self.nodes[node, 1]):
+                e = self.elem_ids[i]
+                overlap = True
+                for k in range(ndim):
+                    if self.bboxes[e, k] > RE[k] or self.bboxes[e, ndim + k] < LE[k]:
+                        overlap = False
+                        break
+                if overlap:
+                    if out != NULL:
+                        out[count] = e
+                    count += 1
+        return count
+
+    def query_box(self, left_edge, right_edge):
+        """
+        Returns the sorted ids of the elements whose bounding boxes overlap the
+        box between left_edge and right_edge.
+        """
+        cdef np.float64_t LE[3]
+        cdef np.float64_t RE[3]
+        cdef np.int64_t count
+        cdef np.int64_t[::1] out
+        for k in range(self.ndim):
+            LE[k] = left_edge[k]
+            RE[k] = right_edge[k]
+        count = self._query(LE, RE, NULL)
+        out = np.empty(count, dtype="int64")
+        if count > 0:
+            self._query(LE, RE, &out[0])
+        return np.sort(np.asarray(out))
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    def query_points(self, np.float64_t[:, :] points, np.float64_t tol=0.0):
+        """
+        Returns the elements whose bounding boxes, padded by tol, contain each
+        of the points, as an array of offsets into an array of sorted element
+        ids.  The elements of point i are ids[offsets[i]:offsets[i+1]].
+        """
+        cdef np.float64_t LE[3]
+        cdef np.float64_t RE[3]
+        cdef np.int64_t i, n
+        cdef int k
+        cdef np.int64_t[::1] offsets = np.zeros(points.shape[0] + 1, dtype="int64")
+        cdef np.int64_t[::1] ids
+        for i in range(points.shape[0]):
+            for k in range(self.ndim):
+                LE[k] = points[i, k] - tol
+                RE[k] = points[i, k] + tol
+            offsets[i + 1] = offsets[i] + self._query(LE, RE, NULL)
+        ids = np.empty(offsets[points.shape[0]], dtype="int64")
+        for i in range(points.shape[0]):
+            for k in range(self.ndim):
+                LE[k] = points[i, k] - tol
+                RE[k] = points[i, k] + tol
+            n = offsets[i + 1] - offsets[i]
+            if n > 0:
+                self._query(LE, RE, &ids[offsets[i]])
+                np.asarray(ids[offsets[i]:offsets[i + 1]]).sort()
+        return np.asarray(offsets), np.asarray(ids)
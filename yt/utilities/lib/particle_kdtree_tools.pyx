@@ -1,4 +1,6 @@
 # distutils: language = c++
+# distutils: extra_compile_args = CPP14_FLAG OMP_ARGS
+# distutils: extra_link_args = CPP14_FLAG OMP_ARGS
 """
 Cython tools for working with the PyKDTree particle KDTree.
 
@@ -12,7 +14,9 @@ import numpy as np
 cimport cython
 cimport numpy as np
 from cpython.exc cimport PyErr_CheckSignals
+from cython.parallel cimport parallel, prange, threadid
 from libc.math cimport sqrt
+from libc.stdlib cimport free, malloc
 from libcpp.vector cimport vector
 
 from yt.utilities.lib.cykdtree.kdtree cimport KDTree, Node, PyKDTree, uint32_t, uint64_t
@@ -54,7 +58,9 @@ cdef int set_axes_range(axes_range *axes, int skipaxis):
 @cython.wraparound(False)
 @cython.cdivision(True)
 def generate_smoothing_length(np.float64_t[:, ::1] tree_positions,
-                              PyKDTree kdtree, int n_neighbors):
+                              PyKDTree kdtree, int n_neighbors,
+                              np.int64_t start = 0, np.int64_t stop = -1,
+                              int num_threads = 1):
     """Calculate array of distances to the nth nearest neighbor
 
     Parameters
@@ -66,44 +72,59 @@ def generate_smoothing_length(np.float64_t[:, ::1] tree_positions,
     kdtree: A PyKDTree instance
         A kdtree to do nearest neighbors searches with
     n_neighbors: The neighbor number to calculate the distance to
+    start, stop: integers
+        The range of particles, in kdtree sorted order, to calculate the
+        smoothing lengths of. Defaults to all of the particles.
+    num_threads: integer
+        The number of threads the particles are distributed on.
 
     Returns
     -------
 
-    smoothing_lengths: arrays of floats with shape (n_particles, )
+    smoothing_lengths: arrays of floats with shape (stop - start, )
         The calculated smoothing lengths
 
     """
-    cdef int i
+    cdef np.int64_t i
     cdef KDTree * c_tree = kdtree._tree
-    cdef int n_particles = tree_positions.shape[0]
-    cdef np.float64_t * pos
-    cdef np.float64_t[:] smoothing_length = np.empty(n_particles)
-    cdef BoundedPriorityQueue queue = BoundedPriorityQueue(n_neighbors)
-    cdef np.int64_t skipaxis = -1
+    cdef np.int64_t n_particles = tree_positions.shape[0]
+    cdef np.float64_t * heap
+    cdef int * heap_size
+    cdef np.float64_t[:] smoothing_length
+    cdef int nthreads = max(num_threads, 1)
+
+    if stop < 0 or stop > n_particles:
+        stop = n_particles
+    smoothing_length = np.empty(max(stop - start, 0))
 
     # We are using all spatial dimensions
     cdef axes_range axes
     set_axes_range(&axes, -1)
 
-    pbar = get_pbar("Generate smoothing length", n_particles)
-    with nogil:
-        for i in range(n_particles):
-            # Reset queue to "empty" state, doing it this way avoids
+    pbar = get_pbar("Generate smoothing length", stop - start)
+    with nogil, parallel(num_threads=nthreads):
+        # Each thread keeps its own max-heap of the n_neighbors smallest
+        # squared distances
+        heap = <np.float64_t *> malloc(n_neighbors * sizeof(np.float64_t))
+        heap_size = <int *> malloc(sizeof(int))
+        for i in prange(start, stop, schedule="dynamic", chunksize=64):
+            # Reset heap to "empty" state, doing it this way avoids
             # needing to reallocate memory
-            queue.size = 0
+            heap_size[0] = 0
 
-            if i % CHUNKSIZE == 0:
+            if i % CHUNKSIZE == 0 and threadid() == 0:
                 with gil:
-                    pbar.update(i-1)
+                    pbar.update(i - start)
                     PyErr_CheckSignals()
 
-            pos = &(tree_positions[i, 0])
-            find_neighbors(pos, tree_positions, queue, c_tree, i, &axes)
+            find_neighbors_heap(&tree_positions[i, 0], tree_positions, heap,
+                                heap_size, n_neighbors, c_tree, i, &axes)
 
-            smoothing_length[i] = sqrt(queue.heap_ptr[0])
+            smoothing_length[i - start] = sqrt(heap[0])
+        free(heap)
+        free(heap_size)
 
-    pbar.update(n_particles-1)
+    pbar.update(stop - start)
     pbar.finish()
     return np.asarray(smoothing_length)
 
@@ -382,3 +403,326 @@ cdef inline int process_node_points_ball(Node* node,
             nblist.add_pid(sq_dist, i)
 
     return 0
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def count_pairs(np.float64_t[:, ::1] positions, np.float64_t[:] weights,
+                np.float64_t[:, ::1] tree_positions,
+                np.float64_t[:] tree_weights, PyKDTree kdtree,
+                np.float64_t[:] bins, periodic, left_edge, right_edge,
+                bint auto = False, int num_threads = 1):
+    """Histogram the separations of particle pairs between two particle sets.
+
+    Every particle in ``positions`` is paired with all particles of the second
+    set (stored in ``kdtree``) that lie within the largest bin edge, and the
+    product of the weights of the pair is added to the bin of their
+    separation.
+
+    Parameters
+    ----------
+
+    positions: array of floats with shape (n_particles, 3)
+        The positions of the first set of particles.
+    weights: array of floats with shape (n_particles, )
+        The weights of the first set of particles.
+    tree_positions: array of floats with shape (n_tree_particles, 3)
+        The positions of the second set of particles in kdtree sorted order.
+    tree_weights: array of floats with shape (n_tree_particles, )
+        The weights of the second set of particles in kdtree sorted order.
+    kdtree: A PyKDTree instance
+        A kdtree built on the second set of particles.
+    bins: array of floats with shape (n_bins + 1, )
+        The monotonically increasing edges of the separation bins.
+    periodic: array of bools with shape (3, )
+        Whether pairs are also searched for across each domain boundary. The
+        largest bin edge must not exceed half of the periodic domain widths.
+    left_edge, right_edge: arrays of floats with shape (3, )
+        The edges of the domain.
+    auto: bool
+        Whether both sets are the same particles in the same order, in which
+        case self-pairs are skipped and each pair is counted once.
+    num_threads: int
+        The number of threads to distribute the particles of the first set on.
+
+    Returns
+    -------
+
+    counts: array of floats with shape (n_bins, )
+        The weighted pair counts in each separation bin.
+
+    """
+    cdef int i, j, k, n_shifts
+    cdef int nbins = bins.shape[0] - 1
+    cdef int n_particles = positions.shape[0]
+    cdef KDTree * c_tree = kdtree._tree
+    cdef np.float64_t * pos
+    cdef np.float64_t * shifts
+    cdef np.float64_t width[3]
+    cdef np.float64_t r2max = bins[nbins] * bins[nbins]
+    cdef np.float64_t[:] bins2 = np.asarray(bins) ** 2
+    cdef np.float64_t[:, ::1] buffers
+    cdef np.int64_t skipidx
+    cdef np.int64_t[:] inverse
+    cdef int nthreads = max(num_threads, 1)
+    cdef np.uint8_t[:] cperiodic = np.asarray(periodic, dtype="uint8")
+    cdef np.float64_t[:] LE = np.asarray(left_edge, dtype="float64")
+    cdef np.float64_t[:] RE = np.asarray(right_edge, dtype="float64")
+
+    if n_particles == 0 or tree_positions.shape[0] == 0:
+        return np.zeros(nbins, dtype="float64")
+    buffers = np.zeros((nthreads, nbins), dtype="float64")
+    if auto:
+        # maps the particles of the first set to their position in the tree
+        inverse = np.argsort(kdtree.idx).astype("int64")
+    else:
+        inverse = np.full(1, -1, dtype="int64")
+    for k in range(3):
+        width[k] = RE[k] - LE[k]
+
+    with nogil, parallel(num_threads=nthreads):
+        pos = <np.float64_t *> malloc(3 * sizeof(np.float64_t))
+        shifts = <np.float64_t *> malloc(81 * sizeof(np.float64_t))
+        for i in prange(n_particles, schedule="dynamic", chunksize=256):
+            skipidx = -1
+            if auto:
+                skipidx = inverse[i]
+            n_shifts = _periodic_shifts(&positions[i, 0], bins[nbins],
+                                        &cperiodic[0], &LE[0], &RE[0], width,
+                                        shifts)
+            for j in range(n_shifts):
+                for k in range(3):
+                    pos[k] = positions[i, k] + shifts[3*j + k]
+                _count_pairs_node(c_tree.root, pos, weights[i], r2max,
+                                  tree_positions, tree_weights, bins2,
+                                  skipidx, &buffers[threadid(), 0])
+        free(pos)
+        free(shifts)
+
+    counts = np.asarray(buffers).sum(axis=0)
+    if auto:
+        counts /= 2
+    return counts
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline int _periodic_shifts(np.float64_t * pos, np.float64_t rmax,
+                                 np.uint8_t * periodic, np.float64_t * LE,
+                                 np.float64_t * RE, np.float64_t * width,
+                                 np.float64_t * shifts) nogil:
+    # Fill the offsets of the periodic images of a point whose search ball
+    # crosses the domain boundaries, the first one being the point itself
+    cdef int k, n, m, ntot = 1
+    cdef np.float64_t offset
+    for k in range(3):
+        shifts[k] = 0.0
+    for k in range(3):
+        if not periodic[k]:
+            continue
+        if pos[k] - rmax < LE[k]:
+            offset = width[k]
+        elif pos[k] + rmax > RE[k]:
+            offset = -width[k]
+        else:
+            continue
+        n = ntot
+        for m in range(n):
+            shifts[3*ntot + 0] = shifts[3*m + 0]
+            shifts[3*ntot + 1] = shifts[3*m + 1]
+            shifts[3*ntot + 2] = shifts[3*m + 2]
+            shifts[3*ntot + k] += offset
+            ntot += 1
+    return ntot
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef int _count_pairs_node(Node* node,
+                           np.float64_t* pos,
+                           np.float64_t weight,
+                           np.float64_t r2max,
+                           np.float64_t[:, ::1] tree_positions,
+                           np.float64_t[:] tree_weights,
+                           np.float64_t[:] bins2,
+                           np.int64_t skipidx,
+                           np.float64_t* counts,
+                           ) nogil except -1:
+    """Traverse the k-d tree, binning the separations of pairs in leaves."""
+    cdef int k, lo, hi, mid
+    cdef uint64_t i
+    cdef np.float64_t v, tpos, sq_dist = 0
+
+    # Cull nodes entirely outside of the largest separation
+    for k in range(3):
+        v = pos[k]
+        if v < node.left_edge[k]:
+            tpos = node.left_edge[k] - v
+        elif v > node.right_edge[k]:
+            tpos = v - node.right_edge[k]
+        else:
+            tpos = 0
+        sq_dist += tpos*tpos
+    if sq_dist > r2max:
+        return 0
+
+    if not node.is_leaf:
+        _count_pairs_node(node.less, pos, weight, r2max, tree_positions,
+                          tree_weights, bins2, skipidx, counts)
+        _count_pairs_node(node.greater, pos, weight, r2max, tree_positions,
+                          tree_weights, bins2, skipidx, counts)
+        return 0
+
+    for i in range(node.left_idx, node.left_idx + node.children):
+        if <np.int64_t> i == skipidx:
+            continue
+        sq_dist = 0.0
+        for k in range(3):
+            tpos = tree_positions[i, k] - pos[k]
+            sq_dist += tpos*tpos
+        if sq_dist < bins2[0] or sq_dist >= r2max:
+            continue
+        # bisect the bin edges
+        lo = 0
+        hi = bins2.shape[0] - 1
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if sq_dist < bins2[mid]:
+                hi = mid
+            else:
+                lo = mid
+        counts[lo] += weight * tree_weights[i]
+    return 0
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef inline void heap_push(np.float64_t * heap, int * size, int max_elements,
+                           np.float64_t val) nogil:
+    # Keep the max_elements smallest values in a max-heap, the largest of them
+    # being heap[0]
+    cdef int index, parent, left, right, largest
+    if size[0] < max_elements:
+        index = size[0]
+        size[0] += 1
+        heap[index] = val
+        while index != 0:
+            parent = (index - 1) // 2
+            if heap[parent] >= heap[index]:
+                break
+            heap[parent], heap[index] = heap[index], heap[parent]
+            index = parent
+        return
+    if val >= heap[0]:
+        return
+    heap[0] = val
+    index = 0
+    while True:
+        left = 2 * index + 1
+        right = 2 * index + 2
+        largest = index
+        if left < size[0] and heap[left] > heap[largest]:
+            largest = left
+        if right < size[0] and heap[right] > heap[largest]:
+            largest = right
+        if largest == index:
+            break
+        heap[index], heap[largest] = heap[largest], heap[index]
+        index = largest
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef int find_neighbors_heap(np.float64_t * pos,
+                             np.float64_t[:, ::1] tree_positions,
+                             np.float64_t * heap, int * heap_size,
+                             int max_elements, KDTree * c_tree,
+                             uint64_t skipidx, axes_range * axes
+                             ) nogil except -1:
+    """Find the nearest neighbors, storing their squared distances in a heap
+    owned by the calling thread."""
+    cdef Node* leafnode
+
+    # Make an initial guess based on the closest node
+    leafnode = c_tree.search(&pos[0])
+    process_node_points_heap(leafnode, heap, heap_size, max_elements,
+                             tree_positions, pos, skipidx, axes)
+
+    # Traverse the rest of the kdtree to finish the neighbor list
+    find_knn_heap(c_tree.root, heap, heap_size, max_elements, tree_positions,
+                  pos, leafnode.leafid, skipidx, axes)
+    return 0
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef int find_knn_heap(Node* node,
+                       np.float64_t * heap,
+                       int * heap_size,
+                       int max_elements,
+                       np.float64_t[:, ::1] tree_positions,
+                       np.float64_t* pos,
+                       uint32_t skipleaf,
+                       uint64_t skipidx,
+                       axes_range * axes,
+                       ) nogil except -1:
+    cdef np.float64_t ndist
+    if node.leafid == skipleaf and node.is_leaf:
+        return 0
+    ndist = node_distance(node, pos, axes)
+    if heap_size[0] == max_elements and ndist > heap[0]:
+        return 0
+    if not node.is_leaf:
+        find_knn_heap(node.less, heap, heap_size, max_elements,
+                      tree_positions, pos, skipleaf, skipidx, axes)
+        find_knn_heap(node.greater, heap, heap_size, max_elements,
+                      tree_positions, pos, skipleaf, skipidx, axes)
+    else:
+        process_node_points_heap(node, heap, heap_size, max_elements,
+                                 tree_positions, pos, skipidx, axes)
+    return 0
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline np.float64_t node_distance(Node* node, np.float64_t* pos,
+                                       axes_range * axes) nogil:
+    # The squared distance between a position and the closest point of a node
+    cdef int k
+    cdef np.float64_t v, tpos, ndist = 0
+    k = axes.start
+    while k < axes.stop:
+        v = pos[k]
+        if v < node.left_edge[k]:
+            tpos = node.left_edge[k] - v
+        elif v > node.right_edge[k]:
+            tpos = v - node.right_edge[k]
+        else:
+            tpos = 0
+        ndist += tpos*tpos
+        k += axes.step
+    return ndist
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef inline int process_node_points_heap(Node* node,
+                                         np.float64_t * heap,
+                                         int * heap_size,
+                                         int max_elements,
+                                         np.float64_t[:, ::1] positions,
+                                         np.float64_t* pos,
+                                         uint64_t skipidx,
+                                         axes_range * axes,
+                                         ) nogil except -1:
+    cdef uint64_t i, k
+    cdef np.float64_t tpos, sq_dist
+    for i in range(node.left_idx, node.left_idx + node.children):
+        if i == skipidx:
+            continue
+
+        sq_dist = 0.0
+
+        k = axes.start
+        while k < axes.stop:
+            tpos = positions[i, k] - pos[k]
+            sq_dist += tpos*tpos
+            k += axes.step
+
+        heap_push(heap, heap_size, max_elements, sq_dist)
+
+    return 0
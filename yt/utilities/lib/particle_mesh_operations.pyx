@@ -103,39 +103,40 @@ def CICDeposit_2(np.float64_t[:] posx,
     dx = x_bin_edges[1] - x_bin_edges[0]
     dy = y_bin_edges[1] - y_bin_edges[0]
 
-    for n in range(npositions):
-
-        # Compute the position of the central cell
-        xpos = (posx[n] - x_bin_edges[0])/dx
-        ypos = (posy[n] - y_bin_edges[0])/dy
-
-        if (xpos < -0.5001) or (xpos > edgex):
-            continue
-        if (ypos < -0.5001) or (ypos > edgey):
-            continue
-
-        i1  = <int> (xpos + 0.5)
-        j1  = <int> (ypos + 0.5)
-
-        # Compute the weights
-        ddx = (<np.float64_t> i1) + 0.5 - xpos
-        ddy = (<np.float64_t> j1) + 0.5 - ypos
-        ddx2 =  1.0 - ddx
-        ddy2 =  1.0 - ddy
-
-        # Deposit onto field
-        if i1 > 0 and j1 > 0:
-            field[i1-1,j1-1] += mass[n] * ddx  * ddy
-            field_mask[i1-1,j1-1] = 1
-        if j1 > 0 and i1 < field.shape[0]:
-            field[i1  ,j1-1] += mass[n] * ddx2 * ddy
-            field_mask[i1,j1-1] = 1
-        if i1 > 0 and j1 < field.shape[1]:
-            field[i1-1,j1  ] += mass[n] * ddx  * ddy2
-            field_mask[i1-1,j1] = 1
-        if i1 < field.shape[0] and j1 < field.shape[1]:
-            field[i1  ,j1  ] += mass[n] * ddx2 * ddy2
-            field_mask[i1,j1] = 1
+    with nogil:
+        for n in range(npositions):
+
+            # Compute the position of the central cell
+            xpos = (posx[n] - x_bin_edges[0])/dx
+            ypos = (posy[n] - y_bin_edges[0])/dy
+
+            if (xpos < -0.5001) or (xpos > edgex):
+                continue
+            if (ypos < -0.5001) or (ypos > edgey):
+                continue
+
+            i1  = <int> (xpos + 0.5)
+            j1  = <int> (ypos + 0.5)
+
+            # Compute the weights
+            ddx = (<np.float64_t> i1) + 0.5 - xpos
+            ddy = (<np.float64_t> j1) + 0.5 - ypos
+            ddx2 =  1.0 - ddx
+            ddy2 =  1.0 - ddy
+
+            # Deposit onto field
+            if i1 > 0 and j1 > 0:
+                field[i1-1,j1-1] += mass[n] * ddx  * ddy
+                field_mask[i1-1,j1-1] = 1
+            if j1 > 0 and i1 < field.shape[0]:
+                field[i1  ,j1-1] += mass[n] * ddx2 * ddy
+                field_mask[i1,j1-1] = 1
+            if i1 > 0 and j1 < field.shape[1]:
+                field[i1-1,j1  ] += mass[n] * ddx  * ddy2
+                field_mask[i1-1,j1] = 1
+            if i1 < field.shape[0] and j1 < field.shape[1]:
+                field[i1  ,j1  ] += mass[n] * ddx2 * ddy2
+                field_mask[i1,j1] = 1
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
@@ -263,6 +263,230 @@ def pixelize_cartesian(np.float64_t[:,:] buff,
                             else:
                                 buff[i,j] = dsp
 
+@cython.cdivision(True)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _pixelize_cartesian_rows(np.float64_t[:,:,:] buffs,
+                                   np.float64_t[:] px,
+                                   np.float64_t[:] py,
+                                   np.float64_t[:] pdx,
+                                   np.float64_t[:] pdy,
+                                   np.float64_t[:,:] data,
+                                   np.float64_t x_min, np.float64_t x_max,
+                                   np.float64_t y_min, np.float64_t y_max,
+                                   np.float64_t period_x, np.float64_t period_y,
+                                   int antialias, int check_period,
+                                   np.int64_t[:] cells,
+                                   np.int64_t cell_start, np.int64_t cell_end,
+                                   int row_start, int row_end) nogil:
+    # Deposits the cells cells[cell_start:cell_end] into the rows
+    # [row_start, row_end) of all of the buffers, in the same order (and so
+    # with the same result) as pixelize_cartesian does for a single buffer.
+    cdef np.float64_t px_dx, px_dy, ipx_dx, ipx_dy
+    cdef np.float64_t oxsp, oysp, xsp, ysp, dxsp, dysp
+    cdef np.float64_t xshift, yshift, lypx, rypx, lxpx, rxpx
+    cdef np.float64_t overlap1, overlap2
+    cdef np.int64_t k, p
+    cdef int xi, yi, i, j, f, lc, lr, rc, rr
+    cdef int nf = buffs.shape[0]
+    px_dx = (x_max - x_min) / (<np.float64_t> buffs.shape[2])
+    px_dy = (y_max - y_min) / (<np.float64_t> buffs.shape[1])
+    ipx_dx = 1.0 / px_dx
+    ipx_dy = 1.0 / px_dy
+    for k in range(cell_start, cell_end):
+        p = cells[k]
+        oxsp = px[p]
+        oysp = py[p]
+        dxsp = pdx[p]
+        dysp = pdy[p]
+        # The periodic images of this cell that may overlap the image; a zero
+        # shift means that there is no such image.
+        xshift = yshift = 0.0
+        if check_period == 1:
+            if (oxsp - dxsp < x_min):
+                xshift = period_x
+            elif (oxsp + dxsp > x_max):
+                xshift = -period_x
+            if (oysp - dysp < y_min):
+                yshift = period_y
+            elif (oysp + dysp > y_max):
+                yshift = -period_y
+        overlap1 = overlap2 = 1.0
+        for xi in range(2):
+            if xi == 1 and xshift == 0.0: continue
+            xsp = oxsp + xi * xshift
+            if (xsp + dxsp < x_min) or (xsp - dxsp > x_max): continue
+            for yi in range(2):
+                if yi == 1 and yshift == 0.0: continue
+                ysp = oysp + yi * yshift
+                if (ysp + dysp < y_min) or (ysp - dysp > y_max): continue
+                lr = <int> fmax(((ysp-dysp-y_min)*ipx_dy),0)
+                rr = <int> fmin(((ysp+dysp-y_min)*ipx_dy + 1), buffs.shape[1])
+                lr = imax(lr, row_start)
+                rr = imin(rr, row_end)
+                if lr >= rr: continue
+                lc = <int> fmax(((xsp-dxsp-x_min)*ipx_dx),0)
+                rc = <int> fmin(((xsp+dxsp-x_min)*ipx_dx + 1), buffs.shape[2])
+                for i in range(lr, rr):
+                    lypx = px_dy * i + y_min
+                    rypx = px_dy * (i+1) + y_min
+                    if antialias == 1:
+                        overlap2 = ((fmin(rypx, ysp+dysp)
+                                   - fmax(lypx, (ysp-dysp)))*ipx_dy)
+                    if overlap2 < 0.0: continue
+                    for j in range(lc, rc):
+                        if antialias == 1:
+                            lxpx = px_dx * j + x_min
+                            rxpx = px_dx * (j+1) + x_min
+                            overlap1 = ((fmin(rxpx, xsp+dxsp)
+                                       - fmax(lxpx, (xsp-dxsp)))*ipx_dx)
+                            if overlap1 < 0.0: continue
+                            if overlap1 * overlap2 < 1.e-6: continue
+                            for f in range(nf):
+                                if buffs[f,i,j] != buffs[f,i,j]:
+                                    buffs[f,i,j] = 0.0
+                                buffs[f,i,j] += (data[f,p] * overlap1) * overlap2
+                        else:
+                            for f in range(nf):
+                                buffs[f,i,j] = data[f,p]
+
+@cython.cdivision(True)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _bin_cells_by_rows(np.float64_t[:] py,
+                             np.float64_t[:] pdy,
+                             np.float64_t y_min, np.float64_t y_max,
+                             np.float64_t period_y, int check_period,
+                             int ny, int block_size,
+                             np.int64_t[:] offsets,
+                             np.int64_t[:] cells,
+                             int fill) nogil:
+    # Goes through the cells in order and, for every block of block_size rows
+    # that a cell (or its periodic image) overlaps, either counts the cell in
+    # offsets[block + 1] or, if fill is set, stores it at cells[offsets[block]]
+    # and advances offsets[block].
+    cdef np.float64_t px_dy, ipx_dy, oysp, ysp, dysp, yshift
+    cdef np.int64_t p
+    cdef int yi, lr, rr, block
+    cdef int lb[2]
+    cdef int rb[2]
+    px_dy = (y_max - y_min) / (<np.float64_t> ny)
+    ipx_dy = 1.0 / px_dy
+    for p in range(py.shape[0]):
+        oysp = py[p]
+        dysp = pdy[p]
+        yshift = 0.0
+        if check_period == 1:
+            if (oysp - dysp < y_min):
+                yshift = period_y
+            elif (oysp + dysp > y_max):
+                yshift = -period_y
+        for yi in range(2):
+            lb[yi] = rb[yi] = 0
+            if yi == 1 and yshift == 0.0: continue
+            ysp = oysp + yi * yshift
+            if (ysp + dysp < y_min) or (ysp - dysp > y_max): continue
+            lr = <int> fmax(((ysp-dysp-y_min)*ipx_dy),0)
+            rr = <int> fmin(((ysp+dysp-y_min)*ipx_dy + 1), ny)
+            if lr >= rr: continue
+            lb[yi] = lr // block_size
+            rb[yi] = (rr - 1) // block_size + 1
+        for yi in range(2):
+            for block in range(lb[yi], rb[yi]):
+                # the blocks already overlapped by the other image
+                if yi == 1 and lb[0] <= block < rb[0]: continue
+                if fill == 1:
+                    cells[offsets[block]] = p
+                    offsets[block] += 1
+                else:
+                    offsets[block + 1] += 1
+
+@cython.cdivision(True)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def pixelize_cartesian_multiple(np.float64_t[:,:,:] buffs,
+                                np.float64_t[:] px,
+                                np.float64_t[:] py,
+                                np.float64_t[:] pdx,
+                                np.float64_t[:] pdy,
+                                np.float64_t[:,:] data,
+                                bounds,
+                                int antialias = 1,
+                                period = None,
+                                int check_period = 1,
+                                int num_threads = 1):
+    """
+    Pixelizes several fields at once.
+
+    This is equivalent to calling pixelize_cartesian for every field, but the
+    overlap of the cells with the pixels is only computed once and is used to
+    fill all of the buffers.  The cells are sorted into blocks of image rows,
+    which are distributed across threads.
+
+    Parameters
+    ----------
+    buffs : 3D array of float64
+        The buffers to fill, of shape (nfields, ny, nx).
+    px, py, pdx, pdy : 1D arrays of float64
+        The centers and half-widths of the cells.
+    data : 2D array of float64
+        The values of the fields, of shape (nfields, ncells).
+    bounds : sequence of float64
+        The (x_min, x_max, y_min, y_max) bounds of the image.
+    antialias : int
+        Whether to weight deposition by the overlap of cells and pixels.
+    period : sequence of float64, optional
+        The period along the x and y axes of the image.
+    check_period : int
+        Whether to deposit the periodic images of the cells.
+    num_threads : int
+        The number of threads to use.
+    """
+    cdef np.float64_t x_min, x_max, y_min, y_max
+    cdef np.float64_t period_x = 0.0, period_y = 0.0
+    cdef int nblocks, block, block_size, ny
+    cdef np.int64_t[:] offsets, fill, cells
+    if period is not None:
+        period_x = period[0]
+        period_y = period[1]
+    x_min = bounds[0]
+    x_max = bounds[1]
+    y_min = bounds[2]
+    y_max = bounds[3]
+    if px.shape[0] != py.shape[0] or \
+       px.shape[0] != pdx.shape[0] or \
+       px.shape[0] != pdy.shape[0] or \
+       px.shape[0] != data.shape[1] or \
+       buffs.shape[0] != data.shape[0]:
+        raise YTPixelizeError("Arrays are not of correct shape.")
+    ny = buffs.shape[1]
+    if ny == 0 or px.shape[0] == 0:
+        return
+    num_threads = imax(num_threads, 1)
+    # Several blocks of rows per thread to balance the load
+    nblocks = imin(ny, 4 * num_threads)
+    block_size = (ny + nblocks - 1) // nblocks
+    nblocks = (ny + block_size - 1) // block_size
+    # The cells overlapping every block are cells[offsets[b]:offsets[b + 1]]
+    offsets = np.zeros(nblocks + 1, dtype="int64")
+    with nogil:
+        _bin_cells_by_rows(py, pdy, y_min, y_max, period_y, check_period,
+                           ny, block_size, offsets, offsets, 0)
+    offsets = np.cumsum(offsets)
+    fill = offsets.copy()
+    cells = np.empty(offsets[nblocks], dtype="int64")
+    with nogil:
+        _bin_cells_by_rows(py, pdy, y_min, y_max, period_y, check_period,
+                           ny, block_size, fill, cells, 1)
+        for block in prange(nblocks, num_threads=num_threads,
+                            schedule="dynamic"):
+            _pixelize_cartesian_rows(
+                buffs, px, py, pdx, pdy, data,
+                x_min, x_max, y_min, y_max, period_x, period_y,
+                antialias, check_period,
+                cells, offsets[block], offsets[block + 1],
+                block * block_size, imin((block + 1) * block_size, ny))
+
 @cython.cdivision(True)
 @cython.boundscheck(False)
 @cython.wraparound(False)
@@ -835,15 +1059,29 @@ cdef int check_face_dot(int nvertices,
     return 1
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
 def pixelize_element_mesh(np.ndarray[np.float64_t, ndim=2] coords,
                           np.ndarray[np.int64_t, ndim=2] conn,
                           buff_size,
                           np.ndarray[np.float64_t, ndim=2] field,
                           extents,
-                          int index_offset = 0):
+                          int index_offset = 0,
+                          bvh = None,
+                          int num_threads = 1):
+    """
+    Pixelizes the elements of an unstructured mesh onto a pseudo-3D buffer.
+
+    If an ElementBVH of the mesh is given, only the elements whose bounding
+    boxes overlap the image are visited.  The image is then split into blocks
+    along its widest dimension, which are filled by num_threads threads; the
+    result does not depend on the number of threads.
+    """
     cdef np.ndarray[np.float64_t, ndim=3] img
     img = np.zeros(buff_size, dtype="float64")
     img[:] = np.nan
+    cdef np.float64_t[:, :, :] img_view = img
     # Two steps:
     #  1. Is image point within the mesh bounding box?
     #  2. Is image point within the mesh element?
@@ -853,13 +1091,13 @@ def pixelize_element_mesh(np.ndarray[np.float64_t, ndim=2] coords,
     # always be 1.
     cdef np.float64_t pLE[3]
     cdef np.float64_t pRE[3]
-    cdef np.float64_t LE[3]
-    cdef np.float64_t RE[3]
+    cdef np.float64_t *LE
+    cdef np.float64_t *RE
     cdef int use
-    cdef np.int64_t n, i, pi, pj, pk, ci, cj
-    cdef np.int64_t pstart[3]
-    cdef np.int64_t pend[3]
-    cdef np.float64_t ppoint[3]
+    cdef np.int64_t n, i, pi, pj, pk, ci, cj, ii, b
+    cdef np.int64_t *pstart
+    cdef np.int64_t *pend
+    cdef np.float64_t *ppoint
     cdef np.float64_t idds[3]
     cdef np.float64_t dds[3]
     cdef np.float64_t *vertices
@@ -867,8 +1105,17 @@ def pixelize_element_mesh(np.ndarray[np.float64_t, ndim=2] coords,
     cdef int nvertices = conn.shape[1]
     cdef int ndim = coords.shape[1]
     cdef int num_field_vals = field.shape[1]
-    cdef double[4] mapped_coord
+    cdef double *mapped_coord
     cdef ElementSampler sampler
+    cdef np.float64_t[:, :] coords_view = coords
+    cdef np.int64_t[:, :] conn_view = conn
+    cdef np.float64_t[:, :] field_view = field
+    cdef bint use_candidates = bvh is not None
+    cdef np.int64_t[::1] candidates
+    cdef np.int64_t[::1] block_offsets
+    cdef np.int64_t[::1] block_edges
+    cdef np.int64_t nblocks
+    cdef int split_ax = 0
 
     # Pick the right sampler and allocate storage for the mapped coordinate
     if ndim == 3 and nvertices == 4:
@@ -900,10 +1147,6 @@ def pixelize_element_mesh(np.ndarray[np.float64_t, ndim=2] coords,
             raise RuntimeError("Slices of 2D datasets must be "
                                "perpendicular to the 'z' direction.")
 
-    # allocate temporary storage
-    vertices = <np.float64_t *> malloc(ndim * sizeof(np.float64_t) * nvertices)
-    field_vals = <np.float64_t *> malloc(sizeof(np.float64_t) * num_field_vals)
-
     # fill the image bounds and pixel size information here
     for i in range(ndim):
         pLE[i] = extents[i][0]
@@ -914,63 +1157,114 @@ def pixelize_element_mesh(np.ndarray[np.float64_t, ndim=2] coords,
         else:
             idds[i] = 1.0 / dds[i]
 
-    with cython.boundscheck(False):
-        for ci in range(conn.shape[0]):
-
-            # Fill the vertices
-            LE[0] = LE[1] = LE[2] = 1e60
-            RE[0] = RE[1] = RE[2] = -1e60
-
-            for n in range(num_field_vals):
-                field_vals[n] = field[ci, n]
-
-            for n in range(nvertices):
-                cj = conn[ci, n] - index_offset
+    # Split the image into blocks along its widest dimension, and find the
+    # elements that may overlap every block.  Elements are visited in the same
+    # order within every block, so the image does not depend on the blocks.
+    for i in range(ndim):
+        if buff_size[i] > buff_size[split_ax]:
+            split_ax = i
+    if use_candidates:
+        nblocks = max(min(buff_size[split_ax], 4 * num_threads), 1)
+    else:
+        nblocks = 1
+        num_threads = 1
+    block_edges = np.array(
+        [b * buff_size[split_ax] // nblocks for b in range(nblocks + 1)],
+        dtype="int64")
+    block_offsets = np.zeros(nblocks + 1, dtype="int64")
+    if use_candidates:
+        block_candidates = []
+        for b in range(nblocks):
+            qLE = [pLE[i] for i in range(ndim)]
+            qRE = [pRE[i] for i in range(ndim)]
+            qLE[split_ax] = pLE[split_ax] + (block_edges[b] - 2) * dds[split_ax]
+            qRE[split_ax] = pLE[split_ax] + (block_edges[b + 1] + 2) * dds[split_ax]
+            elements = bvh.query_box(qLE, qRE)
+            block_candidates.append(elements)
+            block_offsets[b + 1] = block_offsets[b] + elements.size
+        candidates = np.concatenate(block_candidates)
+    else:
+        block_offsets[1] = conn.shape[0]
+
+    with nogil, parallel(num_threads=num_threads):
+        # allocate temporary storage
+        vertices = <np.float64_t *> malloc(ndim * sizeof(np.float64_t) * nvertices)
+        field_vals = <np.float64_t *> malloc(sizeof(np.float64_t) * num_field_vals)
+        LE = <np.float64_t *> malloc(sizeof(np.float64_t) * 10)
+        RE = LE + 3
+        ppoint = LE + 6
+        mapped_coord = <double *> malloc(sizeof(double) * 4)
+        pstart = <np.int64_t *> malloc(sizeof(np.int64_t) * 6)
+        pend = pstart + 3
+        for b in prange(nblocks, schedule="dynamic"):
+            for ii in range(block_offsets[b], block_offsets[b + 1]):
+                if use_candidates:
+                    ci = candidates[ii]
+                else:
+                    ci = ii
+
+                # Fill the vertices
+                LE[0] = LE[1] = LE[2] = 1e60
+                RE[0] = RE[1] = RE[2] = -1e60
+
+                for n in range(num_field_vals):
+                    field_vals[n] = field_view[ci, n]
+
+                for n in range(nvertices):
+                    cj = conn_view[ci, n] - index_offset
+                    for i in range(ndim):
+                        vertices[ndim*n + i] = coords_view[cj, i]
+                        LE[i] = fmin(LE[i], vertices[ndim*n+i])
+                        RE[i] = fmax(RE[i], vertices[ndim*n+i])
+
+                use = 1
                 for i in range(ndim):
-                    vertices[ndim*n + i] = coords[cj, i]
-                    LE[i] = fmin(LE[i], vertices[ndim*n+i])
-                    RE[i] = fmax(RE[i], vertices[ndim*n+i])
-
-            use = 1
-            for i in range(ndim):
-                if RE[i] < pLE[i] or LE[i] >= pRE[i]:
-                    use = 0
-                    break
-                pstart[i] = i64max(<np.int64_t> ((LE[i] - pLE[i])*idds[i]) - 1, 0)
-                pend[i] = i64min(<np.int64_t> ((RE[i] - pLE[i])*idds[i]) + 1, img.shape[i]-1)
-
-            # override for the low-dimensional case
-            if ndim < 3:
-                pstart[2] = 0
-                pend[2] = 0
-            if ndim < 2:
-                pstart[1] = 0
-                pend[1] = 0
-
-            if use == 0:
-                continue
+                    if RE[i] < pLE[i] or LE[i] >= pRE[i]:
+                        use = 0
+                        break
+                    pstart[i] = i64max(<np.int64_t> ((LE[i] - pLE[i])*idds[i]) - 1, 0)
+                    pend[i] = i64min(<np.int64_t> ((RE[i] - pLE[i])*idds[i]) + 1,
+                                     img_view.shape[i]-1)
+
+                # override for the low-dimensional case
+                if ndim < 3:
+                    pstart[2] = 0
+                    pend[2] = 0
+                if ndim < 2:
+                    pstart[1] = 0
+                    pend[1] = 0
+
+                if use == 0:
+                    continue
 
-            # Now our bounding box intersects, so we get the extents of our pixel
-            # region which overlaps with the bounding box, and we'll check each
-            # pixel in there.
-            for pi in range(pstart[0], pend[0] + 1):
-                ppoint[0] = (pi + 0.5) * dds[0] + pLE[0]
-                for pj in range(pstart[1], pend[1] + 1):
-                    ppoint[1] = (pj + 0.5) * dds[1] + pLE[1]
-                    for pk in range(pstart[2], pend[2] + 1):
-                        ppoint[2] = (pk + 0.5) * dds[2] + pLE[2]
-                        # Now we just need to figure out if our ppoint is within
-                        # our set of vertices.
-                        sampler.map_real_to_unit(mapped_coord, vertices, ppoint)
-                        if not sampler.check_inside(mapped_coord):
-                            continue
-                        if (num_field_vals == 1):
-                            img[pi, pj, pk] = field_vals[0]
-                        else:
-                            img[pi, pj, pk] = sampler.sample_at_unit_point(mapped_coord,
-                                                                           field_vals)
-    free(vertices)
-    free(field_vals)
+                # restrict the element to the pixels of this block
+                pstart[split_ax] = i64max(pstart[split_ax], block_edges[b])
+                pend[split_ax] = i64min(pend[split_ax], block_edges[b + 1] - 1)
+
+                # Now our bounding box intersects, so we get the extents of our
+                # pixel region which overlaps with the bounding box, and we'll
+                # check each pixel in there.
+                for pi in range(pstart[0], pend[0] + 1):
+                    ppoint[0] = (pi + 0.5) * dds[0] + pLE[0]
+                    for pj in range(pstart[1], pend[1] + 1):
+                        ppoint[1] = (pj + 0.5) * dds[1] + pLE[1]
+                        for pk in range(pstart[2], pend[2] + 1):
+                            ppoint[2] = (pk + 0.5) * dds[2] + pLE[2]
+                            # Now we just need to figure out if our ppoint is
+                            # within our set of vertices.
+                            sampler.map_real_to_unit(mapped_coord, vertices, ppoint)
+                            if not sampler.check_inside(mapped_coord):
+                                continue
+                            if (num_field_vals == 1):
+                                img_view[pi, pj, pk] = field_vals[0]
+                            else:
+                                img_view[pi, pj, pk] = sampler.sample_at_unit_point(
+                                    mapped_coord, field_vals)
+        free(vertices)
+        free(field_vals)
+        free(LE)
+        free(mapped_coord)
+        free(pstart)
     return img
 
 # used as a cache to avoid repeatedly creating
@@ -1068,10 +1362,20 @@ def pixelize_sph_kernel_projection(
         kernel_name="cubic",
         weight_field=None,
         int check_period=1,
-        period=None):
+        period=None,
+        weight_buff=None):
+    """
+    Deposits the projection of SPH particles onto a buffer.
+
+    If a weight field is given, the weighted quantity is deposited onto buff.
+    If a weight buffer is also given, the weight field itself is deposited
+    onto it in the same pass over the particles, so that the weighted
+    projection is buff / weight_buff.
+    """
 
     cdef np.intp_t xsize, ysize
-    cdef np.float64_t x_min, x_max, y_min, y_max, prefactor_j
+    cdef np.float64_t x_min, x_max, y_min, y_max, prefactor_j, wprefactor_j
+    cdef np.float64_t kern
     cdef np.int64_t xi, yi, x0, x1, y0, y1, xxi, yyi
     cdef np.float64_t q_ij2, posx_diff, posy_diff, ih_j2
     cdef np.float64_t x, y, dx, dy, idx, idy, h_j2, px, py
@@ -1083,9 +1387,18 @@ def pixelize_sph_kernel_projection(
     cdef np.float64_t * xiterv
     cdef np.float64_t * yiterv
     cdef np.float64_t * local_buf
+    cdef np.float64_t * local_wbuff
+    cdef np.float64_t[:, :] _weight_buff
+    cdef bint use_weight = weight_field is not None
+    cdef bint use_wbuff = use_weight and weight_buff is not None
 
-    if weight_field is not None:
+    if use_weight:
         _weight_field = weight_field
+    if use_wbuff:
+        _weight_buff = weight_buff
+        if (_weight_buff.shape[0] != buff.shape[0] or
+                _weight_buff.shape[1] != buff.shape[1]):
+            raise YTPixelizeError("Weight buffer is not of the correct shape.")
 
     if period is not None:
         period_x = period[0]
@@ -1126,6 +1439,10 @@ def pixelize_sph_kernel_projection(
         # intermediate results.
 
         local_buff = <np.float64_t *> malloc(sizeof(np.float64_t) * xsize * ysize)
+        local_wbuff = NULL
+        if use_wbuff:
+            local_wbuff = <np.float64_t *> malloc(
+                sizeof(np.float64_t) * xsize * ysize)
         xiterv = <np.float64_t *> malloc(sizeof(np.float64_t) * 2)
         yiterv = <np.float64_t *> malloc(sizeof(np.float64_t) * 2)
         xiter = <int *> malloc(sizeof(int) * 2)
@@ -1134,6 +1451,8 @@ def pixelize_sph_kernel_projection(
         xiterv[0] = yiterv[0] = 0.0
         for i in range(xsize * ysize):
             local_buff[i] = 0.0
+            if use_wbuff:
+                local_wbuff[i] = 0.0
 
         for j in prange(0, posx.shape[0], schedule="dynamic"):
             if j % 100000 == 0:
@@ -1161,8 +1480,10 @@ def pixelize_sph_kernel_projection(
             ih_j2 = 1.0/h_j2
 
             prefactor_j = pmass[j] / pdens[j] / hsml[j]**2 * quantity_to_smooth[j]
-            if weight_field is not None:
+            if use_weight:
                 prefactor_j *= _weight_field[j]
+            if use_wbuff:
+                wprefactor_j = pmass[j] / pdens[j] / hsml[j]**2 * _weight_field[j]
 
             for ii in range(2):
                 if xiter[ii] == 999: continue
@@ -1207,13 +1528,20 @@ def pixelize_sph_kernel_projection(
 
                             # see equation 32 of the SPLASH paper
                             # now we just use the kernel projection
-                            local_buff[xi + yi*xsize] +=  prefactor_j * itab.interpolate(q_ij2)
+                            kern = itab.interpolate(q_ij2)
+                            local_buff[xi + yi*xsize] +=  prefactor_j * kern
+                            if use_wbuff:
+                                local_wbuff[xi + yi*xsize] += wprefactor_j * kern
 
         with gil:
             for xxi in range(xsize):
                 for yyi in range(ysize):
                     buff[xxi, yyi] += local_buff[xxi + yyi*xsize]
+                    if use_wbuff:
+                        _weight_buff[xxi, yyi] += local_wbuff[xxi + yyi*xsize]
         free(local_buff)
+        if use_wbuff:
+            free(local_wbuff)
         free(xiterv)
         free(yiterv)
         free(xiter)
@@ -1677,16 +2005,23 @@ def pixelize_sph_kernel_arbitrary_grid(np.float64_t[:, :, :] buff,
                                     buff[xi, yi, zi] += prefactor_j * kernel_func(q_ij)
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
 def pixelize_element_mesh_line(np.ndarray[np.float64_t, ndim=2] coords,
                                np.ndarray[np.int64_t, ndim=2] conn,
                                np.ndarray[np.float64_t, ndim=1] start_point,
                                np.ndarray[np.float64_t, ndim=1] end_point,
                                npoints,
                                np.ndarray[np.float64_t, ndim=2] field,
-                               int index_offset = 0):
+                               int index_offset = 0,
+                               bvh = None,
+                               int num_threads = 1):
 
     # This routine chooses the correct element sampler to interpolate field
-    # values at evenly spaced points along a sampling line
+    # values at evenly spaced points along a sampling line.  If an ElementBVH
+    # of the mesh is given, only the elements whose bounding boxes contain a
+    # point are checked, and the points are distributed across threads.
     cdef np.float64_t *vertices
     cdef np.float64_t *field_vals
     cdef int nvertices = conn.shape[1]
@@ -1694,16 +2029,25 @@ def pixelize_element_mesh_line(np.ndarray[np.float64_t, ndim=2] coords,
     cdef int num_field_vals = field.shape[1]
     cdef int num_plot_nodes = npoints
     cdef int num_intervals = npoints - 1
-    cdef double[4] mapped_coord
+    cdef double *mapped_coord
     cdef ElementSampler sampler
     cdef np.ndarray[np.float64_t, ndim=1] lin_vec
     cdef np.ndarray[np.float64_t, ndim=1] lin_inc
     cdef np.ndarray[np.float64_t, ndim=2] lin_sample_points
-    cdef np.int64_t i, n, j, k
+    cdef np.int64_t i, n, j, k, ci, cj, ii, num_candidates
     cdef np.ndarray[np.float64_t, ndim=1] arc_length
     cdef np.float64_t lin_length, inc_length
     cdef np.ndarray[np.float64_t, ndim=1] plot_values
-    cdef np.float64_t sample_point[3]
+    cdef np.float64_t *sample_point
+    cdef np.float64_t[:, :] coords_view = coords
+    cdef np.int64_t[:, :] conn_view = conn
+    cdef np.float64_t[:, :] field_view = field
+    cdef np.float64_t[:, :] points_view
+    cdef np.float64_t[:] values_view
+    cdef bint use_candidates = bvh is not None
+    cdef np.int64_t[::1] candidates
+    cdef np.int64_t[::1] offsets
+    cdef np.uint8_t[::1] found
 
     lin_vec = np.zeros(ndim, dtype="float64")
     lin_inc = np.zeros(ndim, dtype="float64")
@@ -1736,10 +2080,6 @@ def pixelize_element_mesh_line(np.ndarray[np.float64_t, ndim=2] coords,
     else:
         raise YTElementTypeNotRecognized(ndim, nvertices)
 
-    # allocate temporary storage
-    vertices = <np.float64_t *> malloc(ndim * sizeof(np.float64_t) * nvertices)
-    field_vals = <np.float64_t *> malloc(sizeof(np.float64_t) * num_field_vals)
-
     lin_vec = end_point - start_point
     lin_length = np.linalg.norm(lin_vec)
     lin_inc = lin_vec / num_intervals
@@ -1752,36 +2092,86 @@ def pixelize_element_mesh_line(np.ndarray[np.float64_t, ndim=2] coords,
             lin_sample_points[i, j] = lin_sample_points[i-1, j] + lin_inc[j]
             arc_length[i] = arc_length[i-1] + inc_length
 
-    for i in range(num_intervals + 1):
-        for j in range(3):
-            if j < ndim:
-                sample_point[j] = lin_sample_points[i][j]
+    if use_candidates:
+        # pad the bounding boxes, as points just outside of an element may
+        # still be found inside of it
+        tol = 1e-8 * np.abs(coords.max(axis=0) - coords.min(axis=0)).max()
+        offsets, candidates = bvh.query_points(lin_sample_points, tol)
+    else:
+        num_threads = 1
+    points_view = lin_sample_points
+    values_view = plot_values
+    found = np.zeros(num_plot_nodes, dtype="uint8")
+
+    with nogil, parallel(num_threads=num_threads):
+        # allocate temporary storage
+        vertices = <np.float64_t *> malloc(ndim * sizeof(np.float64_t) * nvertices)
+        field_vals = <np.float64_t *> malloc(sizeof(np.float64_t) * num_field_vals)
+        mapped_coord = <double *> malloc(sizeof(double) * 4)
+        sample_point = <np.float64_t *> malloc(sizeof(np.float64_t) * 3)
+        for i in prange(num_intervals + 1, schedule="dynamic"):
+            for j in range(3):
+                if j < ndim:
+                    sample_point[j] = points_view[i, j]
+                else:
+                    sample_point[j] = 0
+            if use_candidates:
+                num_candidates = offsets[i + 1] - offsets[i]
             else:
-                sample_point[j] = 0
-        for ci in range(conn.shape[0]):
-            for n in range(num_field_vals):
-                field_vals[n] = field[ci, n]
-
-            # Fill the vertices
-            for n in range(nvertices):
-                cj = conn[ci, n] - index_offset
-                for k in range(ndim):
-                    vertices[ndim*n + k] = coords[cj, k]
-
-            sampler.map_real_to_unit(mapped_coord, vertices, sample_point)
-            if not sampler.check_inside(mapped_coord) and ci != conn.shape[0] - 1:
-                continue
-            elif not sampler.check_inside(mapped_coord):
-                raise ValueError("Check to see that both starting and ending line points "
-                                 "are within the domain of the mesh.")
-            plot_values[i] = sampler.sample_at_unit_point(mapped_coord, field_vals)
-            break
-
-    free(vertices)
-    free(field_vals)
+                num_candidates = conn_view.shape[0]
+            for ii in range(num_candidates):
+                if use_candidates:
+                    ci = candidates[offsets[i] + ii]
+                else:
+                    ci = ii
+                for n in range(num_field_vals):
+                    field_vals[n] = field_view[ci, n]
+
+                # Fill the vertices
+                for n in range(nvertices):
+                    cj = conn_view[ci, n] - index_offset
+                    for k in range(ndim):
+                        vertices[ndim*n + k] = coords_view[cj, k]
+
+                sampler.map_real_to_unit(mapped_coord, vertices, sample_point)
+                if not sampler.check_inside(mapped_coord):
+                    continue
+                values_view[i] = sampler.sample_at_unit_point(mapped_coord,
+                                                              field_vals)
+                found[i] = 1
+                break
+        free(vertices)
+        free(field_vals)
+        free(mapped_coord)
+        free(sample_point)
+
+    if not np.all(found):
+        raise ValueError("Check to see that both starting and ending line points "
+                         "are within the domain of the mesh.")
     return arc_length, plot_values
 
 
+def off_axis_rotation_matrix(normal_vector, north_vector):
+    """
+    Returns the rotation matrix taking the normal vector to the z-axis (i.e.,
+    the viewer's perspective) and the north vector to the y-axis.
+    """
+    # We want to do two rotations, one to first rotate our coordinates to have
+    # the normal vector be the z-axis (i.e., the viewer's perspective), and then
+    # another rotation to make the north-vector be the y-axis (i.e., north).
+    # Fortunately, total_rotation_matrix = rotation_matrix_1 x rotation_matrix_2
+    cdef np.float64_t[:] z_axis = np.array([0., 0., 1.], dtype='float_')
+    cdef np.float64_t[:] y_axis = np.array([0., 1., 0.], dtype='float_')
+    cdef np.float64_t[:, :] normal_rotation_matrix
+    cdef np.float64_t[:] transformed_north_vector
+    cdef np.float64_t[:, :] north_rotation_matrix
+
+    normal_rotation_matrix = get_rotation_matrix(
+        np.asarray(normal_vector, dtype='float_'), z_axis)
+    transformed_north_vector = np.matmul(normal_rotation_matrix, north_vector)
+    north_rotation_matrix = get_rotation_matrix(transformed_north_vector, y_axis)
+    return np.matmul(north_rotation_matrix, normal_rotation_matrix)
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 def off_axis_projection_SPH(np.float64_t[:] px,
@@ -1797,32 +2187,17 @@ def off_axis_projection_SPH(np.float64_t[:] px,
                             np.float64_t[:, :] projection_array,
                             normal_vector,
                             north_vector,
-                            weight_field=None):
+                            weight_field=None,
+                            weight_buff=None):
     # Do nothing in event of a 0 normal vector
     if np.allclose(normal_vector, np.array([0., 0., 0.]), rtol=1e-09):
         return
 
-    # We want to do two rotations, one to first rotate our coordinates to have
-    # the normal vector be the z-axis (i.e., the viewer's perspective), and then
-    # another rotation to make the north-vector be the y-axis (i.e., north).
-    # Fortunately, total_rotation_matrix = rotation_matrix_1 x rotation_matrix_2
-    cdef int num_particles = np.size(px)
-    cdef np.float64_t[:] z_axis = np.array([0., 0., 1.], dtype='float_')
-    cdef np.float64_t[:] y_axis = np.array([0., 1., 0.], dtype='float_')
-    cdef np.float64_t[:, :] normal_rotation_matrix
-    cdef np.float64_t[:] transformed_north_vector
-    cdef np.float64_t[:, :] north_rotation_matrix
     cdef np.float64_t[:, :] rotation_matrix
+    rotation_matrix = off_axis_rotation_matrix(normal_vector, north_vector)
 
-    normal_rotation_matrix = get_rotation_matrix(normal_vector, z_axis)
-    transformed_north_vector = np.matmul(normal_rotation_matrix, north_vector)
-    north_rotation_matrix = get_rotation_matrix(transformed_north_vector, y_axis)
-    rotation_matrix = np.matmul(north_rotation_matrix, normal_rotation_matrix)
-
-    cdef np.float64_t[:] px_rotated = np.empty(num_particles, dtype='float_')
-    cdef np.float64_t[:] py_rotated = np.empty(num_particles, dtype='float_')
-    cdef np.float64_t[:] coordinate_matrix = np.empty(3, dtype='float_')
-    cdef np.float64_t[:] rotated_coordinates
+    cdef np.float64_t[:] px_rotated
+    cdef np.float64_t[:] py_rotated
     cdef np.float64_t[:] rotated_center
     rotated_center = rotation_matmul(
         rotation_matrix, np.array([center[0], center[1], center[2]]))
@@ -1833,14 +2208,11 @@ def off_axis_projection_SPH(np.float64_t[:] px,
     cdef np.float64_t rot_bounds_y0 = rotated_center[1] - width[1] / 2
     cdef np.float64_t rot_bounds_y1 = rotated_center[1] + width[1] / 2
 
-    for i in range(num_particles):
-        coordinate_matrix[0] = px[i]
-        coordinate_matrix[1] = py[i]
-        coordinate_matrix[2] = pz[i]
-        rotated_coordinates = rotation_matmul(
-            rotation_matrix, coordinate_matrix)
-        px_rotated[i] = rotated_coordinates[0]
-        py_rotated[i] = rotated_coordinates[1]
+    # Only the in-plane coordinates are needed
+    rotated = np.dot(np.asarray(rotation_matrix)[:2],
+                     np.vstack([px, py, pz]))
+    px_rotated = rotated[0]
+    py_rotated = rotated[1]
 
     pixelize_sph_kernel_projection(projection_array,
                                    px_rotated,
@@ -1852,7 +2224,8 @@ def off_axis_projection_SPH(np.float64_t[:] px,
                                    [rot_bounds_x0, rot_bounds_x1,
                                     rot_bounds_y0, rot_bounds_y1],
                                    weight_field=weight_field,
-                                   check_period=0)
+                                   check_period=0,
+                                   weight_buff=weight_buff)
 
 
 @cython.boundscheck(False)
@@ -0,0 +1,167 @@
+# distutils: include_dirs = LIB_DIR
+# distutils: libraries = STD_LIBS
+"""
+Walking many rays at once through the cells of a grid
+
+
+
+"""
+
+
+import numpy as np
+
+cimport cython
+cimport numpy as np
+from libc.stdlib cimport free, malloc, realloc
+
+from yt.utilities.lib.fp_utils cimport fmax, fmin
+from yt.utilities.lib.grid_traversal cimport walk_volume
+from yt.utilities.lib.volume_container cimport VolumeContainer
+
+
+cdef struct SegmentAccumulator:
+    np.int64_t *rays
+    np.int64_t *cells
+    np.float64_t *t
+    np.float64_t *dt
+    np.uint8_t *child_mask
+    np.int64_t ray
+    np.int64_t n
+    np.int64_t size
+    int failed
+
+cdef int grow_segments(SegmentAccumulator *sa) nogil:
+    cdef np.int64_t size = 2 * sa.size
+    cdef void *p
+    p = realloc(sa.rays, size * sizeof(np.int64_t))
+    if p == NULL: return 0
+    sa.rays = <np.int64_t *> p
+    p = realloc(sa.cells, size * sizeof(np.int64_t))
+    if p == NULL: return 0
+    sa.cells = <np.int64_t *> p
+    p = realloc(sa.t, size * sizeof(np.float64_t))
+    if p == NULL: return 0
+    sa.t = <np.float64_t *> p
+    p = realloc(sa.dt, size * sizeof(np.float64_t))
+    if p == NULL: return 0
+    sa.dt = <np.float64_t *> p
+    sa.size = size
+    return 1
+
+cdef void segment_sampler(
+             VolumeContainer *vc,
+             np.float64_t v_pos[3],
+             np.float64_t v_dir[3],
+             np.float64_t enter_t,
+             np.float64_t exit_t,
+             int index[3],
+             void *data) nogil:
+    cdef SegmentAccumulator *sa = <SegmentAccumulator *> data
+    cdef np.int64_t di = (index[0]*vc.dims[1]+index[1])*vc.dims[2]+index[2]
+    if sa.child_mask[di] == 0 or enter_t == exit_t or sa.failed:
+        return
+    if sa.n == sa.size and not grow_segments(sa):
+        sa.failed = 1
+        return
+    sa.rays[sa.n] = sa.ray
+    sa.cells[sa.n] = di
+    sa.t[sa.n] = enter_t
+    sa.dt[sa.n] = exit_t - enter_t
+    sa.n += 1
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+def grid_ray_segments(np.float64_t[:, ::1] starts,
+                      np.float64_t[:, ::1] vecs,
+                      np.float64_t[::1] left_edge,
+                      np.float64_t[::1] right_edge,
+                      np.float64_t[::1] dds,
+                      np.uint8_t[:, :, ::1] child_mask):
+    r"""
+    Walks rays through the unrefined cells of a grid.
+
+    Parameters
+    ----------
+    starts : array of floats
+        The (N, 3) start points of the rays.
+    vecs : array of floats
+        The (N, 3) vectors from the start to the end points of the rays.
+    left_edge, right_edge, dds : array of floats
+        The edges and cell widths of the grid.
+    child_mask : array of uint8
+        The mask of the unrefined cells of the grid.
+
+    Returns
+    -------
+    The indices of the rays, the flat indices of the cells, the parametric
+    positions along the rays at which they enter the cells, and the parametric
+    lengths of the rays in the cells, for each cell crossed by each ray, ray
+    by ray.
+    """
+    cdef int i, ax
+    cdef np.int64_t r, nrays = starts.shape[0]
+    cdef np.float64_t t0, t1, tmin, tmax
+    cdef VolumeContainer vc
+    cdef SegmentAccumulator sa
+    cdef np.float64_t p[3]
+    cdef np.float64_t v[3]
+    for i in range(3):
+        vc.left_edge[i] = left_edge[i]
+        vc.right_edge[i] = right_edge[i]
+        vc.dds[i] = dds[i]
+        vc.idds[i] = 1.0 / dds[i]
+        vc.dims[i] = child_mask.shape[i]
+    sa.size = 64
+    sa.n = 0
+    sa.failed = 0
+    sa.child_mask = &child_mask[0, 0, 0]
+    sa.rays = <np.int64_t *> malloc(sa.size * sizeof(np.int64_t))
+    sa.cells = <np.int64_t *> malloc(sa.size * sizeof(np.int64_t))
+    sa.t = <np.float64_t *> malloc(sa.size * sizeof(np.float64_t))
+    sa.dt = <np.float64_t *> malloc(sa.size * sizeof(np.float64_t))
+    with nogil:
+        for r in range(nrays):
+            # skip the rays missing the bounding box of the grid
+            tmin, tmax = 0.0, 1.0
+            for ax in range(3):
+                p[ax] = starts[r, ax]
+                v[ax] = vecs[r, ax]
+                if v[ax] == 0.0:
+                    if p[ax] < vc.left_edge[ax] or p[ax] > vc.right_edge[ax]:
+                        tmax = -1.0
+                    continue
+                t0 = (vc.left_edge[ax] - p[ax]) / v[ax]
+                t1 = (vc.right_edge[ax] - p[ax]) / v[ax]
+                tmin = fmax(tmin, fmin(t0, t1))
+                tmax = fmin(tmax, fmax(t0, t1))
+            if tmin >= tmax:
+                continue
+            sa.ray = r
+            walk_volume(&vc, p, v, segment_sampler, <void *> &sa)
+            if sa.failed:
+                break
+    if sa.failed:
+        free(sa.rays)
+        free(sa.cells)
+        free(sa.t)
+        free(sa.dt)
+        raise MemoryError
+    rays = np.empty(sa.n, dtype="int64")
+    cells = np.empty(sa.n, dtype="int64")
+    t = np.empty(sa.n, dtype="float64")
+    dt = np.empty(sa.n, dtype="float64")
+    cdef np.int64_t[::1] rays_view = rays
+    cdef np.int64_t[::1] cells_view = cells
+    cdef np.float64_t[::1] t_view = t
+    cdef np.float64_t[::1] dt_view = dt
+    for r in range(sa.n):
+        rays_view[r] = sa.rays[r]
+        cells_view[r] = sa.cells[r]
+        t_view[r] = sa.t[r]
+        dt_view[r] = sa.dt[r]
+    free(sa.rays)
+    free(sa.cells)
+    free(sa.t)
+    free(sa.dt)
+    return rays, cells, t, dt
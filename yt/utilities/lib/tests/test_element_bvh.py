@@ -0,0 +1,97 @@
+import numpy as np
+
+from yt.testing import assert_equal, fake_hexahedral_ds, fake_tetrahedral_ds
+from yt.utilities.lib.mesh_utilities import ElementBVH
+from yt.utilities.lib.pixelization_routines import (
+    pixelize_element_mesh,
+    pixelize_element_mesh_line,
+)
+
+
+def _mesh(ds):
+    mesh = ds.index.meshes[0]
+    return mesh.connectivity_coords, mesh.connectivity_indices, mesh._index_offset
+
+
+def test_element_bvh_queries():
+    coords, indices, offset = _mesh(fake_tetrahedral_ds())
+    bvh = ElementBVH(coords, indices, offset, leaf_size=4)
+    assert_equal(bvh.num_elem, indices.shape[0])
+    vertices = coords[indices - offset]
+    left_edges, right_edges = vertices.min(axis=1), vertices.max(axis=1)
+    prng = np.random.RandomState(0x4D3D3D3)
+    lo, hi = coords.min(axis=0), coords.max(axis=0)
+    for _ in range(10):
+        corners = np.sort(prng.uniform(lo, hi, (2, 3)), axis=0)
+        expected = np.nonzero(
+            np.all((left_edges <= corners[1]) & (right_edges >= corners[0]), axis=1)
+        )[0]
+        assert_equal(bvh.query_box(corners[0], corners[1]), expected)
+    points = prng.uniform(lo, hi, (20, 3))
+    offsets, ids = bvh.query_points(points)
+    for i, point in enumerate(points):
+        expected = np.nonzero(
+            np.all((left_edges <= point) & (right_edges >= point), axis=1)
+        )[0]
+        assert_equal(ids[offsets[i] : offsets[i + 1]], expected)
+
+
+def test_pixelize_element_mesh_bvh():
+    for ds in (fake_hexahedral_ds(), fake_tetrahedral_ds()):
+        coords, indices, offset = _mesh(ds)
+        field = ds.all_data()["connect1", "test"].d
+        bvh = ElementBVH(coords, indices, offset)
+        lo, hi = coords.min(axis=0), coords.max(axis=0)
+        for ax, c in [(0, 0.3), (2, 0.5 * (lo[2] + hi[2]))]:
+            extents = np.array([lo, hi]).T * 0.8
+            extents[ax] = c
+            buff_size = [60, 50, 40]
+            buff_size[ax] = 1
+            expected = pixelize_element_mesh(
+                coords, indices, buff_size, field, extents, offset
+            )
+            assert np.isfinite(expected).any()
+            for num_threads in (1, 4):
+                img = pixelize_element_mesh(
+                    coords,
+                    indices,
+                    buff_size,
+                    field,
+                    extents,
+                    offset,
+                    bvh=bvh,
+                    num_threads=num_threads,
+                )
+                assert_equal(img, expected)
+        start, end = 0.7 * lo + 0.3 * hi, 0.3 * lo + 0.7 * hi
+        expected = pixelize_element_mesh_line(
+            coords, indices, start, end, 50, field, offset
+        )
+        for num_threads in (1, 4):
+            line = pixelize_element_mesh_line(
+                coords,
+                indices,
+                start,
+                end,
+                50,
+                field,
+                offset,
+                bvh=bvh,
+                num_threads=num_threads,
+            )
+            assert_equal(line, expected)
+
+
+def test_element_bvh_shared():
+    ds = fake_hexahedral_ds()
+    slc = ds.slice(2, 0.1, center=ds.arr([0.0, 0.0, 0.1], "code_length"))
+    slc.to_frb(1.0, 64)["connect1", "test"]
+    slc.to_frb(1.0, 32)["connect1", "test"]
+    ds.coordinates.pixelize_line(
+        ("connect1", "test"),
+        ds.arr([-0.4, -0.4, -0.4], "code_length"),
+        ds.arr([0.4, 0.4, 0.4], "code_length"),
+        10,
+    )
+    assert_equal(ds.index.spatial_indexes.keys(), [("element_bvh", "connect1", None)])
+    assert_equal(ds.index.spatial_indexes.misses, 1)
@@ -1,11 +1,13 @@
 import numpy as np
 
-from yt.testing import assert_array_equal
+from yt.testing import assert_allclose, assert_array_equal
 from yt.utilities.lib.bounded_priority_queue import (
     validate,
     validate_nblist,
     validate_pid,
 )
+from yt.utilities.lib.cykdtree import PyKDTree
+from yt.utilities.lib.particle_kdtree_tools import generate_smoothing_length
 
 
 # These test functions use utility functions in
@@ -31,3 +33,17 @@ def test_neighbor_list():
     answers_pids = np.array([0, 1, 2, 3])
     assert_array_equal(answers_data, data)
     assert_array_equal(answers_pids, pids)
+
+
+def test_generate_smoothing_length():
+    prng = np.random.RandomState(0x4D3D3D3)
+    pos = prng.random_sample((1000, 3))
+    kdtree = PyKDTree(pos, left_edge=np.zeros(3), right_edge=np.ones(3), leafsize=16)
+    tree_pos = np.ascontiguousarray(pos[kdtree.idx.astype("int64")])
+    dists = np.sqrt(((tree_pos[:, None, :] - tree_pos[None, :, :]) ** 2).sum(axis=-1))
+    answers = np.sort(dists, axis=1)[:, 8]
+    assert_allclose(generate_smoothing_length(tree_pos, kdtree, 8), answers)
+    hsml = generate_smoothing_length(tree_pos, kdtree, 8, num_threads=4)
+    assert_allclose(hsml, answers)
+    hsml = generate_smoothing_length(tree_pos, kdtree, 8, 100, 300, num_threads=2)
+    assert_allclose(hsml, answers[100:300])
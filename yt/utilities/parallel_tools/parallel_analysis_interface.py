@@ -19,6 +19,7 @@ from yt.units.yt_array import YTArray
 from yt.utilities.exceptions import YTNoDataInObjectError
 from yt.utilities.lib.quad_tree import QuadTree, merge_quadtrees
 from yt.utilities.logger import ytLogger as mylog
+from yt.utilities.performance_counters import yt_spans
 
 # We default to *no* parallelism unless it gets turned on, in which case this
 # will be changed.
@@ -733,6 +734,7 @@ class Communicator:
         return None
 
     @parallel_passthrough
+    @yt_spans.call_func("mpi.par_combine_object")
     def par_combine_object(self, data, op, datatype=None):
         # op can be chosen from:
         #   cat
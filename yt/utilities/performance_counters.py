@@ -1,7 +1,10 @@
 import atexit
+import json
+import threading
 import time
 from bisect import insort
 from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime as dt
 from functools import wraps
 
@@ -134,3 +137,219 @@ class ProfilingController:
             fn = f"{pfn}_{n}.cprof"
             mylog.info("Dumping %s into %s", n, fn)
             p.dump_stats(fn)
+
+
+class SpanStatistics:
+    """Aggregated timing and counters for all spans sharing a name."""
+
+    __slots__ = ("calls", "total_time", "max_time", "counts")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.counts = defaultdict(int)
+
+    def add(self, elapsed, counts):
+        self.calls += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+        for k, v in counts.items():
+            self.counts[k] += v
+
+    def to_dict(self):
+        return {
+            "calls": self.calls,
+            "total_time": self.total_time,
+            "max_time": self.max_time,
+            "counts": dict(self.counts),
+        }
+
+
+class _SpanCounts(dict):
+    # Mutable counter dictionary handed to the body of an instrumented block
+    def add(self, **kwargs):
+        for k, v in kwargs.items():
+            self[k] = self.get(k, 0) + v
+
+
+class _NullSpanCounts:
+    # Shared no-op stand-in used when instrumentation is turned off
+    def add(self, **kwargs):
+        pass
+
+
+_null_counts = _NullSpanCounts()
+
+
+class PerformanceSpans:
+    """
+    Per-rank recorder of instrumentation spans around yt's hot paths.
+
+    Spans are cheap named intervals that carry arbitrary integer counters
+    (bytes read, elements selected, ...).  They are aggregated by name and,
+    optionally, kept as individual events so they can be exported as a
+    Chrome trace (``chrome://tracing`` or https://ui.perfetto.dev).
+
+    Recording is off unless the ``instrument_spans`` configuration option
+    is set, or :meth:`enable` is called.  While off, spans record nothing and
+    only cost the entry into an empty context manager.
+
+    Examples
+    --------
+    >>> from yt.utilities.performance_counters import yt_spans
+    >>> yt_spans.enable()
+    >>> ad = ds.all_data()
+    >>> ad["gas", "density"]
+    >>> yt_spans.print_stats()
+    >>> yt_spans.write_out("my_run")
+    """
+
+    _shared_state = {}  # type: ignore
+
+    def __new__(cls, *args, **kwargs):
+        self = object.__new__(cls, *args, **kwargs)
+        self.__dict__ = cls._shared_state
+        return self
+
+    def __init__(self):
+        self._on = ytcfg.get("yt", "instrument_spans")
+        self.keep_events = True
+        self._lock = threading.Lock()
+        self.reset()
+
+    def enable(self, keep_events=True):
+        self._on = True
+        self.keep_events = keep_events
+
+    def disable(self):
+        self._on = False
+
+    @property
+    def enabled(self):
+        return self._on
+
+    def reset(self):
+        self.stats = defaultdict(SpanStatistics)
+        self.events = []
+        self._t0 = time.perf_counter()
+
+    @contextmanager
+    def __call__(self, name, **counts):
+        if not self._on:
+            yield _null_counts
+            return
+        counts = _SpanCounts(counts)
+        start = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            self._record(name, start, time.perf_counter(), counts)
+
+    def _record(self, name, start, end, counts):
+        with self._lock:
+            self.stats[name].add(end - start, counts)
+            if self.keep_events:
+                self.events.append(
+                    (name, start - self._t0, end - start, threading.get_ident(), counts)
+                )
+
+    def iterate(self, name, iterable):
+        """
+        Yield from *iterable*, charging the time spent producing each item to
+        the span *name* and counting the number of items produced.
+        """
+        if not self._on:
+            yield from iterable
+            return
+        it = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+            self._record(name, start, time.perf_counter(), {"items": 1})
+            yield item
+
+    def call_func(self, name=None):
+        """
+        Decorator recording every call of the decorated function as a span.
+        The span is named after the function unless *name* is provided.
+        """
+
+        def wrapper(func):
+            span_name = name or func.__qualname__
+
+            @wraps(func)
+            def func_wrapper(*args, **kwargs):
+                if not self._on:
+                    return func(*args, **kwargs)
+                with self(span_name):
+                    return func(*args, **kwargs)
+
+            return func_wrapper
+
+        return wrapper
+
+    def to_dict(self):
+        return {name: stat.to_dict() for name, stat in sorted(self.stats.items())}
+
+    def to_chrome_trace(self):
+        rank = ytcfg.get("yt", "internals", "global_parallel_rank")
+        trace_events = [
+            {
+                "name": name,
+                "cat": name.split(".")[0],
+                "ph": "X",
+                "ts": start * 1e6,
+                "dur": elapsed * 1e6,
+                "pid": rank,
+                "tid": tid,
+                "args": dict(counts),
+            }
+            for name, start, elapsed, tid, counts in self.events
+        ]
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def print_stats(self):
+        lines = []
+        for name, stat in sorted(
+            self.stats.items(), key=lambda item: -item[1].total_time
+        ):
+            counts = ", ".join(f"{k}={v}" for k, v in sorted(stat.counts.items()))
+            lines.append(
+                "%-40s %8i calls %0.3e s  %s"
+                % (name, stat.calls, stat.total_time, counts)
+            )
+        mylog.info("Instrumentation spans:\n%s", "\n".join(lines))
+
+    def write_out(self, filename_prefix, chrome_trace=True):
+        """
+        Write the aggregated statistics to ``<prefix>_spans.json`` and,
+        unless *chrome_trace* is False, the individual events to
+        ``<prefix>_trace.json``.  In parallel runs the rank and the number of
+        ranks are appended to the prefix, so that each rank writes its own
+        report.
+        """
+        if ytcfg.get("yt", "internals", "parallel"):
+            pfn = "%s_%03i_%03i" % (
+                filename_prefix,
+                ytcfg.get("yt", "internals", "global_parallel_rank"),
+                ytcfg.get("yt", "internals", "global_parallel_size"),
+            )
+        else:
+            pfn = f"{filename_prefix}"
+        fns = [f"{pfn}_spans.json"]
+        with open(fns[0], mode="w") as fh:
+            json.dump(self.to_dict(), fh, indent=2)
+        if chrome_trace:
+            fns.append(f"{pfn}_trace.json")
+            with open(fns[1], mode="w") as fh:
+                json.dump(self.to_chrome_trace(), fh)
+        for fn in fns:
+            mylog.info("Dumping instrumentation spans into %s", fn)
+        return fns
+
+
+yt_spans = PerformanceSpans()
@@ -1,8 +1,16 @@
 import itertools
+import threading
 
 import numpy as np
 
-from yt.testing import assert_almost_equal, fake_amr_ds
+from yt.testing import assert_almost_equal, assert_equal, fake_amr_ds
+from yt.utilities.amr_kdtree.amr_kdtools import (
+    composite_images,
+    rank_groups,
+    swap_composite,
+    swap_plan,
+)
+from yt.utilities.amr_kdtree.api import AMRKDTree
 
 
 def test_amr_kdtree_set_fields():
@@ -24,3 +32,126 @@ def test_amr_kdtree_set_fields():
                 else:
                     data = np.log10(block.my_data[i])
                 assert_almost_equal(gold[iblock][i], data)
+
+
+def test_amr_kdtree_preloaded_bricks():
+    ds = fake_amr_ds(fields=["density"], units=["g/cm**3"])
+    ref = fake_amr_ds(fields=["density"], units=["g/cm**3"])
+    field = ("gas", "density")
+    grid = ref.index.grids[0]
+    kd = AMRKDTree(ds)
+    kd.set_fields([field], [False], no_ghost=False)
+    cache = ds.index.field_cache
+    # the ghost zones were filled from the data read with the bricks
+    assert cache.hits > 0
+    assert not cache.enabled and len(cache) == 0
+    for node in kd.tree.trunk.kd_traverse():
+        grid = ref.index.grids[node.grid - grid._id_offset]
+        vcd = grid.get_vertex_centered_data([field], smoothed=True, no_ghost=False)
+        li = np.rint((node.get_left_edge() - grid.LeftEdge.d) / grid.dds.d)
+        li = li.astype("int64")
+        ri = li + node.data.my_data[0].shape
+        assert_equal(node.data.my_data[0], vcd[field][tuple(map(slice, li, ri))])
+    # the grids the ghost zones of a few grids are taken from
+    index = ds.index
+    gids = np.array([1, index.num_grids - 1])
+    dds = (index.grid_right_edge - index.grid_left_edge).d / index.grid_dimensions
+    for gi in gids:
+        neighbors = np.all(
+            index.grid_left_edge.d < index.grid_right_edge.d[gi] + dds[gi], axis=1
+        )
+        neighbors &= np.all(
+            index.grid_right_edge.d > index.grid_left_edge.d[gi] - dds[gi], axis=1
+        )
+        neighbors &= index.grid_levels.ravel() <= index.grid_levels[gi, 0]
+        assert set(np.flatnonzero(neighbors)) <= set(kd._ghost_zone_grids(gids))
+
+
+class _Mailbox:
+    def __init__(self):
+        self.messages = {}
+        self.condition = threading.Condition()
+
+    def put(self, key, data):
+        with self.condition:
+            self.messages[key] = data.copy()
+            self.condition.notify_all()
+
+    def get(self, key):
+        with self.condition:
+            self.condition.wait_for(lambda: key in self.messages)
+            return self.messages.pop(key)
+
+
+class _ThreadComm:
+    # the point-to-point communications of a process, run as a thread
+    def __init__(self, rank, mailbox):
+        self.rank = rank
+        self.mailbox = mailbox
+
+    def mpi_nonblocking_send(self, data, dest, tag=0):
+        self.mailbox.put((self.rank, dest, tag), data)
+
+    def mpi_nonblocking_recv(self, data, source, tag=0):
+        return data, (source, self.rank, tag)
+
+    def mpi_Request_Waitall(self, hooks):
+        for hook in hooks:
+            if hook is not None:
+                data, key = hook
+                data[...] = self.mailbox.get(key)
+
+
+def test_swap_composite():
+    rng = np.random.default_rng(0x4D3D3D3)
+    for nprocs, nchannels, nrows in [(2, 4, 16), (3, 4, 16), (5, 3, 9), (8, 4, 7)]:
+        images = rng.random((nprocs, nrows, 6, nchannels))
+        images[..., -1] *= 0.5
+        right_in_front = rng.random(nprocs) > 0.5
+
+        def composite(node):
+            if node >= nprocs:
+                return images[node - nprocs]
+            left, right = composite(2 * node), composite(2 * node + 1)
+            if right_in_front[node]:
+                return composite_images(right, left)
+            return composite_images(left, right)
+
+        mailbox = _Mailbox()
+        results = {}
+
+        def run(rank):
+            path = []
+            node = nprocs + rank
+            while node > 1:
+                node //= 2
+                path.append((node, right_in_front[node]))
+            comm = _ThreadComm(rank, mailbox)
+            results[rank] = swap_composite(comm, images[rank], path, nprocs)
+
+        threads = [threading.Thread(target=run, args=(r,)) for r in range(nprocs)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not mailbox.messages
+        image = np.zeros_like(images[0])
+        covered = np.zeros(nrows, dtype="int")
+        for start, rows in results.values():
+            image[start : start + rows.shape[0]] = rows
+            covered[start : start + rows.shape[0]] += 1
+        assert_equal(covered, 1)
+        assert_almost_equal(image, composite(1))
+
+
+def test_swap_plan():
+    groups = rank_groups(5)
+    assert_equal(groups[1], [3, 4, 0, 1, 2])
+    assert_equal(groups[2], [3, 4, 0])
+    assert_equal(groups[3], [1, 2])
+    plan = swap_plan(groups[2], groups[3], 10)
+    assert_equal(sorted(plan), list(range(5)))
+    for start, end, pieces in plan.values():
+        for side in (0, 1):
+            rows = [(lo, hi) for s, _, lo, hi in pieces if s == side]
+            assert_equal(sum(hi - lo for lo, hi in rows), end - start)
@@ -209,6 +209,49 @@ def test_dark_factor():
     assert_equal(co.get_dark_factor(0), 1.0)
 
 
+@requires_module("scipy")
+def test_tabulated_cosmology():
+    """
+    Test the tabulated calculator against precise integration.
+    """
+    from scipy.integrate import quad
+
+    cosmos = (
+        {"omega_matter": 0.3, "omega_lambda": 0.7},
+        {"omega_matter": 0.3, "omega_lambda": 0.7, "omega_radiation": 1e-4},
+        {"omega_matter": 0.3, "omega_lambda": 0.0, "omega_curvature": 0.7},
+        {"omega_matter": 0.3, "omega_lambda": 0.7, "use_dark_factor": True},
+    )
+    my_random = np.random.RandomState(0x4D3D3D3)
+    z_i = np.power(10, 3 * my_random.random_sample(20) - 2) - 0.01
+    z_f = z_i + np.power(10, 3 * my_random.random_sample(20) - 2)
+    for cosmo in cosmos:
+        co = Cosmology(tabulated=True, **cosmo)
+        hubble_time = 1 / co.hubble_constant
+        for func, integrand in [
+            ("comoving_radial_distance", co.inverse_expansion_factor),
+            ("lookback_time", co.age_integrand),
+            ("path_length", co.path_length_function),
+        ]:
+            expected = [
+                quad(integrand, zi, zf, epsrel=1e-12)[0] for zi, zf in zip(z_i, z_f)
+            ]
+            val = getattr(co, func)(z_i, z_f)
+            if func == "comoving_radial_distance":
+                val = (val / co.hubble_distance()).to("")
+            elif func == "lookback_time":
+                val = (val / hubble_time).to("")
+            assert_rel_equal(np.asarray(val), np.array(expected), 7)
+        # random sample in log(a) from -6 to 0
+        z = 1 / np.power(10, -6 * my_random.random_sample(100)) - 1
+        t = co.t_from_z(z)
+        expected = Cosmology(**cosmo).t_from_z(z)
+        assert_rel_equal(t, expected, 4)
+        assert_rel_equal(co.z_from_t(t) + 1, z + 1, 8)
+        # the tables are shared by calculators with the same parameters
+        assert Cosmology(hubble_constant=0.5, **cosmo).tables is co.tables
+
+
 @requires_module("yaml")
 def test_cosmology_calculator_answers():
     """
@@ -0,0 +1,55 @@
+import numpy as np
+
+from yt.testing import assert_equal, requires_module
+from yt.utilities.file_handler import HDF5FilePool, read_hdf5_ranges, read_hdf5_rows
+from yt.utilities.on_demand_imports import _h5py as h5py
+
+
+@requires_module("h5py")
+def test_read_hdf5_rows(tmp_path):
+    fname = str(tmp_path / "rows.h5")
+    values = np.arange(30000, dtype="float64").reshape(10000, 3)
+    with h5py.File(fname, mode="w") as f:
+        f.create_dataset("values", data=values)
+        f.create_dataset("ids", data=values[:, 0].astype("int64"))
+    indices = np.array([9999, 3, 3, 5000, 0, 4, 2048, 9998])
+    with h5py.File(fname, mode="r") as f:
+        for max_gap in (0, 1024, 10000):
+            rows = read_hdf5_rows(f["values"], indices, max_gap=max_gap)
+            assert_equal(rows, values[indices])
+            assert_equal(read_hdf5_rows(f["ids"], indices), indices * 3)
+        assert_equal(read_hdf5_rows(f["values"], []).shape, (0, 3))
+
+
+@requires_module("h5py")
+def test_read_hdf5_ranges(tmp_path):
+    fname = str(tmp_path / "ranges.h5")
+    values = np.arange(300, dtype="float64").reshape(100, 3)
+    with h5py.File(fname, mode="w") as f:
+        f.create_dataset("values", data=values)
+    ranges = [(0, 10), (40, 45), (90, 100)]
+    expected = np.concatenate([values[start:end] for start, end in ranges])
+    with h5py.File(fname, mode="r") as f:
+        assert_equal(read_hdf5_ranges(f["values"], ranges), expected)
+        assert_equal(read_hdf5_ranges(f["values"], ranges, 2), expected[:, 2])
+        assert_equal(read_hdf5_ranges(f["values"], [(20, 30)]), values[20:30])
+        assert_equal(read_hdf5_ranges(f["values"], []).shape, (0, 3))
+
+
+@requires_module("h5py")
+def test_hdf5_file_pool(tmp_path):
+    fnames = [str(tmp_path / f"pool.{i}.h5") for i in range(3)]
+    for i, fname in enumerate(fnames):
+        with h5py.File(fname, mode="w") as f:
+            f.attrs["i"] = i
+    pool = HDF5FilePool(max_open=2)
+    first = pool.get(fnames[0])
+    assert pool.get(fnames[0]) is first
+    pool.get(fnames[1])
+    pool.get(fnames[2])
+    # the least recently used file is closed
+    assert_equal(len(pool), 2)
+    assert not first
+    assert_equal(pool.get(fnames[0]).attrs["i"], 0)
+    pool.close()
+    assert_equal(len(pool), 0)
@@ -0,0 +1,66 @@
+import json
+
+from yt.testing import assert_equal, fake_particle_ds, fake_random_ds
+from yt.utilities.performance_counters import yt_spans
+
+
+def setup_function(function):
+    yt_spans.reset()
+    yt_spans.enable()
+
+
+def teardown_function(function):
+    yt_spans.disable()
+    yt_spans.reset()
+
+
+def test_spans_disabled():
+    yt_spans.disable()
+    ds = fake_random_ds(16)
+    ds.all_data()["gas", "density"]
+    assert_equal(len(yt_spans.stats), 0)
+    assert_equal(len(yt_spans.events), 0)
+
+
+def test_fluid_spans():
+    ds = fake_random_ds(16, nprocs=8)
+    ad = ds.all_data()
+    ad["gas", "density"]
+    ad["gas", "cell_mass"]
+    stats = yt_spans.to_dict()
+    for name in (
+        "io.read_fluid_selection",
+        "index.chunk_io",
+        "selector.select_grids",
+        "fields.generate_fields",
+    ):
+        assert name in stats
+    read = stats["io.read_fluid_selection"]
+    assert_equal(read["counts"]["cells"], 2 * 16**3)
+    assert read["counts"]["bytes"] >= 16**3 * 8
+    assert_equal(stats["index.chunk_io"]["counts"]["items"] > 0, True)
+
+
+def test_particle_spans():
+    ds = fake_particle_ds(npart=1000)
+    ds.all_data()["io", "particle_mass"]
+    stats = yt_spans.to_dict()
+    read = stats["io.read_particle_selection"]
+    assert_equal(read["counts"]["particles"], 1000)
+    assert_equal(read["counts"]["bytes"], 8000)
+
+
+def test_write_out(tmp_path):
+    with yt_spans("custom.span", items=3) as span:
+        span.add(bytes=10)
+    fns = yt_spans.write_out(str(tmp_path / "report"))
+    with open(fns[0]) as fh:
+        report = json.load(fh)
+    assert_equal(report["custom.span"]["calls"], 1)
+    assert_equal(report["custom.span"]["counts"], {"items": 3, "bytes": 10})
+    with open(fns[1]) as fh:
+        trace = json.load(fh)
+    (event,) = trace["traceEvents"]
+    assert_equal(event["name"], "custom.span")
+    assert_equal(event["ph"], "X")
+    assert_equal(event["args"], {"items": 3, "bytes": 10})
@@ -1,12 +1,18 @@
+import os
+import queue
 import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING, Dict, List, Optional
 
 import numpy as np
 
 from yt._maintenance.deprecation import issue_deprecation_warning
+from yt.config import ytcfg
 from yt.data_objects.image_array import ImageArray
+from yt.data_objects.index_subobjects.unstructured_mesh import SemiStructuredMesh
 from yt.frontends.ytdata.utilities import save_as_dataset
-from yt.funcs import get_output_filename, iter_fields, mylog
+from yt.funcs import get_num_threads, get_output_filename, iter_fields, mylog
 from yt.loaders import load_uniform_grid
 from yt.utilities.lib.api import (  # type: ignore
     CICDeposit_2,
@@ -14,6 +20,9 @@ from yt.utilities.lib.api import (  # type: ignore
 )
 from yt.utilities.lib.pixelization_routines import pixelize_cylinder
 from yt.utilities.on_demand_imports import _h5py as h5py
+from yt.utilities.parallel_tools.parallel_analysis_interface import (
+    communication_system,
+)
 
 from .volume_rendering.api import off_axis_projection
 
@@ -21,6 +30,146 @@ if TYPE_CHECKING:
     from yt.visualization.fixed_resolution_filters import FixedResolutionBufferFilter
 
 
+class ViewCache:
+    r"""
+    A memory-bounded cache of the images pixelized by the fixed resolution
+    buffers of a plot, used to answer pans, zooms and changes of resolution
+    without pixelizing the whole view again.
+
+    A new view is assembled from a cached image of the same field whose pixels
+    are aligned with those of the view and which are either the same size or
+    an integer factor smaller, in which case they are averaged over blocks of
+    pixels, as in an image pyramid.  Only the strips of the view not covered
+    by the cached image are pixelized, as long as they are at most two and
+    cover at most half of the view; otherwise the view is pixelized as usual.
+    The cache only applies to antialiased, axis-aligned views of cartesian
+    datasets, and to the fields deposited onto the pixels with
+    ``pixelize_cartesian``, whose pixels are area-weighted averages of the
+    cells and independent of the extent of the view: SPH, nodal and
+    unstructured mesh fields are always pixelized.  It is emptied whenever it
+    is used with another data source.
+
+    Parameters
+    ----------
+    max_memory : int, optional
+        The maximum size of the cached images, in bytes.  Defaults to the
+        ``plot_view_cache_max_memory`` configuration option.  The cache is
+        disabled if this is not positive.
+    """
+
+    def __init__(self, max_memory=None):
+        if max_memory is None:
+            max_memory = ytcfg.get("yt", "plot_view_cache_max_memory")
+        self.max_memory = max_memory
+        self._images = OrderedDict()
+        self._data_source = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._images)
+
+    @property
+    def nbytes(self):
+        return sum(buff.nbytes for _, buff in self._images.values())
+
+    def clear(self):
+        """Removes all of the cached images."""
+        self._images.clear()
+
+    def _check_source(self, frb, item):
+        if self.max_memory <= 0 or frb.data_source.axis >= 3 or not frb.antialias:
+            return False
+        if frb.ds.geometry != "cartesian":
+            return False
+        index = frb.ds.index
+        if hasattr(index, "meshes") and not isinstance(
+            index.meshes[0], SemiStructuredMesh
+        ):
+            return False
+        if not frb.ds.coordinates._is_cartesian_pixelized(frb.data_source, item):
+            return False
+        source = self._data_source() if self._data_source is not None else None
+        if source is not frb.data_source:
+            self.clear()
+            self._data_source = weakref.ref(frb.data_source)
+        return True
+
+    def add(self, frb, item, buff):
+        """Stores the (unfiltered) image of a field pixelized by an FRB."""
+        if not self._check_source(frb, item):
+            return
+        key = (item, tuple(frb._code_bounds()), buff.shape)
+        # the FRB may convert the units of its image in place
+        self._images[key] = (np.array(frb._code_bounds()), buff.copy())
+        self._images.move_to_end(key)
+        while len(self._images) > 1 and self.nbytes > self.max_memory:
+            self._images.popitem(last=False)
+
+    def get(self, frb, item):
+        """
+        Returns the image of a field in the view of an FRB assembled from the
+        cached images, pixelizing the uncovered strips with the FRB, or None.
+        """
+        if not self._check_source(frb, item):
+            return None
+        x0, x1, y0, y1 = frb._code_bounds()
+        nx, ny = frb.buff_size
+        dx, dy = (x1 - x0) / nx, (y1 - y0) / ny
+        best = None
+        for key, (bounds, buff) in reversed(self._images.items()):
+            if key[0] != item:
+                continue
+            cdx = (bounds[1] - bounds[0]) / buff.shape[1]
+            cdy = (bounds[3] - bounds[2]) / buff.shape[0]
+            factor = int(round(dx / cdx))
+            if factor < 1:
+                continue
+            offsets = ((x0 - bounds[0]) / cdx, (y0 - bounds[2]) / cdy)
+            aligned = [
+                abs(dx / cdx - factor) < 1e-6 * factor,
+                abs(dy / cdy - factor) < 1e-6 * factor,
+            ] + [abs(o - round(o)) < 1e-6 for o in offsets]
+            if not all(aligned):
+                continue
+            ox, oy = (int(round(o)) for o in offsets)
+            # the range of pixels of the view covered by the cached image
+            i0, i1 = max(0, -(ox // factor)), min(nx, (buff.shape[1] - ox) // factor)
+            j0, j1 = max(0, -(oy // factor)), min(ny, (buff.shape[0] - oy) // factor)
+            if i1 <= i0 or j1 <= j0:
+                continue
+            covered = (i1 - i0) * (j1 - j0)
+            if best is None or covered > best[0]:
+                best = (covered, key, buff, factor, ox, oy, (i0, i1, j0, j1))
+        if best is None or best[0] < nx * ny / 2:
+            self.misses += 1
+            return None
+        covered, key, cached, factor, ox, oy, (i0, i1, j0, j1) = best
+        strips = [
+            (0, nx, 0, j0),
+            (0, nx, j1, ny),
+            (0, i0, j0, j1),
+            (i1, nx, j0, j1),
+        ]
+        strips = [s for s in strips if s[1] > s[0] and s[3] > s[2]]
+        if len(strips) > 2:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._images.move_to_end(key)
+        buff = np.full((ny, nx), np.nan, dtype="float64")
+        sub = cached[
+            oy + j0 * factor : oy + j1 * factor, ox + i0 * factor : ox + i1 * factor
+        ]
+        if factor > 1:
+            sub = sub.reshape(j1 - j0, factor, i1 - i0, factor).mean(axis=(1, 3))
+        buff[j0:j1, i0:i1] = sub
+        for si0, si1, sj0, sj1 in strips:
+            bounds = (x0 + si0 * dx, x0 + si1 * dx, y0 + sj0 * dy, y0 + sj1 * dy)
+            buff[sj0:sj1, si0:si1] = frb._pixelize(item, bounds, (si1 - si0, sj1 - sj0))
+        return buff
+
+
 class FixedResolutionBuffer:
     r"""
     FixedResolutionBuffer(data_source, bounds, buff_size, antialias = True)
@@ -94,6 +243,8 @@ class FixedResolutionBuffer:
         ("index", "theta"),
         ("index", "dtheta"),
     )
+    # whether fetch can pixelize several fields at once
+    _multiple_pixelization = True
 
     def __init__(
         self,
@@ -104,6 +255,7 @@ class FixedResolutionBuffer:
         periodic=False,
         *,
         filters: Optional[List["FixedResolutionBufferFilter"]] = None,
+        view_cache: Optional[ViewCache] = None,
     ):
         self.data_source = data_source
         self.ds = data_source.ds
@@ -114,6 +266,7 @@ class FixedResolutionBuffer:
         self.axis = data_source.axis
         self.periodic = periodic
         self._data_valid = False
+        self._view_cache = view_cache
 
         # import type here to avoid import cycles
         # note that this import statement is actually crucial at runtime:
@@ -158,21 +311,92 @@ class FixedResolutionBuffer:
             self.buff_size[0],
             self.buff_size[1],
         )
-        bounds = []
-        for b in self.bounds:
-            if hasattr(b, "in_units"):
-                b = float(b.in_units("code_length"))
-            bounds.append(b)
-
-        buff = self.ds.coordinates.pixelize(
+        buff = None
+        if self._view_cache is not None:
+            buff = self._view_cache.get(self, item)
+        if buff is None:
+            buff = self._pixelize(item, self._code_bounds(), self.buff_size)
+        if self._view_cache is not None:
+            self._view_cache.add(self, item, buff)
+        return self._store_image(item, buff)
+
+    def _pixelize(self, item, bounds, buff_size):
+        return self.ds.coordinates.pixelize(
             self.data_source.axis,
             self.data_source,
             item,
             bounds,
-            self.buff_size,
+            buff_size,
             int(self.antialias),
         )
 
+    def fetch(self, fields):
+        r"""
+        Returns the images of several fields.
+
+        The fields that are not in the buffer yet are pixelized together, so
+        that the overlap of the data with the pixels is computed only once.
+
+        Parameters
+        ----------
+        fields : list of fields
+            The fields to return images of.
+
+        Returns
+        -------
+        A list of the ImageArrays of the fields, in the same order.
+
+        Examples
+        --------
+        >>> frb = ds.slice(2, 0.5).to_frb((1, "Mpc"), 800)
+        >>> density, temperature = frb.fetch(
+        ...     [("gas", "density"), ("gas", "temperature")]
+        ... )
+        """
+        fields = list(fields)
+        missing = []
+        if self._multiple_pixelization:
+            for field in fields:
+                if field in missing or (field in self.data and self._data_valid):
+                    continue
+                buff = None
+                if self._view_cache is not None:
+                    buff = self._view_cache.get(self, field)
+                if buff is not None:
+                    self._view_cache.add(self, field, buff)
+                    self._store_image(field, buff)
+                    continue
+                missing.append(field)
+        if len(missing) > 1:
+            mylog.info(
+                "Making a fixed resolution buffer of (%s) %d by %d",
+                ", ".join(str(field) for field in missing),
+                self.buff_size[0],
+                self.buff_size[1],
+            )
+            buffs = self.ds.coordinates.pixelize_multiple(
+                self.data_source.axis,
+                self.data_source,
+                missing,
+                self._code_bounds(),
+                self.buff_size,
+                int(self.antialias),
+            )
+            for field, buff in zip(missing, buffs):
+                if self._view_cache is not None:
+                    self._view_cache.add(self, field, buff)
+                self._store_image(field, buff)
+        return [self[field] for field in fields]
+
+    def _code_bounds(self):
+        bounds = []
+        for b in self.bounds:
+            if hasattr(b, "in_units"):
+                b = float(b.in_units("code_length"))
+            bounds.append(b)
+        return bounds
+
+    def _store_image(self, item, buff):
         buff = self._apply_filters(buff)
 
         # FIXME FIXME FIXME we shouldn't need to do this for projections
@@ -204,9 +428,13 @@ class FixedResolutionBuffer:
         exclude = self.data_source._key_fields + list(self._exclude_fields)
         fields = getattr(self.data_source, "fields", [])
         fields += getattr(self.data_source, "field_data", {}).keys()
-        for f in fields:
-            if f not in exclude and f[0] not in self.data_source.ds.particle_types:
-                self[f]
+        self.fetch(
+            [
+                f
+                for f in fields
+                if f not in exclude and f[0] not in self.data_source.ds.particle_types
+            ]
+        )
 
     def _get_info(self, item):
         info = {}
@@ -546,6 +774,8 @@ class CylindricalFixedResolutionBuffer(FixedResolutionBuffer):
     that supports non-aligned input data objects, primarily cutting planes.
     """
 
+    _multiple_pixelization = False
+
     def __init__(self, data_source, radius, buff_size, antialias=True, *, filters=None):
         self.data_source = data_source
         self.ds = data_source.ds
@@ -583,6 +813,8 @@ class OffAxisProjectionFixedResolutionBuffer(FixedResolutionBuffer):
     that supports off axis projections.  This calls the volume renderer.
     """
 
+    _multiple_pixelization = False
+
     def __getitem__(self, item):
         if item in self.data:
             return self.data[item]
@@ -627,8 +859,17 @@ class ParticleImageBuffer(FixedResolutionBuffer):
     that supports particle plots. It splats points onto an image
     buffer.
 
+    The particles are read and splatted one chunk (for particle datasets,
+    one data file) at a time, skipping the data files that do not overlap
+    the image.  Chunks are distributed across MPI ranks and splatted by
+    ``num_threads`` threads, and the partial images are then summed.  If
+    ``num_threads`` is zero, the ``num_threads`` configuration option or the
+    number of available CPUs is used.
+
     """
 
+    _multiple_pixelization = False
+
     def __init__(
         self,
         data_source,
@@ -638,10 +879,14 @@ class ParticleImageBuffer(FixedResolutionBuffer):
         periodic=False,
         *,
         filters=None,
+        num_threads=0,
     ):
         super().__init__(
             data_source, bounds, buff_size, antialias, periodic, filters=filters
         )
+        if num_threads == 0:
+            num_threads = int(get_num_threads()) or os.cpu_count() or 1
+        self.num_threads = num_threads
 
         # set up the axis field names
         axis = self.axis
@@ -665,21 +910,99 @@ class ParticleImageBuffer(FixedResolutionBuffer):
             self.buff_size[1],
             deposition,
         )
+        if deposition not in ("ngp", "cic"):
+            raise ValueError(f"Received unknown deposition method '{deposition}'")
 
-        bounds = []
-        for b in self.bounds:
-            if hasattr(b, "in_units"):
-                b = float(b.in_units("code_length"))
-            bounds.append(b)
+        weight_field = self.data_source.weight_field
+        units = self.ds.quan(1, self.ds._get_field_info(item).units).units
+        buff, buff_mask, weight_buff = self._splat_chunks(item, units)
+
+        # remove values in no-particle region
+        buff[buff_mask == 0] = np.nan
 
+        # divide by the weight_field, if needed
+        if weight_field is not None:
+            locs = np.where(weight_buff > 0)
+            buff[locs] /= weight_buff[locs]
+
+        # Normalize by the surface area of the pixel or volume of pencil if
+        # requested
+        info = self._get_info(item)
+        if density:
+            width = self.data_source.width
+            norm = width[self.xax] * width[self.yax] / np.prod(self.buff_size)
+            norm = norm.in_base()
+            buff /= norm.v
+            units = units / norm.units
+            info["label"] = "%s $\\rm{Density}$" % info["label"]
+
+        self.data[item] = ImageArray(buff, units=units, info=info)
+        return self.data[item]
+
+    def _splat_chunks(self, item, units):
+        # Deposits the particles chunk by chunk, so that only the particles of
+        # a few data files are held in memory at once.  The region being
+        # chunked only spans the image, so the particle index skips the data
+        # files that cannot contribute to it.  Chunks are distributed across
+        # MPI ranks and, within a rank, are deposited into per-thread partial
+        # images while the next chunks are read.
+        weight_field = self.data_source.weight_field
+        nbuffs = 2 if weight_field is None else 4
+        partial_images = queue.Queue()
+        for _ in range(self.num_threads):
+            images = []
+            for _ in range(nbuffs // 2):
+                images.append(np.zeros(self.buff_size))
+                images.append(np.zeros(self.buff_size, dtype="uint8"))
+            partial_images.put(images)
+
+        def _splat(particles):
+            images = partial_images.get()
+            try:
+                self._splat_particles(images, *particles)
+            finally:
+                partial_images.put(images)
+
+        bounds = self._code_bounds()
+        comm = communication_system.communicators[-1]
+        pending = deque()
+        with ThreadPoolExecutor(self.num_threads) as executor:
+            for ci, chunk in enumerate(self.data_source.dd.chunks([], "io")):
+                if ci % comm.size != comm.rank:
+                    continue
+                particles = self._read_particles(chunk, item, units, bounds)
+                if particles is None:
+                    continue
+                # bound the number of chunks held in memory
+                if len(pending) >= self.num_threads:
+                    pending.popleft().result()
+                pending.append(executor.submit(_splat, particles))
+            for future in pending:
+                future.result()
+
+        # reduce the partial images
+        images = [partial_images.get() for _ in range(self.num_threads)]
+        buff = comm.mpi_allreduce(np.sum([im[0] for im in images], axis=0))
+        buff_mask = np.max([im[1] for im in images], axis=0).astype("int32")
+        buff_mask = comm.mpi_allreduce(buff_mask, op="max")
+        weight_buff = None
+        if weight_field is not None:
+            weight_buff = np.sum([im[2] for im in images], axis=0)
+            weight_buff = comm.mpi_allreduce(weight_buff)
+        return buff, buff_mask, weight_buff
+
+    def _read_particles(self, chunk, item, units, bounds):
+        # Returns the image coordinates and values of the particles of a chunk
+        # that show up in the image, or None if there are none.
         ftype = item[0]
-        x_data = self.data_source.dd[ftype, self.x_field]
-        y_data = self.data_source.dd[ftype, self.y_field]
-        data = self.data_source.dd[item]
+        x_data = chunk[ftype, self.x_field].to_value("code_length")
+        if x_data.size == 0:
+            return None
+        y_data = chunk[ftype, self.y_field].to_value("code_length")
 
         # handle periodicity
-        dx = x_data.in_units("code_length").d - bounds[0]
-        dy = y_data.in_units("code_length").d - bounds[2]
+        dx = x_data - bounds[0]
+        dy = y_data - bounds[2]
         if self.periodic:
             dx %= float(self._period[0].in_units("code_length"))
             dy %= float(self._period[1].in_units("code_length"))
@@ -692,85 +1015,40 @@ class ParticleImageBuffer(FixedResolutionBuffer):
         mask = np.logical_and(
             np.logical_and(px >= 0.0, px <= 1.0), np.logical_and(py >= 0.0, py <= 1.0)
         )
+        if not mask.any():
+            return None
 
+        data = chunk[item].to_value(units)[mask].astype("float64")
         weight_field = self.data_source.weight_field
         if weight_field is None:
-            weight_data = np.ones_like(data.v)
+            weight_data = None
         else:
-            weight_data = self.data_source.dd[weight_field]
-        splat_vals = weight_data[mask] * data[mask]
-
-        x_bin_edges = np.linspace(0.0, 1.0, self.buff_size[0] + 1)
-        y_bin_edges = np.linspace(0.0, 1.0, self.buff_size[1] + 1)
-
-        # splat particles
-        buff = np.zeros(self.buff_size)
-        buff_mask = np.zeros_like(buff, dtype="uint8")
-        if deposition == "ngp":
-            add_points_to_greyscale_image(
-                buff, buff_mask, px[mask], py[mask], splat_vals
-            )
-        elif deposition == "cic":
-            CICDeposit_2(
-                py[mask],
-                px[mask],
-                splat_vals,
-                mask.sum(),
-                buff,
-                buff_mask,
-                x_bin_edges,
-                y_bin_edges,
-            )
+            weight_units = self.ds._get_field_info(weight_field).units
+            weight_data = chunk[weight_field].to_value(weight_units)[mask]
+            weight_data = weight_data.astype("float64")
+        return px[mask], py[mask], data, weight_data
+
+    def _splat_particles(self, images, px, py, data, weight_data):
+        if weight_data is None:
+            self._deposit(images[0], images[1], px, py, data)
         else:
-            raise ValueError(f"Received unknown deposition method '{deposition}'")
-
-        # remove values in no-particle region
-        buff[buff_mask == 0] = np.nan
+            self._deposit(images[0], images[1], px, py, weight_data * data)
+            self._deposit(images[2], images[3], px, py, weight_data)
 
-        # Normalize by the surface area of the pixel or volume of pencil if
-        # requested
-        info = self._get_info(item)
-        if density:
-            width = self.data_source.width
-            norm = width[self.xax] * width[self.yax] / np.prod(self.buff_size)
-            norm = norm.in_base()
-            buff /= norm.v
-            units = data.units / norm.units
-            info["label"] = "%s $\\rm{Density}$" % info["label"]
+    def _deposit(self, buff, buff_mask, px, py, values):
+        if self.data_source.deposition == "ngp":
+            add_points_to_greyscale_image(buff, buff_mask, px, py, values)
         else:
-            units = data.units
-
-        ia = ImageArray(buff, units=units, info=info)
-
-        # divide by the weight_field, if needed
-        if weight_field is not None:
-            weight_buff = np.zeros(self.buff_size)
-            weight_buff_mask = np.zeros(self.buff_size, dtype="uint8")
-            if deposition == "ngp":
-                add_points_to_greyscale_image(
-                    weight_buff, weight_buff_mask, px[mask], py[mask], weight_data[mask]
-                )
-            elif deposition == "cic":
-                CICDeposit_2(
-                    py[mask],
-                    px[mask],
-                    weight_data[mask],
-                    mask.sum(),
-                    weight_buff,
-                    weight_buff_mask,
-                    y_bin_edges,
-                    x_bin_edges,
-                )
-            weight_array = ImageArray(
-                weight_buff, units=weight_data.units, info=self._get_info(item)
+            CICDeposit_2(
+                py,
+                px,
+                values,
+                px.size,
+                buff,
+                buff_mask,
+                np.linspace(0.0, 1.0, self.buff_size[0] + 1),
+                np.linspace(0.0, 1.0, self.buff_size[1] + 1),
             )
-            # remove values in no-particle region
-            weight_buff[weight_buff_mask == 0] = np.nan
-            locs = np.where(weight_array > 0)
-            ia[locs] /= weight_array[locs]
-
-        self.data[item] = ia
-        return self.data[item]
 
     # over-ride the base class version, since we don't want to exclude
     # particle fields
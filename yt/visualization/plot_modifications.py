@@ -2386,12 +2386,19 @@ class ParticleCallback(PlotCallback):
     pixels per particle, and *col* governs the color.  *ptype* will
     restrict plotted particles to only those that are of a given type.
     *alpha* determines the opacity of the marker symbol used in the scatter.
-    An alternate data source can be specified with *data_source*, but by
-    default the plot's data source will be queried.
+    *stride* thins out the particles: only one in *stride* of the particles
+    falling in each pixel of the image is plotted, so that sparse regions
+    remain visible.  An alternate data source can be specified with
+    *data_source*, but by default the plot's data source will be queried.
+
+    The particles are read from a region extending beyond the plot bounds by
+    half of the plot width on each side, which is kept and reused as long as
+    the plot is zoomed in or panned within it.
     """
 
     _type_name = "particles"
     region = None
+    _region_padding = 0.5
     _descriptor = None
     _supported_geometries = ("cartesian", "spectral_cube", "cylindrical")
     _incompatible_plot_types = ("OffAxisSlice", "OffAxisProjection")
@@ -2481,7 +2488,10 @@ class ParticleCallback(PlotCallback):
             gg &= self.region[pt, "particle_mass"] >= self.minimum_mass
             if gg.sum() == 0:
                 return
-        px, py = [particle_x[gg][:: self.stride], particle_y[gg][:: self.stride]]
+        px, py = particle_x[gg], particle_y[gg]
+        if self.stride > 1:
+            keep = self._downsample(px, py, (x0, x1, y0, y1), plot.frb.buff_size)
+            px, py = px[keep], py[keep]
         px, py = self._convert_to_plot(plot, [px, py])
         px, py = self._sanitize_xy_order(plot, px, py)
         plot._axes.scatter(
@@ -2514,6 +2524,26 @@ class ParticleCallback(PlotCallback):
             particle_x = uhstack((particle_x, particle_x))
         return particle_x, particle_y
 
+    def _downsample(self, px, py, bounds, shape):
+        """
+        Returns the indices of one in every *stride* of the particles in each
+        of the pixels of an image of the given bounds and shape.
+        """
+        x0, x1, y0, y1 = (v.to_value("code_length") for v in bounds)
+        nx, ny = shape
+        ix = (px.to_value("code_length") - x0) / (x1 - x0) * nx
+        iy = (py.to_value("code_length") - y0) / (y1 - y0) * ny
+        ix = np.clip(ix.astype("int64"), 0, nx - 1)
+        iy = np.clip(iy.astype("int64"), 0, ny - 1)
+        pixels = ix * ny + iy
+        order = np.argsort(pixels, kind="stable")
+        pixels = pixels[order]
+        # the rank of each particle among the particles of its pixel
+        starts = np.flatnonzero(np.r_[True, pixels[1:] != pixels[:-1]])
+        counts = np.diff(np.r_[starts, pixels.size])
+        rank = np.arange(pixels.size) - np.repeat(starts, counts)
+        return np.sort(order[rank % self.stride == 0])
+
     def _get_region(self, xlim, ylim, axis, data):
         LE, RE = [None] * 3, [None] * 3
         ds = data.ds
@@ -2531,6 +2561,13 @@ class ParticleCallback(PlotCallback):
             and np.all(self.region.right_edge >= RE)
         ):
             return self.region
+        # read the particles around the plot too, so that the region (and the
+        # particle positions it holds) can be reused when the plot is panned,
+        # without extending it beyond the domain
+        for ax in (xax, yax):
+            pad = (RE[ax] - LE[ax]) * self._region_padding
+            LE[ax] = min(LE[ax], max(LE[ax] - pad, ds.domain_left_edge[ax]))
+            RE[ax] = max(RE[ax], min(RE[ax] + pad, ds.domain_right_edge[ax]))
         self.region = data.ds.region(data.center, LE, RE, data_source=self.data_source)
         return self.region
 
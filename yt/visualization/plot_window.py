@@ -32,6 +32,7 @@ from ._commons import _swap_axes_extents, get_default_from_config
 from .fixed_resolution import (
     FixedResolutionBuffer,
     OffAxisProjectionFixedResolutionBuffer,
+    ViewCache,
 )
 from .geo_plot_utils import get_mpl_transform
 from .plot_container import (
@@ -193,6 +194,7 @@ class PlotWindow(ImagePlotContainer, abc.ABC):
         self._equivalencies = defaultdict(lambda: (None, {}))
         self.buff_size = buff_size
         self.antialias = antialias
+        self._view_cache = ViewCache()
         self._axes_unit_names = None
         self._transform = None
         self._projection = None
@@ -310,7 +312,10 @@ class PlotWindow(ImagePlotContainer, abc.ABC):
         else:
             bounds = self.xlim + self.ylim
 
-        # Generate the FRB
+        # Generate the FRB, reusing the images of the previous views if we can
+        kwargs = {}
+        if self._frb_generator is FixedResolutionBuffer:
+            kwargs["view_cache"] = self._view_cache
         self.frb = self._frb_generator(
             self.data_source,
             bounds,
@@ -318,11 +323,13 @@ class PlotWindow(ImagePlotContainer, abc.ABC):
             self.antialias,
             periodic=self._periodic,
             filters=old_filters,
+            **kwargs,
         )
 
         # At this point the frb has the valid bounds, size, aliasing, etc.
         if old_fields is not None:
             # Restore the old fields
+            self._frb.fetch(old_fields)
             for key, units in zip(old_fields, old_units):
                 self._frb[key]
                 equiv = self._equivalencies[key]
@@ -1015,6 +1022,7 @@ class PWViewerMPL(PlotWindow):
             self._recreate_frb()
         self._colorbar_valid = True
         field_list = list(set(self.data_source._determine_fields(self.fields)))
+        self.frb.fetch(field_list)
         for f in field_list:
             axis_index = self.data_source.axis
 
@@ -3,6 +3,7 @@ import inspect
 import shutil
 import tempfile
 
+import numpy as np
 from numpy.testing import assert_array_equal, assert_raises
 
 import yt.units as u
@@ -372,6 +373,31 @@ def test_particles_callback():
         assert_raises(YTDataTypeUnsupported, p.annotate_particles, (10, "Mpc"))
 
 
+def test_particles_callback_region():
+    ds = fake_amr_ds(fields=("density",), units=("g/cm**3",), particles=1000)
+    p = SlicePlot(ds, "z", ("gas", "density"), width=(0.4, "unitary"))
+    p.annotate_particles((1, "unitary"), stride=4)
+    p._setup_plots()
+    cb = p._callbacks[0]
+    region = cb.region
+    # the particles around the plot are read too, and reused when panning
+    assert region.right_edge[0] - region.left_edge[0] > ds.quan(0.4, "code_length")
+    p.pan((0.1, 0.05))
+    p.zoom(2)
+    p._setup_plots()
+    assert cb.region is region
+    p.zoom(0.1)
+    p._setup_plots()
+    assert cb.region is not region
+
+    # every pixel holding particles keeps at least one of them
+    x = ds.arr(np.r_[np.full(100, 0.1), 0.6, 0.9], "code_length")
+    y = ds.arr(np.r_[np.linspace(0.1, 0.11, 100), 0.6, 0.9], "code_length")
+    bounds = tuple(ds.quan(v, "code_length") for v in (0, 1, 0, 1))
+    keep = cb._downsample(x, y, bounds, (10, 10))
+    assert_array_equal(keep, np.r_[np.arange(0, 100, 4), 100, 101])
+
+
 def test_sphere_callback():
     with _cleanup_fname() as prefix:
         ax = "z"
@@ -0,0 +1,192 @@
+import numpy as np
+
+from yt.testing import (
+    assert_allclose_units,
+    assert_equal,
+    assert_rel_equal,
+    fake_amr_ds,
+    fake_random_ds,
+)
+from yt.utilities.lib.pixelization_routines import (
+    pixelize_cartesian,
+    pixelize_cartesian_multiple,
+)
+from yt.visualization.fixed_resolution import (
+    FixedResolutionBuffer,
+    ParticleImageBuffer,
+    ViewCache,
+)
+from yt.visualization.particle_plots import ParticleAxisAlignedDummyDataSource
+
+FIELDS = [("gas", "density"), ("gas", "velocity_x"), ("index", "ones")]
+
+
+def _fresh_frbs(data_source, bounds, antialias):
+    return [
+        FixedResolutionBuffer(data_source, bounds, (65, 47), antialias=antialias)
+        for _ in range(2)
+    ]
+
+
+def test_fetch_matches_getitem():
+    ds = fake_amr_ds(fields=["density", "velocity_x"], units=["g/cm**3", "cm/s"])
+    # the second bounds extend across the periodic boundaries
+    for bounds in [(0.1, 0.9, 0.2, 0.7), (-0.3, 0.6, 0.4, 1.2)]:
+        for data_source in (ds.slice(2, 0.37), ds.proj(("gas", "density"), 0)):
+            for antialias in (True, False):
+                frb, frb_bulk = _fresh_frbs(data_source, bounds, antialias)
+                images = frb_bulk.fetch(FIELDS)
+                for field, image in zip(FIELDS, images):
+                    assert_equal(image, frb[field])
+                    assert_equal(image.units, frb[field].units)
+                    assert_equal(image.info["field"], frb[field].info["field"])
+                    assert frb_bulk[field] is image
+
+
+def test_pixelize_cartesian_multiple():
+    ds = fake_random_ds(32, nprocs=8)
+    slc = ds.slice(0, 0.5)
+    px, py, pdx, pdy = (slc[f].d for f in ("px", "py", "pdx", "pdy"))
+    data = np.array([slc[f].d for f in FIELDS])
+    bounds = (-0.1, 0.95, 0.05, 1.1)
+    for antialias in (0, 1):
+        expected = np.full((len(FIELDS), 100, 80), np.nan)
+        for i in range(len(FIELDS)):
+            pixelize_cartesian(
+                expected[i], px, py, pdx, pdy, data[i], bounds, antialias, (1.0, 1.0)
+            )
+        for num_threads in (1, 3, 8):
+            buffs = np.full((len(FIELDS), 100, 80), np.nan)
+            pixelize_cartesian_multiple(
+                buffs,
+                px,
+                py,
+                pdx,
+                pdy,
+                data,
+                bounds,
+                antialias,
+                (1.0, 1.0),
+                num_threads=num_threads,
+            )
+            assert_equal(buffs, expected)
+
+
+def _ngp_image(ds, field, center, width, weight_field=None, n=32):
+    ad = ds.all_data()
+    px = (ad["io", "particle_position_x"].d - center[0] + width / 2) / width
+    py = (ad["io", "particle_position_y"].d - center[1] + width / 2) / width
+    z = ad["io", "particle_position_z"].d
+    mask = (px >= 0) & (px <= 1) & (py >= 0) & (py <= 1)
+    mask &= np.abs(z - center[2]) <= width / 2
+    i = np.minimum((n * py[mask]).astype("int64"), n - 1)
+    j = np.minimum((n * px[mask]).astype("int64"), n - 1)
+    values = ad[field].d[mask]
+    if weight_field is not None:
+        weights = ad[weight_field].d[mask]
+        values = values * weights
+    image = np.zeros((n, n))
+    np.add.at(image, (i, j), values)
+    hits = np.zeros((n, n))
+    np.add.at(hits, (i, j), 1)
+    if weight_field is not None:
+        weight_image = np.zeros((n, n))
+        np.add.at(weight_image, (i, j), weights)
+        image[hits > 0] /= weight_image[hits > 0]
+    image[hits == 0] = np.nan
+    return image
+
+
+def test_particle_image_buffer_chunked():
+    # several grids, and hence several io chunks, hold the particles
+    ds = fake_random_ds(16, nprocs=8, particles=4000)
+    center = ds.arr([0.45, 0.55, 0.5], "code_length")
+    width = ds.arr([0.6, 0.6, 0.6], "code_length")
+    bounds = (0.15, 0.75, 0.25, 0.85)
+    # a weighted image of a field with different units than the weights
+    for field, weight_field in [
+        (("io", "particle_mass"), None),
+        (("io", "particle_velocity_x"), ("io", "particle_mass")),
+    ]:
+        expected = _ngp_image(ds, field, center.d, 0.6, weight_field)
+        images = {}
+        for deposition in ("ngp", "cic"):
+            source = ParticleAxisAlignedDummyDataSource(
+                center,
+                ds,
+                2,
+                width,
+                [field],
+                weight_field,
+                deposition=deposition,
+            )
+            for num_threads in (1, 4):
+                frb = ParticleImageBuffer(
+                    source, bounds, (32, 32), num_threads=num_threads
+                )
+                image = frb[field]
+                assert_equal(str(image.units), ds.field_info[field].units)
+                images[deposition, num_threads] = image.d
+        assert_allclose_units(images["ngp", 1], expected)
+        assert_allclose_units(images["ngp", 4], expected)
+        assert_allclose_units(images["cic", 4], images["cic", 1])
+
+
+def test_view_cache():
+    ds = fake_amr_ds(fields=["density"], units=["g/cm**3"])
+    field = ("gas", "density")
+    slc = ds.slice(2, 0.37)
+    cache = ViewCache()
+    FixedResolutionBuffer(slc, (0.1, 0.6, 0.2, 0.7), (100, 100), view_cache=cache)[
+        field
+    ]
+    views = [
+        # a pan by a whole number of pixels
+        ((0.135, 0.635, 0.215, 0.715), 100),
+        # a zoom onto an area that has already been pixelized
+        ((0.2, 0.45, 0.3, 0.55), 50),
+        # a lower resolution
+        ((0.2, 0.45, 0.3, 0.55), 25),
+    ]
+    for i, (bounds, n) in enumerate(views):
+        frb = FixedResolutionBuffer(slc, bounds, (n, n), view_cache=cache)
+        image = frb.fetch([field])[0]
+        assert_equal(cache.hits, i + 1)
+        expected = FixedResolutionBuffer(slc, bounds, (n, n))[field]
+        assert_equal(np.isnan(image), np.isnan(expected))
+        assert_rel_equal(image, expected, 10)
+    # unaligned views are pixelized as usual
+    frb = FixedResolutionBuffer(slc, (0.2, 0.7, 0.2, 0.7), (77, 77), view_cache=cache)
+    frb[field]
+    assert_equal(cache.hits, len(views))
+    # as are the views of other data sources
+    FixedResolutionBuffer(
+        ds.slice(2, 0.5), (0.1, 0.6, 0.2, 0.7), (100, 100), view_cache=cache
+    )[field]
+    assert_equal(len(cache), 1)
+    assert_equal(cache.hits, len(views))
+
+
+def test_view_cache_sph():
+    # SPH fields are not area-weighted averages of cells, so their images
+    # cannot be assembled from those of other views
+    from yt.testing import fake_sph_grid_ds
+    from yt.visualization.plot_window import SlicePlot
+
+    ds = fake_sph_grid_ds()
+    field = ("gas", "density")
+    bounds = (0.5, 2.5, 0.5, 2.5)
+    for source in (ds.slice(2, 1.5), ds.r[:, :, 0.5:2.5].integrate(field, axis=2)):
+        cache = ViewCache()
+        FixedResolutionBuffer(source, bounds, (64, 64), view_cache=cache)[field]
+        image = FixedResolutionBuffer(source, bounds, (32, 32), view_cache=cache)
+        expected = FixedResolutionBuffer(source, bounds, (32, 32))[field]
+        assert_equal(image[field], expected)
+        assert_equal((cache.hits, len(cache)), (0, 0))
+
+    slc = SlicePlot(ds, "z", field)
+    slc.set_buff_size(128)
+    slc.frb[field]
+    slc.set_buff_size(64)
+    expected = FixedResolutionBuffer(slc.data_source, slc.frb.bounds, (64, 64))
+    assert_equal(slc.frb[field], expected[field])
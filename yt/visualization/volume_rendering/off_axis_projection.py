@@ -7,6 +7,10 @@ from yt.utilities.lib.partitioned_grid import PartitionedGrid
 from yt.utilities.lib.pixelization_routines import (
     normalization_2d_utility,
     off_axis_projection_SPH,
+    off_axis_rotation_matrix,
+)
+from yt.utilities.parallel_tools.parallel_analysis_interface import (
+    communication_system,
 )
 
 from .render_source import KDTreeVolumeSource
@@ -209,24 +213,48 @@ def off_axis_projection(
         ounits = finfo.output_units
         bounds = [x_min, x_max, y_min, y_max, z_min, z_max]
 
-        if weight is None:
-            for chunk in data_source.chunks([], "io"):
-                off_axis_projection_SPH(
-                    chunk[ptype, ppos[0]].to("code_length").d,
-                    chunk[ptype, ppos[1]].to("code_length").d,
-                    chunk[ptype, ppos[2]].to("code_length").d,
-                    chunk[ptype, "mass"].to("code_mass").d,
-                    chunk[ptype, "density"].to("code_density").d,
-                    chunk[ptype, "smoothing_length"].to("code_length").d,
-                    bounds,
-                    center.to("code_length").d,
-                    width.to("code_length").d,
-                    chunk[item].in_units(ounits),
-                    buf,
-                    normal_vector,
-                    north,
-                )
+        # Only read the data files whose extent, as recorded in the bitmap
+        # index, overlaps the image, and distribute them across processors
+        visible = _visible_data_files(data_source, center, width, normal_vector, north)
+        comm = communication_system.communicators[-1]
+        if weight is not None:
+            # if there is a weight field, take two projections in one pass:
+            # one of field*weight, the other of just weight, and divide them
+            weight_buff = np.zeros((resolution[0], resolution[1]), dtype="float64")
+            wounits = data_source.ds.field_info[weight].output_units
 
+        nchunks = 0
+        for chunk in data_source.chunks([], "io"):
+            if visible is not None:
+                data_files = getattr(chunk._current_chunk.objs[0], "data_files", [])
+                if not any(df.file_id in visible for df in data_files):
+                    continue
+            nchunks += 1
+            if (nchunks - 1) % comm.size != comm.rank:
+                continue
+            kwargs = {}
+            if weight is not None:
+                kwargs["weight_field"] = chunk[weight].in_units(wounits)
+                kwargs["weight_buff"] = weight_buff
+            off_axis_projection_SPH(
+                chunk[ptype, ppos[0]].to("code_length").d,
+                chunk[ptype, ppos[1]].to("code_length").d,
+                chunk[ptype, ppos[2]].to("code_length").d,
+                chunk[ptype, "mass"].to("code_mass").d,
+                chunk[ptype, "density"].to("code_density").d,
+                chunk[ptype, "smoothing_length"].to("code_length").d,
+                bounds,
+                center.to("code_length").d,
+                width.to("code_length").d,
+                chunk[item].in_units(ounits),
+                buf,
+                normal_vector,
+                north,
+                **kwargs,
+            )
+        buf = comm.mpi_allreduce(buf, op="sum")
+
+        if weight is None:
             # Assure that the path length unit is in the default length units
             # for the dataset by scaling the units of the smoothing length,
             # which in the above calculation is set to be code_length
@@ -242,46 +270,7 @@ def off_axis_projection(
             funits = item_unit * default_path_length_unit
 
         else:
-            # if there is a weight field, take two projections:
-            # one of field*weight, the other of just weight, and divide them
-            weight_buff = np.zeros((resolution[0], resolution[1]), dtype="float64")
-            wounits = data_source.ds.field_info[weight].output_units
-
-            for chunk in data_source.chunks([], "io"):
-                off_axis_projection_SPH(
-                    chunk[ptype, ppos[0]].to("code_length").d,
-                    chunk[ptype, ppos[1]].to("code_length").d,
-                    chunk[ptype, ppos[2]].to("code_length").d,
-                    chunk[ptype, "mass"].to("code_mass").d,
-                    chunk[ptype, "density"].to("code_density").d,
-                    chunk[ptype, "smoothing_length"].to("code_length").d,
-                    bounds,
-                    center.to("code_length").d,
-                    width.to("code_length").d,
-                    chunk[item].in_units(ounits),
-                    buf,
-                    normal_vector,
-                    north,
-                    weight_field=chunk[weight].in_units(wounits),
-                )
-
-            for chunk in data_source.chunks([], "io"):
-                off_axis_projection_SPH(
-                    chunk[ptype, ppos[0]].to("code_length").d,
-                    chunk[ptype, ppos[1]].to("code_length").d,
-                    chunk[ptype, ppos[2]].to("code_length").d,
-                    chunk[ptype, "mass"].to("code_mass").d,
-                    chunk[ptype, "density"].to("code_density").d,
-                    chunk[ptype, "smoothing_length"].to("code_length").d,
-                    bounds,
-                    center.to("code_length").d,
-                    width.to("code_length").d,
-                    chunk[weight].to(wounits),
-                    weight_buff,
-                    normal_vector,
-                    north,
-                )
-
+            weight_buff = comm.mpi_allreduce(weight_buff, op="sum")
             normalization_2d_utility(buf, weight_buff)
             item_unit = data_source.ds._get_field_info(item).units
             item_unit = Unit(item_unit, registry=data_source.ds.unit_registry)
@@ -410,3 +399,37 @@ def off_axis_projection(
             image[mask] = 0
 
     return image[:, :, 0]
+
+
+def _visible_data_files(data_source, center, width, normal_vector, north_vector):
+    # Returns the ids of the data files whose extent overlaps the image plane
+    # of an off-axis projection, or None if all of them have to be read.
+    index = data_source.ds.index
+    if not hasattr(index, "_data_file_extents"):
+        return None
+    if not np.any(normal_vector):
+        return None
+    extents = index._data_file_extents()
+    empty = np.any(extents[:, 0] > extents[:, 1], axis=1)
+    extents = np.where(empty[:, None, None], 0.0, extents)
+    # the eight corners of every bounding box, rotated into the image plane
+    corners = np.stack(
+        [
+            np.stack([extents[:, i, 0], extents[:, j, 1], extents[:, k, 2]], axis=-1)
+            for i in (0, 1)
+            for j in (0, 1)
+            for k in (0, 1)
+        ],
+        axis=1,
+    )
+    rotation = np.asarray(off_axis_rotation_matrix(normal_vector, north_vector))[:2]
+    rotated = corners @ rotation.T
+    image_center = rotation @ center.to("code_length").d
+    half_width = width.to("code_length").d[:2] / 2
+    visible = np.all(
+        (rotated.max(axis=1) >= image_center - half_width)
+        & (rotated.min(axis=1) <= image_center + half_width),
+        axis=1,
+    )
+    visible &= ~empty
+    return set(np.flatnonzero(visible).tolist())
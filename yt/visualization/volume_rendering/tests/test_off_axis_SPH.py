@@ -1,7 +1,17 @@
 import numpy as np
 
-from yt.testing import assert_almost_equal, fake_sph_orientation_ds, requires_module
-from yt.utilities.lib.pixelization_routines import pixelize_sph_kernel_projection
+from yt.loaders import load_particles
+from yt.testing import (
+    assert_almost_equal,
+    assert_equal,
+    fake_sph_orientation_ds,
+    requires_module,
+)
+from yt.utilities.lib.pixelization_routines import (
+    normalization_2d_utility,
+    off_axis_projection_SPH,
+    pixelize_sph_kernel_projection,
+)
 from yt.utilities.on_demand_imports import _scipy
 from yt.visualization.volume_rendering import off_axis_projection as OffAP
 
@@ -267,6 +277,85 @@ def test_center_3():
     find_compare_maxima(expected_maxima, buf1, resolution, width)
 
 
+def test_weighted_projection():
+    """A weighted projection deposits the weighted field and the weight in a
+    single pass, matching separate projections of both"""
+    normal_vector = np.array([0.3, 0.5, 1.0])
+    north_vector = np.array([0.0, 1.0, 0.0])
+    resolution = (64, 64)
+    ds = fake_sph_orientation_ds()
+    ad = ds.all_data()
+    center = (ds.domain_left_edge + ds.domain_right_edge) / 2
+    width = ds.domain_right_edge - ds.domain_left_edge
+    buf1 = OffAP.off_axis_projection(
+        ds,
+        center,
+        normal_vector,
+        width,
+        resolution,
+        ("gas", "density"),
+        weight=("gas", "density"),
+        north_vector=north_vector,
+    )
+
+    north = north_vector / np.linalg.norm(north_vector)
+    args = [ad["io", f"particle_position_{ax}"].d for ax in "xyz"] + [
+        ad["io", "particle_mass"].d,
+        ad["io", "density"].d,
+        ad["io", "smoothing_length"].d,
+        None,
+        center.d,
+        width.d,
+    ]
+    density = ad["gas", "density"].d
+    buf2 = np.zeros(resolution)
+    weight_buff = np.zeros(resolution)
+    off_axis_projection_SPH(
+        *args, density, buf2, normal_vector, north, weight_field=density
+    )
+    off_axis_projection_SPH(*args, density, weight_buff, normal_vector, north)
+    normalization_2d_utility(buf2, weight_buff)
+    assert_almost_equal(buf1.d, buf2, 12)
+
+
+def test_culled_data_files():
+    """Data files entirely outside of the image are not read"""
+    npart = 100
+    pos = 0.5 * np.random.RandomState(0x4D3D3D3).random_sample((npart, 3)) - 3.5
+    data = {
+        "particle_position_x": pos[:, 0],
+        "particle_position_y": pos[:, 1],
+        "particle_position_z": pos[:, 2],
+        "particle_mass": np.ones(npart),
+        "smoothing_length": np.full(npart, 0.1),
+        "density": np.ones(npart),
+    }
+    ds = load_particles(data, length_unit=1.0, bbox=[[-4, 4]] * 3)
+    ad = ds.all_data()
+    # the bounding box of the particles and of their smoothing lengths
+    assert_almost_equal(
+        ds.index._data_file_extents(),
+        [[pos.min(axis=0) - 0.1, pos.max(axis=0) + 0.1]],
+    )
+    normal_vector = np.array([0.2, 0.1, 1.0])
+    north_vector = np.array([0.0, 1.0, 0.0])
+    width = ds.arr([2.0, 2.0, 2.0], "code_length")
+    center = ds.arr([-3.5, -3.5, -3.5], "code_length")
+    assert_equal(
+        OffAP._visible_data_files(ad, center, width, normal_vector, north_vector),
+        {0},
+    )
+    center = ds.arr([3.0, 3.0, 0.0], "code_length")
+    assert_equal(
+        OffAP._visible_data_files(ad, center, width, normal_vector, north_vector),
+        set(),
+    )
+    image = OffAP.off_axis_projection(
+        ad, center, normal_vector, width, (16, 16), ("gas", "density")
+    )
+    assert_equal(image.d, np.zeros((16, 16)))
+
+
 @requires_module("scipy")
 def find_compare_maxima(expected_maxima, buf, resolution, width):
     buf_ndarray = buf.ndarray_view()